@@ -1,5 +1,16 @@
 from .piece import CheckersPiece
 from .board import CheckersBoard
-from .game import CheckersGame
+
+_GAMES = ('CheckersGame',)
 
 __all__ = ['CheckersPiece', 'CheckersBoard', 'CheckersGame']
+
+
+def __getattr__(name):
+    # Imported on first use, so that importing the board does not load the
+    # interactive game and with it the engine player and opening book.
+    if name in _GAMES:
+        from . import game
+
+        return getattr(game, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,54 +1,132 @@
 import copy
+import functools
+import math
+from engine.bitboard import geometry, iter_bits
+from engine.history import PositionHistory
+from engine.move import CAPTURE, QUIET, MoveList
+from engine.state import GameStateMixin
+from engine.zobrist import ZobristTable
 from .piece import CheckersPiece
 
 
-class CheckersBoard:
+SYMBOLS = 'wbWB'
+ZOBRIST = ZobristTable(SYMBOLS)
+
+
+@functools.lru_cache(maxsize=None)
+def zobrist_table(size):
+    """Returns the key table of a board size; 8x8 boards share ZOBRIST."""
+    return ZOBRIST if size == 8 else ZobristTable(SYMBOLS, size, size)
+
+
+def opponent(color):
+    """Returns the color of the other side."""
+    return 'black' if color == 'white' else 'white'
+
+
+class CheckersBoard(GameStateMixin):
     """A class representing a checkers game board with pieces and move history.
 
     Manages piece positioning, move validation, and game state tracking.
+    Implements the engine.state.GameState protocol.
+
+    The grid of piece objects is mirrored by bitboards (see
+    engine.bitboard), from which legal_moves() generates every step and
+    jump of a side with a few shifts, on boards of any even size.
 
     Attributes:
-        board (list[list[CheckersPiece|None]]: 8x8 grid representing the board state.
+        size (int): Number of rows and columns.
+        board (list[list[CheckersPiece|None]]: size x size grid representing the board state.
         move_history (list): Stack of previous board states for undo functionality.
+        undo_stack (list): Compact undo records pushed by make_move() for search.
+        hash (int): Zobrist hash of the piece placement, updated incrementally.
+        history (PositionHistory): Hashes and halfmove clocks of the game so far.
+        turn (str): Side to move; every move played on the board passes it on.
+        pieces (dict[str, int]): Bitboard of each side's pieces.
+        kings (int): Bitboard of the kings of both sides.
+        no_moves_is_loss (bool): Class attribute; a side without moves loses.
+        move_limit (int): Class attribute; plies of king moves without a capture
+                          after which the game is drawn (15 moves per side).
     """
 
-    def __init__(self):
-        """Initializes a new checkers board with standard starting position."""
+    no_moves_is_loss = True
+    move_limit = 30
+
+    def __init__(self, size=8):
+        """Initializes a new checkers board with standard starting position.
+
+        Args:
+            size (int): Number of rows and columns, e.g. 10 for international draughts.
+
+        Raises:
+            ValueError: If size is odd or smaller than 4.
+        """
+        if size % 2 or size < 4:
+            raise ValueError(f"Checkers board size must be even and at least 4, got {size}")
+        self._set_size(size)
         self.board = self.create_initial_board()
         self.move_history = []
+        self.undo_stack = []
+        self.hash = self.zobrist.hash_board(self.board, 'white')
+        self.history = PositionHistory(self.hash)
+        self.turn = 'white'
+        self.index_pieces()
+
+    def _set_size(self, size):
+        self.size = size
+        self.geometry = geometry(size)
+        self.zobrist = zobrist_table(size)
 
     def create_initial_board(self):
         """Creates the standard checkers starting position.
 
         Returns:
             list[list[CheckersPiece|None]]:
-            - Black pieces in top 3 rows on dark squares
-            - White pieces in bottom 3 rows on dark squares
+            - Black pieces in the top size / 2 - 1 rows on dark squares
+              (3 rows on 8x8)
+            - White pieces in the bottom size / 2 - 1 rows on dark squares
             - Empty squares marked as None
         """
-        board = [[None] * 8 for _ in range(8)]
+        size = self.size
+        rows = size // 2 - 1
+        board = [[None] * size for _ in range(size)]
 
-        for i in range(3):
-            for j in range(8):
+        for i in range(rows):
+            for j in range(size):
                 if (i + j) % 2 == 1:
                     board[i][j] = CheckersPiece('black')
 
-        for i in range(5, 8):
-            for j in range(8):
+        for i in range(size - rows, size):
+            for j in range(size):
                 if (i + j) % 2 == 1:
                     board[i][j] = CheckersPiece('white')
 
         return board
 
+    def index_pieces(self):
+        """Rebuilds the bitboards from the grid after it was replaced wholesale."""
+        self.pieces = {'white': 0, 'black': 0}
+        self.kings = 0
+        for i, row in enumerate(self.board):
+            for j, piece in enumerate(row):
+                if piece is not None:
+                    bit = 1 << i * self.size + j
+                    self.pieces[piece.color] |= bit
+                    if piece.is_king:
+                        self.kings |= bit
+
     def display(self):
         """Prints the current board state with coordinate labels."""
-        print("  A B C D E F G H")
-        for i in range(8):
-            row = str(8 - i) + " "
-            for j in range(8):
+        width = len(str(self.size))
+        letters = ' ' * (width + 1) + ' '.join(chr(ord('A') + j) for j in range(self.size))
+        print(letters)
+        for i in range(self.size):
+            rank = str(self.size - i)
+            row = rank.rjust(width) + " "
+            for j in range(self.size):
                 row += (str(self.board[i][j]) if self.board[i][j] else '.') + ' '
-            print(row + str(8 - i))
-        print("  A B C D E F G H")
+            print(row + rank)
+        print(letters)
 
     def move_piece(self, start, end):
         """Attempts to move a piece from start to end position.
@@ -64,18 +142,27 @@ class CheckersBoard:
         x2, y2 = end
         piece = self.board[x1][y1]
         if piece and self.is_valid_move(piece, start, end):
+            # Only jumps cover two squares, so those are the captures.
+            irreversible = not piece.is_king or abs(x2 - x1) == 2
             self.move_history.append(copy.deepcopy(self.board))
             self.board[x2][y2] = piece
             self.board[x1][y1] = None
 
-            if (piece.color == 'white' and x2 == 0) or (piece.color == 'black' and x2 == 7):
+            if (piece.color == 'white' and x2 == 0) or (piece.color == 'black' and x2 == self.size - 1):
                 piece.promote()
+            self.hash = self.zobrist.hash_board(self.board, 'white')
+            self.history.push(self.hash, irreversible)
+            self.index_pieces()
+            self.turn = opponent(self.turn)
             return True
         return False
 
     def is_valid_move(self, piece, start, end):
         """Validates a potential move according to checkers rules.
 
+        A valid capture removes the jumped piece from the board, so this
+        method is only called for moves that are about to be executed.
+
         Args:
             piece (CheckersPiece): The piece being moved.
             start (tuple[int, int]): Starting (row, col) position.
@@ -84,12 +171,29 @@ class CheckersBoard:
         Returns:
             bool: True if the move complies with game rules.
         """
+        valid, captured = self.check_move(piece, start, end)
+        if captured:
+            self.board[captured[0]][captured[1]] = None
+        return valid
+
+    def check_move(self, piece, start, end):
+        """Validates a move without changing the board.
+
+        Args:
+            piece (CheckersPiece): The piece being moved.
+            start (tuple[int, int]): Starting (row, col) position.
+            end (tuple[int, int]): Target (row, col) position.
+
+        Returns:
+            tuple[bool, tuple[int, int]|None]: Whether the move is valid and
+            the square of the captured piece, if any.
+        """
         x1, y1 = start
         x2, y2 = end
         dx, dy = x2 - x1, y2 - y1
 
         if self.board[x2][y2] is not None:
-            return False
+            return False, None
 
         if piece.is_king:
             if abs(dx) == abs(dy):
@@ -100,24 +204,22 @@ class CheckersBoard:
                 while x != x2 and y != y2:
                     if self.board[x][y]:
                         if captured or self.board[x][y].color == piece.color:
-                            return False
+                            return False, None
                         captured = (x, y)
                     x += step_x
                     y += step_y
                 if captured and abs(dx) == 2:
-                    self.board[captured[0]][captured[1]] = None
-                    return True
-                return abs(dx) == 1
+                    return True, captured
+                return abs(dx) == 1, None
         else:
             direction = -1 if piece.color == 'white' else 1
             if dx == direction and abs(dy) == 1:
-                return True
+                return True, None
             if dx == 2 * direction and abs(dy) == 2:
                 mid_x, mid_y = (x1 + x2) // 2, (y1 + y2) // 2
                 if self.board[mid_x][mid_y] and self.board[mid_x][mid_y].color != piece.color:
-                    self.board[mid_x][mid_y] = None
-                    return True
-        return False
+                    return True, (mid_x, mid_y)
+        return False, None
 
     def undo_move(self):
         """Reverts the board to the previous state.
@@ -127,3 +229,263 @@ class CheckersBoard:
         """
         if self.move_history:
             self.board = self.move_history.pop()
+            self.history.pop()
+            self.hash = self.history.hashes[-1]
+            self.turn = opponent(self.turn)
+            self.index_pieces()
+
+    def is_repetition(self, count=3):
+        """Checks whether the current position has occurred count times.
+
+        Only positions since the last capture or man move are compared, by
+        hash, so the cost is proportional to the halfmove clock.
+
+        Args:
+            count (int): Required number of occurrences.
+
+        Returns:
+            bool: True if the position occurred at least count times.
+        """
+        return self.history.repetitions() >= count
+
+    @property
+    def halfmove_clock(self):
+        """Plies since the last capture or man move."""
+        return self.history.halfmove_clock
+
+    def is_move_limit_draw(self):
+        """Returns True once move_limit plies of king moves without captures were played."""
+        return self.history.halfmove_clock >= self.move_limit
+
+    def is_draw(self):
+        """Returns True on threefold repetition or under the move limit rule."""
+        return self.is_repetition(3) or self.is_move_limit_draw()
+
+    def legal_moves(self, color=None):
+        """Generates all moves of the given side.
+
+        Only single diagonal steps to an empty square and single jumps
+        over an enemy piece are legal under this board's rules; men move
+        forward only, kings in all four directions. Each of those is one
+        shift of the side's bitboard per direction.
+
+        Args:
+            color (str|None): Side to generate moves for; the side to move by default.
+
+        Returns:
+            list[tuple[tuple[int, int], tuple[int, int]]]: (start, end) pairs,
+            sorted by start and then end square.
+        """
+        color = color or self.turn
+        geometry = self.geometry
+        size = self.size
+        own = self.pieces[color]
+        enemy = self.pieces[opponent(color)]
+        empty = geometry.full ^ (own | enemy)
+        forward = -1 if color == 'white' else 1
+        moves = []
+        for dr in (-1, 1):
+            movers = own if dr == forward else own & self.kings
+            if not movers:
+                continue
+            for dc in (-1, 1):
+                offset = dr * size + dc
+                step = geometry.shift(movers, dr, dc)
+                for index in iter_bits(step & empty):
+                    moves.append((divmod(index - offset, size), divmod(index, size)))
+                for index in iter_bits(geometry.shift(step & enemy, dr, dc) & empty):
+                    moves.append((divmod(index - 2 * offset, size), divmod(index, size)))
+        moves.sort()
+        return moves
+
+    def move_flags(self, start, end):
+        """Returns CAPTURE for a jump and QUIET for a plain step."""
+        piece = self.board[start[0]][start[1]]
+        return CAPTURE if piece and self.check_move(piece, start, end)[1] else QUIET
+
+    def generate_moves(self, color=None):
+        """Returns the legal moves as a compact MoveList with move flags."""
+        moves = MoveList(size=self.size)
+        for start, end in self.legal_moves(color):
+            moves.append(start, end, self.move_flags(start, end))
+        return moves
+
+    def is_in_check(self, color=None):
+        """Checkers has no check; provided for a uniform engine interface."""
+        return False
+
+    def threatened_pieces(self, color=None):
+        """Returns the squares of color's pieces that an enemy jump would capture.
+
+        Args:
+            color (str|None): Side whose pieces are tested; the side to move by default.
+
+        Returns:
+            frozenset[tuple[int, int]]: (row, col) of every piece that can be jumped.
+        """
+        color = color or self.turn
+        return frozenset(((x1 + x2) // 2, (y1 + y2) // 2)
+                         for (x1, y1), (x2, y2) in self.legal_moves(opponent(color))
+                         if abs(x2 - x1) == 2)
+
+    def make_move(self, start, end):
+        """Plays a move without validation and records how to take it back.
+
+        Args:
+            start (tuple[int, int]): (row, col) of the moving piece.
+            end (tuple[int, int]): (row, col) of the target square.
+        """
+        x1, y1 = start
+        x2, y2 = end
+        size = self.size
+        piece = self.board[x1][y1]
+        captured = self.check_move(piece, start, end)[1]
+        captured_piece = self.board[captured[0]][captured[1]] if captured else None
+        pieces = self.pieces
+        self.undo_stack.append((start, end, piece, captured, captured_piece, piece.is_king,
+                                pieces['white'], pieces['black'], self.kings))
+
+        keys = self.zobrist.piece_keys
+        origin = x1 * size + y1
+        target = x2 * size + y2
+        h = self.hash ^ keys[str(piece)][origin]
+        pieces[piece.color] ^= 1 << origin | 1 << target
+        if piece.is_king:
+            self.kings ^= 1 << origin | 1 << target
+        if captured:
+            self.board[captured[0]][captured[1]] = None
+            jumped = captured[0] * size + captured[1]
+            h ^= keys[str(captured_piece)][jumped]
+            pieces[captured_piece.color] ^= 1 << jumped
+            self.kings &= ~(1 << jumped)
+        self.board[x2][y2] = piece
+        self.board[x1][y1] = None
+        was_king = piece.is_king
+        if (piece.color == 'white' and x2 == 0) or (piece.color == 'black' and x2 == size - 1):
+            piece.promote()
+            self.kings |= 1 << target
+        self.hash = h ^ keys[str(piece)][target]
+        self.history.push(self.hash, captured is not None or not was_king)
+        self.turn = opponent(self.turn)
+
+    def unmake_move(self):
+        """Takes back the last move played with make_move()."""
+        (start, end, piece, captured, captured_piece, was_king,
+         white, black, self.kings) = self.undo_stack.pop()
+        self.pieces['white'] = white
+        self.pieces['black'] = black
+        self.board[start[0]][start[1]] = piece
+        self.board[end[0]][end[1]] = None
+        if captured:
+            self.board[captured[0]][captured[1]] = captured_piece
+        piece.is_king = was_king
+        self.history.pop()
+        self.hash = self.history.hashes[-1]
+        self.turn = opponent(self.turn)
+
+    def push_move(self, start, end):
+        """Plays an already validated move and records it for undo_move().
+
+        Args:
+            start (tuple[int, int]): (row, col) of the moving piece.
+            end (tuple[int, int]): (row, col) of the target square.
+        """
+        self.move_history.append(copy.deepcopy(self.board))
+        self.make_move(start, end)
+        # The grid snapshot in move_history replaces the compact undo record.
+        self.undo_stack.pop()
+
+    def evaluate(self, color=None):
+        """Static evaluation from the point of view of the given side.
+
+        Men are worth 100 plus 3 per row advanced, kings 250.
+
+        Args:
+            color (str|None): Side for which a positive score is good; the
+                              side to move by default.
+
+        Returns:
+            int: Score.
+        """
+        color = color or self.turn
+        score = 0
+        last = self.size - 1
+        for i, row in enumerate(self.board):
+            for piece in row:
+                if piece is None:
+                    continue
+                if piece.is_king:
+                    value = 250
+                else:
+                    value = 100 + 3 * (last - i if piece.color == 'white' else i)
+                score += value if piece.color == color else -value
+        return score
+
+    def position_hash(self, color=None):
+        """Returns the Zobrist hash of the position with the given side to move.
+
+        Args:
+            color (str|None): Side to move; turn by default.
+
+        Returns:
+            int: 64-bit position hash.
+        """
+        return self.hash ^ self.zobrist.side_key if (color or self.turn) == 'black' else self.hash
+
+    def squares_bytes(self):
+        """Returns the placement as size * size ASCII letters (w, b, W, B), '.' for empty squares."""
+        return ''.join(str(piece) if piece is not None else '.'
+                       for row in self.board for piece in row).encode('ascii')
+
+    def set_squares(self, data, halfmove_clock=0, turn='white'):
+        """Replaces the position with one produced by squares_bytes().
+
+        The board size follows from the length of the data.
+
+        Args:
+            data (bytes): size * size ASCII letters.
+            halfmove_clock (int): Reversible plies already played.
+            turn (str): Side to move.
+
+        Raises:
+            ValueError: If the data is not square or holds an unknown letter.
+        """
+        data = bytes(data)
+        size = math.isqrt(len(data))
+        if size * size != len(data) or size % 2:
+            raise ValueError(f"{len(data)} squares do not make an even square board")
+        board = [[None] * size for _ in range(size)]
+        for index, code in enumerate(data):
+            if code != 46:  # '.'
+                char = chr(code)
+                if char not in SYMBOLS:
+                    raise ValueError(f"Unknown piece letter {char!r}")
+                board[index // size][index % size] = CheckersPiece(
+                    'white' if char in 'wW' else 'black', char.isupper())
+        self._set_size(size)
+        self.board = board
+        self.move_history = []
+        self.undo_stack = []
+        self.hash = self.zobrist.hash_board(self.board, 'white')
+        self.history = PositionHistory(self.hash, halfmove_clock)
+        self.turn = turn
+        self.index_pieces()
+
+    def copy(self):
+        """Returns an independent copy of the position and its hash history.
+
+        Returns:
+            CheckersBoard: A board with the same position.
+        """
+        clone = self.__class__.__new__(self.__class__)
+        clone._set_size(self.size)
+        clone.board = [[piece.copy() if piece is not None else None for piece in row]
+                       for row in self.board]
+        clone.move_history = []
+        clone.undo_stack = []
+        clone.hash = self.hash
+        clone.history = self.history.copy()
+        clone.turn = self.turn
+        clone.pieces = dict(self.pieces)
+        clone.kings = self.kings
+        return clone
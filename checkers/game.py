@@ -1,3 +1,4 @@
+from engine.tree import GameTree
 from .board import CheckersBoard
 
 
@@ -11,18 +12,107 @@ class CheckersGame:
         board (CheckersBoard): The game board instance.
         players (list): List of player colors in order ['white', 'black'].
         turn_index (int): Current player index (0 for white, 1 for black).
+        tree (GameTree): Moves and variations explored during the game.
+        moves (array): Moves of the current line, packed by engine.move.pack().
+        result (str): '1-0', '0-1', '1/2-1/2' or '*' while undecided.
+        archive_path (str|None): Game archive the game is appended to on exit.
+        broadcaster (GameBroadcaster|None): Spectator broadcast fed with
+                                            every move, if any.
     """
 
-    def __init__(self):
-        """Initializes a new checkers game with fresh board and white player first."""
+    variant = 'checkers'
+
+    def __init__(self, archive_path=None, broadcaster=None):
+        """Initializes a new checkers game with fresh board and white player first.
+
+        Args:
+            archive_path (str|None): Game archive to append the game to.
+            broadcaster (GameBroadcaster|None): Spectator broadcast to feed.
+        """
         self.board = CheckersBoard()
         self.players = ['white', 'black']
         self.turn_index = 0
+        self.tree = GameTree(self.board, self.players[0])
+        self.result = '*'
+        self.archive_path = archive_path
+        self.broadcaster = broadcaster
+
+    @classmethod
+    def resume(cls, snapshot, **options):
+        """Rebuilds a game from an engine.snapshot.Snapshot without replaying it.
+
+        A game saved on a board of another size gets a tree rooted at that
+        size's start position.
+
+        Args:
+            snapshot (Snapshot): Decoded snapshot of a checkers game.
+            **options: Constructor arguments.
+
+        Returns:
+            CheckersGame: The resumed game.
+        """
+        game = cls(**options)
+        if snapshot.board.size != game.board.size:
+            game.tree = GameTree(CheckersBoard(snapshot.board.size), game.players[0])
+        game.tree.extend(snapshot.line, snapshot.board)
+        game.board = snapshot.board
+        game.turn_index = game.players.index(snapshot.board.turn)
+        game.result = snapshot.result
+        return game
+
+    def snapshot(self):
+        """Returns the game as compact bytes for engine.snapshot.restore_game()."""
+        # Snapshots and the archive are imported when first used.
+        from engine.snapshot import snapshot_game
+
+        return snapshot_game(self)
+
+    @property
+    def turn(self):
+        """Color of the current player, named as in ChessGame."""
+        return self.players[self.turn_index]
+
+    @property
+    def moves(self):
+        """Packed moves from the start of the game to the current position."""
+        return self.tree.line()
 
     def switch_turn(self):
         """Switches the current player turn between white and black."""
         self.turn_index = (self.turn_index + 1) % 2
 
+    def navigate(self, command):
+        """Handles 'undo [N]', 'redo [N]' and 'goto N'.
+
+        Args:
+            command (str): Text entered by the user.
+
+        Returns:
+            bool: False if the text is not a navigation command.
+        """
+        words = command.lower().split()
+        if not words or words[0] not in ('undo', 'redo', 'goto'):
+            return False
+        try:
+            count = int(words[1]) if len(words) > 1 else None
+        except ValueError:
+            print("Неверный ввод! Ожидается число полуходов")
+            return True
+        if words[0] == 'goto':
+            if count is None:
+                print("Укажите номер полухода, например: goto 10")
+                return True
+            self.tree.goto(count)
+        elif words[0] == 'undo':
+            self.tree.undo(count or 1)
+        else:
+            self.tree.redo(count or 1)
+        self.board = self.tree.board_at()
+        self.turn_index = self.players.index(self.tree.color_at(self.tree.current))
+        if self.broadcaster is not None:
+            self.broadcaster.publish_position(self.board)
+        return True
+
     def play(self):
         """Main game loop that handles player moves and game flow.
 
@@ -33,28 +123,61 @@ class CheckersGame:
         4. Validates and executes moves
         5. Switches turns after valid moves
 
-        Supports 'undo' command to revert last move.
+        Supports 'undo [N]', 'redo [N]' and 'goto N' commands to move through
+        the game and its variations. The game is appended to the archive on
+        exit, if configured, and streamed to spectators if a broadcaster is set.
         """
+        if self.broadcaster is not None:
+            self.broadcaster.publish_position(self.board)
+        try:
+            self.play_loop()
+        finally:
+            if self.archive_path:
+                self.save_game()
+            if self.broadcaster is not None:
+                self.broadcaster.close()
+
+    def play_loop(self):
+        """Runs the interactive loop of play() until the game ends."""
         while True:
             self.board.display()
             current_player = self.players[self.turn_index]
             print(f"{current_player.capitalize()} ходит")
+            if self.board.is_draw():
+                if self.board.is_repetition(3):
+                    print("Ничья: позиция повторилась три раза")
+                else:
+                    print("Ничья: 15 ходов дамками без взятий")
+                self.result = '1/2-1/2'
+                return
             start = input("Выберите шашку (например, E3): ")
+            if self.navigate(start):
+                continue
             end = input("Введите целевую позицию (например, F4): ")
-
-            if start.lower() == 'undo' or end.lower() == 'undo':
-                self.board.undo_move()
-                self.switch_turn()
+            if self.navigate(end):
                 continue
 
             try:
                 x1, y1 = self.convert_to_coords(start)
                 x2, y2 = self.convert_to_coords(end)
+                flags = self.board.move_flags((x1, y1), (x2, y2))
                 if self.board.move_piece((x1, y1), (x2, y2)):
+                    self.tree.play((x1, y1), (x2, y2), flags, self.board)
+                    # Undo goes through the tree, so the board's own history is not needed.
+                    self.board.move_history.clear()
                     self.switch_turn()
+                    if self.broadcaster is not None:
+                        self.broadcaster.publish_move(self.board, (x1, y1), (x2, y2), flags)
             except Exception:
                 print("Неверный ввод! Попробуйте еще раз.")
 
+    def save_game(self):
+        """Appends the moves played so far to the game archive."""
+        from engine.archive import GameArchiveWriter
+
+        with GameArchiveWriter(self.archive_path) as archive:
+            archive.append(self.variant, self.result, self.moves, size=self.board.size)
+
     def convert_to_coords(self, position):
         """Converts algebraic notation (e.g., 'E3') to board coordinates.
 
@@ -69,5 +192,5 @@ class CheckersGame:
             IndexError: If coordinates are out of board bounds.
         """
         col = ord(position[0].lower()) - ord('a')
-        row = 8 - int(position[1])
+        row = self.board.size - int(position[1:])
         return row, col
@@ -23,6 +23,12 @@ class CheckersPiece:
         self.color = color
         self.is_king = is_king
 
+    def copy(self):
+        """Returns an independent copy of the piece, cheaper than copy.deepcopy()."""
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        return clone
+
     def promote(self):
         """Promotes the piece from pawn to king.
 
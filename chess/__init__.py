@@ -1,5 +1,16 @@
 from .board import ChessBoard, ModifiedChessBoard
-from .game import ChessGame, ModifiedChessGame
 from .pieces import *
 
+_GAMES = ('ChessGame', 'ModifiedChessGame')
+
 __all__ = ['ChessBoard', 'ModifiedChessBoard', 'ChessGame', 'ModifiedChessGame']
+
+
+def __getattr__(name):
+    # Imported on first use, so that importing the board does not load the
+    # interactive game and with it the engine player and opening book.
+    if name in _GAMES:
+        from . import game
+
+        return getattr(game, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,46 +1,144 @@
 import copy
+import functools
+import math
+from engine.bitboard import geometry, iter_bits
+from engine.history import PositionHistory
+from engine.move import CAPTURE, QUIET, SWAP, MoveList
+from engine.state import GameStateMixin
+from engine.zobrist import ZobristTable
+from .legality import Legality
 from .pieces import (King, Queen, Rook, Bishop,
                      Knight, Pawn, Wizard, Dragon, Jester)
 
 
-class ChessBoard:
+SYMBOLS = 'KQRBNPWDJkqrbnpwdj'
+ZOBRIST = ZobristTable(SYMBOLS)
+
+# Small positional bonus for occupying the centre, indexed [row][col].
+CENTER_BONUS = [
+    [0, 1, 2, 3, 3, 2, 1, 0],
+    [1, 3, 4, 5, 5, 4, 3, 1],
+    [2, 4, 6, 8, 8, 6, 4, 2],
+    [3, 5, 8, 10, 10, 8, 5, 3],
+    [3, 5, 8, 10, 10, 8, 5, 3],
+    [2, 4, 6, 8, 8, 6, 4, 2],
+    [1, 3, 4, 5, 5, 4, 3, 1],
+    [0, 1, 2, 3, 3, 2, 1, 0],
+]
+
+
+@functools.lru_cache(maxsize=None)
+def zobrist_table(size):
+    """Returns the key table of a board size; 8x8 boards share ZOBRIST."""
+    return ZOBRIST if size == 8 else ZobristTable(SYMBOLS, size, size)
+
+
+@functools.lru_cache(maxsize=None)
+def center_bonus(size):
+    """Returns CENTER_BONUS stretched over a size x size board."""
+    if size == 8:
+        return CENTER_BONUS
+    return [[CENTER_BONUS[i * 8 // size][j * 8 // size] for j in range(size)]
+            for i in range(size)]
+
+
+PIECE_BY_LETTER = {
+    cls('white').symbol: cls
+    for cls in (King, Queen, Rook, Bishop, Knight, Pawn, Wizard, Dragon, Jester)
+}
+
+
+def opponent(color):
+    """Returns the color of the other side.
+
+    Args:
+        color (str): 'white' or 'black'.
+
+    Returns:
+        str: 'black' for 'white' and vice versa.
+    """
+    return 'black' if color == 'white' else 'white'
+
+
+class ChessBoard(GameStateMixin):
     """A class representing a standard chess board with game state management.
 
     Manages piece positions, move validation, and special rules like castling and en passant.
+    Implements the engine.state.GameState protocol.
+
+    Boards larger than 8x8 keep the standard back rank in the middle files
+    and fill the whole second rank with pawns. Move generation asks the
+    board geometry (see engine.bitboard) which squares a piece's steps and
+    slide directions reach, and only offers those to is_valid_move().
 
     Attributes:
-        board (list[list[ChessPiece|None]]): 8x8 grid representing the chess board.
+        size (int): Number of rows and columns.
+        board (list[list[ChessPiece|None]]): size x size grid representing the chess board.
         move_history (list): Stack of previous board states for undo functionality.
         white_king_pos (tuple): Current (row, col) position of white king.
         black_king_pos (tuple): Current (row, col) position of black king.
         en_passant_target (tuple|None): Square vulnerable to en passant capture.
+        undo_stack (list): Compact undo records pushed by make_move() for search.
+        hash (int): Zobrist hash of the piece placement, updated incrementally.
+        history (PositionHistory): Hashes and halfmove clocks of the game so far.
+        turn (str): Side to move; every move played on the board passes it on.
+        no_moves_is_loss (bool): Class attribute; False because a side without
+                                 moves that is not in check is stalemated.
+        move_limit (int): Class attribute; plies without a capture or pawn move
+                          after which the game is drawn (the fifty-move rule).
     """
 
-    def __init__(self):
-        """Initializes a new chess board with standard starting position."""
+    no_moves_is_loss = False
+    move_limit = 100
+
+    def __init__(self, size=8):
+        """Initializes a new chess board with standard starting position.
+
+        Args:
+            size (int): Number of rows and columns.
+
+        Raises:
+            ValueError: If size is smaller than 8.
+        """
+        if size < 8:
+            raise ValueError(f"Chess board size must be at least 8, got {size}")
+        self._set_size(size)
         self.board = self.create_initial_board()
         self.move_history = []
-        self.white_king_pos = (7, 4)
-        self.black_king_pos = (0, 4)
+        self.locate_royals()
         self.en_passant_target = None
+        self.undo_stack = []
+        self.hash = self.zobrist.hash_board(self.board, 'white')
+        self.history = PositionHistory(self.hash)
+        self.turn = 'white'
+        self._legality = None
+
+    def _set_size(self, size):
+        self.size = size
+        self.geometry = geometry(size)
+        self.zobrist = zobrist_table(size)
+        self.center_bonus = center_bonus(size)
 
     def create_initial_board(self):
         """Creates the standard chess starting position.
 
         Returns:
-            list[list[ChessPiece|None]]: 8x8 grid with:
-            - Pieces in standard positions
-            - White at bottom (row 7-6)
-            - Black at top (row 0-1)
+            list[list[ChessPiece|None]]: size x size grid with:
+            - Pieces in standard positions, centred on the middle eight files
+            - White at bottom (last two rows)
+            - Black at top (rows 0-1)
         """
-        board = [[None] * 8 for _ in range(8)]
+        size = self.size
+        first = (size - 8) // 2
+        board = [[None] * size for _ in range(size)]
         piece_order = [Rook, Knight, Bishop, Queen, King, Bishop, Knight, Rook]
 
         for i in range(8):
-            board[0][i] = piece_order[i]('black')
-            board[7][i] = piece_order[i]('white')
+            board[0][first + i] = piece_order[i]('black')
+            board[size - 1][first + i] = piece_order[i]('white')
+        for i in range(size):
             board[1][i] = Pawn('black')
-            board[6][i] = Pawn('white')
+            board[size - 2][i] = Pawn('white')
 
         return board
 
@@ -57,15 +155,20 @@ class ChessBoard:
           ----------------
           A B C D E F G H
         """
-        print("  A B C D E F G H")
-        print("  ----------------")
-        for i in range(8):
-            row = str(8 - i) + " "
-            for j in range(8):
+        width = len(str(self.size))
+        margin = ' ' * (width + 1)
+        letters = margin + ' '.join(chr(ord('A') + j) for j in range(self.size))
+        rule = margin + '--' * self.size
+        print(letters)
+        print(rule)
+        for i in range(self.size):
+            rank = str(self.size - i)
+            row = rank.rjust(width) + " "
+            for j in range(self.size):
                 row += (str(self.board[i][j]) if self.board[i][j] else '.') + ' '
-            print(row + str(8 - i))
-        print("  ----------------")
-        print("  A B C D E F G H")
+            print(row + rank)
+        print(rule)
+        print(letters)
 
     def move_piece(self, start, end):
         """Attempts to move a piece following chess rules.
@@ -89,27 +192,28 @@ class ChessBoard:
             print("Недопустимый ход для этой фигуры!") 
             return False
 
+        if not self.legality(piece.color).is_legal(self, start, end):
+            print("Ход оставляет короля под шахом!")  # Move leaves king in check
+            return False
+
         if isinstance(piece, Jester) and self.board[x2][y2] is not None:
             if abs(x2 - x1) <= 1 and abs(y2 - y1) <= 1:
                 self.move_history.append(copy.deepcopy(self.board))
                 self.board[x2][y2], self.board[x1][y1] = self.board[x1][y1], self.board[x2][y2]
+                self.record_position(False)
+                self.turn = opponent(self.turn)
+                self.locate_royals()
                 return True
 
-        test_board = copy.deepcopy(self)
-        test_board.board[x2][y2] = test_board.board[x1][y1]
-        test_board.board[x1][y1] = None
-
-        king_pos = self.white_king_pos if piece.color == 'white' else self.black_king_pos
-        if test_board.is_square_under_attack(king_pos, 'black' if piece.color == 'white' else 'white'):
-            print("Ход оставляет короля под шахом!")  # Move leaves king in check
-            return False
-
+        irreversible = self.board[x2][y2] is not None or isinstance(piece, Pawn)
         self.move_history.append(copy.deepcopy(self.board))
         self.board[x2][y2] = piece
         self.board[x1][y1] = None
         piece.has_moved = True
+        self.record_position(irreversible)
+        self.turn = opponent(self.turn)
 
-        if isinstance(piece, King):
+        if piece.royal:
             if piece.color == 'white':
                 self.white_king_pos = (x2, y2)
             else:
@@ -120,6 +224,9 @@ class ChessBoard:
     def is_square_under_attack(self, position, by_color):
         """Checks if a square is attacked by any piece of given color.
 
+        Only pieces whose movement pattern covers the square on an empty
+        board are asked; is_valid_move() then checks for blockers.
+
         Args:
             position (tuple[int, int]): (row, col) to check.
             by_color (str): 'white' or 'black' attacking color.
@@ -127,19 +234,571 @@ class ChessBoard:
         Returns:
             bool: True if square is under attack.
         """
-        x, y = position
-        for i in range(8):
-            for j in range(8):
-                piece = self.board[i][j]
-                if piece and piece.color == by_color:
-                    if piece.is_valid_move(self.board, (i, j), (x, y)):
-                        return True
+        for i, row in enumerate(self.board):
+            for j, piece in enumerate(row):
+                if piece is not None and piece.color == by_color and \
+                        self.attacks(piece, (i, j), position):
+                    return True
         return False
 
+    def attacks(self, piece, start, end):
+        """Checks whether a piece could capture on a square.
+
+        The piece is only asked if its movement pattern covers the square on
+        an empty board; is_valid_move() then checks for blockers.
+
+        Args:
+            piece (ChessPiece): The attacking piece.
+            start (tuple[int, int]): (row, col) of the piece.
+            end (tuple[int, int]): (row, col) of the attacked square.
+
+        Returns:
+            bool: True if the piece attacks the square.
+        """
+        steps = piece.steps
+        directions = piece.directions
+        if steps is not None or directions:
+            size = self.size
+            index = start[0] * size + start[1]
+            span = self.geometry.leaps(steps)[index] if steps else 0
+            if directions:
+                span |= self.geometry.lines(directions)[index]
+            if not span >> end[0] * size + end[1] & 1:
+                return False
+        return piece.is_valid_move(self.board, start, end)
+
+    def occupancy(self, color):
+        """Scans the grid once.
+
+        Args:
+            color (str): Side whose pieces are listed.
+
+        Returns:
+            tuple[int, list[tuple[int, int, ChessPiece]]]: Bitboard of all
+            occupied squares and (row, col, piece) of the side's pieces.
+        """
+        occupied = 0
+        pieces = []
+        size = self.size
+        for i, row in enumerate(self.board):
+            for j, piece in enumerate(row):
+                if piece is not None:
+                    occupied |= 1 << i * size + j
+                    if piece.color == color:
+                        pieces.append((i, j, piece))
+        return occupied, pieces
+
+    def reach(self, piece, index, occupied):
+        """Returns the squares a piece's movement pattern reaches from a square.
+
+        Slides stop at the first occupied square. Pieces that declare
+        neither steps nor directions reach every square.
+
+        Args:
+            piece (ChessPiece): The moving piece.
+            index (int): Bit index of its square.
+            occupied (int): Bitboard of all pieces.
+
+        Returns:
+            int: Bitboard of candidate target squares.
+        """
+        steps = piece.steps
+        directions = piece.directions
+        if steps is None and not directions:
+            return self.geometry.full
+        targets = self.geometry.leaps(steps)[index] if steps else 0
+        if directions:
+            targets |= self.geometry.slide(index, directions, occupied)
+        return targets
+
     def undo_move(self):
         """Reverts the board to previous state using move history."""
         if self.move_history:
             self.board = self.move_history.pop()
+            self.locate_royals()
+            self.history.pop()
+            self.hash = self.history.hashes[-1]
+            self.turn = opponent(self.turn)
+
+    def record_position(self, irreversible):
+        """Rehashes the grid after a move made outside make_move() and records it.
+
+        Args:
+            irreversible (bool): Whether the move resets the halfmove clock.
+        """
+        self.hash = self.zobrist.hash_board(self.board, 'white')
+        self.history.push(self.hash, irreversible)
+
+    def is_repetition(self, count=3):
+        """Checks whether the current position has occurred count times.
+
+        Only positions since the last irreversible move are compared, by
+        hash, so the cost is proportional to the halfmove clock.
+
+        Args:
+            count (int): Required number of occurrences, 3 for the
+                         threefold repetition rule.
+
+        Returns:
+            bool: True if the position occurred at least count times.
+        """
+        return self.history.repetitions() >= count
+
+    @property
+    def halfmove_clock(self):
+        """Plies since the last capture or pawn move."""
+        return self.history.halfmove_clock
+
+    def is_move_limit_draw(self):
+        """Returns True once move_limit reversible plies have been played."""
+        return self.history.halfmove_clock >= self.move_limit
+
+    def is_fifty_move_draw(self):
+        """Returns True if fifty moves passed without a capture or pawn move."""
+        return self.is_move_limit_draw()
+
+    def is_draw(self):
+        """Returns True on threefold repetition or under the fifty-move rule."""
+        return self.is_repetition(3) or self.is_move_limit_draw()
+
+    def locate_royals(self):
+        """Re-reads the royal piece positions from the board grid.
+
+        Needed after the grid is replaced wholesale (undo, copy), because
+        the cached king positions are otherwise only updated on moves.
+        """
+        for i, row in enumerate(self.board):
+            for j, piece in enumerate(row):
+                if piece and piece.royal:
+                    if piece.color == 'white':
+                        self.white_king_pos = (i, j)
+                    else:
+                        self.black_king_pos = (i, j)
+
+    def king_position(self, color):
+        """Returns the square of the royal piece of the given color.
+
+        Args:
+            color (str): 'white' or 'black'.
+
+        Returns:
+            tuple[int, int]: (row, col) of the king (or dragon in the variant).
+        """
+        return self.white_king_pos if color == 'white' else self.black_king_pos
+
+    def is_in_check(self, color=None):
+        """Checks whether the royal piece of the given color is attacked.
+
+        Args:
+            color (str|None): Color of the side to test; the side to move by default.
+
+        Returns:
+            bool: True if the side is in check.
+        """
+        color = color or self.turn
+        return self.is_square_under_attack(self.king_position(color), opponent(color))
+
+    def threatened_pieces(self, color=None):
+        """Returns the squares of color's pieces that the opponent attacks.
+
+        Args:
+            color (str|None): Side whose pieces are tested; the side to move by default.
+
+        Returns:
+            frozenset[tuple[int, int]]: (row, col) of every attacked piece.
+        """
+        color = color or self.turn
+        enemy = opponent(color)
+        return frozenset((i, j) for i, j, _ in self.occupancy(color)[1]
+                         if self.is_square_under_attack((i, j), enemy))
+
+    def pseudo_legal_moves(self, color):
+        """Generates moves allowed by piece movement rules, ignoring king safety.
+
+        Every square in the piece's reach() is offered to its own
+        is_valid_move(), so new piece types are supported without changes
+        here.
+
+        Args:
+            color (str): Side to generate moves for.
+
+        Returns:
+            list[tuple[tuple[int, int], tuple[int, int]]]: (start, end) pairs.
+        """
+        moves = []
+        board = self.board
+        size = self.size
+        occupied, pieces = self.occupancy(color)
+        for i, j, piece in pieces:
+            origin = i * size + j
+            for index in iter_bits(self.reach(piece, origin, occupied)):
+                if index != origin:
+                    end = divmod(index, size)
+                    if piece.is_valid_move(board, (i, j), end):
+                        moves.append(((i, j), end))
+        return moves
+
+    def legality(self, color=None):
+        """Returns the checkers and pins of a side, computed once per position.
+
+        The last result is kept and reused while the board hash and the
+        side are the same, so make_move()/unmake_move() pairs around it do
+        not invalidate it.
+
+        Args:
+            color (str|None): Side whose moves are validated; the side to move by default.
+
+        Returns:
+            Legality: King safety of the side in the current position.
+        """
+        color = color or self.turn
+        legality = self._legality
+        if legality is None or legality.hash != self.hash or legality.color != color:
+            legality = self._legality = Legality(self, color)
+        return legality
+
+    def is_legal_move(self, start, end, color=None):
+        """Validates one move without playing it, printing or copying the board.
+
+        Args:
+            start (tuple[int, int]): (row, col) of the moving piece.
+            end (tuple[int, int]): (row, col) of the target square.
+            color (str|None): Side making the move; the side to move by default.
+
+        Returns:
+            bool: True if the move is legal for that side.
+        """
+        color = color or self.turn
+        piece = self.board[start[0]][start[1]]
+        if piece is None or piece.color != color or start == end:
+            return False
+        return (piece.is_valid_move(self.board, start, end)
+                and self.legality(color).is_legal(self, start, end))
+
+    def legal_moves(self, color=None):
+        """Generates moves that do not leave the mover's royal piece attacked.
+
+        Checkers and pins are worked out once (see legality()); in check only
+        the royal piece's moves and moves to the squares of the evasion mask
+        are generated, and a pinned piece only reaches squares on its pin line.
+
+        Args:
+            color (str|None): Side to generate moves for; the side to move by default.
+
+        Returns:
+            list[tuple[tuple[int, int], tuple[int, int]]]: (start, end) pairs.
+        """
+        color = color or self.turn
+        legality = self.legality(color)
+        moves = []
+        board = self.board
+        size = self.size
+        occupied, pieces = self.occupancy(color)
+        for i, j, piece in pieces:
+            origin = i * size + j
+            targets = self.reach(piece, origin, occupied)
+            if not isinstance(piece, Jester):
+                # A swap also moves the enemy piece, so it can end a pin elsewhere.
+                targets &= legality.allowed(origin)
+            for index in iter_bits(targets):
+                if index != origin:
+                    end = divmod(index, size)
+                    if piece.is_valid_move(board, (i, j), end) and \
+                            legality.is_legal(self, (i, j), end):
+                        moves.append(((i, j), end))
+        return moves
+
+    def move_flags(self, start, end):
+        """Classifies a move before it is played.
+
+        Args:
+            start (tuple[int, int]): (row, col) of the moving piece.
+            end (tuple[int, int]): (row, col) of the target square.
+
+        Returns:
+            int: SWAP for a Jester swapping places, CAPTURE or QUIET.
+        """
+        piece = self.board[start[0]][start[1]]
+        target = self.board[end[0]][end[1]]
+        if target is None:
+            return QUIET
+        return SWAP if isinstance(piece, Jester) else CAPTURE
+
+    def generate_moves(self, color=None):
+        """Returns the legal moves as a compact MoveList with move flags."""
+        moves = MoveList(size=self.size)
+        for start, end in self.legal_moves(color):
+            moves.append(start, end, self.move_flags(start, end))
+        return moves
+
+    def is_checkmate(self, color):
+        """Returns True if the given side is in check and has no legal moves."""
+        return self.is_in_check(color) and not self.legal_moves(color)
+
+    def is_stalemate(self, color):
+        """Returns True if the given side is not in check but has no legal moves."""
+        return not self.is_in_check(color) and not self.legal_moves(color)
+
+    def make_move(self, start, end):
+        """Plays a move without validation and records how to take it back.
+
+        Unlike move_piece() this neither prints nor deep-copies the board:
+        only the touched pieces are remembered on undo_stack, which makes it
+        suitable for search. The Jester swap with an adjacent piece is
+        reproduced exactly as move_piece() performs it. The other side is to
+        move afterwards.
+
+        Args:
+            start (tuple[int, int]): (row, col) of the moving piece.
+            end (tuple[int, int]): (row, col) of the target square.
+        """
+        x1, y1 = start
+        x2, y2 = end
+        piece = self.board[x1][y1]
+        target = self.board[x2][y2]
+        swap = isinstance(piece, Jester) and target is not None
+        self.undo_stack.append((start, end, piece, target, piece.has_moved, swap,
+                                self.white_king_pos, self.black_king_pos))
+
+        keys = self.zobrist.piece_keys
+        origin = x1 * self.size + y1
+        destination = x2 * self.size + y2
+        h = self.hash
+        moving = keys[str(piece)]
+        h ^= moving[origin] ^ moving[destination]
+        if target is not None:
+            replaced = keys[str(target)]
+            h ^= replaced[destination]
+            if swap:
+                h ^= replaced[origin]
+        self.hash = h
+        self.history.push(h, (target is not None and not swap) or isinstance(piece, Pawn))
+
+        self.board[x2][y2] = piece
+        self.board[x1][y1] = target if swap else None
+        piece.has_moved = True
+
+        if piece.royal:
+            if piece.color == 'white':
+                self.white_king_pos = end
+            else:
+                self.black_king_pos = end
+        if swap and target.royal:
+            if target.color == 'white':
+                self.white_king_pos = start
+            else:
+                self.black_king_pos = start
+        self.turn = opponent(self.turn)
+
+    def push_move(self, start, end):
+        """Plays an already validated move and records it for undo_move().
+
+        Args:
+            start (tuple[int, int]): (row, col) of the moving piece.
+            end (tuple[int, int]): (row, col) of the target square.
+        """
+        self.move_history.append(copy.deepcopy(self.board))
+        self.make_move(start, end)
+        # The grid snapshot in move_history replaces the compact undo record.
+        self.undo_stack.pop()
+
+    def unmake_move(self):
+        """Takes back the last move played with make_move()."""
+        (start, end, piece, target, has_moved, swap,
+         self.white_king_pos, self.black_king_pos) = self.undo_stack.pop()
+        x1, y1 = start
+        x2, y2 = end
+        self.board[x1][y1] = piece
+        self.board[x2][y2] = target
+        piece.has_moved = has_moved
+        self.history.pop()
+        self.hash = self.history.hashes[-1]
+        self.turn = opponent(self.turn)
+
+    def evaluate(self, color=None):
+        """Static evaluation from the point of view of the given side.
+
+        Sums the class-level value of every piece plus a small centre bonus.
+
+        Args:
+            color (str|None): Side for which a positive score is good; the
+                              side to move by default.
+
+        Returns:
+            int: Score in centipawns.
+        """
+        color = color or self.turn
+        score = 0
+        bonus = self.center_bonus
+        for i, row in enumerate(self.board):
+            for j, piece in enumerate(row):
+                if piece is not None:
+                    piece_score = piece.value + (0 if piece.royal else bonus[i][j])
+                    score += piece_score if piece.color == color else -piece_score
+        return score
+
+    def position_hash(self, color=None):
+        """Returns the Zobrist hash of the position with the given side to move.
+
+        Args:
+            color (str|None): Side to move; turn by default.
+
+        Returns:
+            int: 64-bit position hash.
+        """
+        return self.hash ^ self.zobrist.side_key if (color or self.turn) == 'black' else self.hash
+
+    def to_fen(self, color=None):
+        """Serializes the position in Forsyth-Edwards Notation.
+
+        Castling and en passant are not implemented by this board, so those
+        fields are always '-'. Fairy pieces use their own letters (W, D, J).
+
+        Args:
+            color (str|None): Side to move; turn by default.
+
+        Returns:
+            str: FEN string.
+        """
+        rows = []
+        for i in range(self.size):
+            row = ''
+            empty = 0
+            for j in range(self.size):
+                piece = self.board[i][j]
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    row += str(empty)
+                    empty = 0
+                row += str(piece)
+            if empty:
+                row += str(empty)
+            rows.append(row)
+        side = 'w' if (color or self.turn) == 'white' else 'b'
+        return f"{'/'.join(rows)} {side} - - {self.halfmove_clock} 1"
+
+    def set_fen(self, fen):
+        """Replaces the position with one given in Forsyth-Edwards Notation.
+
+        The board size is the number of rows of the placement field,
+        which must have as many files.
+
+        Args:
+            fen (str): FEN string; the placement, side and halfmove clock
+                       fields are used.
+
+        Returns:
+            str: Side to move ('white' or 'black').
+
+        Raises:
+            ValueError: If the placement field is malformed.
+        """
+        fields = fen.split()
+        rows = fields[0].split('/')
+        size = len(rows)
+        if size < 8:
+            raise ValueError(f"FEN must describe at least 8 rows: {fen!r}")
+        board = [[None] * size for _ in range(size)]
+        for i, row in enumerate(rows):
+            j = 0
+            skip = ''
+            for char in row:
+                if char.isdigit():
+                    skip += char
+                    continue
+                j += int(skip or 0)
+                skip = ''
+                cls = PIECE_BY_LETTER.get(char.upper())
+                if cls is None or j >= size:
+                    raise ValueError(f"Bad FEN row {row!r}")
+                board[i][j] = cls('white' if char.isupper() else 'black')
+                j += 1
+            j += int(skip or 0)
+            if j != size:
+                raise ValueError(f"Bad FEN row {row!r}")
+        self._set_size(size)
+        self.board = board
+        self.move_history = []
+        self.undo_stack = []
+        self.en_passant_target = None
+        self.locate_royals()
+        clock = int(fields[4]) if len(fields) > 4 and fields[4].isdigit() else 0
+        self.hash = self.zobrist.hash_board(self.board, 'white')
+        self.history = PositionHistory(self.hash, clock)
+        self.turn = 'black' if len(fields) > 1 and fields[1] == 'b' else 'white'
+        self._legality = None
+        return self.turn
+
+    def squares_bytes(self):
+        """Returns the placement as size * size ASCII piece letters, '.' for empty squares.
+
+        Squares run row by row from a8 to h1 on an 8x8 board. Only the placement is kept:
+        has_moved is not, as no rule of this board depends on it.
+        """
+        return ''.join(str(piece) if piece is not None else '.'
+                       for row in self.board for piece in row).encode('ascii')
+
+    def set_squares(self, data, halfmove_clock=0, turn='white'):
+        """Replaces the position with one produced by squares_bytes().
+
+        The board size follows from the length of the data.
+
+        Args:
+            data (bytes): size * size ASCII piece letters.
+            halfmove_clock (int): Reversible plies already played.
+            turn (str): Side to move.
+
+        Raises:
+            ValueError: If the data is not square or holds an unknown letter.
+        """
+        data = bytes(data)
+        size = math.isqrt(len(data))
+        if size * size != len(data) or size < 8:
+            raise ValueError(f"{len(data)} squares do not make a chess board")
+        board = [[None] * size for _ in range(size)]
+        for index, code in enumerate(data):
+            if code != 46:  # '.'
+                char = chr(code)
+                cls = PIECE_BY_LETTER.get(char.upper())
+                if cls is None:
+                    raise ValueError(f"Unknown piece letter {char!r}")
+                board[index // size][index % size] = cls('white' if char.isupper() else 'black')
+        self._set_size(size)
+        self.board = board
+        self.move_history = []
+        self.undo_stack = []
+        self.en_passant_target = None
+        self.locate_royals()
+        self.hash = self.zobrist.hash_board(self.board, 'white')
+        self.history = PositionHistory(self.hash, halfmove_clock)
+        self.turn = turn
+        self._legality = None
+
+    def copy(self):
+        """Returns an independent copy of the position and its hash history.
+
+        Cheaper than copy.deepcopy(board), which would also clone every
+        snapshot stored in move_history; those are left out.
+
+        Returns:
+            ChessBoard: A board of the same class with the same position.
+        """
+        clone = self.__class__.__new__(self.__class__)
+        clone._set_size(self.size)
+        clone.board = [[piece.copy() if piece is not None else None for piece in row]
+                       for row in self.board]
+        clone.move_history = []
+        clone.white_king_pos = self.white_king_pos
+        clone.black_king_pos = self.black_king_pos
+        clone.en_passant_target = self.en_passant_target
+        clone.undo_stack = []
+        clone.hash = self.hash
+        clone.history = self.history.copy()
+        clone.turn = self.turn
+        clone._legality = None
+        return clone
 
 
 class ModifiedChessBoard(ChessBoard):
@@ -155,28 +814,23 @@ class ModifiedChessBoard(ChessBoard):
         """Creates initial position with custom piece arrangement.
 
         Returns:
-            list[list[ChessPiece|None]]: 8x8 grid with:
-            - Standard pieces except:
+            list[list[ChessPiece|None]]: size x size grid with:
+            - Standard pieces except (files as on 8x8, shifted to the middle):
               - Wizards at d1/d8
               - Dragons at e1/e8
               - Jesters at c2/c7 and f2/f7
         """
-        board = [[None] * 8 for _ in range(8)]
-        piece_order = [Rook, Knight, Bishop, Queen, King, Bishop, Knight, Rook]
-
-        for i in range(8):
-            board[0][i] = piece_order[i]('black')
-            board[7][i] = piece_order[i]('white')
-            board[1][i] = Pawn('black')
-            board[6][i] = Pawn('white')
-          
-        board[0][3] = Wizard('black')
-        board[7][3] = Wizard('white')
-        board[0][4] = Dragon('black')
-        board[7][4] = Dragon('white')
-        board[1][2] = Jester('black')
-        board[6][2] = Jester('white')
-        board[1][5] = Jester('black')
-        board[6][5] = Jester('white')
+        board = super().create_initial_board()
+        first = (self.size - 8) // 2
+        last = self.size - 1
+
+        board[0][first + 3] = Wizard('black')
+        board[last][first + 3] = Wizard('white')
+        board[0][first + 4] = Dragon('black')
+        board[last][first + 4] = Dragon('white')
+        board[1][first + 2] = Jester('black')
+        board[last - 1][first + 2] = Jester('white')
+        board[1][first + 5] = Jester('black')
+        board[last - 1][first + 5] = Jester('white')
 
         return board
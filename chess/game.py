@@ -1,3 +1,5 @@
+from engine.move_cache import MoveCache
+from engine.tree import GameTree
 from .board import ChessBoard, ModifiedChessBoard
 
 
@@ -10,52 +12,282 @@ class ChessGame:
         board (ChessBoard): The game board instance.
         turn (str): Current player's color ('white' or 'black').
         move_count (int): Total number of moves played in the game.
+        engine_color (str|None): Color played by the computer, None if both
+                                 sides are entered by humans.
+        engine (EnginePlayer|None): Computer opponent, if enabled.
+        book (OpeningBook|None): Opening book used by the engine and the
+                                 'book' command.
+        tree (GameTree): Moves and variations explored during the game.
+        move_cache (MoveCache): Legal moves and check status of visited
+                                positions, reused when navigating the tree.
+        moves (array): Moves of the current line, packed by engine.move.pack().
+        result (str): '1-0', '0-1', '1/2-1/2' or '*' while undecided.
+        archive_path (str|None): Game archive the game is appended to on exit.
+        broadcaster (GameBroadcaster|None): Spectator broadcast fed with
+                                            every move, if any.
     """
 
-    def __init__(self):
-        """Initializes a new chess game with standard setup and white to move first."""
-        self.board = ChessBoard()
+    board_class = ChessBoard
+    variant = 'chess'
+
+    def __init__(self, engine_color=None, time_control=None, ponder=True, book_path=None,
+                 archive_path=None, broadcaster=None):
+        """Initializes a new chess game with standard setup and white to move first.
+
+        Args:
+            engine_color (str|None): Color for the computer to play, or None.
+            time_control (TimeControl|None): Engine clock; a fixed time per
+                                             move is used when omitted.
+            ponder (bool): Let the engine think while the human is typing.
+            book_path (str|None): Opening book file built by engine.book.
+            archive_path (str|None): Game archive to append the game to.
+            broadcaster (GameBroadcaster|None): Spectator broadcast to feed.
+        """
+        self.board = self.board_class()
         self.turn = 'white'
         self.move_count = 0
+        self.engine_color = engine_color
+        # The engine, the book, snapshots and the archive are imported when
+        # first used, so that importing a game module stays cheap.
+        self.book = None
+        if book_path:
+            from engine.book import OpeningBook
+
+            self.book = OpeningBook(book_path)
+        self.engine = None
+        if engine_color:
+            from engine.player import EnginePlayer
+
+            self.engine = EnginePlayer(time_control=time_control, ponder=ponder, book=self.book)
+        self.tree = GameTree(self.board, self.turn)
+        self.move_cache = MoveCache()
+        self.result = '*'
+        self.archive_path = archive_path
+        self.broadcaster = broadcaster
+
+    @classmethod
+    def resume(cls, snapshot, **options):
+        """Rebuilds a game from an engine.snapshot.Snapshot without replaying it.
+
+        The saved line becomes the game tree's main line, with the saved
+        position cached as the keyframe of its last node. A game saved on
+        a board of another size gets a tree rooted at that size's start.
+
+        Args:
+            snapshot (Snapshot): Decoded snapshot of this variant.
+            **options: Constructor arguments; engine_color defaults to the saved one.
+
+        Returns:
+            ChessGame: The resumed game.
+        """
+        options.setdefault('engine_color', snapshot.engine_color)
+        game = cls(**options)
+        if snapshot.board.size != game.board.size:
+            game.tree = GameTree(cls.board_class(snapshot.board.size), game.turn)
+        game.tree.extend(snapshot.line, snapshot.board)
+        game.board = snapshot.board
+        game.turn = snapshot.board.turn
+        game.move_count = snapshot.move_count
+        game.result = snapshot.result
+        return game
+
+    def snapshot(self):
+        """Returns the game as compact bytes for engine.snapshot.restore_game()."""
+        from engine.snapshot import snapshot_game
+
+        return snapshot_game(self)
+
+    @property
+    def moves(self):
+        """Packed moves from the start of the game to the current position."""
+        return self.tree.line()
 
     def switch_turn(self):
         """Alternates the current player's turn between white and black."""
         self.turn = 'black' if self.turn == 'white' else 'white'
 
+    def clocks(self):
+        """Returns the remaining seconds of the timed sides, the engine's if any."""
+        if self.engine is None or self.engine.time_manager is None:
+            return {}
+        return {self.engine_color: self.engine.time_manager.remaining}
+
+    def record_move(self, start, end, flags):
+        """Adds a move just played on the board to the game tree and the broadcast."""
+        self.tree.play(start, end, flags, self.board)
+        # Undo goes through the tree, so the board's own history is not needed.
+        self.board.move_history.clear()
+        self.board.undo_stack.clear()
+        if self.broadcaster is not None:
+            self.broadcaster.publish_move(self.board, start, end, flags, self.clocks())
+
+    def navigate(self, command):
+        """Handles 'undo [N]', 'redo [N]' and 'goto N'.
+
+        Plain 'undo' takes back two plies against the engine, so that the
+        human is to move again. Moves played after going back start a
+        variation; the old line stays reachable with 'redo'.
+
+        Args:
+            command (str): Text entered by the user.
+
+        Returns:
+            bool: False if the text is not a navigation command.
+        """
+        words = command.lower().split()
+        if not words or words[0] not in ('undo', 'redo', 'goto'):
+            return False
+        try:
+            count = int(words[1]) if len(words) > 1 else None
+        except ValueError:
+            print("Неверный ввод! Ожидается число полуходов")
+            return True
+        if words[0] == 'goto':
+            if count is None:
+                print("Укажите номер полухода, например: goto 10")
+                return True
+            self.tree.goto(count)
+        elif words[0] == 'undo':
+            self.tree.undo(count or (2 if self.engine is not None else 1))
+        else:
+            self.tree.redo(count or 1)
+        if self.engine is not None:
+            self.engine.opponent_moved(None)
+        self.board = self.tree.board_at()
+        self.turn = self.tree.color_at(self.tree.current)
+        self.move_count = self.tree.current.ply
+        if self.broadcaster is not None:
+            self.broadcaster.publish_position(self.board, self.clocks())
+        return True
+
     def play(self):
         """Main game loop that handles player input and move execution.
 
         Features:
         - Displays current board state
         - Accepts algebraic notation input (e.g., E2-E4)
-        - Supports 'undo' command
+        - Supports 'undo [N]', 'redo [N]' and 'goto N' commands
+        - Supports 'book' command listing opening book moves
         - Validates moves according to chess rules
         - Tracks move count and player turns
+        - Lets the engine reply and ponder on the human's time, if enabled
+        - Appends the game to the archive on exit, if configured
+        - Streams the game to spectators, if a broadcaster is set
 
         The loop continues until manual interruption.
         """
+        if self.broadcaster is not None:
+            self.broadcaster.publish_position(self.board, self.clocks())
+        try:
+            self.play_loop()
+        finally:
+            if self.archive_path:
+                self.save_game()
+            if self.broadcaster is not None:
+                self.broadcaster.close()
+
+    def play_loop(self):
+        """Runs the interactive loop of play() until the game ends."""
         while True:
             self.board.display()
             print(f"Ход {self.move_count + 1}, {self.turn} ходит")  
+
+            if self.board.is_draw():
+                if self.board.is_repetition(3):
+                    print("Ничья: позиция повторилась три раза")
+                else:
+                    print("Ничья: 50 ходов без взятий и ходов пешками")
+                self.result = '1/2-1/2'
+                return
+
+            if self.engine is not None:
+                if not self.move_cache.legal_moves(self.board, self.turn):
+                    if self.move_cache.is_in_check(self.board, self.turn):
+                        print(f"Мат! {self.turn} проигрывает")
+                        self.result = '0-1' if self.turn == 'white' else '1-0'
+                    else:
+                        print("Пат! Ничья")
+                        self.result = '1/2-1/2'
+                    return
+                if self.turn == self.engine_color:
+                    self.play_engine_move()
+                    continue
+                # Started once per human turn; opponent_moved() ends it, so a
+                # mistyped square or a look at the book keeps the search going.
+                if not self.engine.ponderer.active:
+                    self.engine.start_pondering(self.board, self.turn)
+
             start = input("Выберите фигуру (например, E2): ")  
+            if start.lower() == 'book':
+                self.show_book_moves()
+                continue
+            if self.navigate(start):
+                continue
             end = input("Введите целевую позицию (например, E4): ")  
-
-            if start.lower() == 'undo' or end.lower() == 'undo':
-                self.board.undo_move()
-                self.switch_turn()
+            if self.navigate(end):
                 continue
 
             try:
                 # Convert algebraic notation to board coordinates
-                x1, y1 = 8 - int(start[1]), ord(start[0].lower()) - ord('a')
-                x2, y2 = 8 - int(end[1]), ord(end[0].lower()) - ord('a')
+                size = self.board.size
+                x1, y1 = size - int(start[1:]), ord(start[0].lower()) - ord('a')
+                x2, y2 = size - int(end[1:]), ord(end[0].lower()) - ord('a')
 
+                flags = self.board.move_flags((x1, y1), (x2, y2))
                 if self.board.move_piece((x1, y1), (x2, y2)):
+                    self.record_move((x1, y1), (x2, y2), flags)
+                    if self.engine is not None:
+                        self.engine.opponent_moved(((x1, y1), (x2, y2)))
                     self.switch_turn()
                     self.move_count += 1
             except Exception as e:
                 print(f"Неверный ввод! Ошибка: {e}")  
 
+    def play_engine_move(self):
+        """Lets the engine choose and play a move for the current side."""
+        start, end = self.engine.choose_move(self.board, self.turn)
+        flags = self.board.move_flags(start, end)
+        self.board.make_move(start, end)
+        self.record_move(start, end, flags)
+        print(f"Компьютер ходит: {self.format_square(start)}-{self.format_square(end)}")
+        self.switch_turn()
+        self.move_count += 1
+
+    def save_game(self):
+        """Appends the moves played so far to the game archive."""
+        from engine.archive import GameArchiveWriter
+
+        with GameArchiveWriter(self.archive_path) as archive:
+            archive.append(self.variant, self.result, self.moves,
+                           {'engine': self.engine_color} if self.engine_color else None,
+                           self.board.size)
+
+    def show_book_moves(self):
+        """Prints the opening book moves of the current position."""
+        if self.book is None:
+            print("Дебютная книга не загружена")
+            return
+        entries = self.book.moves(self.board, self.turn)
+        if not entries:
+            print("Позиции нет в книге")
+        for (start, end), weight, score in entries:
+            print(f"{self.format_square(start)}-{self.format_square(end)}: вес {weight}, "
+                  f"оценка {score:+d}")
+
+    def format_square(self, position):
+        """Converts board coordinates to algebraic notation.
+
+        Ranks are counted from the bottom of the game's board, whatever its size.
+
+        Args:
+            position (tuple[int, int]): (row, col) coordinates.
+
+        Returns:
+            str: Square name such as 'E4'.
+        """
+        row, col = position
+        return f"{chr(ord('A') + col)}{self.board.size - row}"
+
 
 class ModifiedChessGame(ChessGame):
     """A variant chess game featuring custom pieces (Wizard, Dragon, Jester).
@@ -68,11 +300,8 @@ class ModifiedChessGame(ChessGame):
     - Jester (J/j): Moves like king and can swap with adjacent pieces
     """
 
-    def __init__(self):
-        """Initializes a modified chess game with custom piece setup."""
-        self.board = ModifiedChessBoard()
-        self.turn = 'white'
-        self.move_count = 0
+    board_class = ModifiedChessBoard
+    variant = 'modified'
 
     def play(self):
         """Starts the modified chess game with custom piece explanations.
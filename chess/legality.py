@@ -0,0 +1,180 @@
+from engine.bitboard import KING_STEPS, iter_bits
+from engine.move import SWAP
+
+
+class Legality:
+    """King safety of one side in one position, worked out once.
+
+    The checkers of the royal piece and the pieces pinned to it are found
+    when the object is built; afterwards validating a pseudo-legal move is
+    a bit test for most moves and an attack scan of one square for moves
+    of the royal piece, instead of playing the move and looking for checks.
+    The board is passed back in rather than kept, so that a board can cache
+    its Legality without a reference cycle.
+
+    Pins and check blocks are found along the eight lines through the
+    royal piece: a piece on such a line is pinned if taking it off the
+    board lets an enemy piece further along attack the royal square. That
+    covers every piece of both variants, whose attacks can only be blocked
+    on the straight line between attacker and target. Jester swaps move an
+    enemy piece as well and are tried on the board instead.
+
+    Attributes:
+        color (str): Side whose moves are validated.
+        size (int): Board size.
+        hash (int): Board hash of the position, see ChessBoard.legality().
+        royal (tuple[int, int]|None): (row, col) of the side's royal piece.
+        checkers (tuple[tuple[int, int], ...]): Enemy pieces attacking it.
+        pins (dict[int, int]): Bit index of each pinned piece -> bitboard of
+                               the squares it may still move to.
+        evasions (int): Squares a non-royal move must end on: everything when
+                        not in check, the checker and the squares blocking it
+                        in single check, none in double check.
+    """
+
+    __slots__ = ('color', 'size', 'full', 'hash', 'royal', 'checkers', 'pins', 'evasions', '_enemies')
+
+    def __init__(self, board, color):
+        """Analyses a position.
+
+        Args:
+            board (ChessBoard): The position.
+            color (str): Side whose moves are to be validated.
+        """
+        self.color = color
+        self.size = board.size
+        self.full = board.geometry.full
+        self.hash = board.hash
+        self.royal = board.king_position(color)
+        enemy = 'black' if color == 'white' else 'white'
+        occupied, self._enemies = board.occupancy(enemy)
+        self.pins = {}
+        self.evasions = self.full
+        if self.royal is None:
+            self.checkers = ()
+            return
+        self.checkers = tuple((i, j) for i, j, piece in self._enemies
+                              if board.attacks(piece, (i, j), self.royal))
+        self._find_pins(board, occupied)
+        if len(self.checkers) > 1:
+            self.evasions = 0
+        elif self.checkers:
+            self.evasions = self._evasions(board, self.checkers[0])
+
+    def _find_pins(self, board, occupied):
+        grid = board.board
+        geometry = board.geometry
+        size = board.size
+        royal = self.royal
+        origin = royal[0] * size + royal[1]
+        for dr, dc in KING_STEPS:
+            rays = geometry.ray(dr, dc)
+            blockers = rays[origin] & occupied
+            if not blockers:
+                continue
+            forward = dr * size + dc > 0
+            first = (blockers & -blockers).bit_length() - 1 if forward else blockers.bit_length() - 1
+            x, y = divmod(first, size)
+            pinned = grid[x][y]
+            if pinned.color != self.color:
+                continue
+            blockers &= rays[first]
+            if not blockers:
+                continue
+            second = (blockers & -blockers).bit_length() - 1 if forward else blockers.bit_length() - 1
+            i, j = divmod(second, size)
+            attacker = grid[i][j]
+            if attacker.color == self.color:
+                continue
+            grid[x][y] = None
+            try:
+                attacks = attacker.is_valid_move(grid, (i, j), royal)
+            finally:
+                grid[x][y] = pinned
+            if attacks:
+                # From next to the royal piece up to and including the pinner.
+                self.pins[first] = rays[origin] ^ rays[second]
+
+    def _evasions(self, board, checker):
+        grid = board.board
+        geometry = board.geometry
+        size = board.size
+        royal = self.royal
+        origin = royal[0] * size + royal[1]
+        target = checker[0] * size + checker[1]
+        evasions = 1 << target
+        attacker = grid[checker[0]][checker[1]]
+        for dr, dc in KING_STEPS:
+            rays = geometry.ray(dr, dc)
+            if rays[origin] >> target & 1:
+                between = rays[origin] ^ rays[target] ^ 1 << target
+                # Keep only the squares that really stop the attack.
+                guard = grid[royal[0]][royal[1]]
+                for index in iter_bits(between):
+                    x, y = divmod(index, size)
+                    grid[x][y] = guard
+                    try:
+                        if not attacker.is_valid_move(grid, checker, royal):
+                            evasions |= 1 << index
+                    finally:
+                        grid[x][y] = None
+                break
+        return evasions
+
+    def allowed(self, index):
+        """Returns the squares the piece on a bit index may move to at most.
+
+        Args:
+            index (int): Bit index of one of the side's pieces.
+
+        Returns:
+            int: Bitboard; every square for the royal piece, whose moves are
+            checked one by one by is_legal().
+        """
+        if self.royal is not None and index == self.royal[0] * self.size + self.royal[1]:
+            return self.full
+        return self.evasions & self.pins.get(index, self.full)
+
+    def is_legal(self, board, start, end):
+        """Checks that a pseudo-legal move does not leave the royal piece attacked.
+
+        Args:
+            board (ChessBoard): The position this object was built for.
+            start (tuple[int, int]): (row, col) of the moving piece.
+            end (tuple[int, int]): (row, col) of the target square; the move
+                                   must already pass the piece's is_valid_move().
+
+        Returns:
+            bool: True if the move is legal.
+        """
+        if self.royal is None:
+            return True
+        if start == self.royal:
+            return not self._attacked_after(board, start, end)
+        if board.move_flags(start, end) == SWAP:
+            board.make_move(start, end)
+            in_check = board.is_in_check(self.color)
+            board.unmake_move()
+            return not in_check
+        size = self.size
+        return bool(self.allowed(start[0] * size + start[1]) >> end[0] * size + end[1] & 1)
+
+    def _attacked_after(self, board, start, end):
+        """Returns True if the royal piece would be attacked on end after moving there."""
+        grid = board.board
+        x1, y1 = start
+        x2, y2 = end
+        piece = grid[x1][y1]
+        target = grid[x2][y2]
+        grid[x2][y2] = piece
+        grid[x1][y1] = None
+        try:
+            attacks = board.attacks
+            for i, j, enemy in self._enemies:
+                if (i, j) != end and attacks(enemy, (i, j), end):
+                    return True
+            return False
+        finally:
+            grid[x1][y1] = piece
+            grid[x2][y2] = target
+
@@ -13,3 +13,4 @@ __all__ = [
     'ChessPiece', 'King', 'Queen', 'Rook',
     'Bishop', 'Knight', 'Pawn', 'Wizard',
     'Dragon', 'Jester'
+]
@@ -9,8 +9,25 @@ class ChessPiece:
         symbol (str): The character symbol representing the piece.
         has_moved (bool): Flag indicating if the piece has moved from its initial position.
                          Relevant for special moves like castling and pawn promotion.
+        royal (bool): Class attribute; True for the piece whose capture or
+                      checkmate ends the game (King, Dragon in the variant).
+        value (int): Class attribute; material value in centipawns used by the engine.
+        steps (tuple|None): Class attribute; (row, col) offsets of the squares
+                            the piece may jump to, None if the piece does not
+                            describe its movement, in which case the board
+                            offers it every square.
+        directions (tuple): Class attribute; (row, col) directions the piece
+                            slides along until blocked.
+
+    steps and directions only narrow down the squares the board offers to
+    is_valid_move(), which remains the authority on every move.
     """
 
+    royal = False
+    value = 0
+    steps = None
+    directions = ()
+
     def __init__(self, color):
         """Initializes a new chess piece with basic properties.
 
@@ -24,6 +41,12 @@ class ChessPiece:
         self.symbol = self.get_symbol(color)
         self.has_moved = False
 
+    def copy(self):
+        """Returns an independent copy of the piece, cheaper than copy.deepcopy()."""
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        return clone
+
     def get_symbol(self, color):
         """Gets the symbol representation of the piece.
 
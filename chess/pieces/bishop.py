@@ -1,3 +1,4 @@
+from engine.bitboard import DIAGONAL
 from .base import ChessPiece
 
 
@@ -13,6 +14,9 @@ class Bishop(ChessPiece):
         has_moved (bool): Inherited from ChessPiece, tracks if piece has moved.
     """
 
+    value = 330
+    directions = DIAGONAL
+
     def get_symbol(self, color):
         """Returns the Unicode symbol for the bishop.
 
@@ -1,3 +1,4 @@
+from engine.bitboard import KING_STEPS
 from .base import ChessPiece
 
 
@@ -13,6 +14,11 @@ class Dragon(ChessPiece):
         has_moved (bool): Movement state flag, inherited from ChessPiece.
     """
 
+    royal = True
+    value = 0
+    # Exactly three squares along a line; the path is checked by is_valid_move().
+    steps = tuple((3 * dr, 3 * dc) for dr, dc in KING_STEPS)
+
     def get_symbol(self, color):
         """Returns the symbol representation of the dragon piece.
 
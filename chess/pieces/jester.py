@@ -1,3 +1,4 @@
+from engine.bitboard import KING_STEPS
 from .base import ChessPiece
 
 
@@ -13,6 +14,9 @@ class Jester(ChessPiece):
         has_moved (bool): Tracks if piece has moved (unused for jester).
     """
 
+    value = 250
+    steps = KING_STEPS
+
     def get_symbol(self, color):
         """Returns the symbol representation of the jester piece.
 
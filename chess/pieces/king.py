@@ -1,3 +1,4 @@
+from engine.bitboard import KING_STEPS
 from .base import ChessPiece
 
 class King(ChessPiece):
@@ -12,6 +13,10 @@ class King(ChessPiece):
         has_moved (bool): Tracks if king has moved (important for castling).
     """
 
+    royal = True
+    value = 0
+    steps = KING_STEPS
+
     def get_symbol(self, color):
         """Returns the symbol representation of the king.
 
@@ -1,3 +1,4 @@
+from engine.bitboard import KNIGHT_STEPS
 from .base import ChessPiece
 
 class Knight(ChessPiece):
@@ -12,6 +13,9 @@ class Knight(ChessPiece):
         has_moved (bool): Inherited from ChessPiece (less relevant for knights).
     """
 
+    value = 320
+    steps = KNIGHT_STEPS
+
     def get_symbol(self, color):
         """Returns the symbol representation of the knight.
 
@@ -1,6 +1,10 @@
 from .base import ChessPiece
 
 
+WHITE_STEPS = ((-1, 0), (-2, 0), (-1, -1), (-1, 1))
+BLACK_STEPS = ((1, 0), (2, 0), (1, -1), (1, 1))
+
+
 class Pawn(ChessPiece):
     """Class representing the Pawn chess piece.
 
@@ -16,6 +20,13 @@ class Pawn(ChessPiece):
         has_moved (bool): Tracks if pawn has moved (affects two-square move).
     """
 
+    value = 100
+
+    @property
+    def steps(self):
+        """Forward steps and diagonal captures, which depend on the color."""
+        return WHITE_STEPS if self.color == 'white' else BLACK_STEPS
+
     def get_symbol(self, color):
         """Returns the symbol representation of the pawn.
 
@@ -54,7 +65,7 @@ class Pawn(ChessPiece):
         if dy == 0:
             if dx == direction and board[x2][y2] is None:
                 return True
-            start_row = 6 if self.color == 'white' else 1
+            start_row = len(board) - 2 if self.color == 'white' else 1
             if (x1 == start_row and dx == 2 * direction and
                     board[x2][y2] is None and board[x1 + direction][y1] is None):
                 return True
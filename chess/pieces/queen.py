@@ -1,3 +1,4 @@
+from engine.bitboard import DIAGONAL, ORTHOGONAL
 from .base import ChessPiece
 
 
@@ -16,6 +17,9 @@ class Queen(ChessPiece):
         has_moved (bool): Inherited from ChessPiece (not particularly relevant for queens).
     """
 
+    value = 900
+    directions = ORTHOGONAL + DIAGONAL
+
     def get_symbol(self, color):
         """Returns the symbol representation of the queen.
 
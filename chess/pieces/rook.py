@@ -1,3 +1,4 @@
+from engine.bitboard import ORTHOGONAL
 from .base import ChessPiece
 
 
@@ -13,6 +14,9 @@ class Rook(ChessPiece):
         has_moved (bool): Tracks if rook has moved (important for castling).
     """
 
+    value = 500
+    directions = ORTHOGONAL
+
     def get_symbol(self, color):
         """Returns the symbol representation of the rook.
 
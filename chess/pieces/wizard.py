@@ -1,3 +1,4 @@
+from engine.bitboard import DIAGONAL, KNIGHT_STEPS
 from .base import ChessPiece
 
 
@@ -17,6 +18,10 @@ class Wizard(ChessPiece):
         has_moved (bool): Inherited from ChessPiece (not particularly relevant).
     """
 
+    value = 650
+    steps = KNIGHT_STEPS
+    directions = DIAGONAL
+
     def get_symbol(self, color):
         """Returns the symbol representation of the wizard.
 
@@ -0,0 +1,41 @@
+import importlib
+
+
+# Public name -> submodule. Submodules are imported on first access, so
+# that importing one engine module (as every board does) does not load
+# the search, threads and tables of all the others.
+_EXPORTS = {
+    'ZobristTable': 'zobrist',
+    'Move': 'move',
+    'MoveList': 'move',
+    'GameState': 'protocol',
+    'GameStateMixin': 'state',
+    'MoveCache': 'move_cache',
+    'Deadline': 'timecontrol',
+    'TimeControl': 'timecontrol',
+    'TimeManager': 'timecontrol',
+    'Searcher': 'search',
+    'SearchResult': 'search',
+    'TranspositionTable': 'search',
+    'MATE_SCORE': 'search',
+    'analyse': 'analysis',
+    'analyse_stream': 'analysis',
+    'analyse_batch': 'analysis',
+    'Ponderer': 'ponder',
+    'EnginePlayer': 'player',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
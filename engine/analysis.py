@@ -0,0 +1,231 @@
+import argparse
+import asyncio
+import concurrent.futures
+
+from .notation import move_to_uci, uci_to_move
+from .search import MATE_SCORE, Searcher, TranspositionTable
+from .state import decode_state, encode_state
+from .timecontrol import Deadline
+from .variants import VARIANTS
+
+
+def _deadline(budget):
+    return Deadline.after(budget) if budget is not None else None
+
+
+def analyse(board, color=None, lines=3, max_depth=64, budget=None, max_nodes=None,
+            searcher=None, on_depth=None):
+    """Finds the best few moves of a position, each with its score and PV.
+
+    The search runs on a copy of the board. It can be cancelled from
+    another thread with searcher.stop(); the lines of the last completed
+    depth are returned.
+
+    Args:
+        board (GameState): Position of any variant.
+        color (str|None): Side to move; board.turn by default.
+        lines (int): Number of moves to report.
+        max_depth (int): Maximum depth.
+        budget (float|None): Seconds to spend, unlimited by default.
+        max_nodes (int|None): Stop after roughly this many nodes.
+        searcher (Searcher|None): Searcher to use, e.g. to keep its table
+                                  between calls or to stop it; a new one by default.
+        on_depth (callable|None): Called with the list of SearchResult after
+                                  every completed depth.
+
+    Returns:
+        list[SearchResult]: Best move first; empty if there are no moves.
+    """
+    searcher = searcher if searcher is not None else Searcher()
+    return searcher.search_multipv(board.copy(), color or board.turn, lines, max_depth,
+                                   _deadline(budget), on_depth, max_nodes)
+
+
+async def analyse_stream(board, color=None, lines=3, max_depth=64, budget=None, max_nodes=None,
+                         searcher=None):
+    """Analyses a position in a worker thread, yielding the lines of every depth.
+
+    Leaving the loop early, closing the generator or cancelling the task
+    that iterates it stops the search; the generator returns once the
+    thread has stopped, so the searcher can be reused right away.
+
+    Args:
+        board (GameState): Position of any variant; a copy is searched.
+        color (str|None): Side to move; board.turn by default.
+        lines (int): Number of moves to report.
+        max_depth (int): Maximum depth.
+        budget (float|None): Seconds to spend, unlimited by default.
+        max_nodes (int|None): Stop after roughly this many nodes.
+        searcher (Searcher|None): Searcher to use; a new one by default.
+
+    Yields:
+        list[SearchResult]: Best move first, one list per completed depth.
+    """
+    loop = asyncio.get_running_loop()
+    searcher = searcher if searcher is not None else Searcher()
+    queue = asyncio.Queue()
+    board = board.copy()
+    color = color or board.turn
+
+    def publish(results):
+        loop.call_soon_threadsafe(queue.put_nowait, results)
+
+    def run():
+        try:
+            searcher.search_multipv(board, color, lines, max_depth, on_iteration=publish)
+        finally:
+            # None marks the end of the search.
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    # Before the thread starts, so that stopping early is not undone by the search.
+    searcher.prepare(_deadline(budget), max_nodes)
+    future = loop.run_in_executor(None, run)
+    try:
+        while True:
+            results = await queue.get()
+            if results is None:
+                break
+            yield results
+        await future
+    finally:
+        searcher.stop()
+        if not future.done():
+            await asyncio.wait({future})
+
+
+def analyse_task(task):
+    """Analyses one position of a batch; runs inside a worker process.
+
+    Args:
+        task (dict): index, state (encode_state() bytes), lines, max_depth,
+                     budget, max_nodes and hash_mb.
+
+    Returns:
+        tuple[int, list[SearchResult]]: The task index and the lines.
+    """
+    # The clock starts here, so time spent waiting for a worker is not charged.
+    deadline = _deadline(task['budget'])
+    board, _ = decode_state(task['state'])
+    searcher = Searcher(TranspositionTable.from_megabytes(task['hash_mb']))
+    return task['index'], searcher.search_multipv(board, board.turn, task['lines'],
+                                                  task['max_depth'], deadline,
+                                                  max_nodes=task['max_nodes'])
+
+
+def analyse_batch(boards, lines=3, budget=1.0, max_depth=64, max_nodes=None, hash_mb=16,
+                  workers=None, on_result=None, stop=None):
+    """Analyses many positions concurrently in a pool of worker processes.
+
+    Positions travel to the workers as encode_state() bytes; each worker
+    gives its position a fresh transposition table and its own time budget,
+    counted from when the worker picks it up.
+
+    Args:
+        boards (Iterable[GameState]): Positions of any registered variant,
+                                      each analysed for its side to move.
+        lines (int): Number of moves to report per position.
+        budget (float|None|Sequence): Seconds per position, or one value per
+                                      position; None means no time limit.
+        max_depth (int): Maximum depth.
+        max_nodes (int|None): Node limit per position.
+        hash_mb (int): Transposition table size of each search, in MiB.
+        workers (int|None): Worker processes; one per CPU by default.
+        on_result (callable|None): Called with (index, lines) as each
+                                   position finishes, in completion order.
+        stop (threading.Event|None): Once set, positions not yet started are
+                                     cancelled; searches already running
+                                     finish within their budget.
+
+    Returns:
+        list[list[SearchResult]|None]: Lines in input order; None for the
+        positions that were cancelled.
+    """
+    boards = list(boards)
+    budgets = budget if isinstance(budget, (list, tuple)) else [budget] * len(boards)
+    if len(budgets) != len(boards):
+        raise ValueError(f"Got {len(budgets)} budgets for {len(boards)} positions")
+    results = [None] * len(boards)
+    if not boards:
+        return results
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        pending = {pool.submit(analyse_task, {
+            'index': index, 'state': encode_state(board), 'lines': lines,
+            'max_depth': max_depth, 'budget': budgets[index], 'max_nodes': max_nodes,
+            'hash_mb': hash_mb,
+        }) for index, board in enumerate(boards)}
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, timeout=0.1, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                index, lines_found = future.result()
+                results[index] = lines_found
+                if on_result is not None:
+                    on_result(index, lines_found)
+            if stop is not None and stop.is_set():
+                for future in pending:
+                    future.cancel()
+                pending = {future for future in pending if not future.cancelled()}
+    return results
+
+
+def format_score(score):
+    """Returns a score as '+0.35' pawns or '#3' / '#-2' for mates in moves."""
+    if abs(score) >= MATE_SCORE - 1000:
+        plies = MATE_SCORE - abs(score)
+        moves = (plies + 1) // 2
+        return f"#{moves}" if score > 0 else f"#-{moves}"
+    return f"{score / 100:+.2f}"
+
+
+def format_lines(results):
+    """Returns one text line per analysed move: rank, move, score and PV."""
+    return [f"{rank}) {move_to_uci(result.best_move)} {format_score(result.score)}  "
+            + ' '.join(move_to_uci(move) for move in result.pv)
+            for rank, result in enumerate(results, 1)]
+
+
+def _position(variant, text):
+    board = VARIANTS[variant]()
+    for move in text.split():
+        board.make_move(*uci_to_move(move))
+    return board
+
+
+def main(argv=None):
+    """Command-line entry point: python -m engine.analysis --lines 3 "e2e4 e7e5" ..."""
+    parser = argparse.ArgumentParser(description="Анализ позиции: несколько лучших ходов с оценками")
+    parser.add_argument('positions', nargs='*', default=[''],
+                        help="ходы от начальной позиции, например \"e2e4 e7e5\"")
+    parser.add_argument('--variant', default='chess', choices=sorted(VARIANTS))
+    parser.add_argument('--lines', type=int, default=3, help="число лучших ходов")
+    parser.add_argument('--depth', type=int, default=64, help="наибольшая глубина")
+    parser.add_argument('--movetime', type=float, default=2.0, help="секунд на позицию")
+    parser.add_argument('--workers', type=int, default=None, help="процессов для нескольких позиций")
+    args = parser.parse_args(argv)
+
+    boards = [_position(args.variant, text) for text in args.positions]
+    if len(boards) == 1:
+        def report(results):
+            print(f"Глубина {results[0].depth}, узлов {results[0].nodes}, "
+                  f"{results[0].elapsed:.2f} с:")
+            for line in format_lines(results):
+                print(f"  {line}")
+
+        if not analyse(boards[0], lines=args.lines, max_depth=args.depth,
+                       budget=args.movetime, on_depth=report):
+            print("Ходов нет")
+        return
+
+    def report_position(index, results):
+        print(f"Позиция {index + 1} ({args.positions[index] or 'начальная'}):")
+        for line in format_lines(results) or ["Ходов нет"]:
+            print(f"  {line}")
+
+    analyse_batch(boards, lines=args.lines, budget=args.movetime, max_depth=args.depth,
+                  workers=args.workers, on_result=report_position)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,329 @@
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from .notation import move_typecode
+from .state import VARIANT_IDS, VARIANT_NAMES
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; appends are then unlocked
+    fcntl = None
+
+
+MAGIC = b'CCGA'
+VERSION = 2
+FILE_HEADER = struct.Struct('<4sB3x')
+FRAME_HEADER = struct.Struct('<2sBxII')
+FRAME_MAGIC = b'GF'
+RAW = 0
+ZLIB = 1
+# variant id, result code, board size, metadata bytes, plies; followed by
+# the metadata and the moves as move_typecode(board size) words.
+GAME_HEADER = struct.Struct('<BBBxHH')
+# Version 1 had no board size: its games are 16-bit moves of an 8x8 board.
+GAME_HEADER_V1 = struct.Struct('<BBHH')
+
+RESULT_CODES = {'*': 0, '1-0': 1, '0-1': 2, '1/2-1/2': 3}
+RESULT_NAMES = {number: name for name, number in RESULT_CODES.items()}
+
+
+def game_id(frame_offset, index):
+    """Combines a frame offset and the position inside the frame into a game id."""
+    return frame_offset << 16 | index
+
+
+def split_game_id(number):
+    """Splits a game id into (frame offset, index inside the frame)."""
+    return number >> 16, number & 0xFFFF
+
+
+class ArchivedGame:
+    """One game read from an archive.
+
+    Attributes:
+        game_id (int): Stable id: frame offset << 16 | index in the frame.
+        variant (str): 'chess', 'modified' or 'checkers'.
+        result (str): '1-0', '0-1', '1/2-1/2' or '*' when unfinished.
+        metadata (dict): Free-form information (players, date, ...).
+        moves (array): Packed moves, see engine.move.pack().
+        size (int): Board size the moves were packed for.
+    """
+
+    __slots__ = ('game_id', 'variant', 'result', 'metadata', 'moves', 'size')
+
+    def __init__(self, game_id, variant, result, metadata, moves, size=8):
+        self.game_id = game_id
+        self.variant = variant
+        self.result = result
+        self.metadata = metadata
+        self.moves = moves
+        self.size = size
+
+    def __repr__(self):
+        return (f"ArchivedGame(game_id={self.game_id}, variant={self.variant!r}, "
+                f"result={self.result!r}, plies={len(self.moves)})")
+
+
+def encode_game(variant, result, moves, metadata=None, size=8, version=VERSION):
+    """Serializes one game record.
+
+    Args:
+        variant (str): Key of VARIANT_IDS.
+        result (str): Key of RESULT_CODES.
+        moves (Iterable[int]): Moves packed by engine.move.pack() for the board size.
+        metadata (dict|None): JSON-serializable extra information.
+        size (int): Board size.
+        version (int): Archive format version; 1 only holds 8x8 games.
+
+    Returns:
+        bytes: The record.
+
+    Raises:
+        ValueError: If the format version cannot hold games of the board size.
+    """
+    meta = json.dumps(metadata, ensure_ascii=False).encode('utf-8') if metadata else b''
+    packed = array(move_typecode(size), moves)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    if version == 1:
+        if size != 8:
+            raise ValueError(f"Archive version 1 cannot store {size}x{size} games")
+        header = GAME_HEADER_V1.pack(VARIANT_IDS[variant], RESULT_CODES[result],
+                                     len(meta), len(packed))
+    else:
+        header = GAME_HEADER.pack(VARIANT_IDS[variant], RESULT_CODES[result], size,
+                                  len(meta), len(packed))
+    return header + meta + packed.tobytes()
+
+
+def decode_games(payload, frame_offset, version=VERSION):
+    """Yields the games stored in a frame payload of an archive of the given version."""
+    position = 0
+    index = 0
+    view = memoryview(payload)
+    while position < len(payload):
+        if version == 1:
+            variant, result, meta_length, plies = GAME_HEADER_V1.unpack_from(payload, position)
+            size = 8
+            position += GAME_HEADER_V1.size
+        else:
+            variant, result, size, meta_length, plies = GAME_HEADER.unpack_from(payload, position)
+            position += GAME_HEADER.size
+        metadata = json.loads(bytes(view[position:position + meta_length])) if meta_length else {}
+        position += meta_length
+        moves = array(move_typecode(size))
+        moves.frombytes(view[position:position + moves.itemsize * plies])
+        if sys.byteorder == 'big':
+            moves.byteswap()
+        position += moves.itemsize * plies
+        yield ArchivedGame(game_id(frame_offset, index), VARIANT_NAMES[variant],
+                           RESULT_NAMES[result], metadata, moves, size)
+        index += 1
+
+
+class GameArchiveWriter:
+    """Appends games to an archive file.
+
+    Every frame is written with a single os.write() on a file opened with
+    O_APPEND (under an exclusive lock where fcntl is available), so several
+    writers can append to one archive while readers scan it. With
+    compression enabled, games are buffered and written as zlib blocks of
+    block_size games, which roughly halves the size of large archives.
+
+    Games are appended in the format version of the file, so an archive
+    written before board sizes were recorded keeps its version and only
+    accepts 8x8 games.
+
+    Attributes:
+        path (str): Archive file.
+        compress (bool): Whether frames are zlib-compressed blocks.
+        block_size (int): Games per compressed block.
+        version (int): Format version of the file.
+    """
+
+    def __init__(self, path, compress=False, block_size=512):
+        """Opens (and if necessary creates) an archive for appending.
+
+        Args:
+            path (str): Archive file.
+            compress (bool): Write compressed blocks instead of single games.
+            block_size (int): Games per compressed block, at most 65535.
+
+        Raises:
+            ValueError: If the file exists and is not a game archive.
+        """
+        self.path = path
+        self.compress = compress
+        self.block_size = min(block_size, 0xFFFF)
+        self._pending = []
+        self._fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        self._lock()
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                os.write(self._fd, FILE_HEADER.pack(MAGIC, VERSION))
+            header = os.pread(self._fd, FILE_HEADER.size, 0)
+        finally:
+            self._unlock()
+        magic, self.version = (FILE_HEADER.unpack(header) if len(header) == FILE_HEADER.size
+                               else (None, None))
+        if magic != MAGIC or self.version not in (1, VERSION):
+            os.close(self._fd)
+            self._fd = None
+            raise ValueError(f"{path} is not a game archive")
+
+    def _lock(self):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def _unlock(self):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def append(self, variant, result, moves, metadata=None, size=8):
+        """Adds one game.
+
+        Args:
+            variant (str): 'chess', 'modified' or 'checkers'.
+            result (str): '1-0', '0-1', '1/2-1/2' or '*'.
+            moves (Iterable[int]): Packed moves, see engine.move.pack().
+            metadata (dict|None): Extra information stored with the game.
+            size (int): Board size the moves were packed for.
+
+        Raises:
+            ValueError: If the archive is of version 1 and size is not 8.
+        """
+        record = encode_game(variant, result, moves, metadata, size, self.version)
+        if not self.compress:
+            self._write_frame(RAW, record)
+            return
+        self._pending.append(record)
+        if len(self._pending) >= self.block_size:
+            self.flush()
+
+    def flush(self):
+        """Writes buffered games as one compressed block."""
+        if self._pending:
+            self._write_frame(ZLIB, zlib.compress(b''.join(self._pending), 6))
+            self._pending = []
+
+    def _write_frame(self, kind, payload):
+        frame = FRAME_HEADER.pack(FRAME_MAGIC, kind, len(payload), zlib.crc32(payload)) + payload
+        self._lock()
+        try:
+            os.write(self._fd, frame)
+        finally:
+            self._unlock()
+
+    def close(self):
+        """Flushes buffered games and closes the file."""
+        if self._fd is not None:
+            self.flush()
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GameArchiveReader:
+    """Streams games from an archive without loading it into memory.
+
+    Only one frame is held in memory at a time. A frame that is incomplete
+    or fails its checksum marks the end of the readable data (a writer may
+    be in the middle of appending it); next_offset tells where to resume.
+
+    Attributes:
+        path (str): Archive file.
+        version (int): Format version of the file; pass it to decode_games().
+        next_offset (int): Offset just after the last complete frame read.
+    """
+
+    def __init__(self, path):
+        """Opens an archive.
+
+        Args:
+            path (str): Archive file.
+
+        Raises:
+            ValueError: If the file is not a game archive.
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(FILE_HEADER.size)
+        magic, version = (FILE_HEADER.unpack(header) if len(header) == FILE_HEADER.size
+                          else (None, None))
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError(f"{path} is not a game archive")
+        self.version = version
+        self.next_offset = FILE_HEADER.size
+
+    def frames(self, start=None):
+        """Yields (frame offset, payload) of complete frames.
+
+        Args:
+            start (int|None): Offset to start from; defaults to next_offset.
+        """
+        offset = self.next_offset if start is None else start
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            while True:
+                header = f.read(FRAME_HEADER.size)
+                if len(header) < FRAME_HEADER.size:
+                    break
+                magic, kind, length, checksum = FRAME_HEADER.unpack(header)
+                if magic != FRAME_MAGIC:
+                    break
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    break
+                yield offset, zlib.decompress(payload) if kind == ZLIB else payload
+                offset += FRAME_HEADER.size + length
+                self.next_offset = offset
+
+    def __iter__(self):
+        return self.games(start=FILE_HEADER.size)
+
+    def games(self, start=None):
+        """Yields ArchivedGame objects in file order.
+
+        Args:
+            start (int|None): Frame offset to start from; defaults to
+                              next_offset, i.e. continues after the games
+                              already read.
+        """
+        for frame_offset, payload in self.frames(start):
+            yield from decode_games(payload, frame_offset, self.version)
+
+    def get(self, number):
+        """Reads one game by id.
+
+        Args:
+            number (int): Game id as produced by game_id().
+
+        Returns:
+            ArchivedGame: The game.
+
+        Raises:
+            KeyError: If no such game exists.
+        """
+        frame_offset, index = split_game_id(number)
+        with open(self.path, 'rb') as f:
+            f.seek(frame_offset)
+            header = f.read(FRAME_HEADER.size)
+            if len(header) == FRAME_HEADER.size:
+                magic, kind, length, checksum = FRAME_HEADER.unpack(header)
+                payload = f.read(length)
+                if magic == FRAME_MAGIC and zlib.crc32(payload) == checksum:
+                    if kind == ZLIB:
+                        payload = zlib.decompress(payload)
+                    for game in decode_games(payload, frame_offset, self.version):
+                        if game.game_id == number:
+                            return game
+        raise KeyError(number)
@@ -0,0 +1,314 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from .archive import GameArchiveReader, GameArchiveWriter
+from .move import pack, unpack
+from .variants import VARIANTS
+
+
+VERSION = 1
+DEFAULT_THRESHOLD = 0.25
+# Every metric is a cost: lower is better.
+METRICS = {
+    'move_piece_us': "move_piece(), легальные и нелегальные ходы, мкс",
+    'attack_us': "проверка атаки поля, мкс",
+    'undo_move_us': "undo_move(), мкс",
+    'display_us': "display() в буфер, мкс",
+    'legal_moves_us': "legal_moves(), мкс",
+    'replay_game_ms': "воспроизведение партии из архива, мс",
+    'memory_per_game_kb': "память на партию, КБ",
+}
+
+
+def random_game(board, plies, rng):
+    """Plays random legal moves with make_move() and returns them packed."""
+    moves = []
+    for _ in range(plies):
+        legal = board.legal_moves()
+        if not legal:
+            break
+        start, end = rng.choice(legal)
+        moves.append(pack(start, end, board.move_flags(start, end), board.size))
+        board.make_move(start, end)
+    return moves
+
+
+def sample_positions(variant, count, seed=0, max_plies=60):
+    """Collects positions from random games, each with a legal and an illegal move.
+
+    Args:
+        variant (str): Variant name.
+        count (int): Number of positions.
+        seed (int): Random seed.
+        max_plies (int): Positions are taken up to this many plies in.
+
+    Returns:
+        list[tuple[Board, tuple, tuple]]: (position, legal move, illegal move);
+        the illegal move starts on a piece of the side to move.
+    """
+    rng = random.Random(seed)
+    size = VARIANTS[variant]().size
+    squares = [(i, j) for i in range(size) for j in range(size)]
+    samples = []
+    while len(samples) < count:
+        board = VARIANTS[variant]()
+        for _ in range(rng.randrange(max_plies)):
+            legal = board.legal_moves()
+            if not legal:
+                break
+            board.make_move(*rng.choice(legal))
+        legal = board.legal_moves()
+        if not legal:
+            continue
+        own = [square for square in squares
+               if board.board[square[0]][square[1]] is not None
+               and board.board[square[0]][square[1]].color == board.turn]
+        allowed = set(legal)
+        while True:
+            illegal = (rng.choice(own), rng.choice(squares))
+            if illegal[0] != illegal[1] and illegal not in allowed:
+                break
+        board.undo_stack.clear()
+        samples.append((board, rng.choice(legal), illegal))
+    return samples
+
+
+def write_archive(path, variant, games, plies, seed=0):
+    """Writes random games of a variant to a new game archive."""
+    rng = random.Random(seed)
+    with GameArchiveWriter(path, compress=True) as writer:
+        for _ in range(games):
+            board = VARIANTS[variant]()
+            writer.append(variant, '*', random_game(board, plies, rng), size=board.size)
+
+
+def _attack_probe(board):
+    # Chess asks about every square; checkers, which has no attacked
+    # squares, about the pieces an enemy jump would take.
+    if hasattr(board, 'is_square_under_attack'):
+        enemy = 'black' if board.turn == 'white' else 'white'
+        squares = [(i, j) for i in range(board.size) for j in range(board.size)]
+        return lambda: [board.is_square_under_attack(square, enemy) for square in squares], len(squares)
+    return lambda: board.threatened_pieces(), 1
+
+
+def time_position_ops(samples):
+    """Times move validation, attack tests, undo, rendering and move generation.
+
+    Every position is copied first, so caches filled by an earlier round
+    are not reused.
+
+    Returns:
+        dict: move_piece_us, attack_us, undo_move_us, display_us and
+        legal_moves_us, averaged per call.
+    """
+    totals = dict.fromkeys(('move_piece_us', 'attack_us', 'undo_move_us', 'display_us',
+                            'legal_moves_us'), 0.0)
+    calls = dict.fromkeys(totals, 0)
+    clock = time.perf_counter
+    sink = io.StringIO()
+
+    def timed(name, function, *args, count=1):
+        started = clock()
+        function(*args)
+        totals[name] += clock() - started
+        calls[name] += count
+
+    with contextlib.redirect_stdout(sink):
+        for position, legal, illegal in samples:
+            board = position.copy()
+            timed('legal_moves_us', board.legal_moves)
+            probe, probes = _attack_probe(board)
+            timed('attack_us', probe, count=probes)
+            # The rejected move prints a message, which goes to the sink.
+            timed('move_piece_us', board.move_piece, *illegal)
+            timed('move_piece_us', board.move_piece, *legal)
+            timed('undo_move_us', board.undo_move)
+            timed('display_us', board.display)
+            sink.seek(0)
+            sink.truncate()
+    return {name: totals[name] * 1e6 / calls[name] for name in totals}
+
+
+def replay_archive(path, variant):
+    """Replays every game of a variant in an archive through move_piece().
+
+    Games are replayed the way a live session plays them, with validation
+    and undo history, and the memory the board holds at the end of each
+    game is measured with tracemalloc.
+
+    Returns:
+        dict: replay_game_ms and memory_per_game_kb, averaged per game,
+        and games, the number of games replayed.
+
+    Raises:
+        ValueError: If the archive has no game of the variant or a move
+                    in it is rejected.
+    """
+    games = [game for game in GameArchiveReader(path) if game.variant == variant]
+    if not games:
+        raise ValueError(f"{path} has no {variant} games")
+    elapsed = 0.0
+    memory = 0
+    sink = io.StringIO()
+    was_tracing = tracemalloc.is_tracing()
+    with contextlib.redirect_stdout(sink):
+        for game in games:
+            moves = [unpack(move, game.size)[:2] for move in game.moves]
+            started = time.perf_counter()
+            board = VARIANTS[variant]()
+            for start, end in moves:
+                if not board.move_piece(start, end):
+                    raise ValueError(f"Game {game.game_id}: illegal move {start}-{end}")
+            elapsed += time.perf_counter() - started
+            del board
+
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            board = VARIANTS[variant]()
+            for start, end in moves:
+                board.move_piece(start, end)
+            memory += tracemalloc.get_traced_memory()[0] - before
+            if not was_tracing:
+                tracemalloc.stop()
+            del board
+    return {'replay_game_ms': elapsed * 1000 / len(games),
+            'memory_per_game_kb': memory / 1024 / len(games),
+            'games': len(games)}
+
+
+def run_suite(variants, positions=200, games=20, plies=80, rounds=3, seed=0, archive=None):
+    """Runs the benchmark suite.
+
+    Timings are the best of several rounds, which filters out most noise
+    from other processes; memory is deterministic.
+
+    Args:
+        variants (Iterable[str]): Variant names.
+        positions (int): Random positions per variant.
+        games (int): Random games per variant written to a temporary archive
+                     when no archive is given.
+        plies (int): Length of those games.
+        rounds (int): Repetitions of every timing.
+        seed (int): Random seed.
+        archive (str|None): Game archive to replay instead of random games.
+
+    Returns:
+        dict[str, float]: 'variant.metric' -> value, see METRICS.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for variant in variants:
+            samples = sample_positions(variant, positions, seed)
+            path = archive
+            if path is None:
+                path = os.path.join(directory, f'{variant}.cca')
+                write_archive(path, variant, games, plies, seed)
+            rows = [time_position_ops(samples) for _ in range(rounds)]
+            replays = [replay_archive(path, variant) for _ in range(rounds)]
+            for name in rows[0]:
+                results[f'{variant}.{name}'] = min(row[name] for row in rows)
+            results[f'{variant}.replay_game_ms'] = min(row['replay_game_ms'] for row in replays)
+            results[f'{variant}.memory_per_game_kb'] = replays[0]['memory_per_game_kb']
+    return results
+
+
+def save_baseline(path, results):
+    """Writes results as a JSON baseline."""
+    data = {
+        'version': VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'metrics': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_baseline(path):
+    """Reads the metrics of a JSON baseline.
+
+    Raises:
+        ValueError: If the file is not a baseline of this version.
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or data.get('version') != VERSION:
+        raise ValueError(f"{path} is not a benchmark baseline")
+    return data['metrics']
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Finds the metrics that got worse than a baseline allows.
+
+    Args:
+        results (dict[str, float]): Current metrics.
+        baseline (dict[str, float]): Baseline metrics.
+        threshold (float): Allowed relative increase, 0.25 for 25%.
+
+    Returns:
+        list[tuple[str, float, float]]: (metric, baseline, current) of every
+        regression; metrics missing from either side are skipped.
+    """
+    return [(name, baseline[name], value) for name, value in sorted(results.items())
+            if name in baseline and value > baseline[name] * (1 + threshold)]
+
+
+def main(argv=None):
+    """Command-line entry point: python -m engine.benchmark --baseline bench.json
+
+    Exits with status 1 if a metric regressed beyond the threshold.
+    """
+    parser = argparse.ArgumentParser(description="Набор замеров производительности игровой сессии")
+    parser.add_argument('--variant', action='append', choices=sorted(VARIANTS),
+                        help="варианты (по умолчанию все)")
+    parser.add_argument('--positions', type=int, default=200, help="случайных позиций на вариант")
+    parser.add_argument('--games', type=int, default=20, help="случайных партий для воспроизведения")
+    parser.add_argument('--plies', type=int, default=80, help="длина случайных партий")
+    parser.add_argument('--rounds', type=int, default=3, help="повторов каждого замера")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--archive', help="архив партий вместо случайных")
+    parser.add_argument('--baseline', help="JSON с эталонными значениями для сравнения")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="допустимое ухудшение, доля (0.25 = 25%%)")
+    parser.add_argument('--save', help="сохранить результаты как эталон в JSON")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.baseline:
+        try:
+            baseline = load_baseline(args.baseline)
+        except (OSError, ValueError) as e:
+            parser.error(f"не удалось прочитать эталон: {e}")
+    results = run_suite(args.variant or list(VARIANTS), args.positions, args.games, args.plies,
+                        args.rounds, args.seed, args.archive)
+    regressions = compare(results, baseline, args.threshold)
+    regressed = {name for name, _, _ in regressions}
+    for name, value in sorted(results.items()):
+        line = f"{name:<30} {value:10.2f}"
+        if name in baseline:
+            change = (value / baseline[name] - 1) * 100 if baseline[name] else 0.0
+            line += f"  эталон {baseline[name]:10.2f} {change:+7.1f}%"
+            line += "  регрессия!" if name in regressed else " " * 12
+        print(f"{line}  {METRICS[name.partition('.')[2]]}")
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"Эталон сохранён в {args.save}")
+    if regressions:
+        print(f"Ухудшение больше {args.threshold:.0%}: {', '.join(sorted(regressed))}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+import functools
+
+
+KING_STEPS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+KNIGHT_STEPS = ((1, 2), (2, 1), (-1, 2), (-2, 1), (1, -2), (2, -1), (-1, -2), (-2, -1))
+ORTHOGONAL = ((1, 0), (-1, 0), (0, 1), (0, -1))
+DIAGONAL = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def iter_bits(bitboard):
+    """Yields the square indices set in a bitboard, lowest first."""
+    while bitboard:
+        low = bitboard & -bitboard
+        yield low.bit_length() - 1
+        bitboard ^= low
+
+
+class BoardGeometry:
+    """Square numbering and precomputed bitboard tables for one board size.
+
+    Square (row, col) is bit row * cols + col of a Python int, so a set of
+    squares on a board of any size is a single integer. Moving a whole set
+    one step in some direction is a shift plus a mask that first drops the
+    squares which would leave the board (or wrap onto the next row).
+    Tables are built on first use and kept, and geometry() hands out one
+    instance per size, so every board of that size shares them.
+
+    Attributes:
+        rows (int): Number of rows.
+        cols (int): Number of columns.
+        squares (int): rows * cols.
+        full (int): Bitboard with every square set.
+        dark (int): Squares with an odd row + col, where checkers are played.
+    """
+
+    def __init__(self, rows, cols):
+        """Creates the geometry of a rows x cols board.
+
+        Raises:
+            ValueError: If a dimension is smaller than 4.
+        """
+        if rows < 4 or cols < 4:
+            raise ValueError(f"Board must be at least 4x4, got {rows}x{cols}")
+        self.rows = rows
+        self.cols = cols
+        self.squares = rows * cols
+        self.full = (1 << self.squares) - 1
+        self.dark = 0
+        for row in range(rows):
+            for col in range(cols):
+                if (row + col) % 2:
+                    self.dark |= 1 << row * cols + col
+        self._shift_masks = {}
+        self._leaps = {}
+        self._rays = {}
+        self._lines = {}
+
+    def index(self, row, col):
+        """Returns the bit index of a square."""
+        return row * self.cols + col
+
+    def square(self, index):
+        """Returns the (row, col) of a bit index."""
+        return divmod(index, self.cols)
+
+    def row_mask(self, row):
+        """Returns the bitboard of one row."""
+        return ((1 << self.cols) - 1) << row * self.cols
+
+    def shift_mask(self, dr, dc):
+        """Returns the squares that stay on the board when moved by (dr, dc)."""
+        mask = self._shift_masks.get((dr, dc))
+        if mask is None:
+            mask = 0
+            for row in range(max(0, -dr), min(self.rows, self.rows - dr)):
+                for col in range(max(0, -dc), min(self.cols, self.cols - dc)):
+                    mask |= 1 << row * self.cols + col
+            self._shift_masks[(dr, dc)] = mask
+        return mask
+
+    def shift(self, bitboard, dr, dc):
+        """Moves every square of a bitboard by (dr, dc), dropping those that leave the board."""
+        bitboard &= self.shift_mask(dr, dc)
+        offset = dr * self.cols + dc
+        return bitboard << offset if offset >= 0 else bitboard >> -offset
+
+    def leaps(self, steps):
+        """Returns, for every square, the bitboard of squares one of the steps reaches.
+
+        Args:
+            steps (tuple[tuple[int, int], ...]): (dr, dc) offsets.
+
+        Returns:
+            list[int]: Bitboards indexed by square.
+        """
+        table = self._leaps.get(steps)
+        if table is None:
+            table = [0] * self.squares
+            for dr, dc in steps:
+                mask = self.shift_mask(dr, dc)
+                offset = dr * self.cols + dc
+                for index in iter_bits(mask):
+                    table[index] |= 1 << index + offset
+            self._leaps[steps] = table
+        return table
+
+    def ray(self, dr, dc):
+        """Returns, for every square, the squares from it to the edge in one direction, itself excluded."""
+        table = self._rays.get((dr, dc))
+        if table is None:
+            table = [0] * self.squares
+            mask = self.shift_mask(dr, dc)
+            offset = dr * self.cols + dc
+            # Walk from the far edge backwards, so each ray extends the next square's.
+            order = range(self.squares - 1, -1, -1) if offset > 0 else range(self.squares)
+            for index in order:
+                if mask >> index & 1:
+                    table[index] = 1 << index + offset | table[index + offset]
+            self._rays[(dr, dc)] = table
+        return table
+
+    def lines(self, directions):
+        """Returns, for every square, the union of its rays in the given directions.
+
+        This is what a slider reaches on an empty board.
+
+        Args:
+            directions (tuple[tuple[int, int], ...]): Slide directions.
+
+        Returns:
+            list[int]: Bitboards indexed by square.
+        """
+        table = self._lines.get(directions)
+        if table is None:
+            table = [0] * self.squares
+            for dr, dc in directions:
+                for index, ray in enumerate(self.ray(dr, dc)):
+                    table[index] |= ray
+            self._lines[directions] = table
+        return table
+
+    def slide(self, index, directions, occupied):
+        """Returns the squares a slider reaches from a square.
+
+        Each ray stops at its first occupied square, which is included, so
+        captures are part of the result and own pieces have to be filtered
+        by the caller.
+
+        Args:
+            index (int): Bit index of the slider.
+            directions (tuple[tuple[int, int], ...]): Slide directions.
+            occupied (int): Bitboard of all pieces.
+
+        Returns:
+            int: Bitboard of reachable squares.
+        """
+        targets = 0
+        for dr, dc in directions:
+            rays = self.ray(dr, dc)
+            ray = rays[index]
+            blockers = ray & occupied
+            if blockers:
+                if dr * self.cols + dc > 0:
+                    first = (blockers & -blockers).bit_length() - 1
+                else:
+                    first = blockers.bit_length() - 1
+                ray ^= rays[first]
+            targets |= ray
+        return targets
+
+    def __repr__(self):
+        return f"BoardGeometry({self.rows}x{self.cols})"
+
+
+@functools.lru_cache(maxsize=None)
+def geometry(rows, cols=None):
+    """Returns the shared BoardGeometry of a size; square boards need only rows."""
+    return BoardGeometry(rows, cols or rows)
+
+
+def benchmark(board, seconds=1.0, max_plies=60, seed=0):
+    """Measures move generation and make/unmake speed with random games.
+
+    Random games of up to max_plies are played from the board's position
+    and taken back again until the time is up.
+
+    Args:
+        board (GameState): Starting position; restored on return.
+        seconds (float): Time to spend.
+        max_plies (int): Length of each random game.
+        seed (int): Random seed.
+
+    Returns:
+        dict: positions (generations run), moves (moves generated) and
+        elapsed seconds.
+    """
+    # Imported here, like argparse in main(): every board imports this module.
+    import random
+    import time
+
+    rng = random.Random(seed)
+    positions = moves = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        made = 0
+        for _ in range(max_plies):
+            legal = board.legal_moves()
+            positions += 1
+            moves += len(legal)
+            if not legal:
+                break
+            board.make_move(*rng.choice(legal))
+            made += 1
+        for _ in range(made):
+            board.unmake_move()
+    return {'positions': positions, 'moves': moves, 'elapsed': time.perf_counter() - started}
+
+
+def main(argv=None):
+    """Command-line entry point: python -m engine.bitboard --sizes 8 10 12"""
+    import argparse
+
+    from .variants import VARIANTS
+
+    parser = argparse.ArgumentParser(description="Скорость генерации ходов на досках разного размера")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[8, 10, 12])
+    parser.add_argument('--variant', action='append', choices=sorted(VARIANTS),
+                        help="варианты (по умолчанию все)")
+    parser.add_argument('--seconds', type=float, default=2.0, help="время на каждый замер")
+    args = parser.parse_args(argv)
+
+    for name in args.variant or sorted(VARIANTS):
+        for size in args.sizes:
+            board = VARIANTS[name](size=size)
+            stats = benchmark(board, args.seconds)
+            print(f"{name} {size}x{size}: "
+                  f"{stats['positions'] / stats['elapsed']:.0f} позиций/с, "
+                  f"{stats['moves'] / stats['elapsed']:.0f} ходов/с")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+import struct
+from multiprocessing import shared_memory
+
+from .state import VARIANT_IDS, VARIANT_NAMES
+
+
+MAGIC = b'CCPOOL01'
+HEADER = struct.Struct('<8sII')
+SLOT = struct.Struct('<IBBBxH2x64s4x')
+SQUARES_OFFSET = struct.calcsize('<IBBBxH2x')
+FREE = 0
+USED = 1
+COLOR_CODES = {'white': 0, 'black': 1}
+COLOR_NAMES = ('white', 'black')
+GENERATION_MASK = 0xFFFFFFFF
+
+
+class StaleHandleError(KeyError):
+    """Raised when a handle refers to a slot that was freed or reused."""
+
+
+def make_handle(index, generation):
+    """Combines a slot index and its generation into a handle."""
+    return generation << 32 | index
+
+
+def split_handle(handle):
+    """Splits a handle into (slot index, generation)."""
+    return handle & 0xFFFFFFFF, handle >> 32
+
+
+class BoardPool:
+    """Fixed-size position slots in shared memory.
+
+    Instead of pickling boards (their piece objects and move history) for
+    every task, a process stores the position in a slot and passes the
+    slot's handle, a plain integer, through the task queue. Workers
+    attach to the pool by name and read or overwrite the slot in place.
+
+    Each slot holds a generation counter that is incremented when the slot
+    is freed. A handle carries the generation it was issued with, so using
+    a handle after its slot was freed or reallocated raises
+    StaleHandleError instead of silently reading another position.
+
+    Slot layout (80 bytes): generation u32, state u8, variant id u8,
+    side to move u8, halfmove clock u16 and the 64 squares as ASCII piece
+    letters (see squares_bytes() of the boards).
+
+    Allocation scans the shared slot states, so any process may allocate
+    and free, provided the same multiprocessing lock is passed to every
+    process that does; a pool used by a single allocating process needs
+    no lock.
+
+    Attributes:
+        name (str): Shared memory block name, used by attach().
+        capacity (int): Number of slots.
+    """
+
+    def __init__(self, capacity=1024, name=None, lock=None):
+        """Creates a pool in a new shared memory block.
+
+        Args:
+            capacity (int): Number of slots.
+            name (str|None): Block name; chosen by the system when omitted.
+            lock (multiprocessing.Lock|None): Lock guarding allocation.
+        """
+        self._shm = shared_memory.SharedMemory(name=name, create=True,
+                                               size=HEADER.size + capacity * SLOT.size)
+        HEADER.pack_into(self._shm.buf, 0, MAGIC, capacity, SLOT.size)
+        self._setup(lock)
+        self._owner = True
+
+    @classmethod
+    def attach(cls, name, lock=None):
+        """Opens an existing pool, typically inside a worker process.
+
+        Args:
+            name (str): BoardPool.name of the creating process.
+            lock (multiprocessing.Lock|None): The pool's allocation lock, if any.
+
+        Returns:
+            BoardPool: A view of the same slots.
+
+        Raises:
+            ValueError: If the block is not a board pool.
+        """
+        pool = cls.__new__(cls)
+        pool._shm = shared_memory.SharedMemory(name=name)
+        magic, _, slot_size = HEADER.unpack_from(pool._shm.buf, 0)
+        if magic != MAGIC or slot_size != SLOT.size:
+            pool._shm.close()
+            raise ValueError(f"{name} is not a board pool")
+        pool._setup(lock)
+        pool._owner = False
+        return pool
+
+    def _setup(self, lock):
+        self.name = self._shm.name
+        self.capacity = HEADER.unpack_from(self._shm.buf, 0)[1]
+        self._lock = lock
+        self._hint = 0
+
+    def _offset(self, index):
+        return HEADER.size + index * SLOT.size
+
+    def _check(self, handle):
+        index, generation = split_handle(handle)
+        if index >= self.capacity:
+            raise StaleHandleError(handle)
+        offset = self._offset(index)
+        current, state = struct.unpack_from('<IB', self._shm.buf, offset)
+        if state != USED or current != generation:
+            raise StaleHandleError(handle)
+        return offset
+
+    def allocate(self):
+        """Reserves a free slot.
+
+        Returns:
+            int: Handle of the slot.
+
+        Raises:
+            MemoryError: If every slot is in use.
+        """
+        if self._lock is not None:
+            self._lock.acquire()
+        try:
+            buf = self._shm.buf
+            for step in range(self.capacity):
+                index = (self._hint + step) % self.capacity
+                offset = self._offset(index)
+                if buf[offset + 4] == FREE:
+                    buf[offset + 4] = USED
+                    self._hint = index + 1
+                    return make_handle(index, struct.unpack_from('<I', buf, offset)[0])
+        finally:
+            if self._lock is not None:
+                self._lock.release()
+        raise MemoryError("Board pool is full")
+
+    def free(self, handle):
+        """Releases a slot; its outstanding handles become stale.
+
+        Raises:
+            StaleHandleError: If the handle is already stale.
+        """
+        if self._lock is not None:
+            self._lock.acquire()
+        try:
+            offset = self._check(handle)
+            generation = struct.unpack_from('<I', self._shm.buf, offset)[0]
+            struct.pack_into('<IB', self._shm.buf, offset, (generation + 1) & GENERATION_MASK, FREE)
+        finally:
+            if self._lock is not None:
+                self._lock.release()
+
+    def store(self, handle, board, color, variant=None):
+        """Writes a position into a slot.
+
+        Args:
+            handle (int): Slot handle from allocate().
+            board: ChessBoard, ModifiedChessBoard or CheckersBoard.
+            color (str): Side to move.
+            variant (str|None): Variant name; derived from the board when omitted.
+
+        Raises:
+            StaleHandleError: If the handle is stale.
+            ValueError: If the board is not 8x8; slots hold 64 squares.
+        """
+        if board.size != 8:
+            raise ValueError(f"Pool slots hold 8x8 boards, got {board.size}x{board.size}")
+        if variant is None:
+            from .variants import variant_name
+
+            variant = variant_name(board)
+        offset = self._check(handle)
+        generation = struct.unpack_from('<I', self._shm.buf, offset)[0]
+        SLOT.pack_into(self._shm.buf, offset, generation, USED, VARIANT_IDS[variant],
+                       COLOR_CODES[color], min(board.halfmove_clock, 0xFFFF),
+                       board.squares_bytes())
+
+    def put(self, board, color, variant=None):
+        """Allocates a slot and stores a position in it; returns the handle."""
+        handle = self.allocate()
+        self.store(handle, board, color, variant)
+        return handle
+
+    def load(self, handle):
+        """Rebuilds the position of a slot as a new board.
+
+        Args:
+            handle (int): Slot handle.
+
+        Returns:
+            tuple[Board, str, str]: The board, the side to move and the variant.
+
+        Raises:
+            StaleHandleError: If the handle is stale.
+        """
+        from .variants import VARIANTS
+
+        offset = self._check(handle)
+        _, _, variant, color, clock, squares = SLOT.unpack_from(self._shm.buf, offset)
+        name = VARIANT_NAMES[variant]
+        cls = VARIANTS[name]
+        # set_squares() initializes every attribute, so the start position is not built.
+        board = cls.__new__(cls)
+        board.set_squares(squares, clock, COLOR_NAMES[color])
+        return board, COLOR_NAMES[color], name
+
+    def squares(self, handle):
+        """Returns a zero-copy, writable view of a slot's 64 squares.
+
+        The view must be released before the pool is closed.
+
+        Raises:
+            StaleHandleError: If the handle is stale.
+        """
+        offset = self._check(handle) + SQUARES_OFFSET
+        return self._shm.buf[offset:offset + 64]
+
+    def in_use(self):
+        """Returns the number of allocated slots."""
+        buf = self._shm.buf
+        return sum(1 for index in range(self.capacity) if buf[self._offset(index) + 4] == USED)
+
+    def close(self):
+        """Detaches from the block; the creating process also destroys it."""
+        if self._shm is None:
+            return
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,277 @@
+import argparse
+import json
+import mmap
+import random
+import struct
+
+from .notation import decode_move, encode_move, move_to_uci, uci_to_move
+from .variants import VARIANTS, variant_name
+
+
+MAGIC = b'CCBOOK01'
+HEADER = struct.Struct('>8s8s')
+ENTRY = struct.Struct('>QHHi')
+KEY = struct.Struct('>Q')
+
+RESULT_POINTS = {'1-0': 1, '0-1': -1, '1/2-1/2': 0}
+
+
+def read_games(path):
+    """Reads recorded games from a file.
+
+    Two formats are accepted: JSON lines as written by the tournament
+    runner (objects with 'moves' and 'result'), or plain text with one
+    game per line as coordinate moves followed by the result.
+
+    Args:
+        path (str): Path of the game collection.
+
+    Yields:
+        tuple[list[str], str]: Moves such as 'e2e4' and the result string.
+    """
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('{'):
+                record = json.loads(line)
+                yield record['moves'], record['result']
+            else:
+                *moves, result = line.split()
+                yield moves, result
+
+
+class BookBuilder:
+    """Accumulates book statistics from games and writes the book file.
+
+    Every position reached within the first max_ply plies gets one entry
+    per move played in it. The weight counts points scored by the side
+    playing the move (two per win, one per draw), the score is the sum of
+    game results from the mover's point of view.
+
+    Attributes:
+        variant (str): Key of VARIANTS the games belong to.
+        board_class (type): Board class of the variant.
+        max_ply (int): Number of plies of each game taken into the book.
+        stats (dict[tuple[int, int], list[int]]): (hash, move) -> [weight, score, games].
+    """
+
+    def __init__(self, variant, max_ply=20):
+        """Creates an empty builder.
+
+        Args:
+            variant (str): Key of VARIANTS.
+            max_ply (int): Depth of the book in plies.
+        """
+        self.board_class = VARIANTS[variant]
+        self.variant = variant
+        self.max_ply = max_ply
+        self.stats = {}
+
+    def add_game(self, moves, result):
+        """Replays one game and records its opening moves.
+
+        Args:
+            moves (list[str]): Coordinate moves such as 'e2e4'.
+            result (str): '1-0', '0-1' or '1/2-1/2'; other games are skipped.
+
+        Returns:
+            bool: False if the game was skipped or contained a malformed or
+            illegal move.
+        """
+        if result not in RESULT_POINTS:
+            return False
+        board = self.board_class()
+        color = 'white'
+        for text in moves[:self.max_ply]:
+            try:
+                move = uci_to_move(text)
+            except ValueError:
+                return False
+            if move not in board.legal_moves(color):
+                return False
+            points = RESULT_POINTS[result] if color == 'white' else -RESULT_POINTS[result]
+            entry = self.stats.setdefault((board.position_hash(color), encode_move(move)),
+                                          [0, 0, 0])
+            entry[0] += points + 1
+            entry[1] += points
+            entry[2] += 1
+            board.make_move(*move)
+            color = 'black' if color == 'white' else 'white'
+        return True
+
+    def write(self, path, min_games=1):
+        """Writes the sorted book file.
+
+        Weights are scaled down proportionally if they overflow 16 bits.
+
+        Args:
+            path (str): Output file.
+            min_games (int): Moves played fewer times are left out.
+
+        Returns:
+            int: Number of entries written.
+        """
+        entries = sorted((key, move, weight, score)
+                         for (key, move), (weight, score, games) in self.stats.items()
+                         if games >= min_games)
+        largest = max((entry[2] for entry in entries), default=0)
+        scale = 0xFFFF / largest if largest > 0xFFFF else 1
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, self.variant.encode('ascii')))
+            for key, move, weight, score in entries:
+                f.write(ENTRY.pack(key, move, max(1, int(weight * scale)) if weight else 0, score))
+        return len(entries)
+
+
+class OpeningBook:
+    """Read-only opening book accessed through mmap.
+
+    The file is never loaded into memory: lookups binary-search the sorted
+    entries directly in the mapping, so any number of processes can share
+    one book through the operating system's page cache.
+
+    Attributes:
+        path (str): Book file.
+        variant (str): Variant the book was built for.
+        size (int): Number of entries.
+    """
+
+    def __init__(self, path):
+        """Opens and maps a book file.
+
+        Args:
+            path (str): Path written by BookBuilder.write().
+
+        Raises:
+            ValueError: If the file is not a book.
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, variant = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an opening book")
+        self.variant = variant.rstrip(b'\0').decode('ascii')
+        self.size = (len(self._map) - HEADER.size) // ENTRY.size
+
+    def close(self):
+        """Releases the mapping and the file."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _key_at(self, index):
+        return KEY.unpack_from(self._map, HEADER.size + index * ENTRY.size)[0]
+
+    def lookup(self, key):
+        """Returns all entries of a position hash.
+
+        Args:
+            key (int): Position hash.
+
+        Returns:
+            list[tuple[tuple, int, int]]: (move, weight, score) triples.
+        """
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        entries = []
+        while low < self.size:
+            entry_key, move, weight, score = ENTRY.unpack_from(
+                self._map, HEADER.size + low * ENTRY.size)
+            if entry_key != key:
+                break
+            entries.append((decode_move(move), weight, score))
+            low += 1
+        return entries
+
+    def moves(self, board, color):
+        """Returns the legal book moves of a position, best weighted first.
+
+        Book entries hold 16-bit moves of 8x8 boards, so a position of any
+        other size is out of book, as is a position of another variant than
+        the one the book was built for.
+
+        Args:
+            board: Position to look up.
+            color (str): Side to move.
+
+        Returns:
+            list[tuple[tuple, int, int]]: (move, weight, score) triples.
+        """
+        if board.size != 8 or variant_name(board) != self.variant:
+            return []
+        legal = board.legal_moves(color)
+        entries = [entry for entry in self.lookup(board.position_hash(color))
+                   if entry[0] in legal]
+        return sorted(entries, key=lambda entry: -entry[1])
+
+    def choose(self, board, color, rng=random):
+        """Picks a book move at random, proportionally to its weight.
+
+        Args:
+            board: Position to look up.
+            color (str): Side to move.
+            rng (random.Random): Source of randomness.
+
+        Returns:
+            tuple|None: (start, end) move, or None when out of book.
+        """
+        entries = [entry for entry in self.moves(board, color) if entry[1] > 0]
+        if not entries:
+            return None
+        return rng.choices([entry[0] for entry in entries],
+                           weights=[entry[1] for entry in entries])[0]
+
+
+def main(argv=None):
+    """Command-line entry point: python -m engine.book build|probe ..."""
+    parser = argparse.ArgumentParser(description="Дебютная книга")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="построить книгу из партий")
+    build.add_argument('games', nargs='+', help="файлы партий (JSON lines или текст)")
+    build.add_argument('-o', '--output', required=True)
+    build.add_argument('--variant', choices=sorted(VARIANTS), default='chess')
+    build.add_argument('--max-ply', type=int, default=20)
+    build.add_argument('--min-games', type=int, default=1)
+    probe = commands.add_parser('probe', help="показать ходы книги для позиции")
+    probe.add_argument('book')
+    probe.add_argument('--moves', default='', help="ходы от начальной позиции, e2e4 e7e5 ...")
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        builder = BookBuilder(args.variant, args.max_ply)
+        added = skipped = 0
+        for path in args.games:
+            for moves, result in read_games(path):
+                if builder.add_game(moves, result):
+                    added += 1
+                else:
+                    skipped += 1
+        count = builder.write(args.output, args.min_games)
+        print(f"Партий: {added}, пропущено: {skipped}, записей в книге: {count}")
+    else:
+        with OpeningBook(args.book) as book:
+            board = VARIANTS[book.variant]()
+            color = 'white'
+            for text in args.moves.split():
+                board.make_move(*uci_to_move(text))
+                color = 'black' if color == 'white' else 'white'
+            for move, weight, score in book.moves(board, color):
+                print(f"{move_to_uci(move)} вес {weight} оценка {score:+d}")
+
+
+if __name__ == '__main__':
+    main()
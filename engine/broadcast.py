@@ -0,0 +1,449 @@
+import argparse
+import asyncio
+import collections
+import struct
+import time
+
+from .state import decode_state, encode_state
+from .variants import VARIANTS
+
+
+KEYFRAME = 0
+DELTA = 1
+NO_CLOCK = 0xFFFFFFFF
+
+# kind, sequence number, side to move in check, white and black clock in
+# milliseconds, number of threatened squares; followed by the squares as
+# uint16 indices and then encode_state() output.
+KEYFRAME_HEADER = struct.Struct('<BIBIIB')
+# kind, sequence number, move (row, col, row, col), move flags, side to move
+# in check, halfmove clock, white and black clock in milliseconds, number of
+# changed squares, number of threatened squares; followed by the changes as
+# (uint16 index, piece letter) and the threatened squares as uint16 indices.
+DELTA_HEADER = struct.Struct('<BI4BBBHIIBB')
+CHANGE = struct.Struct('<Hc')
+SQUARE = struct.Struct('<H')
+
+
+def _clock_millis(clocks, color):
+    seconds = (clocks or {}).get(color)
+    return NO_CLOCK if seconds is None else min(max(int(seconds * 1000), 0), NO_CLOCK - 1)
+
+
+def _clock_seconds(millis):
+    return None if millis == NO_CLOCK else millis / 1000
+
+
+class Update:
+    """A decoded broadcast frame.
+
+    Attributes:
+        kind (int): KEYFRAME or DELTA.
+        seq (int): Sequence number; a keyframe carries that of the last
+                   move it includes.
+        board (GameState|None): Full position of a keyframe.
+        variant (str|None): Variant of a keyframe.
+        move (tuple|None): (start, end) of a delta.
+        flags (int): engine.move flags of a delta's move.
+        changes (list[tuple[int, str]]): (square index, piece letter or '.')
+                                         of every square a delta changed.
+        halfmove_clock (int|None): Reversible plies after a delta.
+        check (bool): Whether the side to move is in check.
+        threats (list[int]): Indices of the side to move's threatened pieces.
+        clocks (dict[str, float|None]): Remaining seconds per color, None when untimed.
+    """
+
+    __slots__ = ('kind', 'seq', 'board', 'variant', 'move', 'flags', 'changes',
+                 'halfmove_clock', 'check', 'threats', 'clocks')
+
+    def __init__(self, kind, seq):
+        self.kind = kind
+        self.seq = seq
+        self.board = None
+        self.variant = None
+        self.move = None
+        self.flags = 0
+        self.changes = []
+        self.halfmove_clock = None
+        self.check = False
+        self.threats = []
+        self.clocks = {}
+
+    def apply(self, squares):
+        """Writes a delta's changes into a bytearray from squares_bytes()."""
+        for index, letter in self.changes:
+            squares[index] = ord(letter)
+
+    def __repr__(self):
+        kind = 'keyframe' if self.kind == KEYFRAME else 'delta'
+        return f"Update({kind}, seq={self.seq}, move={self.move}, changes={len(self.changes)})"
+
+
+def decode_frame(data):
+    """Decodes a frame produced by GameBroadcaster.
+
+    Args:
+        data (bytes): One frame.
+
+    Returns:
+        Update: The decoded frame.
+
+    Raises:
+        ValueError: If the frame is malformed.
+    """
+    if not data or data[0] not in (KEYFRAME, DELTA):
+        raise ValueError("Unknown broadcast frame kind")
+    try:
+        if data[0] == KEYFRAME:
+            _, seq, check, white, black, count = KEYFRAME_HEADER.unpack_from(data)
+            update = Update(KEYFRAME, seq)
+            offset = KEYFRAME_HEADER.size
+            update.threats = [SQUARE.unpack_from(data, offset + SQUARE.size * k)[0]
+                              for k in range(count)]
+            update.board, update.variant = decode_state(data[offset + SQUARE.size * count:])
+            update.halfmove_clock = update.board.halfmove_clock
+        else:
+            (_, seq, x1, y1, x2, y2, flags, check, halfmove, white, black,
+             changes, count) = DELTA_HEADER.unpack_from(data)
+            update = Update(DELTA, seq)
+            update.move = ((x1, y1), (x2, y2))
+            update.flags = flags
+            update.halfmove_clock = halfmove
+            offset = DELTA_HEADER.size
+            for _ in range(changes):
+                index, letter = CHANGE.unpack_from(data, offset)
+                update.changes.append((index, letter.decode('ascii')))
+                offset += CHANGE.size
+            update.threats = [SQUARE.unpack_from(data, offset + SQUARE.size * k)[0]
+                              for k in range(count)]
+    except struct.error as e:
+        raise ValueError(f"Truncated broadcast frame: {e}") from None
+    update.check = bool(check)
+    update.clocks = {'white': _clock_seconds(white), 'black': _clock_seconds(black)}
+    return update
+
+
+class Subscription:
+    """One spectator's view of a broadcast, read with async for.
+
+    Yields encoded frames: first the latest keyframe, then every frame
+    published after it, until the broadcast ends. A subscriber that falls
+    more than the broadcaster's max_lag frames behind is dropped:
+    iteration ends and dropped is set, and the client should subscribe
+    again.
+
+    Attributes:
+        dropped (bool): Whether the subscriber was dropped for lagging.
+        closed (bool): Whether iteration has ended.
+    """
+
+    __slots__ = ('_broadcaster', '_pending', '_cursor', 'dropped', 'closed')
+
+    def __init__(self, broadcaster, keyframe, cursor):
+        self._broadcaster = broadcaster
+        self._pending = keyframe
+        self._cursor = cursor
+        self.dropped = False
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._pending is not None:
+            frame, self._pending = self._pending, None
+            return frame
+        broadcaster = self._broadcaster
+        while not self.closed:
+            if self._cursor < broadcaster.next_seq:
+                frame = broadcaster.frame(self._cursor)
+                if frame is None:
+                    self.dropped = True
+                    broadcaster.dropped += 1
+                    self.close()
+                    break
+                self._cursor += 1
+                return frame
+            if broadcaster.finished:
+                self.close()
+                break
+            try:
+                await broadcaster.wait()
+            except asyncio.CancelledError:
+                self.close()
+                raise
+        raise StopAsyncIteration
+
+    def close(self):
+        """Stops the subscription; iteration ends after the current frame."""
+        if not self.closed:
+            self.closed = True
+            self._broadcaster.subscribers -= 1
+
+
+class GameBroadcaster:
+    """Publishes a game to asyncio subscribers as compact binary frames.
+
+    Each move is sent as a delta of a few dozen bytes: the move, the
+    squares it changed, the halfmove clock, the clocks, and the check and
+    threatened-piece flags of the side to move. A full keyframe is sent
+    to everyone only when the position jumps (a new game or navigating
+    the game tree). Every keyframe_interval moves a keyframe is prepared
+    for late joiners only, who then receive the deltas after it.
+
+    Frames are encoded once into a shared ring buffer and every
+    subscriber reads it with its own cursor, so a move costs the same
+    whatever the number of spectators, apart from waking the idle ones.
+    Subscribers that fall off the end of the ring are dropped instead of
+    buffering without bound.
+
+    publish_move() and publish_position() may be called from the thread
+    running the game; frames are handed to the event loop with
+    call_soon_threadsafe() when a loop is given.
+
+    Attributes:
+        variant (str): Variant name, sent in keyframes.
+        keyframe_interval (int): Moves between late-joiner keyframes.
+        max_lag (int): Frames a subscriber may fall behind before it is dropped.
+        next_seq (int): Sequence number of the next frame.
+        finished (bool): Whether close() ended the broadcast.
+        subscribers (int): Active subscriptions.
+        dropped (int): Subscriptions dropped for lagging.
+        published (int): Frames published.
+        bytes_published (int): Total size of the published frames.
+    """
+
+    def __init__(self, variant, keyframe_interval=32, max_lag=256, loop=None):
+        """Creates a broadcaster without a position; publish_position() sets one.
+
+        Args:
+            variant (str): 'chess', 'modified' or 'checkers'.
+            keyframe_interval (int): Moves between late-joiner keyframes.
+            max_lag (int): Frames a subscriber may fall behind.
+            loop (asyncio.AbstractEventLoop|None): Loop the subscribers run
+                                                  in, when publishing from
+                                                  another thread.
+        """
+        self.variant = variant
+        self.keyframe_interval = keyframe_interval
+        self.max_lag = max_lag
+        self.loop = loop
+        self.next_seq = 0
+        self.finished = False
+        self.subscribers = 0
+        self.dropped = 0
+        self.published = 0
+        self.bytes_published = 0
+        self._ring = collections.deque(maxlen=keyframe_interval + max_lag)
+        self._keyframe = None
+        self._keyframe_seq = 0
+        self._waiter = None
+        # Publisher side: placement sent last and moves since the last keyframe.
+        self._squares = None
+        self._since_keyframe = 0
+
+    def _status(self, board):
+        color = board.turn
+        threats = sorted(x * board.size + y for x, y in board.threatened_pieces(color))
+        return board.is_in_check(color), threats
+
+    def _keyframe_frame(self, board, clocks, seq):
+        check, threats = self._status(board)
+        return b''.join((
+            KEYFRAME_HEADER.pack(KEYFRAME, seq, check, _clock_millis(clocks, 'white'),
+                                 _clock_millis(clocks, 'black'), len(threats)),
+            b''.join(SQUARE.pack(index) for index in threats),
+            encode_state(board, self.variant),
+        ))
+
+    def publish_position(self, board, clocks=None):
+        """Sends a keyframe of a new position to every subscriber.
+
+        Args:
+            board (GameState): Position after a jump (new game, undo, goto).
+            clocks (dict[str, float]|None): Remaining seconds per color.
+        """
+        self._squares = board.squares_bytes()
+        self._since_keyframe = 0
+        frame = self._keyframe_frame(board, clocks, self._publisher_seq())
+        self._dispatch(frame, frame)
+
+    def publish_move(self, board, start, end, flags=0, clocks=None):
+        """Sends the delta of a move just played on the board.
+
+        Args:
+            board (GameState): Position after the move.
+            start (tuple[int, int]): (row, col) the piece moved from.
+            end (tuple[int, int]): (row, col) it moved to.
+            flags (int): engine.move flags of the move.
+            clocks (dict[str, float]|None): Remaining seconds per color.
+        """
+        if self._squares is None:
+            self.publish_position(board, clocks)
+            return
+        squares = board.squares_bytes()
+        changes = [CHANGE.pack(index, squares[index:index + 1])
+                   for index, (old, new) in enumerate(zip(self._squares, squares)) if old != new]
+        self._squares = squares
+        check, threats = self._status(board)
+        seq = self._publisher_seq()
+        frame = b''.join((
+            DELTA_HEADER.pack(DELTA, seq, *start, *end, flags, check,
+                              min(board.halfmove_clock, 0xFFFF),
+                              _clock_millis(clocks, 'white'), _clock_millis(clocks, 'black'),
+                              len(changes), len(threats)),
+            b''.join(changes),
+            b''.join(SQUARE.pack(index) for index in threats),
+        ))
+        self._since_keyframe += 1
+        keyframe = None
+        if self._since_keyframe >= self.keyframe_interval:
+            self._since_keyframe = 0
+            keyframe = self._keyframe_frame(board, clocks, seq)
+        self._dispatch(frame, keyframe)
+
+    def _publisher_seq(self):
+        # Frames may still be on their way to the loop, so the publisher
+        # counts on its own.
+        seq = self.published
+        self.published += 1
+        return seq
+
+    def close(self):
+        """Ends the broadcast; subscribers stop after the frames already published."""
+        self._call(self._finish)
+
+    def _call(self, function, *args):
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if self.loop is None or running is self.loop:
+            function(*args)
+        else:
+            self.loop.call_soon_threadsafe(function, *args)
+
+    def _dispatch(self, frame, keyframe):
+        self.bytes_published += len(frame)
+        self._call(self._append, frame, keyframe)
+
+    def _append(self, frame, keyframe):
+        seq = self.next_seq
+        self._ring.append(frame)
+        self.next_seq += 1
+        if keyframe is not None:
+            self._keyframe = keyframe
+            # A full-position keyframe is also the ring frame; joiners skip it.
+            self._keyframe_seq = seq + 1
+        self._wake()
+
+    def _finish(self):
+        self.finished = True
+        self._wake()
+
+    def _wake(self):
+        if self._waiter is not None:
+            if not self._waiter.done():
+                self._waiter.set_result(None)
+            self._waiter = None
+
+    def frame(self, seq):
+        """Returns the frame with a sequence number, None once it left the ring."""
+        first = self.next_seq - len(self._ring)
+        if seq < first:
+            return None
+        return self._ring[seq - first]
+
+    async def wait(self):
+        """Waits until the next frame is published."""
+        waiter = self._waiter
+        if waiter is None or waiter.done():
+            waiter = self._waiter = asyncio.get_running_loop().create_future()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Subscribers await the shared future directly, which wakes them
+            # about twice as fast as shield(); a cancelled subscriber cancels
+            # it for everyone though, so the others just look again.
+            if asyncio.current_task().cancelling():
+                raise
+
+    def subscribe(self):
+        """Adds a spectator.
+
+        Returns:
+            Subscription: Starts with the latest keyframe; before the first
+            publish_position() it just waits for frames.
+        """
+        self.subscribers += 1
+        if self._keyframe is None:
+            return Subscription(self, None, self.next_seq)
+        return Subscription(self, self._keyframe, self._keyframe_seq)
+
+    def stats(self):
+        """Returns the counters as a dict."""
+        return {
+            'subscribers': self.subscribers,
+            'dropped': self.dropped,
+            'frames': self.published,
+            'bytes': self.bytes_published,
+        }
+
+
+async def _spectate(subscription, lag):
+    received = 0
+    async for _ in subscription:
+        received += 1
+        if lag:
+            await asyncio.sleep(lag)
+    return received
+
+
+async def _benchmark(variant, subscribers, moves, slow, seed):
+    import random
+
+    rng = random.Random(seed)
+    board = VARIANTS[variant]()
+    broadcaster = GameBroadcaster(variant, max_lag=16)
+    broadcaster.publish_position(board)
+    tasks = [asyncio.create_task(_spectate(broadcaster.subscribe(), 0.01 if k < slow else 0))
+             for k in range(subscribers)]
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    played = 0
+    for _ in range(moves):
+        legal = board.legal_moves()
+        if not legal:
+            break
+        start, end = rng.choice(legal)
+        flags = board.move_flags(start, end)
+        board.make_move(start, end)
+        broadcaster.publish_move(board, start, end, flags)
+        played += 1
+        # Let the spectators catch up, as a network loop would between moves.
+        await asyncio.sleep(0)
+    broadcaster.close()
+    received = sum(await asyncio.gather(*tasks))
+    return played, received, time.perf_counter() - started, broadcaster.stats()
+
+
+def main(argv=None):
+    """Command-line entry point: python -m engine.broadcast --subscribers 20000"""
+    parser = argparse.ArgumentParser(description="Нагрузочный тест трансляции партии зрителям")
+    parser.add_argument('--variant', default='chess', choices=sorted(VARIANTS))
+    parser.add_argument('--subscribers', type=int, default=10000)
+    parser.add_argument('--moves', type=int, default=100)
+    parser.add_argument('--slow', type=int, default=0, help="зрителей, не успевающих читать")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    played, received, elapsed, stats = asyncio.run(
+        _benchmark(args.variant, args.subscribers, args.moves, args.slow, args.seed))
+    print(f"Ходов: {played}, кадров доставлено: {received} за {elapsed:.2f} с "
+          f"({received / elapsed:.0f} в секунду)")
+    print(f"Средний кадр: {stats['bytes'] / max(stats['frames'], 1):.0f} байт, "
+          f"отключено медленных зрителей: {stats['dropped']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+import argparse
+import itertools
+
+import numpy as np
+
+from .bitboard import DIAGONAL, KING_STEPS, KNIGHT_STEPS, ORTHOGONAL
+
+CHESS_SYMBOLS = 'KQRBNPWDJkqrbnpwdj'
+WHITE, BLACK = 0, 1
+COLORS = ('white', 'black')
+FEN_EXPAND = str.maketrans({str(n): '.' * n for n in range(1, 9)} | {'/': None})
+
+PAWN_CAPTURES = {WHITE: [(-1, -1), (-1, 1)], BLACK: [(1, -1), (1, 1)]}
+
+FEATURE_NAMES = [
+    f"{color}_{name}"
+    for color in COLORS
+    for name in ('material', 'mobility', 'attacked_squares', 'attacks_on_enemy',
+                 'king_zone_attacks', 'in_check')
+]
+
+
+def placement_codes(positions):
+    """Converts positions to a (N, 64) array of piece symbols as bytes.
+
+    Args:
+        positions (Sequence): Chess boards or FEN strings; empty squares
+                              become '.'.
+
+    Returns:
+        np.ndarray: uint8 array, row-major from a8 to h1.
+
+    Raises:
+        ValueError: If a position is not 8x8; the planes have 64 squares.
+    """
+    rows = []
+    for position in positions:
+        if isinstance(position, str):
+            row = position.split()[0].translate(FEN_EXPAND).encode('ascii')
+            if len(row) != 64:
+                raise ValueError(f"Feature planes hold 8x8 boards, got FEN {position.strip()!r}")
+        else:
+            if position.size != 8:
+                raise ValueError(f"Feature planes hold 8x8 boards, "
+                                 f"got {position.size}x{position.size}")
+            row = position.squares_bytes()
+        rows.append(row)
+    return np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(len(rows), 64)
+
+
+def to_planes(codes, symbols=CHESS_SYMBOLS):
+    """Turns symbol codes into one-hot planes, one per symbol.
+
+    Args:
+        codes (np.ndarray): (N, 64) array from placement_codes().
+        symbols (str): Symbol of each plane; white pieces first by default.
+
+    Returns:
+        np.ndarray: (N, len(symbols), 8, 8) uint8 tensor.
+    """
+    letters = np.frombuffer(symbols.encode('ascii'), dtype=np.uint8)
+    planes = codes[:, None, :] == letters[None, :, None]
+    return planes.view(np.uint8).reshape(len(codes), len(symbols), 8, 8)
+
+
+def encode_positions(positions, symbols=CHESS_SYMBOLS):
+    """Converts positions straight to a (N, planes, 8, 8) uint8 tensor."""
+    return to_planes(placement_codes(positions), symbols)
+
+
+def shift(squares, dr, dc):
+    """Moves every set square of (..., 8, 8) arrays by (dr, dc), dropping those leaving the board."""
+    out = np.zeros_like(squares)
+    out[..., max(dr, 0):8 + min(dr, 0), max(dc, 0):8 + min(dc, 0)] = \
+        squares[..., max(-dr, 0):8 - max(dr, 0), max(-dc, 0):8 - max(dc, 0)]
+    return out
+
+
+def _slide(pieces, empty, directions):
+    attacks = np.zeros(pieces.shape, dtype=np.uint8)
+    for dr, dc in directions:
+        ray = pieces
+        for _ in range(7):
+            ray = shift(ray, dr, dc)
+            if not ray.any():
+                break
+            attacks += ray
+            ray = ray & empty
+    return attacks
+
+
+def _leap(pieces, steps):
+    attacks = np.zeros(pieces.shape, dtype=np.uint8)
+    for dr, dc in steps:
+        attacks += shift(pieces, dr, dc)
+    return attacks
+
+
+def _dragon(pieces, empty):
+    attacks = np.zeros(pieces.shape, dtype=np.uint8)
+    for dr, dc in ORTHOGONAL + DIAGONAL:
+        first = shift(pieces, dr, dc) & empty
+        second = shift(first, dr, dc) & empty
+        attacks += shift(second, dr, dc)
+    return attacks
+
+
+def attack_counts(planes):
+    """Counts, for every square, the pieces of each side attacking it.
+
+    Movement follows the piece classes: sliders stop at the first piece,
+    the Dragon reaches exactly three squares along a clear line, the
+    Wizard combines knight and bishop, the Jester moves like a king.
+    Squares held by the attacker's own pieces count as attacked
+    (defended), matching the usual notion of attack maps.
+
+    Args:
+        planes (np.ndarray): (N, 18, 8, 8) tensor in CHESS_SYMBOLS order.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (N, 2, 8, 8) uint8 counts of pieces
+        and of pawns, indexed [position, color, row, col].
+    """
+    planes = planes.astype(bool)
+    empty = ~planes.any(axis=1)
+    pieces = np.zeros((len(planes), 2, 8, 8), dtype=np.uint8)
+    pawns = np.zeros_like(pieces)
+    for color in (WHITE, BLACK):
+        king, queen, rook, bishop, knight, pawn, wizard, dragon, jester = \
+            (planes[:, 9 * color + i] for i in range(9))
+        counts = _leap(king | jester, KING_STEPS)
+        counts += _leap(knight | wizard, KNIGHT_STEPS)
+        counts += _slide(queen | rook, empty, ORTHOGONAL)
+        counts += _slide(queen | bishop | wizard, empty, DIAGONAL)
+        counts += _dragon(dragon, empty)
+        pieces[:, color] = counts
+        pawns[:, color] = _leap(pawn, PAWN_CAPTURES[color])
+    return pieces, pawns
+
+
+def piece_values(symbols=CHESS_SYMBOLS):
+    """Returns the material value of each plane, taken from the piece classes."""
+    # Imported here so that the engine package does not depend on chess at import time.
+    from chess.board import PIECE_BY_LETTER
+
+    return np.array([PIECE_BY_LETTER[symbol.upper()].value for symbol in symbols],
+                    dtype=np.int32)
+
+
+def extract_features(planes, values=None):
+    """Computes per-side features for a batch of chess positions.
+
+    For each side: material, mobility (piece moves to squares not held by
+    own pieces, plus pawn pushes), squares attacked, attacks on enemy
+    pieces, enemy attacks on the 3x3 zone around the own king, and
+    whether that king is attacked. Columns follow FEATURE_NAMES.
+
+    Args:
+        planes (np.ndarray): (N, 18, 8, 8) tensor in CHESS_SYMBOLS order.
+        values (np.ndarray|None): Value of each plane; piece_values() by default.
+
+    Returns:
+        np.ndarray: (N, len(FEATURE_NAMES)) int32 matrix.
+    """
+    if values is None:
+        values = piece_values()
+    n = len(planes)
+    occupied = planes.astype(bool)
+    own = np.stack([occupied[:, :9].any(axis=1), occupied[:, 9:].any(axis=1)], axis=1)
+    empty = ~(own[:, WHITE] | own[:, BLACK])
+    pieces, pawns = attack_counts(planes)
+    attacks = pieces + pawns
+    kings = occupied[:, [0, 9]] | occupied[:, [7, 16]]  # king or dragon planes
+
+    features = np.zeros((n, len(FEATURE_NAMES)), dtype=np.int32)
+    for color in (WHITE, BLACK):
+        enemy = 1 - color
+        offset = 6 * color
+        per_plane = planes[:, 9 * color:9 * color + 9].reshape(n, 9, 64).sum(axis=2, dtype=np.int32)
+        features[:, offset] = per_plane @ values[9 * color:9 * color + 9]
+        push = shift(occupied[:, 9 * color + 5], -1 if color == WHITE else 1, 0) & empty
+        features[:, offset + 1] = ((pieces[:, color] * ~own[:, color]).reshape(n, 64).sum(axis=1)
+                                   + push.reshape(n, 64).sum(axis=1))
+        features[:, offset + 2] = (attacks[:, color] > 0).reshape(n, 64).sum(axis=1)
+        features[:, offset + 3] = (attacks[:, color] * own[:, enemy]).reshape(n, 64).sum(axis=1)
+        zone = kings[:, color] | _leap(kings[:, color], KING_STEPS).astype(bool)
+        features[:, offset + 4] = (attacks[:, enemy] * zone).reshape(n, 64).sum(axis=1)
+        features[:, offset + 5] = (attacks[:, enemy] * kings[:, color]).reshape(n, 64).any(axis=1)
+    return features
+
+
+def iter_batches(positions, chunk_size=4096, features=True):
+    """Streams planes (and features) for any number of positions.
+
+    Only chunk_size positions are held in memory at a time.
+
+    Args:
+        positions (Iterable): Chess boards or FEN strings.
+        chunk_size (int): Positions per batch.
+        features (bool): Also compute extract_features() for each batch.
+
+    Yields:
+        tuple[np.ndarray, np.ndarray|None]: Planes and feature matrix of a batch.
+    """
+    values = piece_values() if features else None
+    iterator = iter(positions)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        planes = encode_positions(chunk)
+        yield planes, extract_features(planes, values) if features else None
+
+
+def main(argv=None):
+    """Command-line entry point: python -m engine.features positions.fen -o features.npy"""
+    parser = argparse.ArgumentParser(description="Признаки позиций для обучения оценки")
+    parser.add_argument('positions', help="файл с позициями FEN, по одной в строке")
+    parser.add_argument('-o', '--output', required=True, help="файл .npy для матрицы признаков")
+    parser.add_argument('--planes', help="файл .npy для тензора плоскостей")
+    parser.add_argument('--chunk-size', type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    with open(args.positions, encoding='utf-8') as f:
+        count = sum(1 for line in f if line.strip())
+    features_out = np.lib.format.open_memmap(args.output, mode='w+', dtype=np.int32,
+                                             shape=(count, len(FEATURE_NAMES)))
+    planes_out = (np.lib.format.open_memmap(args.planes, mode='w+', dtype=np.uint8,
+                                            shape=(count, len(CHESS_SYMBOLS), 8, 8))
+                  if args.planes else None)
+    done = 0
+    with open(args.positions, encoding='utf-8') as f:
+        lines = (line for line in f if line.strip())
+        for planes, features in iter_batches(lines, args.chunk_size):
+            features_out[done:done + len(planes)] = features
+            if planes_out is not None:
+                planes_out[done:done + len(planes)] = planes
+            done += len(planes)
+    features_out.flush()
+    if planes_out is not None:
+        planes_out.flush()
+    print(f"Позиций: {done}, признаков: {len(FEATURE_NAMES)}")
+
+
+if __name__ == '__main__':
+    main()
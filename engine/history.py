@@ -0,0 +1,64 @@
+class PositionHistory:
+    """Stack of position hashes and halfmove clocks for draw detection.
+
+    One entry is pushed per move, holding the hash of the position after
+    it and the number of reversible plies played since the last capture
+    or other irreversible move. Since no position can repeat across an
+    irreversible move, repetition checks only look back that many plies,
+    and only at every second entry, where the same side is to move.
+
+    Attributes:
+        hashes (list[int]): Position hashes, the starting position first.
+        clocks (list[int]): Halfmove clock after each entry.
+    """
+
+    __slots__ = ('hashes', 'clocks')
+
+    def __init__(self, start_hash=0, clock=0):
+        """Starts a history at a position.
+
+        Args:
+            start_hash (int): Hash of the starting position.
+            clock (int): Reversible plies already played before it.
+        """
+        self.hashes = [start_hash]
+        self.clocks = [clock]
+
+    def push(self, position_hash, irreversible):
+        """Records the position reached by a move.
+
+        Args:
+            position_hash (int): Hash of the new position.
+            irreversible (bool): Whether the move resets the halfmove clock.
+        """
+        self.hashes.append(position_hash)
+        self.clocks.append(0 if irreversible else self.clocks[-1] + 1)
+
+    def pop(self):
+        """Forgets the last move; the starting position is always kept."""
+        if len(self.hashes) > 1:
+            self.hashes.pop()
+            self.clocks.pop()
+
+    @property
+    def halfmove_clock(self):
+        """Reversible plies since the last irreversible move."""
+        return self.clocks[-1]
+
+    def repetitions(self):
+        """Returns how many times the current position has occurred, itself included."""
+        hashes = self.hashes
+        current = hashes[-1]
+        count = 1
+        oldest = max(0, len(hashes) - 1 - self.clocks[-1])
+        for index in range(len(hashes) - 3, oldest - 1, -2):
+            if hashes[index] == current:
+                count += 1
+        return count
+
+    def copy(self):
+        """Returns an independent copy."""
+        clone = PositionHistory.__new__(PositionHistory)
+        clone.hashes = self.hashes[:]
+        clone.clocks = self.clocks[:]
+        return clone
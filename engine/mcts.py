@@ -0,0 +1,536 @@
+import argparse
+import concurrent.futures
+import math
+import os
+import random
+import threading
+import time
+
+from .move import CAPTURE, pack, unpack
+from .notation import move_to_uci, uci_to_move
+from .timecontrol import Deadline, TimeManager
+
+
+UCT = 'uct'
+PUCT = 'puct'
+DEFAULT_EXPLORATION = {UCT: math.sqrt(2), PUCT: 2.0}
+DEFAULT_PLAYOUTS = 1000
+
+# Playouts cut off before the end of the game are scored from the static
+# evaluation with the Elo logistic curve: +400 centipawns wins 10 to 1.
+EVAL_SCALE = 400.0
+
+
+def opponent(color):
+    """Returns the color of the other side."""
+    return 'black' if color == 'white' else 'white'
+
+
+def win_probability(score):
+    """Maps a centipawn score to an expected result between 0 and 1."""
+    return 1.0 / (1.0 + 10.0 ** (-score / EVAL_SCALE))
+
+
+def score_from_probability(probability):
+    """Inverse of win_probability(), clamped to a finite centipawn score."""
+    probability = min(max(probability, 0.001), 0.999)
+    return int(round(-EVAL_SCALE * math.log10(1.0 / probability - 1.0)))
+
+
+class MCTSNode:
+    """A position in the Monte Carlo search tree.
+
+    Attributes:
+        move (int|None): Packed move from the parent, see engine.move.pack().
+        parent (MCTSNode|None): Previous position, None for the root.
+        children (list[MCTSNode]|None): Successors, None until expanded.
+        visits (int): Playouts that went through this node.
+        value (float): Sum of their results for the side that made move.
+        prior (float): Selection weight of move under PUCT.
+        key (int|None): position_hash() of the node, set on the first visit.
+        terminal (float|None): Result for the side to move if the game is
+                               over here, None otherwise or while unknown.
+    """
+
+    __slots__ = ('move', 'parent', 'children', 'visits', 'value', 'prior', 'key', 'terminal')
+
+    def __init__(self, parent=None, move=None, prior=1.0):
+        self.move = move
+        self.parent = parent
+        self.children = None
+        self.visits = 0
+        self.value = 0.0
+        self.prior = prior
+        self.key = None
+        self.terminal = None
+
+    def most_visited(self):
+        """Returns the child with the most visits, None if not expanded."""
+        if not self.children:
+            return None
+        return max(self.children, key=lambda child: child.visits)
+
+    def __repr__(self):
+        return f"MCTSNode(visits={self.visits}, value={self.value:.1f})"
+
+
+class MCTSResult:
+    """Outcome of one Monte Carlo search.
+
+    Carries the same attributes as SearchResult, so callers can use either
+    searcher; depth is the length of the most visited line.
+
+    Attributes:
+        best_move (tuple|None): Most visited (start, end) move, None if there are no moves.
+        score (int): Centipawn equivalent of the best move's win rate.
+        win_rate (float): Average result of the best move for the mover, 0 to 1.
+        depth (int): Length of pv.
+        pv (list[tuple]): Most visited line starting with best_move.
+        visits (dict[tuple, int]): Visits of every root move.
+        playouts (int): Playouts run by this search.
+        nodes (int): Same as playouts.
+        reused (int): Root visits inherited from the previous search.
+        elapsed (float): Seconds spent.
+    """
+
+    def __init__(self, best_move, win_rate, pv, visits, playouts, reused, elapsed):
+        self.best_move = best_move
+        self.win_rate = win_rate
+        self.score = score_from_probability(win_rate)
+        self.pv = pv
+        self.depth = len(pv)
+        self.visits = visits
+        self.playouts = playouts
+        self.nodes = playouts
+        self.reused = reused
+        self.elapsed = elapsed
+
+    @property
+    def playouts_per_second(self):
+        """float: Search speed."""
+        return self.playouts / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        return (f"MCTSResult(best_move={self.best_move}, win_rate={self.win_rate:.3f}, "
+                f"playouts={self.playouts}, pps={self.playouts_per_second:.0f})")
+
+
+class MonteCarloSearcher:
+    """Monte Carlo tree search with UCT or PUCT selection.
+
+    Works on any engine.state.GameState board. Boards that also provide
+    pseudo_legal_moves(color) have playout moves sampled from it, with a
+    sampled move rejected if it leaves the mover in check; this skips the
+    legality test of every move the playout does not play.
+
+    Playouts pick random moves, preferring captures with probability
+    capture_bias, and are scored by the static evaluation once they reach
+    max_playout_plies. Under PUCT, captures also get capture_weight times
+    the prior of quiet moves.
+
+    The tree is kept between searches. Every visited node remembers its
+    position hash, so a later search from a position the tree already
+    holds, the root itself, a child or a grandchild (after both sides
+    moved), continues from that subtree.
+
+    With workers > 1 the search is root-parallel: each worker process runs
+    its own tree on the position and only root visit counts and values are
+    merged. Workers keep their trees between searches in the same way.
+
+    Attributes:
+        mode (str): UCT or PUCT.
+        exploration (float): Exploration constant of the selection formula.
+        capture_bias (float): Probability that a playout move is a capture when one exists.
+        capture_weight (float): PUCT prior of captures relative to quiet moves.
+        max_playout_plies (int): Playout length before the evaluation decides.
+        workers (int): Processes searching in parallel; 1 searches in-process.
+        root (MCTSNode|None): Tree of the last search.
+        size (int): Board size of the last search, which the packed moves depend on.
+        playouts (int): Playouts run by the current search.
+    """
+
+    def __init__(self, mode=UCT, exploration=None, capture_bias=0.5, capture_weight=3.0,
+                 max_playout_plies=60, workers=1, seed=None):
+        """Creates a searcher.
+
+        Args:
+            mode (str): UCT or PUCT.
+            exploration (float|None): Exploration constant; sqrt(2) for UCT
+                                      and 2.0 for PUCT by default.
+            capture_bias (float): 0 for uniformly random playouts.
+            capture_weight (float): PUCT prior of captures, quiet moves being 1.
+            max_playout_plies (int): Playout length limit.
+            workers (int): Number of processes for root-parallel search.
+            seed (int|None): Random seed for reproducible searches.
+
+        Raises:
+            ValueError: On an unknown mode.
+        """
+        if mode not in DEFAULT_EXPLORATION:
+            raise ValueError(f"Unknown MCTS mode {mode!r}")
+        self.mode = mode
+        self.exploration = exploration if exploration is not None else DEFAULT_EXPLORATION[mode]
+        self.capture_bias = capture_bias
+        self.capture_weight = capture_weight
+        self.max_playout_plies = max_playout_plies
+        self.workers = max(1, workers)
+        self.seed = seed
+        self.root = None
+        self.size = 8
+        self.playouts = 0
+        self._rng = random.Random(seed)
+        self._executor = None
+        self._stop_event = threading.Event()
+
+    def settings(self):
+        """Returns the constructor arguments, used to set up worker processes."""
+        return {'mode': self.mode, 'exploration': self.exploration,
+                'capture_bias': self.capture_bias, 'capture_weight': self.capture_weight,
+                'max_playout_plies': self.max_playout_plies}
+
+    def stop(self):
+        """Asks the running search to stop after the current playout."""
+        self._stop_event.set()
+
+    def search(self, board, color, playouts=None, deadline=None):
+        """Searches the position and returns the most visited move.
+
+        Without a playout limit and a deadline DEFAULT_PLAYOUTS are run.
+        The search returns at once when there is only one legal move.
+
+        Args:
+            board: Board to search; restored to its original state on return.
+            color (str): Side to move.
+            playouts (int|None): Number of playouts.
+            deadline (Deadline|None): Stops once its soft limit has passed.
+
+        Returns:
+            MCTSResult: The chosen move and search statistics.
+        """
+        self._stop_event.clear()
+        if playouts is None and deadline is None:
+            playouts = DEFAULT_PLAYOUTS
+        deadline = deadline if deadline is not None else Deadline.infinite()
+        started = time.monotonic()
+        if self.workers > 1:
+            return self._search_parallel(board, color, playouts, deadline, started)
+
+        if board.size != self.size:
+            self.root = None
+            self.size = board.size
+        root = self._reuse_root(board.position_hash(color))
+        reused = root.visits
+        if root.children is None:
+            self._expand(root, board, color)
+        if not root.children:
+            return MCTSResult(None, root.terminal or 0.0, [], {}, 0, reused,
+                              time.monotonic() - started)
+
+        self.playouts = 0
+        while len(root.children) > 1 and not self._stop_event.is_set():
+            if playouts is not None and self.playouts >= playouts:
+                break
+            if deadline.soft_expired():
+                break
+            self._run_playout(board, color)
+            self.playouts += 1
+        return self._result(root, reused, time.monotonic() - started)
+
+    def root_statistics(self, board, color, playouts=None, deadline=None):
+        """Searches and returns raw root statistics, for merging across processes.
+
+        Returns:
+            tuple[dict[int, tuple[int, float]], int]: (visits, value) of every
+            root child keyed by packed move, and the playouts run.
+        """
+        self.search(board, color, playouts, deadline)
+        children = self.root.children or []
+        return {child.move: (child.visits, child.value) for child in children}, self.playouts
+
+    def close(self):
+        """Shuts down the worker processes, if any."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _reuse_root(self, key):
+        root = self.root
+        if root is not None:
+            candidates = [root]
+            for child in root.children or ():
+                candidates.append(child)
+                candidates.extend(child.children or ())
+            for node in candidates:
+                if node.key == key:
+                    node.parent = None
+                    node.move = None
+                    self.root = node
+                    return node
+        self.root = MCTSNode()
+        self.root.key = key
+        return self.root
+
+    def _expand(self, node, board, color):
+        if node.parent is not None and board.is_draw():
+            node.terminal = 0.5
+            return
+        moves = board.legal_moves(color)
+        if not moves:
+            node.terminal = 0.0 if board.no_moves_is_loss or board.is_in_check(color) else 0.5
+            node.children = []
+            return
+        self._rng.shuffle(moves)
+        if self.mode == PUCT:
+            weights = [self.capture_weight if board.move_flags(start, end) & CAPTURE else 1.0
+                       for start, end in moves]
+            total = sum(weights)
+            node.children = [MCTSNode(node, pack(start, end, size=self.size), weight / total)
+                             for (start, end), weight in zip(moves, weights)]
+        else:
+            node.children = [MCTSNode(node, pack(start, end, size=self.size))
+                             for start, end in moves]
+
+    def _select(self, node):
+        c = self.exploration
+        best = None
+        best_score = -math.inf
+        if self.mode == PUCT:
+            scale = c * math.sqrt(node.visits)
+            for child in node.children:
+                q = child.value / child.visits if child.visits else 0.5
+                score = q + scale * child.prior / (1 + child.visits)
+                if score > best_score:
+                    best, best_score = child, score
+            return best
+        log_visits = math.log(node.visits) if node.visits else 0.0
+        for child in node.children:
+            if not child.visits:
+                return child
+            score = child.value / child.visits + c * math.sqrt(log_visits / child.visits)
+            if score > best_score:
+                best, best_score = child, score
+        return best
+
+    def _run_playout(self, board, color):
+        """Selection, expansion, playout and backpropagation of one iteration."""
+        node = self.root
+        made = 0
+        while True:
+            if node.key is None:
+                node.key = board.position_hash(color)
+            if node.children is None and node.terminal is None and (node.visits or node is self.root):
+                self._expand(node, board, color)
+            if node.terminal is not None:
+                result = node.terminal
+                break
+            if node.children is None:
+                result = self._playout(board, color)
+                break
+            node = self._select(node)
+            start, end, _ = unpack(node.move, self.size)
+            board.make_move(start, end)
+            made += 1
+            color = opponent(color)
+        for _ in range(made):
+            board.unmake_move()
+
+        # result is for the side to move at node; each node stores the
+        # results of the side that moved into it.
+        while node is not None:
+            node.visits += 1
+            node.value += 1.0 - result
+            result = 1.0 - result
+            node = node.parent
+
+    def _playout(self, board, color):
+        """Plays random moves from the position; returns the result for color."""
+        mover = color
+        made = 0
+        result = None
+        while made < self.max_playout_plies:
+            if made and board.is_draw():
+                result = 0.5
+                break
+            if not self._play_random_move(board, mover):
+                result = 0.0 if board.no_moves_is_loss or board.is_in_check(mover) else 0.5
+                break
+            made += 1
+            mover = opponent(mover)
+        if result is None:
+            result = win_probability(board.evaluate(mover))
+        for _ in range(made):
+            board.unmake_move()
+        return result if mover == color else 1.0 - result
+
+    def _play_random_move(self, board, color):
+        pseudo_legal = getattr(board, 'pseudo_legal_moves', None)
+        moves = pseudo_legal(color) if pseudo_legal is not None else board.legal_moves(color)
+        rng = self._rng
+        candidates = [moves]
+        if self.capture_bias and rng.random() < self.capture_bias:
+            candidates.insert(0, [move for move in moves if board.move_flags(*move) & CAPTURE])
+        for pool in candidates:
+            # Sampling without replacement: only rejected moves are drawn twice.
+            while pool:
+                index = rng.randrange(len(pool))
+                start, end = pool[index]
+                pool[index] = pool[-1]
+                pool.pop()
+                board.make_move(start, end)
+                if pseudo_legal is None or not board.is_in_check(color):
+                    return True
+                board.unmake_move()
+        return False
+
+    def _result(self, root, reused, elapsed):
+        best = root.most_visited()
+        size = self.size
+        pv = [unpack(best.move, size)[:2]]
+        node = best.most_visited()
+        while node is not None and node.visits:
+            pv.append(unpack(node.move, size)[:2])
+            node = node.most_visited()
+        visits = {unpack(child.move, size)[:2]: child.visits for child in root.children}
+        win_rate = best.value / best.visits if best.visits else 0.5
+        return MCTSResult(pv[0], win_rate, pv, visits, self.playouts, reused, elapsed)
+
+    def _search_parallel(self, board, color, playouts, deadline, started):
+        moves = board.legal_moves(color)
+        if len(moves) <= 1:
+            if moves:
+                return MCTSResult(moves[0], 0.5, [moves[0]], {moves[0]: 0}, 0, 0,
+                                  time.monotonic() - started)
+            terminal = 0.0 if board.no_moves_is_loss or board.is_in_check(color) else 0.5
+            return MCTSResult(None, terminal, [], {}, 0, 0, time.monotonic() - started)
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                self.workers, initializer=_init_worker, initargs=(self.settings(), self.seed))
+        share = -(-playouts // self.workers) if playouts is not None else None
+        snapshot = board.copy()
+        futures = [self._executor.submit(_worker_search, snapshot, color, share, deadline)
+                   for _ in range(self.workers)]
+        totals = {}
+        self.playouts = 0
+        for future in futures:
+            statistics, count = future.result()
+            self.playouts += count
+            for move, (visits, value) in statistics.items():
+                merged = totals.setdefault(move, [0, 0.0])
+                merged[0] += visits
+                merged[1] += value
+        best, (visits, value) = max(totals.items(), key=lambda item: item[1][0])
+        best_move = unpack(best, board.size)[:2]
+        return MCTSResult(best_move, value / visits if visits else 0.5, [best_move],
+                          {unpack(move, board.size)[:2]: merged[0] for move, merged in totals.items()},
+                          self.playouts, 0, time.monotonic() - started)
+
+
+_worker_searcher = None
+
+
+def _init_worker(settings, seed):
+    global _worker_searcher
+    _worker_searcher = MonteCarloSearcher(
+        seed=None if seed is None else seed ^ os.getpid(), **settings)
+
+
+def _worker_search(board, color, playouts, deadline):
+    return _worker_searcher.root_statistics(board, color, playouts, deadline)
+
+
+class MCTSPlayer:
+    """Computer opponent driven by Monte Carlo tree search.
+
+    Offers the same methods as EnginePlayer, so games can use either.
+
+    Attributes:
+        searcher (MonteCarloSearcher): The search, keeping its tree between moves.
+        playouts (int|None): Playouts per move; the clock decides when omitted.
+        time_manager (TimeManager|None): Clock of the engine, if any.
+        move_time (float): Fixed seconds per move without a clock or playout count.
+        last_result (MCTSResult|None): Result behind the last move played.
+    """
+
+    def __init__(self, playouts=None, time_control=None, move_time=2.0, **options):
+        """Creates a player.
+
+        Args:
+            playouts (int|None): Fixed playouts per move.
+            time_control (TimeControl|None): Clock settings.
+            move_time (float): Seconds per move without a clock.
+            **options: Passed to MonteCarloSearcher.
+        """
+        self.searcher = MonteCarloSearcher(**options)
+        self.playouts = playouts
+        self.time_manager = TimeManager(time_control) if time_control else None
+        self.move_time = move_time
+        self.last_result = None
+
+    def choose_move(self, board, color):
+        """Finds the engine's move in the given position.
+
+        Args:
+            board: Current position; restored before returning.
+            color (str): Side the engine plays.
+
+        Returns:
+            tuple|None: Chosen (start, end) move, None if there are no legal moves.
+        """
+        started = time.monotonic()
+        deadline = None
+        if self.time_manager is not None:
+            deadline = self.time_manager.deadline_for_move()
+        elif self.playouts is None:
+            deadline = Deadline.after(self.move_time)
+        self.last_result = self.searcher.search(board, color, self.playouts, deadline)
+        if self.time_manager is not None:
+            self.time_manager.consume(time.monotonic() - started)
+        return self.last_result.best_move
+
+    def start_pondering(self, board, opponent_color):
+        """Does nothing; the kept tree already covers the opponent's replies."""
+
+    def opponent_moved(self, move):
+        """Does nothing; the next search finds the position in its tree by hash."""
+
+
+def main(argv=None):
+    """Command-line entry point: python -m engine.mcts --variant checkers --playouts 5000"""
+    from .variants import VARIANTS
+
+    parser = argparse.ArgumentParser(description="Поиск хода методом Монте-Карло")
+    parser.add_argument('--variant', choices=sorted(VARIANTS), default='modified')
+    parser.add_argument('--moves', nargs='*', default=[],
+                        help="ходы от начальной позиции, например e2e4 e7e5")
+    parser.add_argument('--playouts', type=int, help="число симуляций")
+    parser.add_argument('--time', type=float, help="время на ход в секундах")
+    parser.add_argument('--mode', choices=(UCT, PUCT), default=UCT)
+    parser.add_argument('--workers', type=int, default=1, help="процессов для параллельного поиска")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    board = VARIANTS[args.variant]()
+    color = 'white'
+    for text in args.moves:
+        board.make_move(*uci_to_move(text))
+        color = opponent(color)
+    searcher = MonteCarloSearcher(mode=args.mode, workers=args.workers, seed=args.seed)
+    deadline = Deadline.after(args.time) if args.time else None
+    try:
+        result = searcher.search(board, color, args.playouts, deadline)
+    finally:
+        searcher.close()
+    if result.best_move is None:
+        print("Нет допустимых ходов")
+        return
+    print(f"Лучший ход: {move_to_uci(result.best_move)}, "
+          f"доля побед {result.win_rate:.3f} ({result.score:+d})")
+    print(f"Вариант: {' '.join(move_to_uci(move) for move in result.pv)}")
+    for move, visits in sorted(result.visits.items(), key=lambda item: -item[1])[:10]:
+        print(f"  {move_to_uci(move)}: {visits}")
+    print(f"Симуляций: {result.playouts} за {result.elapsed:.2f} с "
+          f"({result.playouts_per_second:.0f} в секунду)")
+
+
+if __name__ == '__main__':
+    main()
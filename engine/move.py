@@ -0,0 +1,207 @@
+from array import array
+
+from .notation import move_typecode, square_bits, square_to_uci, uci_to_move
+
+
+# Bits 0-5 hold the target square, bits 6-11 the start square (row * 8 + col),
+# bits 12-15 a flag code. A code without flags equals encode_move(), so books
+# and archives written before flags existed decode unchanged. Boards larger
+# than 8x8 use square_bits(size) bits per square (row * size + col) and the
+# flags above them, in 32-bit words.
+QUIET = 0
+SWAP = 1
+CASTLE = 2
+CONTINUATION = 3
+CAPTURE = 4
+EN_PASSANT = 5
+PROMOTION = 8
+PROMOTION_PIECES = 'NBRQ'
+
+FLAG_NAMES = {QUIET: 'quiet', SWAP: 'swap', CASTLE: 'castle', CONTINUATION: 'continuation',
+              CAPTURE: 'capture', EN_PASSANT: 'en passant'}
+
+
+def pack(start, end, flags=QUIET, size=8):
+    """Packs a move into 16 bits, or 32 bits on boards larger than 8x8.
+
+    Args:
+        start (tuple[int, int]): (row, col) of the moving piece.
+        end (tuple[int, int]): (row, col) of the target square.
+        flags (int): Flag code, see the module constants.
+        size (int): Board size.
+
+    Returns:
+        int: The packed move.
+    """
+    if size == 8:
+        return flags << 12 | (start[0] * 8 + start[1]) << 6 | end[0] * 8 + end[1]
+    bits = square_bits(size)
+    return flags << 2 * bits | (start[0] * size + start[1]) << bits | end[0] * size + end[1]
+
+
+def unpack(code, size=8):
+    """Splits a move packed by pack() for a board size into (start, end, flags)."""
+    if size == 8:
+        start, end = code >> 6 & 63, code & 63
+        return (start >> 3, start & 7), (end >> 3, end & 7), code >> 12
+    bits = square_bits(size)
+    mask = (1 << bits) - 1
+    return divmod(code >> bits & mask, size), divmod(code & mask, size), code >> 2 * bits
+
+
+def promotion_flags(piece_letter, capture=False):
+    """Returns the flag code of a promotion to the piece given by its letter."""
+    return PROMOTION | (CAPTURE if capture else 0) | PROMOTION_PIECES.index(piece_letter.upper())
+
+
+class Move:
+    """A move at API boundaries; generation and history keep packed integers.
+
+    A checkers move may jump several times in a row: path then lists every
+    square visited, and the move packs into one 16-bit word per jump, all
+    but the last flagged CONTINUATION.
+
+    Attributes:
+        start (tuple[int, int]): (row, col) of the moving piece.
+        end (tuple[int, int]): (row, col) where the piece ends up.
+        flags (int): Flag code of the (last) step.
+        path (tuple[tuple[int, int], ...]): Squares visited, start and end included.
+    """
+
+    __slots__ = ('start', 'end', 'flags', 'path')
+
+    def __init__(self, start, end, flags=QUIET, path=None):
+        self.start = tuple(start)
+        self.end = tuple(end)
+        self.flags = flags
+        self.path = tuple(path) if path else (self.start, self.end)
+
+    @classmethod
+    def from_code(cls, code, size=8):
+        """Creates a single-step move from its packed form."""
+        start, end, flags = unpack(code, size)
+        return cls(start, end, flags)
+
+    @classmethod
+    def from_codes(cls, codes, offset=0, size=8):
+        """Reads one move, possibly spanning several words, from packed codes.
+
+        Args:
+            codes (Sequence[int]): Packed words, e.g. a MoveList's storage.
+            offset (int): Index of the move's first word.
+            size (int): Size of the board the moves were packed for.
+
+        Returns:
+            tuple[Move, int]: The move and the index just after it.
+        """
+        start, end, flags = unpack(codes[offset], size)
+        path = [start, end]
+        while flags == CONTINUATION:
+            offset += 1
+            _, end, flags = unpack(codes[offset], size)
+            path.append(end)
+        return cls(path[0], path[-1], flags, path), offset + 1
+
+    @classmethod
+    def from_uci(cls, text, size=8):
+        """Parses coordinate notation such as 'e2e4'."""
+        return cls(*uci_to_move(text, size))
+
+    @property
+    def code(self):
+        """The packed 16-bit form of a single-step move on an 8x8 board."""
+        return pack(self.start, self.end, self.flags)
+
+    def codes(self, size=8):
+        """Returns the packed words of the move, one per step of its path."""
+        steps = len(self.path) - 1
+        return array(move_typecode(size), (pack(self.path[i], self.path[i + 1],
+                                                CONTINUATION if i < steps - 1 else self.flags,
+                                                size)
+                                           for i in range(steps)))
+
+    def uci(self, size=8):
+        """Returns coordinate notation with ranks counted on a board of the given size."""
+        text = ''.join(square_to_uci(square, size) for square in self.path)
+        return text + (self.promotion.lower() if self.promotion else '')
+
+    @property
+    def is_capture(self):
+        """True for captures, including en passant and capturing promotions."""
+        return bool(self.flags & CAPTURE)
+
+    @property
+    def is_swap(self):
+        """True if a Jester swaps places with the piece on the target square."""
+        return self.flags == SWAP
+
+    @property
+    def promotion(self):
+        """Letter of the promotion piece, or None."""
+        return PROMOTION_PIECES[self.flags & 3] if self.flags & PROMOTION else None
+
+    def __iter__(self):
+        # Allows `start, end = move` wherever plain tuples were used.
+        return iter((self.start, self.end))
+
+    def __eq__(self, other):
+        if isinstance(other, Move):
+            return self.path == other.path and self.flags == other.flags
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.path, self.flags))
+
+    def __str__(self):
+        return self.uci()
+
+    def __repr__(self):
+        name = 'promotion' if self.flags & PROMOTION else FLAG_NAMES.get(self.flags, self.flags)
+        return f"Move({str(self)!r}, {name})"
+
+
+class MoveList:
+    """Compact list of packed moves backed by array('H').
+
+    Two bytes per move instead of a tuple of tuples, so generated move
+    lists and game histories stay small; four bytes on boards larger
+    than 8x8, see move_typecode().
+
+    Attributes:
+        codes (array): Packed words; multi-jump moves take several.
+        size (int): Size of the board the moves are packed for.
+    """
+
+    __slots__ = ('codes', 'size')
+
+    def __init__(self, codes=(), size=8):
+        self.codes = array(move_typecode(size), codes)
+        self.size = size
+
+    def append(self, start, end, flags=QUIET):
+        """Adds a single-step move."""
+        self.codes.append(pack(start, end, flags, self.size))
+
+    def add(self, move):
+        """Adds a Move, including every step of a multi-jump path."""
+        self.codes.extend(move.codes(self.size))
+
+    def __iter__(self):
+        """Yields Move objects."""
+        offset = 0
+        codes = self.codes
+        size = self.size
+        while offset < len(codes):
+            move, offset = Move.from_codes(codes, offset, size)
+            yield move
+
+    def pairs(self):
+        """Returns the moves as (start, end) tuples, the form boards accept."""
+        return [(move.start, move.end) for move in self]
+
+    def __len__(self):
+        shift = 2 * square_bits(self.size)
+        return sum(1 for code in self.codes if code >> shift != CONTINUATION)
+
+    def __repr__(self):
+        return f"MoveList([{', '.join(move.uci(self.size) for move in self)}])"
@@ -0,0 +1,167 @@
+from collections import OrderedDict
+
+
+class CacheEntry:
+    """Query results of one position, filled in as they are asked for.
+
+    Attributes:
+        moves (tuple|None): Legal (start, end) moves.
+        threats (frozenset|None): Squares of the mover's attacked pieces.
+        check (bool|None): Whether the mover is in check.
+        cost (int): Estimated bytes held by the entry.
+    """
+
+    __slots__ = ('moves', 'threats', 'check', 'cost')
+
+    def __init__(self, cost):
+        self.moves = None
+        self.threats = None
+        self.check = None
+        self.cost = cost
+
+
+class MoveCache:
+    """Least-recently-used cache of legal moves, threats and check status.
+
+    Entries are keyed by board class, size and position_hash(color), so a
+    position reached again, on any board object, is answered with
+    dictionary lookups, and moving to another position simply looks up
+    another key; nothing has to be invalidated. The memory bound is a
+    byte budget estimated from the size of the stored results; when it is
+    exceeded the least recently used positions are evicted.
+
+    Results are shared between callers: moves come back as a tuple and
+    threats as a frozenset, so they cannot be changed by accident.
+    The cache is not thread-safe.
+
+    Attributes:
+        max_bytes (int): Memory budget.
+        bytes (int): Estimated memory held by the entries.
+        hits (int): Queries answered from the cache.
+        misses (int): Queries that had to ask the board.
+        evictions (int): Positions dropped to stay within the budget.
+    """
+
+    ENTRY_BYTES = 240  # measured: entry, key tuple and OrderedDict slot
+    MOVE_BYTES = 184  # measured: a ((row, col), (row, col)) tuple plus its slot
+    SET_BYTES = 224  # measured: an empty frozenset
+    SQUARE_BYTES = 64
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        """Creates an empty cache.
+
+        Args:
+            max_bytes (int): Memory budget in bytes.
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    @classmethod
+    def from_megabytes(cls, megabytes):
+        """Creates a cache with a budget given in MiB."""
+        return cls(megabytes * 1024 * 1024)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _entry(self, board, color):
+        key = (board.__class__, board.size, board.position_hash(color))
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = CacheEntry(self.ENTRY_BYTES)
+            self._entries[key] = entry
+            self.bytes += entry.cost
+        else:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _grow(self, entry, cost):
+        entry.cost += cost
+        self.bytes += cost
+        entries = self._entries
+        # The newest entry is never evicted, so an oversized result is still returned.
+        while self.bytes > self.max_bytes and len(entries) > 1:
+            _, evicted = entries.popitem(last=False)
+            self.bytes -= evicted.cost
+            self.evictions += 1
+
+    def legal_moves(self, board, color=None):
+        """Returns board.legal_moves(color), computing it once per position.
+
+        Args:
+            board (GameState): Position to query.
+            color (str|None): Side to move; the board's turn by default.
+
+        Returns:
+            tuple[tuple[tuple[int, int], tuple[int, int]], ...]: Legal moves.
+        """
+        color = color or board.turn
+        entry = self._entry(board, color)
+        if entry.moves is not None:
+            self.hits += 1
+            return entry.moves
+        self.misses += 1
+        entry.moves = tuple(board.legal_moves(color))
+        self._grow(entry, self.MOVE_BYTES * len(entry.moves))
+        return entry.moves
+
+    def threatened_pieces(self, board, color=None):
+        """Returns board.threatened_pieces(color), computing it once per position.
+
+        Args:
+            board (GameState): Position to query.
+            color (str|None): Side whose pieces are tested; the board's turn by default.
+
+        Returns:
+            frozenset[tuple[int, int]]: Squares of the attacked pieces.
+        """
+        color = color or board.turn
+        entry = self._entry(board, color)
+        if entry.threats is not None:
+            self.hits += 1
+            return entry.threats
+        self.misses += 1
+        entry.threats = frozenset(board.threatened_pieces(color))
+        self._grow(entry, self.SET_BYTES + self.SQUARE_BYTES * len(entry.threats))
+        return entry.threats
+
+    def is_in_check(self, board, color=None):
+        """Returns board.is_in_check(color), computing it once per position.
+
+        Args:
+            board (GameState): Position to query.
+            color (str|None): Side to test; the board's turn by default.
+
+        Returns:
+            bool: True if the side is in check.
+        """
+        color = color or board.turn
+        entry = self._entry(board, color)
+        if entry.check is not None:
+            self.hits += 1
+            return entry.check
+        self.misses += 1
+        entry.check = board.is_in_check(color)
+        self._grow(entry, 0)
+        return entry.check
+
+    def stats(self):
+        """Returns the counters as a dict, with the hit rate of all queries so far."""
+        queries = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / queries if queries else 0.0,
+        }
+
+    def clear(self):
+        """Removes all entries; the counters are kept."""
+        self._entries.clear()
+        self.bytes = 0
@@ -0,0 +1,77 @@
+import re
+
+
+_UCI_MOVE = re.compile(r'([a-z])(\d+)([a-z])(\d+)')
+
+
+def square_bits(size=8):
+    """Returns the bits one square takes in a packed move on a board of a given size.
+
+    Six bits (row * 8 + col) cover boards up to 8x8; larger boards take as
+    many bits as row * size + col needs, so their squares do not wrap.
+    """
+    return max(6, (size * size - 1).bit_length())
+
+
+def move_typecode(size=8):
+    """Returns the array typecode that holds packed moves of a board size.
+
+    Moves of boards up to 8x8 fit into 16 bits ('H'); larger boards need
+    32-bit words ('I').
+    """
+    return 'H' if 2 * square_bits(size) + 4 <= 16 else 'I'
+
+
+def square_to_uci(position, size=8):
+    """Converts (row, col) coordinates to a square name such as 'e2'.
+
+    Ranks are counted from the bottom of a board of the given size, so
+    a 10x10 board has squares a1 to j10.
+    """
+    row, col = position
+    return f"{chr(ord('a') + col)}{size - row}"
+
+
+def move_to_uci(move, size=8):
+    """Converts a (start, end) move to long algebraic notation such as 'e2e4'."""
+    start, end = move
+    return square_to_uci(start, size) + square_to_uci(end, size)
+
+
+def uci_to_move(text, size=8):
+    """Parses long algebraic notation such as 'e2e4' into a (start, end) move.
+
+    Ranks may have several digits on boards larger than 9x9 ('a10b9');
+    anything after the two squares (a promotion letter) is ignored.
+
+    Args:
+        text (str): The move.
+        size (int): Board size.
+
+    Raises:
+        ValueError: If the text is not a valid move on such a board.
+    """
+    match = _UCI_MOVE.match(text.lower())
+    if match is None:
+        raise ValueError(f"Bad move {text!r}")
+    x1, y1 = size - int(match[2]), ord(match[1]) - ord('a')
+    x2, y2 = size - int(match[4]), ord(match[3]) - ord('a')
+    if not all(0 <= v < size for v in (x1, y1, x2, y2)):
+        raise ValueError(f"Bad move {text!r}")
+    return (x1, y1), (x2, y2)
+
+
+def encode_move(move, size=8):
+    """Packs a (start, end) move: from-square << square_bits(size) | to-square.
+
+    On boards up to 8x8 that is 16 bits, from-square << 6 | to-square.
+    """
+    (x1, y1), (x2, y2) = move
+    return (x1 * size + y1) << square_bits(size) | (x2 * size + y2)
+
+
+def decode_move(code, size=8):
+    """Unpacks a move produced by encode_move() (flag bits are ignored)."""
+    bits = square_bits(size)
+    mask = (1 << bits) - 1
+    return divmod(code >> bits & mask, size), divmod(code & mask, size)
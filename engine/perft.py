@@ -0,0 +1,253 @@
+import argparse
+import concurrent.futures
+import json
+import sys
+import time
+
+from .notation import move_to_uci, uci_to_move
+from .state import decode_state, encode_state
+from .variants import VARIANTS
+
+
+class PerftCache:
+    """Bounded table of subtree leaf counts keyed by (position hash, depth).
+
+    Transpositions are then counted once. When the table is full the
+    oldest entry is evicted, like in the search's TranspositionTable.
+
+    Attributes:
+        max_entries (int): Maximum number of stored subtrees.
+        hits (int): Lookups answered from the table.
+        misses (int): Lookups that had to be counted.
+    """
+
+    ENTRY_BYTES = 200  # measured size of one dict slot with its tuple key
+
+    def __init__(self, max_entries=1 << 20):
+        self.max_entries = max_entries
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_megabytes(cls, megabytes):
+        """Creates a cache sized to roughly the given amount of memory."""
+        return cls(max(1, megabytes * 1024 * 1024 // cls.ENTRY_BYTES))
+
+    def get(self, key):
+        """Returns the count stored for (hash, depth), or None."""
+        count = self.entries.get(key)
+        if count is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return count
+
+    def store(self, key, count):
+        """Stores the leaf count of a fully counted subtree."""
+        entries = self.entries
+        if key not in entries and len(entries) >= self.max_entries:
+            del entries[next(iter(entries))]
+        entries[key] = count
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class _Budget:
+    __slots__ = ('nodes', 'limit')
+
+    def __init__(self, limit):
+        self.nodes = 0
+        self.limit = limit
+
+
+def _count(board, depth, path, cache, budget, leftovers):
+    # Returns (leaves counted, whether the whole subtree was counted). Once
+    # the budget is spent, the children not yet visited are appended to
+    # leftovers as (path, depth) for another task to count.
+    if depth == 1:
+        return len(board.legal_moves()), True
+    key = (board.position_hash(), depth)
+    if cache is not None:
+        count = cache.get(key)
+        if count is not None:
+            return count, True
+    budget.nodes += 1
+    moves = board.legal_moves()
+    total = 0
+    complete = True
+    for index, move in enumerate(moves):
+        if budget.limit is not None and budget.nodes >= budget.limit:
+            leftovers.extend((path + [rest], depth - 1) for rest in moves[index:])
+            return total, False
+        board.make_move(*move)
+        path.append(move)
+        try:
+            count, done = _count(board, depth - 1, path, cache, budget, leftovers)
+        finally:
+            path.pop()
+            board.unmake_move()
+        total += count
+        complete = complete and done
+    if complete and cache is not None:
+        cache.store(key, total)
+    return total, complete
+
+
+def perft(board, depth, cache=None):
+    """Counts the leaf nodes of the legal move tree, in this process.
+
+    Args:
+        board (GameState): Root position, side to move board.turn; restored on return.
+        depth (int): Plies to expand.
+        cache (PerftCache|None): Table of counted subtrees.
+
+    Returns:
+        int: Number of move sequences of exactly depth plies.
+    """
+    if depth <= 0:
+        return 1
+    return _count(board, depth, [], cache, _Budget(None), [])[0]
+
+
+# Worker process state, set up once per process by _init_worker().
+_worker = {}
+
+
+def _init_worker(state, cache_entries, split_nodes):
+    _worker['board'], _ = decode_state(state)
+    _worker['cache'] = PerftCache(cache_entries) if cache_entries else None
+    _worker['split_nodes'] = split_nodes
+
+
+def perft_task(task):
+    """Counts one subtree; runs inside a worker process.
+
+    Args:
+        task (tuple[list, int]): Moves from the root to the subtree and the
+                                 depth left below it.
+
+    Returns:
+        tuple[tuple, int, list]: The root move, the leaves counted and the
+        (path, depth) subtrees handed back when the node budget ran out.
+    """
+    path, depth = task
+    board = _worker['board']
+    for move in path:
+        board.make_move(*move)
+    leftovers = []
+    try:
+        if depth == 0:
+            count = 1
+        else:
+            count, _ = _count(board, depth, list(path), _worker['cache'],
+                              _Budget(_worker['split_nodes']), leftovers)
+    finally:
+        for _ in path:
+            board.unmake_move()
+    return path[0], count, leftovers
+
+
+def divide(board, depth, workers=1, cache=None, hash_mb=0, split_nodes=2000, on_task=None):
+    """Counts the leaves below every root move, optionally in a process pool.
+
+    With several workers each root move is a task of the pool. A task that
+    visits more than split_nodes interior nodes stops expanding and hands
+    the subtrees it has not started back to the pool, where idle workers
+    take them, so one heavy branch does not leave the others waiting.
+    The counts do not depend on how the work was split.
+
+    Args:
+        board (GameState): Root position, side to move board.turn; restored on return.
+        depth (int): Plies to expand, at least 1.
+        workers (int): Worker processes; 1 counts in this process.
+        cache (PerftCache|None): Table used when counting in this process.
+        hash_mb (int): Size of the table each worker process keeps, in MiB;
+                       0 for none.
+        split_nodes (int): Interior nodes a task visits before splitting.
+        on_task (callable|None): Called with (root move, leaves) as tasks finish.
+
+    Returns:
+        list[tuple[tuple, int]]: (move, leaves) for every root move, sorted
+        by move so that runs can be compared line by line.
+    """
+    moves = board.legal_moves()
+    counts = dict.fromkeys(moves, 0)
+    if workers <= 1 or depth <= 1:
+        for move in moves:
+            board.make_move(*move)
+            try:
+                counts[move] = perft(board, depth - 1, cache)
+            finally:
+                board.unmake_move()
+            if on_task is not None:
+                on_task(move, counts[move])
+        return sorted(counts.items())
+
+    cache_entries = PerftCache.from_megabytes(hash_mb).max_entries if hash_mb else 0
+    with concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=_init_worker,
+            initargs=(encode_state(board), cache_entries, max(split_nodes, 2))) as pool:
+        pending = {pool.submit(perft_task, ([move], depth - 1)) for move in moves}
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                move, count, leftovers = future.result()
+                counts[move] += count
+                pending.update(pool.submit(perft_task, leftover) for leftover in leftovers)
+                if on_task is not None:
+                    on_task(move, count)
+    return sorted(counts.items())
+
+
+def main(argv=None):
+    """Command-line entry point: python -m engine.perft --variant modified --depth 4 --workers 4
+
+    With --expect the divide output is compared with a file written by
+    --save, and the exit status is 1 on any difference.
+    """
+    parser = argparse.ArgumentParser(description="Подсчёт perft для проверки генератора ходов")
+    parser.add_argument('--variant', default='chess', choices=sorted(VARIANTS))
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--moves', default='', help="ходы от начальной позиции, например \"e2e4 e7e5\"")
+    parser.add_argument('--workers', type=int, default=1, help="процессов")
+    parser.add_argument('--hash-mb', type=int, default=0, help="кэш поддеревьев, МБ на процесс")
+    parser.add_argument('--split-nodes', type=int, default=2000,
+                        help="узлов задачи до передачи поддеревьев другим процессам")
+    parser.add_argument('--save', help="записать результат по ходам в JSON")
+    parser.add_argument('--expect', help="сравнить с JSON, записанным через --save")
+    args = parser.parse_args(argv)
+
+    board = VARIANTS[args.variant]()
+    for text in args.moves.split():
+        board.make_move(*uci_to_move(text))
+    cache = PerftCache.from_megabytes(args.hash_mb) if args.hash_mb else None
+    started = time.perf_counter()
+    lines = divide(board, args.depth, args.workers, cache, args.hash_mb, args.split_nodes)
+    elapsed = time.perf_counter() - started
+
+    result = {move_to_uci(move): count for move, count in lines}
+    for text, count in result.items():
+        print(f"{text}: {count}")
+    total = sum(result.values())
+    print(f"Всего: {total} за {elapsed:.2f} с ({total / elapsed:.0f} листьев/с)")
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'variant': args.variant, 'moves': args.moves, 'depth': args.depth,
+                       'divide': result}, f, indent=2)
+            f.write('\n')
+    if args.expect:
+        with open(args.expect, encoding='utf-8') as f:
+            expected = json.load(f)['divide']
+        wrong = sorted(text for text in set(result) | set(expected)
+                       if result.get(text) != expected.get(text))
+        for text in wrong:
+            print(f"Расхождение {text}: {result.get(text)} вместо {expected.get(text)}")
+        if wrong:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
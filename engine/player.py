@@ -0,0 +1,113 @@
+import time
+
+from .ponder import Ponderer
+from .search import Searcher
+from .timecontrol import Deadline, TimeManager
+
+
+class EnginePlayer:
+    """Computer opponent combining search, time management and pondering.
+
+    Attributes:
+        searcher (Searcher): The search shared with the ponderer.
+        time_manager (TimeManager|None): Clock of the engine, if any.
+        move_time (float): Fixed seconds per move used without a clock.
+        ponder (bool): Whether to think on the opponent's time.
+        ponderer (Ponderer): Background search on the predicted reply.
+        book (OpeningBook|None): Opening book consulted before searching.
+        last_result (SearchResult|None): Result behind the last move played;
+                                         None after a book move.
+    """
+
+    def __init__(self, time_control=None, move_time=2.0, ponder=True, max_depth=64,
+                 book=None, tablebases=None):
+        """Creates an engine player.
+
+        Args:
+            time_control (TimeControl|None): Clock settings; a fixed time per
+                                             move is used when omitted.
+            move_time (float): Seconds per move without a clock.
+            ponder (bool): Enable pondering during the opponent's turn.
+            max_depth (int): Maximum search depth.
+            book (OpeningBook|None): Opening book to play from while in book.
+            tablebases (Tablebases|None): Endgame tables probed during search.
+        """
+        self.searcher = Searcher(tablebases=tablebases)
+        self.time_manager = TimeManager(time_control) if time_control else None
+        self.move_time = move_time
+        self.ponder = ponder
+        self.max_depth = max_depth
+        self.ponderer = Ponderer(self.searcher)
+        self.book = book
+        self.last_result = None
+        self._ponder_hit = False
+
+    def next_deadline(self):
+        """Returns the deadline for the engine's next move."""
+        if self.time_manager is not None:
+            return self.time_manager.deadline_for_move()
+        return Deadline.after(self.move_time, self.move_time * 1.5)
+
+    def choose_move(self, board, color):
+        """Finds the engine's move in the given position.
+
+        Args:
+            board: Current position; restored before returning.
+            color (str): Side the engine plays.
+
+        Returns:
+            tuple|None: Best (start, end) move, None if there are no legal moves.
+        """
+        if self.book is not None:
+            move = self.book.choose(board, color)
+            if move is not None:
+                self.ponderer.stop()
+                self._ponder_hit = False
+                self.last_result = None
+                return move
+
+        started = time.monotonic()
+        deadline = self.next_deadline()
+        result = None
+        if self._ponder_hit:
+            result = self.ponderer.ponderhit(deadline)
+            self._ponder_hit = False
+        else:
+            self.ponderer.stop()
+        if result is None or (result.best_move is None and board.legal_moves(color)):
+            result = self.searcher.search(board, color, max_depth=self.max_depth,
+                                          deadline=deadline)
+        if self.time_manager is not None:
+            self.time_manager.consume(time.monotonic() - started)
+        self.last_result = result
+        return result.best_move
+
+    def start_pondering(self, board, opponent_color):
+        """Starts searching the expected reply while the opponent thinks.
+
+        Uses the second move of the last principal variation as the
+        prediction of the opponent's move; does nothing without one.
+
+        Args:
+            board: Position with the opponent to move.
+            opponent_color (str): Color of the side about to move.
+        """
+        if not self.ponder or self.last_result is None or len(self.last_result.pv) < 2:
+            return
+        predicted = self.last_result.pv[1]
+        if predicted not in board.legal_moves(opponent_color):
+            return
+        self.ponderer.start(board, opponent_color, predicted)
+
+    def opponent_moved(self, move):
+        """Tells the engine which move the opponent actually played.
+
+        Args:
+            move (tuple|None): (start, end) of the played move, or None if the
+                               position changed otherwise (e.g. undo).
+        """
+        if self.ponderer.active and move is not None and move == self.ponderer.predicted_move:
+            self._ponder_hit = True
+        else:
+            self._ponder_hit = False
+            self.ponderer.stop()
@@ -0,0 +1,93 @@
+import threading
+import time
+
+from .timecontrol import Deadline
+
+
+class Ponderer:
+    """Searches the expected reply in a background thread.
+
+    While the opponent is thinking (typically blocked in input()), the
+    position after the predicted opponent move is searched with an
+    unlimited deadline. If the opponent then plays the predicted move
+    (a "ponder hit"), the running search is given a real deadline and its
+    result is used; otherwise it is stopped and only the warmed
+    transposition table of the shared searcher remains.
+
+    Attributes:
+        searcher (Searcher): Searcher shared with the foreground engine.
+        predicted_move (tuple|None): Opponent move being pondered on.
+        result (SearchResult|None): Latest completed iteration of the ponder search.
+    """
+
+    def __init__(self, searcher):
+        """Creates an idle ponderer.
+
+        Args:
+            searcher (Searcher): Searcher whose transposition table is warmed.
+        """
+        self.searcher = searcher
+        self.predicted_move = None
+        self.result = None
+        self._thread = None
+
+    @property
+    def active(self):
+        """bool: True while a ponder search is running or awaiting a decision."""
+        return self._thread is not None
+
+    def start(self, board, opponent_color, predicted_move):
+        """Starts pondering on the position after the predicted move.
+
+        Args:
+            board: Current position; it is copied and never modified.
+            opponent_color (str): Side that is about to play predicted_move.
+            predicted_move (tuple): Expected (start, end) opponent move.
+        """
+        self.stop()
+        ponder_board = board.copy()
+        ponder_board.make_move(*predicted_move)
+        engine_color = 'black' if opponent_color == 'white' else 'white'
+        self.predicted_move = predicted_move
+        self.result = None
+        self.searcher.prepare(Deadline.infinite())
+        self._thread = threading.Thread(target=self._run, args=(ponder_board, engine_color),
+                                        daemon=True)
+        self._thread.start()
+
+    def _run(self, board, color):
+        self.result = self.searcher.search(board, color, on_iteration=self._store)
+
+    def _store(self, result):
+        self.result = result
+
+    def ponderhit(self, deadline):
+        """Converts the ponder search into a timed search and waits for it.
+
+        Args:
+            deadline (Deadline): Time limits for the remainder of the search.
+
+        Returns:
+            SearchResult|None: Result of the ponder search.
+        """
+        self.searcher.deadline = deadline
+        if deadline.soft_expired():
+            self.searcher.stop()
+        thread = self._thread
+        self._thread = None
+        # The soft limit is only checked between iterations, so enforce it
+        # here as well to keep the reply latency bounded.
+        if deadline.soft is not None:
+            thread.join(max(deadline.soft - time.monotonic(), 0.0))
+            self.searcher.stop()
+        thread.join()
+        return self.result
+
+    def stop(self):
+        """Stops pondering and discards the search result."""
+        if self._thread is not None:
+            self.searcher.stop()
+            self._thread.join()
+            self._thread = None
+        self.predicted_move = None
+
@@ -0,0 +1,264 @@
+import argparse
+import concurrent.futures
+import json
+import os
+from collections import Counter
+
+import numpy as np
+
+from .archive import RESULT_CODES, GameArchiveReader, decode_games
+from .notation import decode_move, move_to_uci, uci_to_move
+from .state import VARIANT_IDS
+
+
+ENTRY_DTYPE = np.dtype([
+    ('key', '<u8'),
+    ('game', '<u8'),
+    ('ply', '<u2'),
+    ('next_move', '<u2'),
+    ('result', 'u1'),
+])
+NO_MOVE = 0xFFFF
+MANIFEST = 'manifest.json'
+MAX_SEGMENTS = 8
+
+
+def position_key(position_hash, variant):
+    """Mixes the variant into a position hash so variants never share keys."""
+    return (position_hash ^ (VARIANT_IDS[variant] * 0x9E3779B97F4A7C15)) & 0xFFFFFFFFFFFFFFFF
+
+
+def index_frames(archive_path, frame_offsets):
+    """Replays the games of some archive frames; runs in a worker process.
+
+    Games played on a board of another size than the variant's standard
+    board are skipped.
+
+    Args:
+        archive_path (str): Game archive.
+        frame_offsets (list[int]): Offsets of the frames to replay.
+
+    Returns:
+        np.ndarray: Unsorted ENTRY_DTYPE records, one per position reached.
+    """
+    from .variants import VARIANTS
+
+    reader = GameArchiveReader(archive_path)
+    rows = []
+    for offset in frame_offsets:
+        for _, payload in reader.frames(offset):
+            for game in decode_games(payload, offset, reader.version):
+                board = VARIANTS[game.variant]()
+                if board.size != game.size:
+                    continue
+                color = 'white'
+                result = RESULT_CODES[game.result]
+                moves = game.moves
+                for ply in range(len(moves) + 1):
+                    next_move = moves[ply] if ply < len(moves) else NO_MOVE
+                    rows.append((position_key(board.position_hash(color), game.variant),
+                                 game.game_id, ply, next_move, result))
+                    if next_move == NO_MOVE:
+                        break
+                    board.make_move(*decode_move(next_move))
+                    color = 'black' if color == 'white' else 'white'
+            break
+    return np.array(rows, dtype=ENTRY_DTYPE)
+
+
+class PositionStats:
+    """Aggregate answer of a position query.
+
+    Attributes:
+        occurrences (list[tuple[int, int]]): (game id, ply) of every visit.
+        games (int): Number of distinct games that reached the position.
+        white_wins (int): Those games won by white.
+        draws (int): Those games drawn.
+        black_wins (int): Those games won by black.
+        next_moves (Counter): (start, end) move -> times played from here.
+    """
+
+    def __init__(self, entries):
+        self.occurrences = [(int(e['game']), int(e['ply'])) for e in entries]
+        results = {}
+        for entry in entries:
+            results[int(entry['game'])] = int(entry['result'])
+        counts = Counter(results.values())
+        self.games = len(results)
+        self.white_wins = counts[RESULT_CODES['1-0']]
+        self.draws = counts[RESULT_CODES['1/2-1/2']]
+        self.black_wins = counts[RESULT_CODES['0-1']]
+        self.next_moves = Counter(decode_move(int(e['next_move']))
+                                  for e in entries if e['next_move'] != NO_MOVE)
+
+
+class PositionIndex:
+    """Sorted on-disk index: position hash -> (game id, ply).
+
+    The index is a directory of segments, each a NumPy array of
+    ENTRY_DTYPE sorted by key, plus a manifest that remembers up to which
+    archive offset games have been indexed. Queries binary-search every
+    segment through np.load(mmap_mode='r'), so only a few pages are
+    touched per lookup. update() indexes newly appended games into a new
+    segment and merges segments when there are too many.
+
+    Attributes:
+        directory (str): Index directory.
+        archive_path (str): Archive the index covers.
+        indexed_offset (int): Archive offset up to which games are indexed.
+        segments (list[str]): Segment file names.
+    """
+
+    def __init__(self, directory, archive_path=None):
+        """Opens an index, creating an empty one if needed.
+
+        Args:
+            directory (str): Index directory.
+            archive_path (str|None): Archive to index; required when the
+                                     index does not exist yet.
+        """
+        self.directory = directory
+        manifest = os.path.join(directory, MANIFEST)
+        if os.path.exists(manifest):
+            with open(manifest, encoding='utf-8') as f:
+                data = json.load(f)
+        else:
+            if archive_path is None:
+                raise FileNotFoundError(manifest)
+            os.makedirs(directory, exist_ok=True)
+            data = {'archive': os.path.abspath(archive_path), 'offset': 0, 'segments': [],
+                    'next_segment': 0}
+        self.archive_path = data['archive']
+        self.indexed_offset = data['offset']
+        self.segments = data['segments']
+        self._next_segment = data['next_segment']
+        self._maps = {}
+
+    def _save_manifest(self):
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'archive': self.archive_path, 'offset': self.indexed_offset,
+                       'segments': self.segments, 'next_segment': self._next_segment}, f)
+        os.replace(path + '.tmp', path)
+
+    def _segment(self, name):
+        if name not in self._maps:
+            self._maps[name] = np.load(os.path.join(self.directory, name), mmap_mode='r')
+        return self._maps[name]
+
+    def _write_segment(self, entries):
+        entries = np.sort(entries, order=('key', 'game', 'ply'), kind='stable')
+        name = f"segment-{self._next_segment:06d}.npy"
+        self._next_segment += 1
+        np.save(os.path.join(self.directory, name), entries)
+        return name
+
+    def update(self, workers=None, frames_per_task=64):
+        """Indexes games appended to the archive since the last update.
+
+        Args:
+            workers (int|None): Worker processes replaying games.
+            frames_per_task (int): Archive frames handed to a worker at once.
+
+        Returns:
+            int: Number of positions added.
+        """
+        reader = GameArchiveReader(self.archive_path)
+        start = max(self.indexed_offset, reader.next_offset)
+        offsets = [offset for offset, _ in reader.frames(start)]
+        end = reader.next_offset
+        if not offsets:
+            return 0
+        batches = [offsets[i:i + frames_per_task] for i in range(0, len(offsets), frames_per_task)]
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(index_frames, [self.archive_path] * len(batches), batches))
+        entries = np.concatenate(parts) if parts else np.empty(0, dtype=ENTRY_DTYPE)
+        self.segments.append(self._write_segment(entries))
+        self.indexed_offset = end
+        if len(self.segments) > MAX_SEGMENTS:
+            self.compact()
+        else:
+            self._save_manifest()
+        return len(entries)
+
+    def compact(self):
+        """Merges all segments into one."""
+        if len(self.segments) <= 1:
+            return
+        merged = np.concatenate([np.asarray(self._segment(name)) for name in self.segments])
+        old = self.segments
+        self.segments = [self._write_segment(merged)]
+        self._save_manifest()
+        self._maps.clear()
+        for name in old:
+            os.remove(os.path.join(self.directory, name))
+
+    def lookup(self, key):
+        """Returns all index entries of a position key.
+
+        Args:
+            key (int): Key from position_key().
+
+        Returns:
+            np.ndarray: ENTRY_DTYPE records.
+        """
+        found = []
+        key = np.uint64(key)
+        for name in self.segments:
+            segment = self._segment(name)
+            low = np.searchsorted(segment['key'], key, side='left')
+            high = np.searchsorted(segment['key'], key, side='right')
+            if high > low:
+                found.append(np.asarray(segment[low:high]))
+        return np.concatenate(found) if found else np.empty(0, dtype=ENTRY_DTYPE)
+
+    def query(self, board, color, variant):
+        """Answers "which games reached this position" with statistics.
+
+        Args:
+            board: Position to look up.
+            color (str): Side to move.
+            variant (str): 'chess', 'modified' or 'checkers'.
+
+        Returns:
+            PositionStats: Games, results and next-move frequencies.
+        """
+        return PositionStats(self.lookup(position_key(board.position_hash(color), variant)))
+
+
+def main(argv=None):
+    """Command-line entry point: python -m engine.position_index update|query ..."""
+    parser = argparse.ArgumentParser(description="Индекс позиций по архиву партий")
+    commands = parser.add_subparsers(dest='command', required=True)
+    update = commands.add_parser('update', help="проиндексировать новые партии архива")
+    update.add_argument('directory')
+    update.add_argument('--archive', help="архив партий (для нового индекса)")
+    update.add_argument('--workers', type=int, default=None)
+    query = commands.add_parser('query', help="найти партии с позицией")
+    query.add_argument('directory')
+    query.add_argument('--variant', choices=sorted(VARIANT_IDS), default='chess')
+    query.add_argument('--moves', default='', help="ходы от начальной позиции, e2e4 e7e5 ...")
+    args = parser.parse_args(argv)
+
+    if args.command == 'update':
+        index = PositionIndex(args.directory, args.archive)
+        added = index.update(args.workers)
+        print(f"Добавлено позиций: {added}, сегментов: {len(index.segments)}")
+        return
+
+    from .variants import VARIANTS
+
+    index = PositionIndex(args.directory)
+    board = VARIANTS[args.variant]()
+    color = 'white'
+    for text in args.moves.split():
+        board.make_move(*uci_to_move(text))
+        color = 'black' if color == 'white' else 'white'
+    stats = index.query(board, color, args.variant)
+    print(f"Партий: {stats.games}  (+{stats.white_wins} ={stats.draws} -{stats.black_wins})")
+    for move, count in stats.next_moves.most_common(10):
+        print(f"{move_to_uci(move)}: {count}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+from typing import FrozenSet, List, Optional, Protocol, Tuple, runtime_checkable
+
+
+Square = Tuple[int, int]
+MovePair = Tuple[Square, Square]
+
+
+@runtime_checkable
+class GameState(Protocol):
+    """Interface shared by every board, so engines and tools are written once.
+
+    A game state knows its side to move: make_move() and unmake_move()
+    pass the turn on, and methods taking a color default to turn.
+    Moves are (start, end) square pairs as returned by legal_moves().
+
+    Attributes:
+        turn (str): Side to move, 'white' or 'black'.
+        size (int): Number of rows and columns of the board.
+        no_moves_is_loss (bool): Whether a side without moves loses rather
+                                 than being stalemated.
+        move_limit (int): Reversible plies after which the game is drawn.
+    """
+
+    turn: str
+    size: int
+    no_moves_is_loss: bool
+    move_limit: int
+
+    def legal_moves(self, color: Optional[str] = None) -> List[MovePair]:
+        """Returns the legal moves of color, the side to move by default."""
+
+    def make_move(self, start: Square, end: Square) -> None:
+        """Plays a legal move; the other side is to move afterwards."""
+
+    def unmake_move(self) -> None:
+        """Takes back the last make_move()."""
+
+    def move_flags(self, start: Square, end: Square) -> int:
+        """Returns the engine.move flag code of a move before it is played."""
+
+    def position_hash(self, color: Optional[str] = None) -> int:
+        """Returns the Zobrist hash of the position with color to move."""
+
+    def is_in_check(self, color: Optional[str] = None) -> bool:
+        """Returns True if color's royal piece is attacked."""
+
+    def threatened_pieces(self, color: Optional[str] = None) -> FrozenSet[Square]:
+        """Returns the squares of color's pieces the opponent can capture."""
+
+    def evaluate(self, color: Optional[str] = None) -> int:
+        """Returns the static score in centipawns for color."""
+
+    def is_draw(self) -> bool:
+        """Returns True if a repetition or move limit rule draws the game."""
+
+    def result(self) -> Optional[str]:
+        """Returns '1-0', '0-1' or '1/2-1/2' once the game is over, else None."""
+
+    def is_terminal(self) -> bool:
+        """Returns True if the game is over."""
+
+    def copy(self) -> 'GameState':
+        """Returns an independent copy, repetition history included."""
+
+    def encode(self) -> bytes:
+        """Packs side to move, halfmove clock, size and placement into bytes."""
+
+    @classmethod
+    def decode(cls, data: bytes) -> 'GameState':
+        """Builds a board from encode() output."""
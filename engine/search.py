@@ -0,0 +1,390 @@
+import threading
+import time
+
+from .notation import decode_move, encode_move
+from .timecontrol import Deadline
+
+
+MATE_SCORE = 100000
+INFINITY = 10 ** 9
+
+
+class SearchAborted(Exception):
+    """Raised inside the search when it has to stop immediately."""
+
+
+class TranspositionTable:
+    """Bounded dictionary of search results keyed by position hash.
+
+    When the table is full the oldest entry is evicted, relying on the
+    insertion order of dict. Best moves are kept packed by encode_move()
+    for the board size, which keeps entries small.
+
+    Attributes:
+        max_entries (int): Maximum number of stored positions.
+        entries (dict[int, tuple]): hash -> (depth, score, flag, packed best move).
+    """
+
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+    ENTRY_BYTES = 220  # measured size of one dict slot with its tuple and key
+
+    def __init__(self, max_entries=1 << 18):
+        """Creates an empty table.
+
+        Args:
+            max_entries (int): Maximum number of stored positions.
+        """
+        self.max_entries = max_entries
+        self.entries = {}
+
+    @classmethod
+    def from_megabytes(cls, megabytes):
+        """Creates a table sized to roughly the given amount of memory.
+
+        Args:
+            megabytes (int): Memory budget in MiB.
+
+        Returns:
+            TranspositionTable: The new table.
+        """
+        return cls(max(1, megabytes * 1024 * 1024 // cls.ENTRY_BYTES))
+
+    def probe(self, key, size=8):
+        """Returns (depth, score, flag, best_move) stored for a position hash, or None.
+
+        Args:
+            key (int): Position hash.
+            size (int): Board size the move was stored for.
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry[3] is None:
+            return entry
+        depth, score, flag, move = entry
+        return depth, score, flag, decode_move(move, size)
+
+    def store(self, key, depth, score, flag, move, size=8):
+        """Stores a search result, evicting the oldest entry if needed.
+
+        Args:
+            key (int): Position hash.
+            depth (int): Remaining depth the score was searched to.
+            score (int): Score from the side to move's point of view.
+            flag (int): EXACT, LOWER or UPPER bound.
+            move (tuple|None): Best move found in the position.
+            size (int): Board size, which the packed move depends on.
+        """
+        entries = self.entries
+        if key not in entries and len(entries) >= self.max_entries:
+            del entries[next(iter(entries))]
+        entries[key] = (depth, score, flag, None if move is None else encode_move(move, size))
+
+    def clear(self):
+        """Removes all entries."""
+        self.entries.clear()
+
+
+class SearchResult:
+    """Outcome of one completed iterative-deepening iteration.
+
+    Attributes:
+        best_move (tuple|None): Best (start, end) move, None if there are no moves.
+        score (int): Score in centipawns from the mover's point of view.
+        depth (int): Depth of the completed iteration.
+        pv (list[tuple]): Principal variation starting with best_move.
+        nodes (int): Nodes searched so far.
+        elapsed (float): Seconds spent so far.
+    """
+
+    def __init__(self, best_move, score, depth, pv, nodes, elapsed):
+        self.best_move = best_move
+        self.score = score
+        self.depth = depth
+        self.pv = pv
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return (f"SearchResult(best_move={self.best_move}, score={self.score}, "
+                f"depth={self.depth}, nodes={self.nodes})")
+
+
+class Searcher:
+    """Iterative-deepening alpha-beta (negamax) search with a transposition table.
+
+    Works on any engine.state.GameState board that also provides
+    is_repetition(count) and is_move_limit_draw(). Below the root a
+    position repeated once, or one drawn by the move limit, scores zero.
+
+    The search may run in a worker thread: stop() and the deadline
+    attribute can be changed from another thread while it runs. The
+    thread's starter calls prepare() first, so that such a change made
+    before the thread enters the search is not overwritten by it.
+
+    Attributes:
+        tt (TranspositionTable): Table shared by all searches of this searcher.
+        tablebases (Tablebases|None): Endgame tables probed below the root.
+        deadline (Deadline): Time limits of the running search.
+        max_nodes (int|None): Node limit of the running search.
+        nodes (int): Nodes visited by the current search.
+    """
+
+    CHECK_INTERVAL = 256
+
+    def __init__(self, tt=None, tablebases=None):
+        """Creates a searcher.
+
+        Args:
+            tt (TranspositionTable|None): Table to use; a new one by default.
+            tablebases (Tablebases|None): Object whose probe(board, color)
+                                          returns a distance-to-mate value
+                                          or None.
+        """
+        self.tt = tt if tt is not None else TranspositionTable()
+        self.tablebases = tablebases
+        self.deadline = Deadline.infinite()
+        self.max_nodes = None
+        self.nodes = 0
+        self._stop_event = threading.Event()
+        self._prepared = False
+
+    def stop(self):
+        """Asks the running search to stop as soon as possible."""
+        self._stop_event.set()
+
+    def prepare(self, deadline=None, max_nodes=None):
+        """Clears an earlier stop() and sets the limits of the next search.
+
+        search() and search_multipv() do this themselves with their own
+        arguments unless prepare() was called since the last search. A
+        caller that runs the search in another thread calls it before
+        starting the thread: a stop() or a new deadline arriving while
+        the thread starts up then still applies.
+
+        Args:
+            deadline (Deadline|None): Time limits, unlimited by default.
+            max_nodes (int|None): Stop after roughly this many nodes.
+        """
+        self._stop_event.clear()
+        self.deadline = deadline if deadline is not None else Deadline.infinite()
+        self.max_nodes = max_nodes
+        self._prepared = True
+
+    def _begin(self, deadline, max_nodes):
+        if not self._prepared:
+            self.prepare(deadline, max_nodes)
+        self._prepared = False
+        self.nodes = 0
+
+    def search(self, board, color, max_depth=64, deadline=None, on_iteration=None,
+               max_nodes=None):
+        """Searches the position and returns the best move found.
+
+        The result of the last fully completed iteration is returned. If even
+        the first iteration is interrupted, the first legal move is played so
+        that a move is always available.
+
+        Args:
+            board: Board to search; restored to its original state on return.
+            color (str): Side to move.
+            max_depth (int): Maximum iteration depth.
+            deadline (Deadline|None): Time limits, unlimited by default;
+                                      ignored after prepare().
+            on_iteration (callable|None): Called with a SearchResult after
+                                          each completed iteration.
+            max_nodes (int|None): Stop after roughly this many nodes;
+                                  ignored after prepare().
+
+        Returns:
+            SearchResult: The best move and its principal variation.
+        """
+        self._begin(deadline, max_nodes)
+        started = time.monotonic()
+
+        moves = board.legal_moves(color)
+        if not moves:
+            score = -MATE_SCORE if board.no_moves_is_loss or board.is_in_check(color) else 0
+            return SearchResult(None, score, 0, [], 0, 0.0)
+        result = SearchResult(moves[0], 0, 0, [moves[0]], 0, 0.0)
+
+        for depth in range(1, max_depth + 1):
+            try:
+                score = self._negamax(board, color, depth, -INFINITY, INFINITY, 0)
+            except SearchAborted:
+                break
+            pv = self._extract_pv(board, color, depth)
+            result = SearchResult(pv[0] if pv else moves[0], score, depth, pv or [moves[0]],
+                                  self.nodes, time.monotonic() - started)
+            if on_iteration is not None:
+                on_iteration(result)
+            if (len(moves) == 1 or abs(score) >= MATE_SCORE - max_depth
+                    or self._stop_event.is_set() or self.deadline.soft_expired()
+                    or self.max_nodes is not None and self.nodes >= self.max_nodes):
+                break
+        return result
+
+    def search_multipv(self, board, color, lines=3, max_depth=64, deadline=None,
+                       on_iteration=None, max_nodes=None):
+        """Searches the position for its best few moves, each with a score and PV.
+
+        Every iteration makes one pass over the root moves: each move is
+        searched with alpha set to the score of the lines-th best move so
+        far, so only moves that enter the top lines get exact scores and
+        the rest fail low cheaply. All lines share the transposition table,
+        which also orders the next iteration and yields the variations.
+
+        Args:
+            board: Board to search; restored to its original state on return.
+            color (str): Side to move.
+            lines (int): Number of best moves to report.
+            max_depth (int): Maximum iteration depth.
+            deadline (Deadline|None): Time limits, unlimited by default;
+                                      ignored after prepare().
+            on_iteration (callable|None): Called with the list of SearchResult
+                                          after each completed iteration.
+            max_nodes (int|None): Stop after roughly this many nodes;
+                                  ignored after prepare().
+
+        Returns:
+            list[SearchResult]: Best move first, at most lines entries; empty
+            if the side has no moves. Results come from the last completed
+            iteration, or list the first moves unscored if none completed.
+        """
+        self._begin(deadline, max_nodes)
+        started = time.monotonic()
+
+        moves = board.legal_moves(color)
+        lines = max(1, min(lines, len(moves)))
+        results = [SearchResult(move, 0, 0, [move], 0, 0.0) for move in moves[:lines]]
+        if not moves:
+            return []
+        other = 'black' if color == 'white' else 'white'
+
+        for depth in range(1, max_depth + 1):
+            top = []
+            try:
+                for start, end in moves:
+                    alpha = top[-1][0] if len(top) == lines else -INFINITY
+                    board.make_move(start, end)
+                    try:
+                        score = -self._negamax(board, other, depth - 1, -INFINITY, -alpha, 1)
+                    finally:
+                        board.unmake_move()
+                    if len(top) < lines or score > alpha:
+                        top.append((score, (start, end)))
+                        top.sort(key=lambda line: -line[0])
+                        del top[lines:]
+            except SearchAborted:
+                break
+            self.tt.store(board.position_hash(color), depth, top[0][0],
+                          TranspositionTable.EXACT, top[0][1], board.size)
+            elapsed = time.monotonic() - started
+            results = []
+            for score, move in top:
+                board.make_move(*move)
+                pv = [move] + self._extract_pv(board, other, depth - 1)
+                board.unmake_move()
+                results.append(SearchResult(move, score, depth, pv, self.nodes, elapsed))
+            ranked = [move for _, move in top]
+            moves = ranked + [move for move in moves if move not in ranked]
+            if on_iteration is not None:
+                on_iteration(results)
+            if (len(moves) == 1 or all(abs(score) >= MATE_SCORE - max_depth for score, _ in top)
+                    or self._stop_event.is_set() or self.deadline.soft_expired()
+                    or self.max_nodes is not None and self.nodes >= self.max_nodes):
+                break
+        return results
+
+    def _check_abort(self):
+        if (self._stop_event.is_set() or self.deadline.hard_expired()
+                or self.max_nodes is not None and self.nodes >= self.max_nodes):
+            raise SearchAborted()
+
+    def _negamax(self, board, color, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes % self.CHECK_INTERVAL == 0:
+            self._check_abort()
+
+        if ply > 0 and (board.is_repetition(2) or board.is_move_limit_draw()):
+            return 0
+
+        if self.tablebases is not None and ply > 0:
+            value = self.tablebases.probe(board, color)
+            if value is not None:
+                if value > 0:
+                    return MATE_SCORE - ply - value
+                if value < 0:
+                    return -MATE_SCORE + ply - value - 1
+                return 0
+
+        if depth == 0:
+            return board.evaluate(color)
+
+        key = board.position_hash(color)
+        entry = self.tt.probe(key, board.size)
+        tt_move = None
+        if entry is not None:
+            entry_depth, entry_score, flag, tt_move = entry
+            if entry_depth >= depth and ply > 0:
+                if flag == TranspositionTable.EXACT:
+                    return entry_score
+                if flag == TranspositionTable.LOWER and entry_score >= beta:
+                    return entry_score
+                if flag == TranspositionTable.UPPER and entry_score <= alpha:
+                    return entry_score
+
+        moves = board.legal_moves(color)
+        if not moves:
+            if board.no_moves_is_loss or board.is_in_check(color):
+                return -MATE_SCORE + ply
+            return 0
+        if tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+
+        other = 'black' if color == 'white' else 'white'
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = moves[0]
+        for start, end in moves:
+            board.make_move(start, end)
+            try:
+                score = -self._negamax(board, other, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.unmake_move()
+            if score > best_score:
+                best_score = score
+                best_move = (start, end)
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = TranspositionTable.UPPER
+        elif best_score >= beta:
+            flag = TranspositionTable.LOWER
+        else:
+            flag = TranspositionTable.EXACT
+        self.tt.store(key, depth, best_score, flag, best_move, board.size)
+        return best_score
+
+    def _extract_pv(self, board, color, depth):
+        pv = []
+        seen = set()
+        for _ in range(depth):
+            key = board.position_hash(color)
+            entry = self.tt.probe(key, board.size)
+            if entry is None or entry[3] is None or key in seen:
+                break
+            move = entry[3]
+            if move not in board.legal_moves(color):
+                break
+            seen.add(key)
+            pv.append(move)
+            board.make_move(*move)
+            color = 'black' if color == 'white' else 'white'
+        for _ in pv:
+            board.unmake_move()
+        return pv
@@ -0,0 +1,387 @@
+import gc
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from .archive import RESULT_CODES, RESULT_NAMES
+from .notation import move_typecode
+from .state import decode_state, encode_state
+from .variants import VARIANTS
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; the store is then unlocked
+    fcntl = None
+
+
+MAGIC = b'CCSN'
+VERSION = 2
+# magic, version, engine color, result, board size, move count, en passant
+# square, hashes in the repetition history, plies in the line, bytes of the
+# moved bitmap; followed by the line, the history, the bitmap and
+# encode_state(). The line takes move_typecode(board size) words.
+SNAPSHOT_HEADER = struct.Struct('<4sBBBBHHHHH')
+# Version 1 had no board size: its lines are 16-bit moves of an 8x8 board.
+SNAPSHOT_HEADER_V1 = struct.Struct('<4sBBBHHHHH')
+ENGINE_CODES = {None: 0, 'white': 1, 'black': 2}
+ENGINE_NAMES = {code: color for color, code in ENGINE_CODES.items()}
+NO_SQUARE = 0xFFFF
+
+STORE_MAGIC = b'CCSS'
+STORE_VERSION = 1
+STORE_HEADER = struct.Struct('<4sB3x')
+RECORD_HEADER = struct.Struct('<2sBxHII')
+RECORD_MAGIC = b'SR'
+PARK = 0
+DISCARD = 1
+
+
+def _little_endian(values):
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def moved_bitmap(board):
+    """Returns one bit per square, set where a piece has has_moved set.
+
+    The engine has no castling move, so these flags of kings and rooks are
+    all that castling rights amount to; pawns use them too.
+    """
+    bits = 0
+    for index, piece in enumerate(piece for row in board.board for piece in row):
+        if piece is not None and getattr(piece, 'has_moved', False):
+            bits |= 1 << index
+    return bits.to_bytes((board.size * board.size + 7) // 8, 'little')
+
+
+def apply_moved_bitmap(board, data):
+    """Restores the has_moved flags saved by moved_bitmap()."""
+    bits = int.from_bytes(data, 'little')
+    for index, piece in enumerate(piece for row in board.board for piece in row):
+        if piece is not None and hasattr(piece, 'has_moved'):
+            piece.has_moved = bool(bits >> index & 1)
+
+
+def snapshot_game(game):
+    """Serializes a game session into one bytes object.
+
+    The snapshot holds the current position with its side to move,
+    halfmove clock and has_moved flags, the move count, the en passant
+    square, the repetition history since the last irreversible move, the
+    engine's color and the game result, and the line from the start to
+    the current position as packed moves. Side variations and the
+    engine's tables are not kept.
+
+    Args:
+        game (ChessGame|ModifiedChessGame|CheckersGame): Session to save.
+
+    Returns:
+        bytes: The snapshot.
+    """
+    board = game.board
+    line = _little_endian(game.tree.line())
+    history = board.history
+    kept = min(board.halfmove_clock + 1, len(history.hashes), 0xFFFF)
+    hashes = _little_endian(array('Q', history.hashes[-kept:]))
+    en_passant = getattr(board, 'en_passant_target', None)
+    moved = moved_bitmap(board)
+    return b''.join((
+        SNAPSHOT_HEADER.pack(MAGIC, VERSION, ENGINE_CODES[getattr(game, 'engine_color', None)],
+                             RESULT_CODES[game.result], board.size,
+                             min(game.tree.current.ply, 0xFFFF),
+                             NO_SQUARE if en_passant is None
+                             else en_passant[0] * board.size + en_passant[1],
+                             kept, len(line), len(moved)),
+        line.tobytes(),
+        hashes.tobytes(),
+        moved,
+        encode_state(board, game.variant),
+    ))
+
+
+class Snapshot:
+    """A decoded snapshot, ready for a game class's resume().
+
+    Attributes:
+        variant (str): 'chess', 'modified' or 'checkers'.
+        board (GameState): Current position, repetition history included.
+        line (array): Packed moves from the start to the position.
+        move_count (int): Moves played.
+        engine_color (str|None): Side played by the engine.
+        result (str): '1-0', '0-1', '1/2-1/2' or '*'.
+    """
+
+    __slots__ = ('variant', 'board', 'line', 'move_count', 'engine_color', 'result')
+
+    def __init__(self, variant, board, line, move_count, engine_color, result):
+        self.variant = variant
+        self.board = board
+        self.line = line
+        self.move_count = move_count
+        self.engine_color = engine_color
+        self.result = result
+
+
+def read_snapshot(data):
+    """Decodes snapshot_game() output.
+
+    Args:
+        data (bytes): The snapshot.
+
+    Returns:
+        Snapshot: The decoded session state.
+
+    Raises:
+        ValueError: If the data is not a snapshot.
+    """
+    view = memoryview(data)
+    if len(view) < SNAPSHOT_HEADER_V1.size:
+        raise ValueError("Snapshot is truncated")
+    if bytes(view[:4]) != MAGIC or view[4] not in (1, VERSION):
+        raise ValueError("Data is not a game snapshot")
+    if view[4] == 1:
+        (_, _, engine, result, move_count, en_passant,
+         kept, plies, moved_length) = SNAPSHOT_HEADER_V1.unpack_from(view)
+        size = 8
+        offset = SNAPSHOT_HEADER_V1.size
+    else:
+        if len(view) < SNAPSHOT_HEADER.size:
+            raise ValueError("Snapshot is truncated")
+        (_, _, engine, result, size, move_count, en_passant,
+         kept, plies, moved_length) = SNAPSHOT_HEADER.unpack_from(view)
+        offset = SNAPSHOT_HEADER.size
+    line = array(move_typecode(size))
+    line.frombytes(view[offset:offset + line.itemsize * plies])
+    offset += line.itemsize * plies
+    hashes = array('Q')
+    hashes.frombytes(view[offset:offset + 8 * kept])
+    offset += 8 * kept
+    moved = view[offset:offset + moved_length]
+    board, variant = decode_state(view[offset + moved_length:])
+    _little_endian(line)
+    _little_endian(hashes)
+
+    apply_moved_bitmap(board, moved)
+    if hashes:
+        clock = board.halfmove_clock
+        board.history.hashes = hashes.tolist()
+        board.history.clocks = list(range(clock - len(hashes) + 1, clock + 1))
+    if en_passant != NO_SQUARE and hasattr(board, 'en_passant_target'):
+        board.en_passant_target = divmod(en_passant, board.size)
+    return Snapshot(variant, board, line, move_count, ENGINE_NAMES[engine], RESULT_NAMES[result])
+
+
+def restore_game(data, **options):
+    """Rebuilds a game session of any variant from snapshot_game() output.
+
+    No moves are replayed: the position is decoded directly and handed to
+    the game class's resume().
+
+    Args:
+        data (bytes): The snapshot.
+        **options: Extra arguments for the game constructor (book_path,
+                   time_control, archive_path, ...).
+
+    Returns:
+        ChessGame|ModifiedChessGame|CheckersGame: The resumed session.
+
+    Raises:
+        ValueError: If the data is not a snapshot.
+    """
+    snapshot = read_snapshot(data)
+    return VARIANTS.variant(snapshot.variant).game_class().resume(snapshot, **options)
+
+
+class SnapshotStore:
+    """Parks game sessions in one append-only file and resumes them by id.
+
+    Each park() is one record written with a single os.pwrite(); many
+    sessions can be parked together with park_many(), which writes all
+    their records at once. An index of session id -> record location is
+    kept in memory and rebuilt by scanning the file on open. Discarding a
+    session appends a tombstone; compact() rewrites the file with only
+    the live sessions. Like the game archive, a record that is incomplete
+    or fails its checksum ends the readable data.
+
+    The store is meant to be owned by one process.
+
+    Attributes:
+        path (str): Store file.
+        live_bytes (int): Size of the records still referenced by the index.
+    """
+
+    def __init__(self, path):
+        """Opens (and if necessary creates) a store.
+
+        Args:
+            path (str): Store file.
+
+        Raises:
+            ValueError: If the file exists but is not a snapshot store.
+            BlockingIOError: If another process has the store open.
+        """
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._index = {}
+        self.live_bytes = 0
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            if os.fstat(self._fd).st_size == 0:
+                os.write(self._fd, STORE_HEADER.pack(STORE_MAGIC, STORE_VERSION))
+                self._end = STORE_HEADER.size
+            else:
+                self._end = self._scan()
+        except (OSError, ValueError):
+            self.close()
+            raise
+
+    def _scan(self):
+        header = os.pread(self._fd, STORE_HEADER.size, 0)
+        if len(header) < STORE_HEADER.size or STORE_HEADER.unpack(header) != (STORE_MAGIC, STORE_VERSION):
+            raise ValueError(f"{self.path} is not a snapshot store")
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        offset = STORE_HEADER.size
+        while offset + RECORD_HEADER.size <= len(data):
+            magic, kind, key_length, length, checksum = RECORD_HEADER.unpack_from(data, offset)
+            body = offset + RECORD_HEADER.size
+            end = body + key_length + length
+            if magic != RECORD_MAGIC or end > len(data) or zlib.crc32(data[body:end]) != checksum:
+                break
+            key = data[body:body + key_length].decode('utf-8')
+            self._forget(key)
+            if kind == PARK:
+                self._index[key] = (body + key_length, length)
+                self.live_bytes += length
+            offset = end
+        return offset
+
+    def _forget(self, session_id):
+        location = self._index.pop(session_id, None)
+        if location is not None:
+            self.live_bytes -= location[1]
+
+    def _record(self, kind, session_id, payload=b''):
+        key = session_id.encode('utf-8')
+        body = key + payload
+        return RECORD_HEADER.pack(RECORD_MAGIC, kind, len(key), len(payload), zlib.crc32(body)) + body
+
+    def _write(self, records):
+        # (session id, payload) of parked sessions and None payloads of discarded ones.
+        chunks = []
+        offset = self._end
+        for session_id, payload in records:
+            record = self._record(PARK if payload is not None else DISCARD, session_id,
+                                  payload or b'')
+            self._forget(session_id)
+            if payload is not None:
+                start = offset + len(record) - len(payload)
+                self._index[session_id] = (start, len(payload))
+                self.live_bytes += len(payload)
+            chunks.append(record)
+            offset += len(record)
+        os.pwrite(self._fd, b''.join(chunks), self._end)
+        self._end = offset
+
+    def park(self, session_id, game):
+        """Saves a session under an id, replacing any earlier snapshot.
+
+        Args:
+            session_id (str): Key of the session.
+            game: ChessGame, ModifiedChessGame or CheckersGame.
+        """
+        self._write([(session_id, snapshot_game(game))])
+
+    def park_many(self, sessions):
+        """Saves many sessions with one write.
+
+        Args:
+            sessions (Iterable[tuple[str, Game]]): (session id, game) pairs.
+        """
+        self._write([(session_id, snapshot_game(game)) for session_id, game in sessions])
+
+    def load(self, session_id):
+        """Returns the raw snapshot of a session.
+
+        Raises:
+            KeyError: If the session is not parked.
+        """
+        start, length = self._index[session_id]
+        return os.pread(self._fd, length, start)
+
+    def restore(self, session_id, **options):
+        """Resumes a parked session; it stays parked until discard().
+
+        Args:
+            session_id (str): Key of the session.
+            **options: Extra arguments for the game constructor.
+
+        Returns:
+            ChessGame|ModifiedChessGame|CheckersGame: The resumed session.
+
+        Raises:
+            KeyError: If the session is not parked.
+        """
+        return restore_game(self.load(session_id), **options)
+
+    def restore_many(self, session_ids, **options):
+        """Resumes several sessions; returns {session id: game}.
+
+        The cycle collector is paused meanwhile: every game built would
+        otherwise make it rescan all the games built before, which about
+        halves the restore rate of large batches.
+        """
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return {session_id: self.restore(session_id, **options) for session_id in session_ids}
+        finally:
+            if enabled:
+                gc.enable()
+
+    def discard(self, *session_ids):
+        """Forgets parked sessions; unknown ids are ignored."""
+        self._write([(session_id, None) for session_id in session_ids
+                     if session_id in self._index])
+
+    def compact(self):
+        """Rewrites the file with only the parked sessions."""
+        temporary = self.path + '.tmp'
+        sessions = [(session_id, self.load(session_id)) for session_id in self._index]
+        with open(temporary, 'wb') as f:
+            f.write(STORE_HEADER.pack(STORE_MAGIC, STORE_VERSION))
+        fd = os.open(temporary, os.O_RDWR)
+        old, self._fd = self._fd, fd
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._index = {}
+        self.live_bytes = 0
+        self._end = STORE_HEADER.size
+        self._write(sessions)
+        os.replace(temporary, self.path)
+        os.close(old)
+
+    def __contains__(self, session_id):
+        return session_id in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        return iter(list(self._index))
+
+    def close(self):
+        """Closes the file."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
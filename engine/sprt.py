@@ -0,0 +1,97 @@
+import math
+
+
+def score_fraction(wins, draws, losses):
+    """Returns the points fraction scored, counting a draw as half a point."""
+    games = wins + draws + losses
+    return (wins + draws / 2) / games if games else 0.5
+
+
+def elo_from_score(score):
+    """Converts an expected score in (0, 1) to an Elo difference."""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def score_from_elo(elo):
+    """Converts an Elo difference to the expected score."""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def elo_estimate(wins, draws, losses):
+    """Estimates the Elo difference with a 95% confidence margin.
+
+    Args:
+        wins (int): Games won by the first engine.
+        draws (int): Drawn games.
+        losses (int): Games lost by the first engine.
+
+    Returns:
+        tuple[float, float]: (elo, margin); margin is inf with fewer than two games.
+    """
+    games = wins + draws + losses
+    score = score_fraction(wins, draws, losses)
+    if games < 2:
+        return elo_from_score(score), math.inf
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2
+                + losses * score ** 2) / games
+    deviation = math.sqrt(variance / games)
+    low = elo_from_score(score - 1.96 * deviation)
+    high = elo_from_score(score + 1.96 * deviation)
+    return elo_from_score(score), (high - low) / 2
+
+
+class SPRT:
+    """Sequential probability ratio test on game results.
+
+    Tests H0: elo = elo0 against H1: elo = elo1 using the normal
+    approximation of the trinomial log-likelihood ratio, which lets a
+    tournament stop as soon as the evidence is strong enough.
+
+    Attributes:
+        elo0 (float): Elo difference under the null hypothesis.
+        elo1 (float): Elo difference under the alternative hypothesis.
+        lower (float): LLR bound for accepting H0.
+        upper (float): LLR bound for accepting H1.
+    """
+
+    def __init__(self, elo0=0.0, elo1=5.0, alpha=0.05, beta=0.05):
+        """Creates a test.
+
+        Args:
+            elo0 (float): Elo difference under H0.
+            elo1 (float): Elo difference under H1.
+            alpha (float): Probability of a false positive.
+            beta (float): Probability of a false negative.
+        """
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+
+    def llr(self, wins, draws, losses):
+        """Returns the log-likelihood ratio of the results so far."""
+        games = wins + draws + losses
+        if games == 0 or wins + losses == 0:
+            return 0.0
+        score = score_fraction(wins, draws, losses)
+        variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2
+                    + losses * score ** 2) / games
+        if variance <= 0:
+            return 0.0
+        s0 = score_from_elo(self.elo0)
+        s1 = score_from_elo(self.elo1)
+        return (s1 - s0) * (2 * score - s0 - s1) / (2 * variance / games)
+
+    def status(self, wins, draws, losses):
+        """Returns the decision for the results so far.
+
+        Returns:
+            str: 'H1' (accepted), 'H0' (rejected) or 'continue'.
+        """
+        llr = self.llr(wins, draws, losses)
+        if llr >= self.upper:
+            return 'H1'
+        if llr <= self.lower:
+            return 'H0'
+        return 'continue'
@@ -0,0 +1,79 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+DEFAULT_MODULES = ('main', 'engine', 'engine.variants', 'chess.board', 'checkers.board',
+                   'chess.game', 'checkers.game')
+DEFAULT_BUDGET_MS = 60.0
+
+# Run in a fresh interpreter: prints the import time in seconds and the
+# number of modules the import loaded.
+PROBE = (
+    "import sys, time\n"
+    "before = len(sys.modules)\n"
+    "started = time.perf_counter()\n"
+    "import {module}\n"
+    "print(time.perf_counter() - started, len(sys.modules) - before)\n"
+)
+
+
+def measure_import(module, runs=5, python=None, cwd=None):
+    """Measures how long importing a module takes in fresh interpreters.
+
+    Args:
+        module (str): Dotted module name.
+        runs (int): Interpreters to start; the median is reported.
+        python (str|None): Interpreter; the running one by default.
+        cwd (str|None): Directory to run in; the project root by default.
+
+    Returns:
+        tuple[float, int]: Median import time in seconds and the number of
+        modules the import loaded.
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    cwd = cwd or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    times = []
+    loaded = 0
+    for _ in range(runs):
+        process = subprocess.run([python or sys.executable, '-c', PROBE.format(module=module)],
+                                 cwd=cwd, capture_output=True, text=True)
+        if process.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{process.stderr}")
+        elapsed, loaded = process.stdout.split()
+        times.append(float(elapsed))
+    return statistics.median(times), int(loaded)
+
+
+def main(argv=None):
+    """Command-line entry point: python -m engine.startup --budget-ms 60 [modules...]
+
+    Exits with status 1 if any module takes longer than the budget, so the
+    check can guard the startup of the CLI and of worker processes.
+    """
+    parser = argparse.ArgumentParser(description="Время импорта модулей при запуске")
+    parser.add_argument('modules', nargs='*', default=list(DEFAULT_MODULES))
+    parser.add_argument('--runs', type=int, default=5, help="запусков интерпретатора на модуль")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help="допустимое время импорта, мс")
+    args = parser.parse_args(argv)
+
+    over = []
+    for module in args.modules:
+        seconds, loaded = measure_import(module, args.runs)
+        millis = seconds * 1000
+        mark = '' if millis <= args.budget_ms else '  превышение!'
+        print(f"{module:<20} {millis:7.1f} мс  модулей: {loaded}{mark}")
+        if millis > args.budget_ms:
+            over.append(module)
+    if over:
+        print(f"Бюджет {args.budget_ms:.0f} мс превышен: {', '.join(over)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import struct
+
+
+# Numbers of the variants in binary formats: game states, archives and board pools.
+VARIANT_IDS = {'chess': 1, 'modified': 2, 'checkers': 3}
+VARIANT_NAMES = {number: name for name, number in VARIANT_IDS.items()}
+
+# Side to move letter, halfmove clock and board size, then size * size
+# placement letters (see squares_bytes()).
+STATE = struct.Struct('<cHB')
+SIDE_LETTERS = {'white': b'w', 'black': b'b'}
+SIDE_NAMES = {b'w': 'white', b'b': 'black'}
+
+
+def __getattr__(name):
+    # The GameState protocol lives in engine.protocol: typing takes longer
+    # to import than the boards, which only need GameStateMixin.
+    if name in ('GameState', 'Square', 'MovePair'):
+        from . import protocol
+
+        return getattr(protocol, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class GameStateMixin:
+    """GameState methods written once on top of the board primitives.
+
+    Boards provide turn, size, legal_moves(), is_in_check(), is_draw(),
+    halfmove_clock, squares_bytes() and set_squares(); this mixin adds
+    result(), is_terminal(), encode() and decode().
+    """
+
+    def result(self):
+        """Returns the game result, None while the game goes on.
+
+        A side to move without legal moves loses if the board's rules say
+        so or if it is in check, and is stalemated otherwise; that takes
+        precedence over the draw rules.
+
+        Returns:
+            str|None: '1-0', '0-1', '1/2-1/2' or None.
+        """
+        color = self.turn
+        if not self.legal_moves(color):
+            if self.no_moves_is_loss or self.is_in_check(color):
+                return '0-1' if color == 'white' else '1-0'
+            return '1/2-1/2'
+        if self.is_draw():
+            return '1/2-1/2'
+        return None
+
+    def is_terminal(self):
+        """Returns True if the game is over."""
+        return self.result() is not None
+
+    def encode(self):
+        """Packs the position into STATE.size + size * size bytes.
+
+        Returns:
+            bytes: Side to move, halfmove clock, board size and placement.
+        """
+        return STATE.pack(SIDE_LETTERS[self.turn], min(self.halfmove_clock, 0xFFFF),
+                          self.size) + self.squares_bytes()
+
+    @classmethod
+    def decode(cls, data):
+        """Builds a board from encode() output.
+
+        The repetition history restarts at the decoded position.
+
+        Args:
+            data (bytes): encode() output; trailing bytes are ignored.
+
+        Returns:
+            Board: A new board of this class.
+
+        Raises:
+            ValueError: If the data is malformed.
+        """
+        if len(data) < STATE.size:
+            raise ValueError(f"Game state needs {STATE.size} header bytes, got {len(data)}")
+        side, clock, size = STATE.unpack_from(data)
+        if side not in SIDE_NAMES:
+            raise ValueError(f"Unknown side to move {side!r}")
+        end = STATE.size + size * size
+        if len(data) < end:
+            raise ValueError(f"Game state of a {size}x{size} board needs {end} bytes, got {len(data)}")
+        squares = bytes(data[STATE.size:end])
+        # set_squares() initializes every attribute, so the start position is not built.
+        board = cls.__new__(cls)
+        board.set_squares(squares, clock, SIDE_NAMES[side])
+        return board
+
+
+def encode_state(board, variant=None):
+    """Packs a board of any variant, prefixed with its variant id.
+
+    Args:
+        board (GameState): Position to pack.
+        variant (str|None): Variant name; derived from the board when omitted.
+
+    Returns:
+        bytes: The variant id byte followed by board.encode().
+    """
+    if variant is None:
+        from .variants import variant_name
+
+        variant = variant_name(board)
+    return bytes((VARIANT_IDS[variant],)) + board.encode()
+
+
+def decode_state(data):
+    """Rebuilds a board packed by encode_state().
+
+    Returns:
+        tuple[GameState, str]: The board and its variant name.
+
+    Raises:
+        ValueError: If the data is malformed or the variant unknown.
+    """
+    from .variants import VARIANTS
+
+    if not data or data[0] not in VARIANT_NAMES:
+        raise ValueError("Unknown variant id in game state")
+    name = VARIANT_NAMES[data[0]]
+    return VARIANTS[name].decode(data[1:]), name
@@ -0,0 +1,550 @@
+import argparse
+import concurrent.futures
+import functools
+import os
+
+import numpy as np
+
+from chess.board import PIECE_BY_LETTER
+from chess.pieces import Jester
+
+
+# Canonical order of pieces inside one side of a material signature.
+PIECE_ORDER = 'KDQWRBNJP'
+
+ILLEGAL = np.int16(-32768)
+DRAW = 0
+
+# The eight symmetries of the square board acting on (row, col).
+TRANSFORMS = (
+    lambda r, c: (r, c),
+    lambda r, c: (r, 7 - c),
+    lambda r, c: (7 - r, c),
+    lambda r, c: (7 - r, 7 - c),
+    lambda r, c: (c, r),
+    lambda r, c: (c, 7 - r),
+    lambda r, c: (7 - c, r),
+    lambda r, c: (7 - c, 7 - r),
+)
+TRANSFORM_TABLE = np.array([[t(sq // 8, sq % 8)[0] * 8 + t(sq // 8, sq % 8)[1]
+                             for sq in range(64)] for t in TRANSFORMS], dtype=np.int64)
+
+
+class PieceTables:
+    """Movement tables of one piece type and color, derived from is_valid_move().
+
+    The tables are computed by asking the piece itself about every move on
+    an otherwise empty board, so fairy pieces need no special code here.
+
+    Attributes:
+        quiet (np.ndarray): bool[64, 64], move to an empty square is valid.
+        capture (np.ndarray): bool[64, 64], move onto an enemy piece is valid.
+        quiet_blockers (np.ndarray): uint64[64, 64], squares whose occupation
+                                     invalidates the quiet move.
+        capture_blockers (np.ndarray): uint64[64, 64], the same for captures.
+        swaps (bool): True for the Jester, which swaps instead of capturing.
+        royal (bool): True for the king-like piece of the side.
+    """
+
+    def __init__(self, letter, color):
+        """Builds the tables.
+
+        Args:
+            letter (str): Uppercase piece letter from PIECE_BY_LETTER.
+            color (str): 'white' or 'black'.
+        """
+        cls = PIECE_BY_LETTER[letter]
+        piece = cls(color)
+        blocker = cls(color)
+        enemy = cls('black' if color == 'white' else 'white')
+        self.swaps = issubclass(cls, Jester)
+        self.royal = cls.royal
+        self.quiet = np.zeros((64, 64), dtype=bool)
+        self.capture = np.zeros((64, 64), dtype=bool)
+        self.quiet_blockers = np.zeros((64, 64), dtype=np.uint64)
+        self.capture_blockers = np.zeros((64, 64), dtype=np.uint64)
+        board = [[None] * 8 for _ in range(8)]
+        for start in range(64):
+            x1, y1 = divmod(start, 8)
+            board[x1][y1] = piece
+            for end in range(64):
+                if end == start:
+                    continue
+                x2, y2 = divmod(end, 8)
+                for target, valid, blockers in ((None, self.quiet, self.quiet_blockers),
+                                                (enemy, self.capture, self.capture_blockers)):
+                    board[x2][y2] = target
+                    if not piece.is_valid_move(board, (x1, y1), (x2, y2)):
+                        continue
+                    valid[start, end] = True
+                    mask = 0
+                    for square in range(64):
+                        if square in (start, end):
+                            continue
+                        bx, by = divmod(square, 8)
+                        board[bx][by] = blocker
+                        if not piece.is_valid_move(board, (x1, y1), (x2, y2)):
+                            mask |= 1 << square
+                        board[bx][by] = None
+                    blockers[start, end] = mask
+                board[x2][y2] = None
+            board[x1][y1] = None
+
+    def is_symmetric(self, transform):
+        """Returns True if the movement is unchanged by a board symmetry.
+
+        Args:
+            transform (np.ndarray): int64[64] square permutation.
+        """
+        t = transform
+        return (np.array_equal(self.quiet[np.ix_(t, t)], self.quiet)
+                and np.array_equal(self.capture[np.ix_(t, t)], self.capture))
+
+
+@functools.lru_cache(maxsize=None)
+def piece_tables(letter, color):
+    """Returns the cached PieceTables of a piece type and color."""
+    return PieceTables(letter, color)
+
+
+def parse_signature(signature):
+    """Splits a material signature such as 'KQvK' into its two sides.
+
+    Args:
+        signature (str): White pieces, 'v', black pieces.
+
+    Returns:
+        tuple[str, str]: White and black piece letters in canonical order.
+
+    Raises:
+        ValueError: If a side does not have exactly one royal piece.
+    """
+    white, _, black = signature.upper().partition('V')
+    sides = []
+    for side in (white, black):
+        if any(letter not in PIECE_BY_LETTER for letter in side):
+            raise ValueError(f"Unknown piece in signature {signature!r}")
+        if sum(PIECE_BY_LETTER[letter].royal for letter in side) != 1:
+            raise ValueError(f"Each side needs exactly one royal piece: {signature!r}")
+        sides.append(''.join(sorted(side, key=PIECE_ORDER.index)))
+    return sides[0], sides[1]
+
+
+def make_signature(white, black):
+    """Joins two sides into a signature string."""
+    return f"{''.join(sorted(white, key=PIECE_ORDER.index))}v" \
+           f"{''.join(sorted(black, key=PIECE_ORDER.index))}"
+
+
+def sub_signatures(signature):
+    """Returns the signatures reachable by one capture of a non-royal piece."""
+    white, black = parse_signature(signature)
+    result = set()
+    for i, letter in enumerate(white):
+        if not PIECE_BY_LETTER[letter].royal:
+            result.add(make_signature(white[:i] + white[i + 1:], black))
+    for i, letter in enumerate(black):
+        if not PIECE_BY_LETTER[letter].royal:
+            result.add(make_signature(white, black[:i] + black[i + 1:]))
+    return sorted(result)
+
+
+class Layout:
+    """Index layout of one material signature.
+
+    Positions are indexed as (side to move, region square of the white
+    royal piece, square of every other piece). Board symmetries that leave
+    the movement of every piece unchanged are used to map the white royal
+    piece into a fundamental region, which shrinks the table up to 8 times.
+
+    Attributes:
+        signature (str): Material signature.
+        pieces (list[tuple[str, str]]): (letter, color) per index slot,
+                                        white royal first.
+        tables (list[PieceTables]): Movement tables per slot.
+        region (np.ndarray): Squares of the fundamental region.
+        size (int): Number of positions in the table.
+    """
+
+    def __init__(self, signature):
+        white, black = parse_signature(signature)
+        self.signature = make_signature(white, black)
+        self.pieces = [(letter, 'white') for letter in white] + \
+                      [(letter, 'black') for letter in black]
+        self.tables = [piece_tables(letter, color) for letter, color in self.pieces]
+        self.white_royal = 0
+        self.black_royal = len(white) + next(i for i, letter in enumerate(black)
+                                             if PIECE_BY_LETTER[letter].royal)
+        self.colors = np.array([color == 'white' for _, color in self.pieces])
+
+        group = [t for t in range(len(TRANSFORMS))
+                 if all(tables.is_symmetric(TRANSFORM_TABLE[t]) for tables in self.tables)]
+        images = TRANSFORM_TABLE[group]
+        canonical = images.min(axis=0)
+        self.canon_transform = np.array(group)[images.argmin(axis=0)]
+        self.region = np.unique(canonical)
+        self.region_index = np.full(64, -1, dtype=np.int64)
+        self.region_index[self.region] = np.arange(len(self.region))
+        self.others = len(self.pieces) - 1
+        self.per_side = len(self.region) * 64 ** self.others
+        self.size = 2 * self.per_side
+
+    def decode(self, index):
+        """Converts position indices to (white_to_move, squares).
+
+        Args:
+            index (np.ndarray): int64 position indices.
+
+        Returns:
+            tuple[np.ndarray, list[np.ndarray]]: Bool side-to-move array and
+            one square array per piece slot.
+        """
+        white_to_move = index < self.per_side
+        rest = index % self.per_side
+        squares = []
+        for _ in range(self.others):
+            rest, square = np.divmod(rest, 64)
+            squares.append(square)
+        squares.append(self.region[rest])
+        squares.reverse()
+        return white_to_move, squares
+
+    def encode(self, white_to_move, squares):
+        """Converts (white_to_move, squares) to canonical position indices.
+
+        Args:
+            white_to_move (np.ndarray): Bool array.
+            squares (list[np.ndarray]): Square array per piece slot.
+
+        Returns:
+            np.ndarray: int64 position indices.
+        """
+        transform = self.canon_transform[squares[0]]
+        index = self.region_index[TRANSFORM_TABLE[transform, squares[0]]]
+        for square in squares[1:]:
+            index = index * 64 + TRANSFORM_TABLE[transform, square]
+        return np.where(white_to_move, index, index + self.per_side)
+
+    def attacked(self, target, squares, by_white):
+        """Returns which positions have the target square attacked.
+
+        Args:
+            target (np.ndarray): Square per position.
+            squares (list[np.ndarray]): Square array per piece slot.
+            by_white (bool|np.ndarray): Color of the attackers per position.
+
+        Returns:
+            np.ndarray: Bool array.
+        """
+        result = np.zeros(len(target), dtype=bool)
+        for k, tables in enumerate(self.tables):
+            own = self.colors[k] == by_white
+            hits = own & tables.capture[squares[k], target] & (squares[k] != target)
+            blockers = tables.capture_blockers[squares[k], target]
+            for j, square in enumerate(squares):
+                if j != k:
+                    hits &= (blockers >> square.astype(np.uint64)) & np.uint64(1) == 0
+            result |= hits
+        return result
+
+
+def _moves(layout, white_to_move, squares, quiet_only):
+    """Yields (mask, successor signature, successor indices) for every candidate move.
+
+    Successor indices are meaningful only where mask is True. Captures
+    lead to the signature without the captured piece.
+    """
+    count = len(squares)
+    for k, tables in enumerate(layout.tables):
+        mover = layout.colors[k] == white_to_move
+        start = squares[k]
+        for end in range(64):
+            dest = np.full_like(start, end)
+            own = np.zeros(len(start), dtype=bool)
+            victim = np.full(len(start), -1)
+            for j in range(count):
+                if j == k:
+                    continue
+                here = squares[j] == end
+                friendly = layout.colors[j] == white_to_move
+                own |= here & friendly
+                victim = np.where(here & ~friendly, j, victim)
+            capture = victim >= 0
+            valid = mover & ~own & np.where(capture, tables.capture[start, dest],
+                                            tables.quiet[start, dest])
+            blockers = np.where(capture, tables.capture_blockers[start, dest],
+                                tables.quiet_blockers[start, dest])
+            for j in range(count):
+                if j != k:
+                    valid &= (blockers >> squares[j].astype(np.uint64)) & np.uint64(1) == 0
+            if not valid.any():
+                continue
+
+            quiet = valid & (~capture | tables.swaps)
+            if quiet.any():
+                moved = list(squares)
+                moved[k] = dest
+                if tables.swaps:
+                    for j in range(count):
+                        if j != k:
+                            moved[j] = np.where(quiet & (victim == j), start, moved[j])
+                yield quiet, layout.signature, layout.encode(~white_to_move, moved)
+            if quiet_only or tables.swaps:
+                continue
+            for j in range(count):
+                taken = valid & (victim == j)
+                if j == k or layout.tables[j].royal or not taken.any():
+                    continue
+                letters = [letter for letter, _ in layout.pieces]
+                remaining = letters[:j] + letters[j + 1:]
+                colors = list(layout.colors[:j]) + list(layout.colors[j + 1:])
+                sub = make_signature([l for l, c in zip(remaining, colors) if c],
+                                     [l for l, c in zip(remaining, colors) if not c])
+                sub_layout = get_layout(sub)
+                moved = [dest if i == k else squares[i] for i in range(count) if i != j]
+                order = _slot_order(sub_layout, remaining, colors)
+                yield taken, sub, sub_layout.encode(~white_to_move, [moved[i] for i in order])
+
+
+def _slot_order(layout, letters, colors):
+    """Maps the slots of a sub-layout to positions in a list of remaining pieces."""
+    available = list(zip(letters, ['white' if c else 'black' for c in colors]))
+    order = []
+    used = set()
+    for piece in layout.pieces:
+        i = next(i for i, p in enumerate(available) if p == piece and i not in used)
+        used.add(i)
+        order.append(i)
+    return order
+
+
+@functools.lru_cache(maxsize=None)
+def get_layout(signature):
+    """Returns the cached Layout of a signature."""
+    return Layout(signature)
+
+
+def generate(signature, directory):
+    """Generates one distance-to-mate table by retrograde analysis.
+
+    All tables reachable by a capture must already exist in the directory.
+    Values are stored per position from the side to move's point of view:
+    a positive odd v means mate in v plies, a negative odd v means being
+    mated after -v - 1 plies, 0 is a draw and ILLEGAL marks impossible
+    placements.
+
+    Args:
+        signature (str): Material signature such as 'KQvK'.
+        directory (str): Directory holding the .npy tables.
+
+    Returns:
+        str: Path of the written table.
+    """
+    layout = get_layout(signature)
+    tables = {layout.signature: None}
+    for sub in sub_signatures(layout.signature):
+        tables[sub] = np.load(os.path.join(directory, f"{sub}.npy"), mmap_mode='r')
+
+    index = np.arange(layout.size, dtype=np.int64)
+    white_to_move, squares = layout.decode(index)
+    values = np.zeros(layout.size, dtype=np.int16)
+    resolved = np.zeros(layout.size, dtype=bool)
+
+    illegal = np.zeros(layout.size, dtype=bool)
+    for i in range(len(squares)):
+        for j in range(i + 1, len(squares)):
+            illegal |= squares[i] == squares[j]
+    waiting_royal = np.where(white_to_move, squares[layout.black_royal], squares[layout.white_royal])
+    illegal |= layout.attacked(waiting_royal, squares, white_to_move)
+    values[illegal] = ILLEGAL
+    resolved[illegal] = True
+
+    # Captures lead to finished tables, so their contribution is computed once.
+    has_move = np.zeros(layout.size, dtype=bool)
+    capture_win = np.full(layout.size, np.iinfo(np.int16).max, dtype=np.int32)
+    capture_all_win = np.ones(layout.size, dtype=bool)
+    capture_max_win = np.zeros(layout.size, dtype=np.int32)
+    live = ~illegal
+    for mask, sub, successor in _moves(layout, white_to_move, squares, quiet_only=False):
+        mask &= live
+        if sub == layout.signature:
+            if mask.any():
+                has_move |= mask & (values[np.where(mask, successor, 0)] != ILLEGAL)
+            continue
+        result = np.asarray(tables[sub])[np.where(mask, successor, 0)].astype(np.int32)
+        legal = mask & (result != ILLEGAL)
+        has_move |= legal
+        capture_win = np.where(legal & (result < 0), np.minimum(capture_win, -result), capture_win)
+        capture_all_win &= ~legal | (result > 0)
+        capture_max_win = np.where(legal, np.maximum(capture_max_win, result), capture_max_win)
+
+    in_check = layout.attacked(np.where(white_to_move, squares[layout.white_royal],
+                                        squares[layout.black_royal]),
+                               squares, ~white_to_move)
+    no_moves = live & ~has_move
+    values[no_moves & in_check] = -1
+    resolved |= no_moves
+
+    longest = max([int(np.abs(np.asarray(t)[np.asarray(t) != ILLEGAL]).max(initial=0))
+                   for t in tables.values() if t is not None] + [0])
+    ply = 0
+    idle = 0
+    while idle < 2 or ply <= longest + 1:
+        ply += 1
+        open_index = np.nonzero(~resolved)[0]
+        if len(open_index) == 0:
+            break
+        side, open_squares = layout.decode(open_index)
+        best_win = capture_win[open_index]
+        all_win = capture_all_win[open_index].copy()
+        max_win = capture_max_win[open_index].copy()
+        for mask, _, successor in _moves(layout, side, open_squares, quiet_only=True):
+            result = values[np.where(mask, successor, 0)].astype(np.int32)
+            done = resolved[np.where(mask, successor, 0)]
+            legal = mask & (result != ILLEGAL)
+            best_win = np.where(legal & done & (result < 0), np.minimum(best_win, -result), best_win)
+            all_win &= ~legal | (done & (result > 0))
+            max_win = np.where(legal, np.maximum(max_win, result), max_win)
+        wins = (ply % 2 == 1) & (best_win == ply)
+        losses = (ply % 2 == 0) & all_win & (max_win == ply - 1)
+        found = wins | losses
+        values[open_index[wins]] = ply
+        values[open_index[losses]] = -(ply + 1)
+        resolved[open_index[found]] = True
+        idle = 0 if found.any() else idle + 1
+
+    path = os.path.join(directory, f"{layout.signature}.npy")
+    np.save(path, values)
+    return path
+
+
+def dependencies(signatures):
+    """Returns all signatures needed to generate the given ones, grouped by size.
+
+    Args:
+        signatures (list[str]): Requested material signatures.
+
+    Returns:
+        list[list[str]]: Signatures grouped by piece count, smallest first.
+    """
+    needed = set()
+    stack = [make_signature(*parse_signature(s)) for s in signatures]
+    while stack:
+        signature = stack.pop()
+        if signature not in needed:
+            needed.add(signature)
+            stack.extend(sub_signatures(signature))
+    by_size = {}
+    for signature in needed:
+        by_size.setdefault(len(signature) - 1, []).append(signature)
+    return [sorted(by_size[size]) for size in sorted(by_size)]
+
+
+def generate_all(signatures, directory, workers=None, on_done=None):
+    """Generates tables and their dependencies in parallel.
+
+    Signatures with the same number of pieces never depend on each other,
+    so each size level is spread over a process pool.
+
+    Args:
+        signatures (list[str]): Requested material signatures.
+        directory (str): Output directory.
+        workers (int|None): Number of worker processes.
+        on_done (callable|None): Called with the path of every finished table.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        for level in dependencies(signatures):
+            todo = [s for s in level if not os.path.exists(os.path.join(directory, f"{s}.npy"))]
+            for path in pool.map(generate, todo, [directory] * len(todo)):
+                if on_done is not None:
+                    on_done(path)
+
+
+class Tablebases:
+    """Probes distance-to-mate tables through memory-mapped .npy files.
+
+    Attributes:
+        directory (str): Directory with the tables.
+        max_pieces (int): Largest piece count present.
+    """
+
+    def __init__(self, directory):
+        """Indexes the tables available in a directory.
+
+        Args:
+            directory (str): Directory written by generate_all().
+        """
+        self.directory = directory
+        self._files = {name[:-4]: os.path.join(directory, name)
+                       for name in os.listdir(directory) if name.endswith('.npy')}
+        self._tables = {}
+        self.max_pieces = max((len(name) - 1 for name in self._files), default=0)
+
+    def _table(self, signature):
+        if signature not in self._tables:
+            self._tables[signature] = np.load(self._files[signature], mmap_mode='r')
+        return self._tables[signature]
+
+    def probe(self, board, color):
+        """Looks up a position.
+
+        Args:
+            board (ChessBoard): Position to probe.
+            color (str): Side to move.
+
+        Returns:
+            int|None: Stored value (see generate()), None if not covered;
+            tables are built for 8x8 boards, so other sizes never are.
+        """
+        if board.size != 8:
+            return None
+        pieces = []
+        for i, row in enumerate(board.board):
+            for j, piece in enumerate(row):
+                if piece is not None:
+                    pieces.append((str(piece).upper(), piece.color, i * 8 + j))
+                    if len(pieces) > self.max_pieces:
+                        return None
+        white = [p[0] for p in pieces if p[1] == 'white']
+        black = [p[0] for p in pieces if p[1] == 'black']
+        try:
+            signature = make_signature(white, black)
+        except ValueError:
+            return None
+        if signature not in self._files:
+            return None
+        layout = get_layout(signature)
+        used = set()
+        squares = []
+        for letter, piece_color in layout.pieces:
+            k = next(k for k, p in enumerate(pieces)
+                     if k not in used and p[0] == letter and p[1] == piece_color)
+            used.add(k)
+            squares.append(np.array([pieces[k][2]]))
+        index = layout.encode(np.array([color == 'white']), squares)[0]
+        value = int(self._table(signature)[index])
+        return None if value == ILLEGAL else value
+
+
+def main(argv=None):
+    """Command-line entry point: python -m engine.tablebase KQvK KWvK ..."""
+    parser = argparse.ArgumentParser(description="Генерация эндшпильных таблиц")
+    parser.add_argument('signatures', nargs='+', help="соотношения материала, например KQvK или DWvD")
+    parser.add_argument('-d', '--directory', default='tablebases')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    def report(path):
+        table = np.load(path, mmap_mode='r')
+        legal = table[table != ILLEGAL]
+        wins = int((legal > 0).sum())
+        print(f"{os.path.basename(path)}: {len(legal)} позиций, выигрышей {wins}, "
+              f"проигрышей {int((legal < 0).sum())}, ничьих {int((legal == 0).sum())}, "
+              f"максимум {int(legal.max(initial=0))} полуходов")
+
+    generate_all(args.signatures, args.directory, args.workers, report)
+
+
+if __name__ == '__main__':
+    main()
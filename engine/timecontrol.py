@@ -0,0 +1,149 @@
+import time
+
+
+class Deadline:
+    """A pair of soft and hard time limits for one search.
+
+    The soft limit is checked between iterative-deepening iterations: once
+    it has passed, no new iteration is started. The hard limit is checked
+    inside the search and aborts it immediately (emergency stop).
+
+    Attributes:
+        soft (float|None): time.monotonic() value of the soft limit, None if unlimited.
+        hard (float|None): time.monotonic() value of the hard limit, None if unlimited.
+    """
+
+    def __init__(self, soft=None, hard=None):
+        """Creates a deadline from absolute monotonic timestamps.
+
+        Args:
+            soft (float|None): Soft limit, or None for no limit.
+            hard (float|None): Hard limit, or None for no limit.
+        """
+        self.soft = soft
+        self.hard = hard
+
+    @classmethod
+    def infinite(cls):
+        """Returns a deadline that never expires (used for pondering)."""
+        return cls()
+
+    @classmethod
+    def after(cls, soft_seconds, hard_seconds=None):
+        """Returns a deadline relative to the current time.
+
+        Args:
+            soft_seconds (float): Seconds until the soft limit.
+            hard_seconds (float|None): Seconds until the hard limit.
+                                       Defaults to the soft limit.
+
+        Returns:
+            Deadline: The new deadline.
+        """
+        now = time.monotonic()
+        if hard_seconds is None:
+            hard_seconds = soft_seconds
+        return cls(now + soft_seconds, now + hard_seconds)
+
+    def soft_expired(self):
+        """Returns True if no new iteration should be started."""
+        return self.soft is not None and time.monotonic() >= self.soft
+
+    def hard_expired(self):
+        """Returns True if the running search must be aborted."""
+        return self.hard is not None and time.monotonic() >= self.hard
+
+
+class TimeControl:
+    """Description of a clock: base time, increment and optional move count.
+
+    Attributes:
+        base (float): Initial time on the clock in seconds.
+        increment (float): Seconds added after every move.
+        moves_to_go (int|None): Moves until the next time control, or None
+                                for sudden death.
+    """
+
+    def __init__(self, base, increment=0.0, moves_to_go=None):
+        """Initializes a time control.
+
+        Args:
+            base (float): Initial time in seconds.
+            increment (float): Increment per move in seconds.
+            moves_to_go (int|None): Moves per period, None for sudden death.
+        """
+        self.base = base
+        self.increment = increment
+        self.moves_to_go = moves_to_go
+
+
+def parse_time_control(text):
+    """Parses 'base+increment' in seconds, e.g. '10+0.1'.
+
+    Raises:
+        ValueError: If either part is not a number.
+    """
+    base, _, increment = text.partition('+')
+    return TimeControl(float(base), float(increment or 0))
+
+
+class TimeManager:
+    """Allocates a per-move budget from a running clock.
+
+    The budget is the remaining time spread over the expected number of
+    moves plus most of the increment. The hard limit allows overrunning the
+    budget for a difficult move but always keeps a safety reserve, so the
+    reply latency is bounded even if the search misbehaves.
+
+    Attributes:
+        time_control (TimeControl): The clock settings.
+        remaining (float): Seconds left on the clock.
+        moves_played (int): Moves played under this time control.
+    """
+
+    DEFAULT_MOVES_TO_GO = 30
+    HARD_FACTOR = 3.0
+    RESERVE = 0.05
+    EMERGENCY_THRESHOLD = 1.0
+
+    def __init__(self, time_control):
+        """Starts a clock at the base time of the time control.
+
+        Args:
+            time_control (TimeControl): Clock settings.
+        """
+        self.time_control = time_control
+        self.remaining = time_control.base
+        self.moves_played = 0
+
+    def in_emergency(self):
+        """Returns True when the clock is low enough to play almost instantly."""
+        return self.remaining < self.EMERGENCY_THRESHOLD
+
+    def deadline_for_move(self):
+        """Computes the deadline for the next move.
+
+        Returns:
+            Deadline: Soft and hard limits for the search.
+        """
+        tc = self.time_control
+        available = max(self.remaining - self.RESERVE, 0.0)
+        if tc.moves_to_go:
+            moves_left = max(tc.moves_to_go - self.moves_played % tc.moves_to_go, 1)
+        else:
+            moves_left = self.DEFAULT_MOVES_TO_GO
+        if self.in_emergency():
+            soft = min(available / 4, tc.increment / 2) if tc.increment else available / 10
+            return Deadline.after(soft, soft)
+        soft = min(available / moves_left + tc.increment * 0.75, available)
+        hard = min(soft * self.HARD_FACTOR, available)
+        return Deadline.after(soft, hard)
+
+    def consume(self, elapsed):
+        """Charges the clock for a finished move and adds the increment.
+
+        Args:
+            elapsed (float): Seconds spent on the move.
+        """
+        self.remaining = self.remaining - elapsed + self.time_control.increment
+        self.moves_played += 1
@@ -0,0 +1,554 @@
+import argparse
+import concurrent.futures
+import json
+import os
+import random
+import time
+
+from .mcts import MonteCarloSearcher
+from .search import Searcher, TranspositionTable
+from .sprt import SPRT, elo_estimate
+from .timecontrol import TimeControl, TimeManager, parse_time_control
+from .archive import GameArchiveWriter
+from .move import pack
+from .notation import move_to_uci, uci_to_move
+from .variants import VARIANTS
+
+
+class EngineConfig:
+    """Settings of one tournament participant.
+
+    Attributes:
+        name (str): Name used in reports.
+        max_depth (int): Maximum search depth.
+        max_nodes (int|None): Node limit per move.
+        hash_mb (int): Transposition table size in MiB.
+        playouts (int|None): Playouts per move; when set the engine uses
+                             Monte Carlo tree search instead of alpha-beta.
+    """
+
+    def __init__(self, name, max_depth=64, max_nodes=None, hash_mb=16, playouts=None):
+        self.name = name
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.hash_mb = hash_mb
+        self.playouts = playouts
+
+    @classmethod
+    def parse(cls, spec):
+        """Builds a config from a string such as 'new,depth=4,nodes=5000,hash=32'.
+
+        'mcts,playouts=2000' selects Monte Carlo tree search.
+
+        Args:
+            spec (str): Name followed by comma-separated key=value settings.
+
+        Returns:
+            EngineConfig: The parsed config.
+
+        Raises:
+            ValueError: On an unknown key.
+        """
+        name, *settings = spec.split(',')
+        keys = {'depth': 'max_depth', 'nodes': 'max_nodes', 'hash': 'hash_mb',
+                'playouts': 'playouts'}
+        kwargs = {}
+        for setting in settings:
+            key, _, value = setting.partition('=')
+            if key not in keys:
+                raise ValueError(f"Unknown engine setting {key!r}")
+            kwargs[keys[key]] = int(value)
+        return cls(name, **kwargs)
+
+
+class Adjudication:
+    """Rules for ending engine games early.
+
+    Attributes:
+        max_plies (int): Game is drawn after this many plies.
+        resign_score (int): Score beyond which a side is considered lost.
+        resign_plies (int): Consecutive plies the resign score must hold.
+        draw_score (int): Score within which a position is considered drawn.
+        draw_plies (int): Consecutive plies the draw score must hold.
+        draw_min_ply (int): No draw adjudication before this ply.
+    """
+
+    def __init__(self, max_plies=300, resign_score=1000, resign_plies=6,
+                 draw_score=10, draw_plies=20, draw_min_ply=80):
+        self.max_plies = max_plies
+        self.resign_score = resign_score
+        self.resign_plies = resign_plies
+        self.draw_score = draw_score
+        self.draw_plies = draw_plies
+        self.draw_min_ply = draw_min_ply
+
+
+def load_opening_suite(path):
+    """Reads an opening suite: one opening per line as coordinate moves.
+
+    Blank lines and lines starting with '#' are ignored.
+
+    Args:
+        path (str): Path of the suite file.
+
+    Returns:
+        list[list[str]]: Openings as lists of moves such as 'e2e4'.
+    """
+    with open(path, encoding='utf-8') as f:
+        return [line.split() for line in f if line.strip() and not line.startswith('#')]
+
+
+def replay_opening(variant, moves):
+    """Plays an opening on a new board, checking every move.
+
+    Args:
+        variant (str): Key of VARIANTS.
+        moves (list[str]): Coordinate moves such as 'e2e4', white first.
+
+    Returns:
+        tuple: The board after the opening and the side to move.
+
+    Raises:
+        ValueError: If a move is malformed or not legal in the variant.
+    """
+    board = VARIANTS[variant]()
+    color = 'white'
+    for text in moves:
+        move = uci_to_move(text, board.size)
+        if move not in board.legal_moves(color):
+            raise ValueError(f"illegal move {text}")
+        board.make_move(*move)
+        color = 'black' if color == 'white' else 'white'
+    return board, color
+
+
+def legal_openings(variant, suite):
+    """Splits an opening suite into the openings legal in a variant and the rest.
+
+    Args:
+        variant (str): Key of VARIANTS.
+        suite (list[list[str]]): Openings as lists of coordinate moves.
+
+    Returns:
+        tuple[list[list[str]], list[tuple[list[str], str]]]: Legal openings,
+        and the rejected ones with the reason.
+    """
+    legal, rejected = [], []
+    for moves in suite:
+        try:
+            replay_opening(variant, moves)
+        except ValueError as e:
+            rejected.append((moves, str(e)))
+        else:
+            legal.append(moves)
+    return legal, rejected
+
+
+def random_openings(variant, count, plies, seed=0):
+    """Generates distinct openings by playing random legal moves.
+
+    Args:
+        variant (str): Key of VARIANTS.
+        count (int): Number of openings.
+        plies (int): Length of each opening.
+        seed (int): Random seed for reproducible suites.
+
+    Returns:
+        list[list[str]]: Openings as lists of coordinate moves.
+    """
+    rng = random.Random(seed)
+    openings = []
+    seen = set()
+    attempts = 0
+    while len(openings) < count and attempts < count * 20:
+        attempts += 1
+        board = VARIANTS[variant]()
+        color = 'white'
+        moves = []
+        for _ in range(plies):
+            legal = board.legal_moves(color)
+            if not legal:
+                break
+            move = rng.choice(legal)
+            board.make_move(*move)
+            moves.append(move_to_uci(move))
+            color = 'black' if color == 'white' else 'white'
+        key = board.position_hash(color)
+        if key not in seen:
+            seen.add(key)
+            openings.append(moves)
+    return openings
+
+
+def play_game(task):
+    """Plays one engine-vs-engine game; runs inside a worker process.
+
+    Args:
+        task (dict): Game description with keys index, variant, opening,
+                     white, black (EngineConfig), base, increment and
+                     adjudication (Adjudication).
+
+    Returns:
+        dict: Result record with result ('1-0', '0-1', '1/2-1/2'), reason,
+        plies, moves and timing.
+    """
+    started_wall = time.monotonic()
+    started_cpu = time.process_time()
+    moves = list(task['opening'])
+    board, color = replay_opening(task['variant'], moves)
+
+    configs = {'white': task['white'], 'black': task['black']}
+    searchers = {side: MonteCarloSearcher() if configs[side].playouts else
+                 Searcher(TranspositionTable.from_megabytes(configs[side].hash_mb))
+                 for side in configs}
+    clocks = {side: TimeManager(TimeControl(task['base'], task['increment']))
+              for side in configs}
+    rules = task['adjudication']
+    white_scores = []
+    result, reason = '1/2-1/2', 'move limit'
+
+    for ply in range(len(moves), rules.max_plies):
+        if not board.legal_moves(color):
+            if board.no_moves_is_loss or board.is_in_check(color):
+                result = '0-1' if color == 'white' else '1-0'
+                reason = 'no moves' if board.no_moves_is_loss else 'checkmate'
+            else:
+                result, reason = '1/2-1/2', 'stalemate'
+            break
+
+        config = configs[color]
+        clock = clocks[color]
+        move_started = time.monotonic()
+        if config.playouts:
+            search = searchers[color].search(board, color, playouts=config.playouts,
+                                             deadline=clock.deadline_for_move())
+        else:
+            search = searchers[color].search(board, color, max_depth=config.max_depth,
+                                             deadline=clock.deadline_for_move(),
+                                             max_nodes=config.max_nodes)
+        clock.consume(time.monotonic() - move_started)
+        if clock.remaining < 0:
+            result = '0-1' if color == 'white' else '1-0'
+            reason = 'time forfeit'
+            break
+
+        board.make_move(*search.best_move)
+        moves.append(move_to_uci(search.best_move))
+        white_scores.append(search.score if color == 'white' else -search.score)
+        color = 'black' if color == 'white' else 'white'
+        if board.is_repetition(3):
+            result, reason = '1/2-1/2', 'repetition'
+            break
+        if board.is_move_limit_draw():
+            result, reason = '1/2-1/2', 'move rule'
+            break
+
+        recent = white_scores[-rules.resign_plies:]
+        if len(recent) == rules.resign_plies:
+            if all(score >= rules.resign_score for score in recent):
+                result, reason = '1-0', 'adjudicated win'
+                break
+            if all(score <= -rules.resign_score for score in recent):
+                result, reason = '0-1', 'adjudicated win'
+                break
+        recent = white_scores[-rules.draw_plies:]
+        if (ply >= rules.draw_min_ply and len(recent) == rules.draw_plies
+                and all(abs(score) <= rules.draw_score for score in recent)):
+            result, reason = '1/2-1/2', 'adjudicated draw'
+            break
+
+    return {
+        'index': task['index'],
+        'variant': task['variant'],
+        'white': configs['white'].name,
+        'black': configs['black'].name,
+        'opening': task['opening'],
+        'result': result,
+        'reason': reason,
+        'plies': len(moves),
+        'moves': moves,
+        'wall_time': time.monotonic() - started_wall,
+        'cpu_time': time.process_time() - started_cpu,
+    }
+
+
+def packed_moves(variant, moves):
+    """Replays a game's coordinate moves and packs them with their flags.
+
+    Args:
+        variant (str): Key of VARIANTS.
+        moves (list[str]): Moves such as 'e2e4', white first.
+
+    Returns:
+        tuple[list[int], int]: Moves packed by engine.move.pack() with the
+        capture and swap flags of board.move_flags(), and the board size.
+    """
+    board = VARIANTS[variant]()
+    packed = []
+    for text in moves:
+        start, end = uci_to_move(text, board.size)
+        packed.append(pack(start, end, board.move_flags(start, end), board.size))
+        board.make_move(start, end)
+    return packed, board.size
+
+
+class TournamentReport:
+    """Aggregated tournament statistics from the point of view of engine A.
+
+    Attributes:
+        wins (int): Games won by engine A.
+        draws (int): Drawn games.
+        losses (int): Games lost by engine A.
+        by_variant (dict[str, dict]): Per-variant game counts, plies and decisive games.
+        wall_time (float): Seconds since the tournament started.
+        cpu_time (float): Total CPU seconds spent by workers in games.
+        workers (int): Number of worker processes.
+        sprt_status (str|None): SPRT decision, None if no test is run.
+        llr (float|None): Current log-likelihood ratio.
+    """
+
+    def __init__(self, workers):
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.by_variant = {}
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.workers = workers
+        self.sprt_status = None
+        self.llr = None
+
+    @property
+    def games(self):
+        """int: Number of finished games."""
+        return self.wins + self.draws + self.losses
+
+    def add(self, record, engine_a):
+        """Accounts one finished game record."""
+        if record['result'] == '1/2-1/2':
+            self.draws += 1
+        elif (record['result'] == '1-0') == (record['white'] == engine_a):
+            self.wins += 1
+        else:
+            self.losses += 1
+        stats = self.by_variant.setdefault(record['variant'],
+                                           {'games': 0, 'plies': 0, 'decisive': 0})
+        stats['games'] += 1
+        stats['plies'] += record['plies']
+        stats['decisive'] += record['result'] != '1/2-1/2'
+        self.cpu_time += record['cpu_time']
+
+    def games_per_second(self):
+        """float: Overall throughput."""
+        return self.games / self.wall_time if self.wall_time else 0.0
+
+    def games_per_core_second(self):
+        """float: Throughput of one worker, from CPU time spent in games."""
+        return self.games / self.cpu_time if self.cpu_time else 0.0
+
+    def summary(self):
+        """Returns a human-readable multi-line report."""
+        elo, margin = elo_estimate(self.wins, self.draws, self.losses)
+        lines = [
+            f"Партий: {self.games}  +{self.wins} ={self.draws} -{self.losses}",
+            f"Elo: {elo:+.1f} ± {margin:.1f}",
+        ]
+        if self.sprt_status is not None:
+            lines.append(f"SPRT: LLR {self.llr:.2f}, решение: {self.sprt_status}")
+        for variant, stats in sorted(self.by_variant.items()):
+            lines.append(f"{variant}: {stats['games']} партий, "
+                         f"средняя длина {stats['plies'] / stats['games']:.1f} полуходов, "
+                         f"результативных {100 * stats['decisive'] / stats['games']:.0f}%")
+        lines.append(f"Скорость: {self.games_per_second():.2f} партий/с на {self.workers} ядрах, "
+                     f"{self.games_per_core_second():.2f} партий/с на ядро")
+        return '\n'.join(lines)
+
+
+class Tournament:
+    """Engine-vs-engine match played across a process pool.
+
+    Each opening is played twice with colors reversed. Finished games are
+    appended to a JSON-lines file as soon as they complete, and the match
+    stops early once the SPRT reaches a decision.
+
+    Attributes:
+        variants (list[str]): Keys of VARIANTS to play.
+        engine_a (EngineConfig): Tested engine.
+        engine_b (EngineConfig): Reference engine.
+        openings (dict[str, list[list[str]]]): Opening suite per variant,
+            holding only openings legal in that variant.
+        rejected_openings (dict[str, list[tuple[list[str], str]]]): Openings
+            dropped from each suite, with the reason.
+        time_control (TimeControl): Clock of both engines.
+        max_games (int): Upper bound on the number of games.
+        workers (int): Number of worker processes.
+        output_path (str|None): JSON-lines file receiving game records.
+        archive_path (str|None): Binary game archive receiving the games.
+        sprt (SPRT|None): Stop rule.
+        adjudication (Adjudication): Early-termination rules.
+    """
+
+    def __init__(self, variants, engine_a, engine_b, openings, time_control, max_games,
+                 workers=None, output_path=None, sprt=None, adjudication=None,
+                 archive_path=None):
+        self.variants = list(variants)
+        self.engine_a = engine_a
+        self.engine_b = engine_b
+        self.openings = {}
+        self.rejected_openings = {}
+        for variant, suite in openings.items():
+            self.openings[variant], self.rejected_openings[variant] = legal_openings(variant, suite)
+        self.time_control = time_control
+        self.max_games = max_games
+        self.workers = workers or os.cpu_count() or 1
+        self.output_path = output_path
+        self.sprt = sprt
+        self.adjudication = adjudication or Adjudication()
+        self.archive_path = archive_path
+
+    def tasks(self):
+        """Yields game descriptions, alternating colors on each opening."""
+        index = 0
+        round_number = 0
+        while True:
+            produced = False
+            for variant in self.variants:
+                suite = self.openings.get(variant) or [[]]
+                opening = suite[round_number % len(suite)]
+                for white, black in ((self.engine_a, self.engine_b),
+                                     (self.engine_b, self.engine_a)):
+                    if index >= self.max_games:
+                        return
+                    yield {
+                        'index': index, 'variant': variant, 'opening': opening,
+                        'white': white, 'black': black,
+                        'base': self.time_control.base,
+                        'increment': self.time_control.increment,
+                        'adjudication': self.adjudication,
+                    }
+                    index += 1
+                    produced = True
+            if not produced:
+                return
+            round_number += 1
+
+    def run(self, on_result=None):
+        """Plays the match.
+
+        Args:
+            on_result (callable|None): Called with (record, report) after each game.
+
+        Returns:
+            TournamentReport: Final statistics.
+        """
+        report = TournamentReport(self.workers)
+        started = time.monotonic()
+        output = open(self.output_path, 'a', encoding='utf-8') if self.output_path else None
+        archive = GameArchiveWriter(self.archive_path, compress=True) if self.archive_path else None
+        tasks = self.tasks()
+        try:
+            with concurrent.futures.ProcessPoolExecutor(self.workers) as pool:
+                pending = set()
+                stopped = False
+                while True:
+                    while not stopped and len(pending) < self.workers * 2:
+                        task = next(tasks, None)
+                        if task is None:
+                            break
+                        pending.add(pool.submit(play_game, task))
+                    if not pending:
+                        break
+                    done, pending = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        record = future.result()
+                        report.add(record, self.engine_a.name)
+                        report.wall_time = time.monotonic() - started
+                        if output is not None:
+                            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+                            output.flush()
+                        if archive is not None:
+                            codes, size = packed_moves(record['variant'], record['moves'])
+                            archive.append(record['variant'], record['result'], codes,
+                                           {key: record[key] for key in ('white', 'black', 'reason')},
+                                           size)
+                        if self.sprt is not None:
+                            report.llr = self.sprt.llr(report.wins, report.draws, report.losses)
+                            report.sprt_status = self.sprt.status(
+                                report.wins, report.draws, report.losses)
+                            if report.sprt_status != 'continue' and not stopped:
+                                stopped = True
+                                for future_left in pending:
+                                    future_left.cancel()
+                        if on_result is not None:
+                            on_result(record, report)
+                    pending = {future for future in pending if not future.cancelled()}
+        finally:
+            if output is not None:
+                output.close()
+            if archive is not None:
+                archive.close()
+        report.wall_time = time.monotonic() - started
+        return report
+
+
+def main(argv=None):
+    """Command-line entry point: python -m engine.tournament --help."""
+    parser = argparse.ArgumentParser(description="Турнир движков между собой")
+    parser.add_argument('--variant', action='append', choices=sorted(VARIANTS),
+                        help="вариант игры (можно указать несколько раз)")
+    parser.add_argument('--engine-a', default='A,depth=3', help="имя,depth=N,nodes=N,hash=MB или имя,playouts=N")
+    parser.add_argument('--engine-b', default='B,depth=2', help="имя,depth=N,nodes=N,hash=MB или имя,playouts=N")
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--tc', default='10+0.1', help="контроль времени, секунды: база+добавка")
+    parser.add_argument('--openings', action='append',
+                        help="файл дебютов (ходы вида e2e4 через пробел); "
+                             "вариант:файл задаёт дебюты только для этого варианта")
+    parser.add_argument('--opening-plies', type=int, default=4)
+    parser.add_argument('--max-plies', type=int, default=300)
+    parser.add_argument('--sprt', help="elo0,elo1 для остановки по SPRT")
+    parser.add_argument('--out', default=None, help="файл JSON-lines для результатов")
+    parser.add_argument('--archive', default=None, help="двоичный архив партий")
+    args = parser.parse_args(argv)
+
+    variants = args.variant or ['chess']
+    games_per_variant = max(1, args.games // (2 * len(variants)))
+    suites = {}
+    for spec in args.openings or ():
+        name, sep, path = spec.partition(':')
+        if not sep or name not in VARIANTS:
+            name, path = None, spec
+        suites[name] = load_opening_suite(path)
+    openings = {}
+    for variant in variants:
+        suite = suites.get(variant, suites.get(None))
+        if suite is None:
+            suite = random_openings(variant, games_per_variant, args.opening_plies)
+        openings[variant] = suite
+    sprt = None
+    if args.sprt:
+        elo0, elo1 = (float(value) for value in args.sprt.split(','))
+        sprt = SPRT(elo0, elo1)
+
+    tournament = Tournament(variants, EngineConfig.parse(args.engine_a),
+                            EngineConfig.parse(args.engine_b), openings,
+                            parse_time_control(args.tc), args.games, args.workers,
+                            args.out, sprt, Adjudication(max_plies=args.max_plies),
+                            args.archive)
+    for variant, rejected in tournament.rejected_openings.items():
+        for moves, reason in rejected:
+            print(f"Дебют «{' '.join(moves)}» пропущен для варианта {variant}: {reason}")
+        if rejected and not tournament.openings[variant]:
+            print(f"Для варианта {variant} не осталось дебютов, партии начнутся с начальной позиции")
+
+    def progress(record, report):
+        print(f"#{record['index']} {record['variant']}: {record['white']} - {record['black']} "
+              f"{record['result']} ({record['reason']}, {record['plies']} полуходов)")
+
+    report = tournament.run(progress)
+    print(report.summary())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+from array import array
+from collections import OrderedDict
+
+from .move import pack, unpack
+from .notation import move_typecode
+
+
+class VariationNode:
+    """A position in a game tree, reached by one move from its parent.
+
+    Nodes store only the packed move leading to them; positions are
+    rebuilt on demand by GameTree.board_at().
+
+    Attributes:
+        parent (VariationNode|None): Previous position, None for the root.
+        move (int|None): Packed move from the parent, see engine.move.pack().
+        ply (int): Number of moves from the root.
+        children (list[VariationNode]): Continuations; the first is the main line.
+        selected (VariationNode|None): Child followed by redo, the last one visited.
+        comment (str): Free-form annotation.
+    """
+
+    __slots__ = ('parent', 'move', 'ply', 'children', 'selected', 'comment')
+
+    def __init__(self, parent=None, move=None):
+        self.parent = parent
+        self.move = move
+        self.ply = parent.ply + 1 if parent is not None else 0
+        self.children = []
+        self.selected = None
+        self.comment = ''
+
+    def path(self):
+        """Returns the nodes from the root down to this one."""
+        nodes = []
+        node = self
+        while node is not None:
+            nodes.append(node)
+            node = node.parent
+        nodes.reverse()
+        return nodes
+
+    def child(self, move):
+        """Returns the child reached by a packed move, or None."""
+        for node in self.children:
+            if node.move == move:
+                return node
+        return None
+
+    def __repr__(self):
+        return f"VariationNode(ply={self.ply}, children={len(self.children)})"
+
+
+class GameTree:
+    """Tree of moves and variations with cached keyframe positions.
+
+    The root position and a bounded LRU set of intermediate positions
+    (keyframes) are stored as board copies; any other node is rebuilt
+    from the nearest cached ancestor by replaying the moves in between
+    with make_move(). Memory therefore stays flat however large the tree
+    grows, while moving around it costs at most keyframe_interval moves
+    when the keyframes are warm.
+
+    Attributes:
+        root (VariationNode): Starting position.
+        current (VariationNode): Position the game is at.
+        root_color (str): Side to move at the root.
+        size (int): Board size, which the packed moves depend on.
+        keyframe_interval (int): Plies between cached keyframes.
+        max_keyframes (int): Capacity of the keyframe cache.
+    """
+
+    def __init__(self, board, color='white', keyframe_interval=8, max_keyframes=64):
+        """Creates a tree rooted at a position.
+
+        Args:
+            board: Starting position; a copy is kept.
+            color (str): Side to move in it.
+            keyframe_interval (int): Plies between cached keyframes.
+            max_keyframes (int): Maximum number of cached keyframes.
+        """
+        self.root = VariationNode()
+        self.current = self.root
+        self.root_color = color
+        self.size = board.size
+        self.keyframe_interval = keyframe_interval
+        self.max_keyframes = max_keyframes
+        self._root_board = board.copy()
+        self._keyframes = OrderedDict()
+
+    def color_at(self, node):
+        """Returns the side to move at a node."""
+        if node.ply % 2 == 0:
+            return self.root_color
+        return 'black' if self.root_color == 'white' else 'white'
+
+    def play(self, start, end, flags=0, board=None):
+        """Records a move from the current node and makes its target current.
+
+        An existing child with the same move is reused; otherwise a new
+        variation is added.
+
+        Args:
+            start (tuple[int, int]): (row, col) of the moving piece.
+            end (tuple[int, int]): (row, col) of the target square.
+            flags (int): Move flags, see engine.move.
+            board: Position after the move, if at hand; it is copied into
+                   the keyframe cache when the new ply is a keyframe ply.
+
+        Returns:
+            VariationNode: The new current node.
+        """
+        move = pack(start, end, flags, self.size)
+        node = self.current.child(move)
+        if node is None:
+            node = VariationNode(self.current, move)
+            self.current.children.append(node)
+        self.current.selected = node
+        self.current = node
+        if board is not None and node.ply % self.keyframe_interval == 0:
+            self._store_keyframe(node, board)
+        return node
+
+    def extend(self, moves, board=None):
+        """Records packed moves from the current node without playing them.
+
+        Args:
+            moves (Iterable[int]): Packed moves, see engine.move.pack().
+            board: Position after the last move, if at hand; it is cached
+                   as a keyframe so that board_at() need not replay the line.
+
+        Returns:
+            VariationNode: The new current node.
+        """
+        for move in moves:
+            node = self.current.child(move)
+            if node is None:
+                node = VariationNode(self.current, move)
+                self.current.children.append(node)
+            self.current.selected = node
+            self.current = node
+        if board is not None and self.current is not self.root:
+            self._store_keyframe(self.current, board)
+        return self.current
+
+    def undo(self, count=1):
+        """Moves up to count plies back towards the root.
+
+        Returns:
+            VariationNode: The new current node.
+        """
+        node = self.current
+        while count > 0 and node.parent is not None:
+            node.parent.selected = node
+            node = node.parent
+            count -= 1
+        self.current = node
+        return node
+
+    def redo(self, count=1):
+        """Moves up to count plies forward along the last visited line.
+
+        Returns:
+            VariationNode: The new current node.
+        """
+        node = self.current
+        while count > 0:
+            following = node.selected or (node.children[0] if node.children else None)
+            if following is None:
+                break
+            node = following
+            count -= 1
+        self.current = node
+        return node
+
+    def goto(self, ply):
+        """Jumps to the given ply of the current line.
+
+        Plies behind the current node are reached through its ancestors,
+        later ones by following the line redo() would take.
+
+        Args:
+            ply (int): Target ply, 0 being the root.
+
+        Returns:
+            VariationNode: The new current node.
+        """
+        if ply <= self.current.ply:
+            return self.undo(self.current.ply - max(ply, 0))
+        return self.redo(ply - self.current.ply)
+
+    def line(self, node=None):
+        """Returns the packed moves from the root to a node (default: current)."""
+        node = node or self.current
+        return array(move_typecode(self.size), (step.move for step in node.path()[1:]))
+
+    def board_at(self, node=None):
+        """Rebuilds the position of a node (default: current).
+
+        Args:
+            node (VariationNode|None): Node to rebuild.
+
+        Returns:
+            Board: A new, independent board.
+        """
+        node = node or self.current
+        replay = []
+        base = node
+        board = None
+        while base is not None:
+            if base is self.root:
+                board = self._root_board.copy()
+                break
+            cached = self._keyframes.get(base)
+            if cached is not None:
+                self._keyframes.move_to_end(base)
+                board = cached.copy()
+                break
+            replay.append(base)
+            base = base.parent
+        for step in reversed(replay):
+            start, end, _ = unpack(step.move, self.size)
+            board.make_move(start, end)
+            if step.ply % self.keyframe_interval == 0:
+                self._store_keyframe(step, board)
+        board.undo_stack.clear()
+        return board
+
+    def _store_keyframe(self, node, board):
+        snapshot = board.copy()
+        self._keyframes[node] = snapshot
+        self._keyframes.move_to_end(node)
+        while len(self._keyframes) > self.max_keyframes:
+            self._keyframes.popitem(last=False)
+
+    def __len__(self):
+        count = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children)
+        return count
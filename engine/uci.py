@@ -0,0 +1,331 @@
+import sys
+import threading
+
+from .notation import move_to_uci, uci_to_move
+from .search import MATE_SCORE, Searcher, TranspositionTable
+from .timecontrol import Deadline, TimeControl, TimeManager
+from .variants import VARIANTS
+
+
+# UCI_Variant values that differ from the registry names.
+UCI_NAMES = {'chess': 'standard'}
+
+
+def uci_variants():
+    """Returns {UCI_Variant value: registry name} for the chess variants."""
+    return {UCI_NAMES.get(variant.name, variant.name): variant.name
+            for variant in VARIANTS.variants() if variant.board.startswith('chess.')}
+
+
+class UCIAdapter:
+    """Universal Chess Interface front-end for ChessBoard and ModifiedChessBoard.
+
+    Commands are read line by line from a text stream. Searches run in a
+    worker thread, so 'stop', 'ponderhit' and 'isready' are answered while
+    the engine is thinking; 'info' lines are streamed after every completed
+    iteration and 'bestmove' is printed when the search ends. After 'go
+    infinite' or 'go ponder' it is held back until 'stop' or 'ponderhit'.
+
+    Supported options: Hash (MiB), Threads, Ponder, BookFile, TablebasePath and UCI_Variant
+    ('standard' or 'modified' for the Wizard/Dragon/Jester set; the chess
+    variants of engine.variants.VARIANTS, with 'chess' called 'standard').
+
+    Attributes:
+        input (TextIO): Stream of commands.
+        output (TextIO): Stream for responses.
+        variant (str): VARIANTS name of the board variant in use.
+        board (ChessBoard): Current position.
+        color (str): Side to move in the current position.
+        searcher (Searcher): Search with its transposition table.
+        threads (int): Value of the Threads option.
+        book (OpeningBook|None): Book set with the BookFile option.
+    """
+
+    NAME = 'checkers-chess'
+    AUTHOR = 'Маслова Варвара'
+    DEFAULT_HASH_MB = 16
+    GO_PARAMS = ('depth', 'nodes', 'movetime', 'wtime', 'btime', 'winc', 'binc', 'movestogo')
+
+    def __init__(self, input_stream=None, output_stream=None):
+        """Creates an adapter reading and writing the given streams.
+
+        Args:
+            input_stream (TextIO|None): Command source, stdin by default.
+            output_stream (TextIO|None): Response sink, stdout by default.
+        """
+        self.input = input_stream if input_stream is not None else sys.stdin
+        self.output = output_stream if output_stream is not None else sys.stdout
+        self.variant = 'chess'
+        self.board = VARIANTS[self.variant]()
+        self.color = 'white'
+        self.searcher = Searcher(TranspositionTable.from_megabytes(self.DEFAULT_HASH_MB))
+        self.threads = 1
+        self.book = None
+        self._output_lock = threading.Lock()
+        self._search_thread = None
+        self._ponder_budget = None
+        self._pondering = False
+        # Cleared while 'bestmove' must wait for 'stop' or 'ponderhit'.
+        self._release = threading.Event()
+        self._release.set()
+
+    def send(self, line):
+        """Writes one response line and flushes it immediately."""
+        with self._output_lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def run(self):
+        """Processes commands until 'quit' or the end of the input stream."""
+        for line in self.input:
+            if not self.handle(line.strip()):
+                self.stop_search()
+                return
+        if self._release.is_set():
+            self.wait_search()
+        else:
+            # Nobody is left to send 'stop' to an infinite or pondering search.
+            self.stop_search()
+
+    def handle(self, line):
+        """Executes one command line.
+
+        Args:
+            line (str): Command without trailing newline.
+
+        Returns:
+            bool: False if the adapter should terminate.
+        """
+        if not line:
+            return True
+        command, _, args = line.partition(' ')
+        tokens = args.split()
+        if command == 'quit':
+            return False
+        if command == 'uci':
+            self.send(f"id name {self.NAME}")
+            self.send(f"id author {self.AUTHOR}")
+            self.send(f"option name Hash type spin default {self.DEFAULT_HASH_MB} min 1 max 4096")
+            self.send("option name Threads type spin default 1 min 1 max 64")
+            self.send("option name Ponder type check default true")
+            self.send("option name BookFile type string default <empty>")
+            self.send("option name TablebasePath type string default <empty>")
+            self.send("option name UCI_Variant type combo default standard "
+                      + ' '.join(f"var {name}" for name in uci_variants()))
+            self.send("uciok")
+        elif command == 'isready':
+            self.send("readyok")
+        elif command == 'ucinewgame':
+            self.stop_search()
+            self.searcher.tt.clear()
+        elif command == 'setoption':
+            self.set_option(tokens)
+        elif command == 'position':
+            self.stop_search()
+            self.set_position(tokens)
+        elif command == 'go':
+            self.stop_search()
+            self.go(tokens)
+        elif command == 'stop':
+            self.stop_search()
+        elif command == 'ponderhit':
+            self.ponderhit()
+        else:
+            self.send(f"info string unknown command {command}")
+        return True
+
+    def set_option(self, tokens):
+        """Handles 'setoption name <id> [value <x>]'."""
+        if 'name' not in tokens:
+            return
+        name_end = tokens.index('value') if 'value' in tokens else len(tokens)
+        name = ' '.join(tokens[tokens.index('name') + 1:name_end]).lower()
+        value = ' '.join(tokens[name_end + 1:])
+        try:
+            self._apply_option(name, value)
+        except (ValueError, OSError) as e:
+            self.send(f"info string bad value {value!r} for option {name}: {e}")
+
+    def _apply_option(self, name, value):
+        if name == 'hash':
+            self.stop_search()
+            self.searcher.tt = TranspositionTable.from_megabytes(max(1, int(value)))
+        elif name == 'threads':
+            self.threads = max(1, int(value))
+        elif name == 'bookfile':
+            from .book import OpeningBook
+
+            book = OpeningBook(value) if value and value != '<empty>' else None
+            if self.book is not None:
+                self.book.close()
+            self.book = book
+        elif name == 'tablebasepath':
+            if value and value != '<empty>':
+                # NumPy is only needed when tablebases are actually used.
+                from .tablebase import Tablebases
+                self.searcher.tablebases = Tablebases(value)
+            else:
+                self.searcher.tablebases = None
+        elif name == 'uci_variant':
+            variants = uci_variants()
+            if value not in variants:
+                self.send(f"info string unknown variant {value}")
+                return
+            self.stop_search()
+            self.variant = variants[value]
+            self.board = VARIANTS[self.variant]()
+            self.color = 'white'
+            self.searcher.tt.clear()
+
+    def set_position(self, tokens):
+        """Handles 'position startpos|fen <fen> [moves <m1> ...]'."""
+        board = VARIANTS[self.variant]()
+        color = 'white'
+        moves_at = tokens.index('moves') if 'moves' in tokens else len(tokens)
+        if tokens and tokens[0] == 'fen':
+            try:
+                color = board.set_fen(' '.join(tokens[1:moves_at]))
+            except ValueError as e:
+                self.send(f"info string {e}")
+                return
+        for text in tokens[moves_at + 1:]:
+            try:
+                move = uci_to_move(text)
+            except ValueError:
+                move = None
+            if move is None or not board.is_legal_move(*move, color):
+                self.send(f"info string illegal move {text}")
+                return
+            board.make_move(*move)
+            color = 'black' if color == 'white' else 'white'
+        self.board = board
+        self.color = color
+
+    def go(self, tokens):
+        """Handles 'go' with depth, nodes, movetime, clock, infinite and ponder.
+
+        Unknown tokens (such as 'searchmoves' and its moves) and parameters
+        without an integer value are skipped.
+        """
+        params = {}
+        flags = set()
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            i += 1
+            if token in ('infinite', 'ponder'):
+                flags.add(token)
+            elif token in self.GO_PARAMS and i < len(tokens):
+                try:
+                    params[token] = int(tokens[i])
+                except ValueError:
+                    self.send(f"info string bad value {tokens[i]} for {token}")
+                    continue
+                i += 1
+
+        if self.book is not None and 'infinite' not in flags and 'ponder' not in flags:
+            move = self.book.choose(self.board, self.color)
+            if move is not None:
+                self.send(f"bestmove {move_to_uci(move)}")
+                return
+
+        budget = self.time_budget(params)
+        self._pondering = 'ponder' in flags
+        if 'infinite' in flags or 'ponder' in flags:
+            self._ponder_budget = budget if 'ponder' in flags else None
+            self._release.clear()
+            deadline = Deadline.infinite()
+        else:
+            self._release.set()
+            deadline = budget() if budget else Deadline.infinite()
+
+        board = self.board.copy()
+        # Set before the thread starts, so an early 'stop' or 'ponderhit' is kept.
+        self.searcher.prepare(deadline, params.get('nodes'))
+        self._search_thread = threading.Thread(
+            target=self._search, args=(board, self.color, params.get('depth', 64)), daemon=True)
+        self._search_thread.start()
+
+    def time_budget(self, params):
+        """Returns a factory of the deadline implied by the 'go' parameters.
+
+        The deadline is created lazily so that a pondering search gets its
+        clock started only at 'ponderhit'.
+
+        Args:
+            params (dict[str, int]): Numeric 'go' parameters.
+
+        Returns:
+            callable|None: Zero-argument function returning a Deadline, or
+                           None if the search is not time limited.
+        """
+        if 'movetime' in params:
+            seconds = params['movetime'] / 1000
+            return lambda: Deadline.after(seconds)
+        prefix = 'w' if self.color == 'white' else 'b'
+        if f'{prefix}time' in params:
+            control = TimeControl(params[f'{prefix}time'] / 1000,
+                                  params.get(f'{prefix}inc', 0) / 1000,
+                                  params.get('movestogo'))
+            return TimeManager(control).deadline_for_move
+        return None
+
+    def _search(self, board, color, depth):
+        result = self.searcher.search(board, color, max_depth=depth, on_iteration=self.send_info)
+        # The protocol forbids 'bestmove' during 'go infinite' or 'go ponder',
+        # even when the search itself has already ended.
+        self._release.wait()
+        if result.best_move is None:
+            self.send("bestmove 0000")
+        elif len(result.pv) > 1:
+            self.send(f"bestmove {move_to_uci(result.best_move)} ponder {move_to_uci(result.pv[1])}")
+        else:
+            self.send(f"bestmove {move_to_uci(result.best_move)}")
+        self._ponder_budget = None
+
+    def send_info(self, result):
+        """Streams one 'info' line for a completed iteration."""
+        if abs(result.score) >= MATE_SCORE - 1000:
+            plies = MATE_SCORE - abs(result.score)
+            moves = (plies + 1) // 2
+            score = f"mate {moves if result.score > 0 else -moves}"
+        else:
+            score = f"cp {result.score}"
+        millis = int(result.elapsed * 1000)
+        nps = int(result.nodes / result.elapsed) if result.elapsed > 0 else 0
+        pv = ' '.join(move_to_uci(move) for move in result.pv)
+        self.send(f"info depth {result.depth} score {score} nodes {result.nodes} "
+                  f"time {millis} nps {nps} pv {pv}")
+
+    def ponderhit(self):
+        """Switches a pondering search to the clock given with 'go ponder'."""
+        budget = self._ponder_budget
+        self._ponder_budget = None
+        if self._search_thread is None or not self._pondering:
+            return
+        self._pondering = False
+        if budget is not None:
+            self.searcher.deadline = budget()
+        self._release.set()
+
+    def stop_search(self):
+        """Stops the running search, if any, and waits for its 'bestmove'."""
+        if self._search_thread is not None:
+            self.searcher.stop()
+            self._release.set()
+            self.wait_search()
+
+    def wait_search(self):
+        """Waits until the running search, if any, has finished."""
+        if self._search_thread is not None:
+            self._search_thread.join()
+            self._search_thread = None
+
+
+def main():
+    """Runs the UCI adapter on stdin/stdout."""
+    UCIAdapter().run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+import importlib
+from collections.abc import Mapping
+
+
+def load(path):
+    """Imports a 'module:attribute' path and returns the attribute."""
+    module, _, name = path.partition(':')
+    return getattr(importlib.import_module(module), name)
+
+
+class Variant:
+    """A game variant, declared by the import paths of its classes.
+
+    Nothing is imported until one of the *_class methods is called, so
+    listing the variants costs no board, piece or engine table setup.
+
+    Attributes:
+        name (str): Registry key, also used in archives and on the command line.
+        title (str): Menu entry.
+        greeting (str): Message printed when a game starts.
+        board (str): 'module:Class' of the board.
+        game (str): 'module:Class' of the interactive game.
+        pieces (tuple[str, ...]): 'module:Class' of every piece type.
+    """
+
+    __slots__ = ('name', 'title', 'greeting', 'board', 'game', 'pieces', '_loaded')
+
+    def __init__(self, name, title, greeting, board, game, pieces=()):
+        self.name = name
+        self.title = title
+        self.greeting = greeting
+        self.board = board
+        self.game = game
+        self.pieces = tuple(pieces)
+        self._loaded = {}
+
+    def _load(self, path):
+        value = self._loaded.get(path)
+        if value is None:
+            value = self._loaded[path] = load(path)
+        return value
+
+    def board_class(self):
+        """Imports and returns the board class."""
+        return self._load(self.board)
+
+    def game_class(self):
+        """Imports and returns the game class."""
+        return self._load(self.game)
+
+    def piece_classes(self):
+        """Imports and returns the piece classes."""
+        return [self._load(path) for path in self.pieces]
+
+    def __repr__(self):
+        return f"Variant({self.name!r})"
+
+
+class VariantRegistry(Mapping):
+    """Registered variants, in menu order.
+
+    As a mapping it goes from variant name to board class, so that
+    VARIANTS[name]() builds a board; the board module is imported on
+    that first lookup. Names can be listed and tested with 'in' without
+    importing anything.
+    """
+
+    def __init__(self):
+        self._variants = {}
+
+    def register(self, name, title, greeting, board, game, pieces=()):
+        """Declares a variant; see Variant for the arguments.
+
+        Returns:
+            Variant: The registered variant.
+        """
+        variant = self._variants[name] = Variant(name, title, greeting, board, game, pieces)
+        return variant
+
+    def variant(self, name):
+        """Returns the Variant registered under a name.
+
+        Raises:
+            KeyError: If no such variant is registered.
+        """
+        return self._variants[name]
+
+    def variants(self):
+        """Returns the registered variants in menu order."""
+        return list(self._variants.values())
+
+    def __getitem__(self, name):
+        return self._variants[name].board_class()
+
+    def __contains__(self, name):
+        return name in self._variants
+
+    def __iter__(self):
+        return iter(self._variants)
+
+    def __len__(self):
+        return len(self._variants)
+
+
+VARIANTS = VariantRegistry()
+VARIANTS.register(
+    'checkers', "Шашки", "Начинаем игру в шашки!",
+    'checkers.board:CheckersBoard', 'checkers.game:CheckersGame',
+    ['checkers.piece:CheckersPiece'])
+VARIANTS.register(
+    'chess', "Классические шахматы", "Начинаем классические шахматы!",
+    'chess.board:ChessBoard', 'chess.game:ChessGame',
+    ['chess.pieces:King', 'chess.pieces:Queen', 'chess.pieces:Rook',
+     'chess.pieces:Bishop', 'chess.pieces:Knight', 'chess.pieces:Pawn'])
+VARIANTS.register(
+    'modified', "Модифицированные шахматы (с новыми фигурами)",
+    "Начинаем модифицированные шахматы!",
+    'chess.board:ModifiedChessBoard', 'chess.game:ModifiedChessGame',
+    ['chess.pieces:King', 'chess.pieces:Queen', 'chess.pieces:Rook',
+     'chess.pieces:Bishop', 'chess.pieces:Knight', 'chess.pieces:Pawn',
+     'chess.pieces:Wizard', 'chess.pieces:Dragon', 'chess.pieces:Jester'])
+
+
+def variant_name(board):
+    """Returns the VARIANTS key of a board instance.
+
+    The board's class is matched by its import path, so no other variant
+    gets imported.
+
+    Args:
+        board: A board of one of the registered classes.
+
+    Returns:
+        str: Variant name.
+
+    Raises:
+        KeyError: If the board class is not registered.
+    """
+    cls = type(board)
+    path = f"{cls.__module__}:{cls.__qualname__}"
+    for variant in VARIANTS.variants():
+        if variant.board == path:
+            return variant.name
+    raise KeyError(cls.__name__)
@@ -0,0 +1,211 @@
+import argparse
+import collections
+import concurrent.futures
+import itertools
+import json
+import os
+import time
+
+from .move import FLAG_NAMES, PROMOTION, unpack
+from .notation import move_to_uci, uci_to_move
+from .variants import VARIANTS, variant_name
+
+
+OK = 'ok'
+UNKNOWN_VARIANT = 'unknown_variant'
+BAD_NOTATION = 'bad_notation'
+NO_PIECE = 'no_piece'
+WRONG_COLOR = 'wrong_color'
+INVALID_MOVE = 'invalid_move'
+LEAVES_KING_IN_CHECK = 'leaves_king_in_check'
+
+REASONS = {
+    OK: "Партия корректна",
+    UNKNOWN_VARIANT: "Неизвестный вариант игры",
+    BAD_NOTATION: "Не удалось разобрать ход",
+    NO_PIECE: "Нет фигуры в начальной позиции",
+    WRONG_COLOR: "Ход фигурой соперника",
+    INVALID_MOVE: "Недопустимый ход для этой фигуры",
+    LEAVES_KING_IN_CHECK: "Ход оставляет короля под шахом",
+}
+
+
+class VerificationResult:
+    """Outcome of verifying one game.
+
+    Attributes:
+        index (int): Position of the game in the input.
+        reason (str): OK or the reason code of the first illegal ply.
+        ply (int|None): Zero-based number of the first illegal ply.
+        move (str|None): That move as given in the input, in coordinate notation.
+        plies (int): Number of plies checked successfully.
+    """
+
+    __slots__ = ('index', 'reason', 'ply', 'move', 'plies')
+
+    def __init__(self, index, reason, plies, ply=None, move=None):
+        self.index = index
+        self.reason = reason
+        self.plies = plies
+        self.ply = ply
+        self.move = move
+
+    @property
+    def ok(self):
+        """True if every move of the game was legal."""
+        return self.reason == OK
+
+    def to_dict(self):
+        """Returns the result as a JSON-serializable dict."""
+        return {'index': self.index, 'reason': self.reason, 'plies': self.plies,
+                'ply': self.ply, 'move': self.move}
+
+    def __repr__(self):
+        return (f"VerificationResult(index={self.index}, reason={self.reason!r}, "
+                f"ply={self.ply}, move={self.move!r})")
+
+
+def parse_move(move):
+    """Turns a coordinate string, a packed integer or a (start, end) pair into a move.
+
+    Packed integers are 16-bit engine.move.pack() codes of an 8x8 board;
+    their flags are not checked against the position, but must be one of
+    the known flag codes.
+
+    Raises:
+        ValueError: If the move cannot be parsed.
+    """
+    if isinstance(move, str):
+        if len(move) != 4 or move[0] not in 'abcdefgh' or move[2] not in 'abcdefgh' \
+                or move[1] not in '12345678' or move[3] not in '12345678':
+            raise ValueError(move)
+        return uci_to_move(move)
+    if isinstance(move, int):
+        if not 0 <= move <= 0xFFFF:
+            raise ValueError(move)
+        start, end, flags = unpack(move)
+        if flags not in FLAG_NAMES and not flags & PROMOTION:
+            raise ValueError(move)
+        return start, end
+    (x1, y1), (x2, y2) = move
+    if not all(0 <= value < 8 for value in (x1, y1, x2, y2)):
+        raise ValueError(move)
+    return (x1, y1), (x2, y2)
+
+
+def check_ply(board, color, start, end):
+    """Returns OK or the reason why a move is illegal, without changing the board."""
+    piece = board.board[start[0]][start[1]]
+    if piece is None:
+        return NO_PIECE
+    if piece.color != color:
+        return WRONG_COLOR
+    if start == end:
+        return INVALID_MOVE
+    if variant_name(board) == 'checkers':
+        # The checkers board validates moves itself and has no check.
+        return OK if board.check_move(piece, start, end)[0] else INVALID_MOVE
+    if not piece.is_valid_move(board.board, start, end):
+        return INVALID_MOVE
+    if not board.legality(color).is_legal(board, start, end):
+        return LEAVES_KING_IN_CHECK
+    return OK
+
+
+def verify_game(variant, moves, index=0):
+    """Replays a game and reports its first illegal ply.
+
+    Nothing is printed; the board is only changed through make_move(),
+    so a whole game costs one board and no copies.
+
+    Args:
+        variant (str): Key of VARIANTS.
+        moves (Iterable): Moves as 'e2e4' strings, packed integers (with or
+                          without flags, see engine.move.pack()) or
+                          ((row, col), (row, col)) pairs; white moves first.
+        index (int): Position of the game in a batch, copied to the result.
+
+    Returns:
+        VerificationResult: The verdict.
+    """
+    if variant not in VARIANTS:
+        return VerificationResult(index, UNKNOWN_VARIANT, 0)
+    board = VARIANTS[variant]()
+    color = 'white'
+    for ply, move in enumerate(moves):
+        try:
+            start, end = parse_move(move)
+        except (ValueError, TypeError):
+            return VerificationResult(index, BAD_NOTATION, ply, ply, str(move))
+        reason = check_ply(board, color, start, end)
+        if reason != OK:
+            return VerificationResult(index, reason, ply, ply, move_to_uci((start, end)))
+        board.make_move(start, end)
+        color = 'black' if color == 'white' else 'white'
+    return VerificationResult(index, OK, len(board.undo_stack))
+
+
+def verify_chunk(chunk):
+    """Verifies a list of (index, variant, moves) games; runs in a worker process."""
+    return [verify_game(variant, moves, index) for index, variant, moves in chunk]
+
+
+def verify_games(games, workers=None, chunk_size=256):
+    """Verifies many games across worker processes.
+
+    Games are read from the iterable lazily and at most two chunks per
+    worker are in flight, so memory stays bounded for inputs of any
+    length. Results are yielded in input order.
+
+    Args:
+        games (Iterable[tuple[str, Iterable]]): (variant, moves) pairs.
+        workers (int|None): Worker processes; None uses every core.
+        chunk_size (int): Games sent to a worker at once.
+
+    Yields:
+        VerificationResult: One per game, in input order.
+    """
+    numbered = ((index, variant, list(moves)) for index, (variant, moves) in enumerate(games))
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        limit = 2 * workers
+        pending = collections.deque()
+        while True:
+            while len(pending) < limit:
+                chunk = list(itertools.islice(numbered, chunk_size))
+                if not chunk:
+                    break
+                pending.append(pool.submit(verify_chunk, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def main(argv=None):
+    """Command-line entry point: python -m engine.verify games.jsonl ..."""
+    from .book import read_games
+
+    parser = argparse.ArgumentParser(description="Проверка корректности партий")
+    parser.add_argument('games', nargs='+', help="файлы партий (JSON lines или текст)")
+    parser.add_argument('--variant', choices=sorted(VARIANTS), default='chess')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=256)
+    parser.add_argument('--all', action='store_true', help="выводить и корректные партии")
+    args = parser.parse_args(argv)
+
+    games = ((args.variant, moves) for path in args.games for moves, _ in read_games(path))
+    started = time.monotonic()
+    counts = collections.Counter()
+    for result in verify_games(games, args.workers, args.chunk_size):
+        counts[result.reason] += 1
+        if args.all or not result.ok:
+            print(json.dumps(result.to_dict(), ensure_ascii=False))
+    elapsed = time.monotonic() - started
+    total = sum(counts.values())
+    print(f"Партий: {total}, {total / elapsed if elapsed else 0:.0f} партий/с")
+    for reason, count in counts.most_common():
+        print(f"{REASONS[reason]}: {count}")
+
+
+if __name__ == '__main__':
+    main()
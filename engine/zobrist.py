@@ -0,0 +1,66 @@
+import random
+
+
+class ZobristTable:
+    """Table of random 64-bit keys for Zobrist hashing of board positions.
+
+    A position hash is the XOR of one key per occupied square (chosen by the
+    piece symbol standing on it) and, when black is to move, the side key.
+    Because XOR is its own inverse, the hash can be updated incrementally
+    when a piece is moved or removed.
+
+    Attributes:
+        rows (int): Number of board rows covered by the table.
+        cols (int): Number of board columns covered by the table.
+        piece_keys (dict[str, list[int]]): Per-symbol keys indexed by square.
+        side_key (int): Key mixed in when black is to move.
+    """
+
+    def __init__(self, symbols, rows=8, cols=8, seed=0x5EED):
+        """Generates a reproducible key set.
+
+        Args:
+            symbols (str): All piece symbols that can appear on the board.
+            rows (int): Number of board rows.
+            cols (int): Number of board columns.
+            seed (int): Seed of the pseudo-random generator, so that hashes
+                        are stable between runs and processes.
+        """
+        rng = random.Random(seed)
+        self.rows = rows
+        self.cols = cols
+        self.piece_keys = {
+            symbol: [rng.getrandbits(64) for _ in range(rows * cols)]
+            for symbol in symbols
+        }
+        self.side_key = rng.getrandbits(64)
+
+    def square_key(self, piece, row, col):
+        """Returns the key of a piece standing on a square.
+
+        Args:
+            piece: Any piece whose str() is its display symbol.
+            row (int): Board row.
+            col (int): Board column.
+
+        Returns:
+            int: 64-bit key.
+        """
+        return self.piece_keys[str(piece)][row * self.cols + col]
+
+    def hash_board(self, board, color):
+        """Computes the hash of a position from scratch.
+
+        Args:
+            board (list[list]): 2D grid of pieces or None.
+            color (str): Side to move ('white' or 'black').
+
+        Returns:
+            int: 64-bit position hash.
+        """
+        h = self.side_key if color == 'black' else 0
+        for i, row in enumerate(board):
+            for j, piece in enumerate(row):
+                if piece is not None:
+                    h ^= self.piece_keys[str(piece)][i * self.cols + j]
+        return h
@@ -1,39 +1,68 @@
-from checkers.game import CheckersGame
-from Chess.game import ChessGame, ModifiedChessGame
+import argparse
+import inspect
 
+from engine.timecontrol import parse_time_control
+from engine.variants import VARIANTS
 
-def main():
-    """Main entry point for the game suite application.
 
-    Provides a menu to select between different game variants:
-    - Checkers
-    - Standard Chess
-    - Modified Chess (with custom pieces)
+def choose_variant():
+    """Shows the menu of registered variants until one is picked.
+
+    Returns:
+        Variant: The chosen variant.
     """
+    variants = VARIANTS.variants()
     print("Добро пожаловать в игровой комплект!")
-    print("1. Шашки")
-    print("2. Классические шахматы")
-    print("3. Модифицированные шахматы (с новыми фигурами)")
+    for number, variant in enumerate(variants, 1):
+        print(f"{number}. {variant.title}")
 
     while True:
-        choice = input("Выберите игру (1-3): ")
-        if choice == '1':
-            print("\nНачинаем игру в шашки!")
-            game = CheckersGame()
-            game.play()
-            break
-        elif choice == '2':
-            print("\nНачинаем классические шахматы!")
-            game = ChessGame()
-            game.play()
-            break
-        elif choice == '3':
-            print("\nНачинаем модифицированные шахматы!")
-            game = ModifiedChessGame()
-            game.play()
-            break
-        else:
-            print("Неверный выбор. Попробуйте еще раз.")
+        choice = input(f"Выберите игру (1-{len(variants)}): ").strip()
+        if choice.isdigit() and 1 <= int(choice) <= len(variants):
+            return variants[int(choice) - 1]
+        if choice in VARIANTS:
+            return VARIANTS.variant(choice)
+        print("Неверный выбор. Попробуйте еще раз.")
+
+
+def main(argv=None):
+    """Main entry point for the game suite application.
+
+    Offers the variants of engine.variants (checkers, standard chess,
+    modified chess with custom pieces, ...) in a menu, or starts the one
+    given with --variant directly. Only the chosen variant's modules are
+    imported. --engine, --book and --tc set up a game against the computer
+    and are rejected for variants whose game has no engine (checkers).
+    """
+    parser = argparse.ArgumentParser(description="Шашки и шахматы в консоли")
+    parser.add_argument('--variant', choices=list(VARIANTS), help="начать игру без меню")
+    parser.add_argument('--engine', choices=('white', 'black'), help="цвет, которым играет компьютер")
+    parser.add_argument('--book', help="дебютная книга компьютера (файл engine.book)")
+    parser.add_argument('--tc', type=parse_time_control,
+                        help="контроль времени компьютера, секунды: база+добавка")
+    args = parser.parse_args(argv)
+
+    options = {}
+    if args.engine:
+        options['engine_color'] = args.engine
+    if args.book:
+        options['book_path'] = args.book
+    if args.tc:
+        options['time_control'] = args.tc
+    if options and not args.engine:
+        parser.error("--book и --tc задают игру против компьютера и требуют --engine")
+
+    variant = VARIANTS.variant(args.variant) if args.variant else choose_variant()
+    game_class = variant.game_class()
+    accepted = inspect.signature(game_class).parameters
+    if any(name not in accepted for name in options):
+        parser.error(f"{variant.title}: игра против компьютера не поддерживается")
+    try:
+        game = game_class(**options)
+    except (OSError, ValueError) as e:
+        parser.error(f"не удалось открыть дебютную книгу: {e}")
+    print(f"\n{variant.greeting}")
+    game.play()
 
 
 if __name__ == "__main__":
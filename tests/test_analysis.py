@@ -0,0 +1,146 @@
+import asyncio
+import threading
+
+import pytest
+
+from chess.board import ChessBoard
+from engine.analysis import analyse, analyse_batch, analyse_stream, format_lines, format_score, main
+from engine.notation import uci_to_move
+from engine.search import MATE_SCORE, Searcher
+
+
+def position(fen=None, moves=()):
+    board = ChessBoard()
+    color = board.set_fen(fen) if fen else 'white'
+    for text in moves:
+        board.make_move(*uci_to_move(text))
+        color = 'black' if color == 'white' else 'white'
+    return board, color
+
+
+def test_lines_are_distinct_sorted_and_exact():
+    board, color = position(moves=['e2e4', 'd7d5'])
+    results = analyse(board, color, lines=4, max_depth=2)
+    assert len(results) == 4
+    assert len({result.best_move for result in results}) == 4
+    scores = [result.score for result in results]
+    assert scores == sorted(scores, reverse=True)
+    for result in results:
+        assert result.depth == 2 and result.pv[0] == result.best_move
+        board.make_move(*result.best_move)
+        # Every reported line carries the score a full-window search gives it.
+        assert -Searcher().search(board, 'black', max_depth=1).score == result.score
+        board.unmake_move()
+    assert results[0].score == Searcher().search(board, color, max_depth=2).score
+
+
+def test_lines_are_capped_by_the_legal_moves():
+    board, color = position('7k/8/6K1/8/8/8/8/R7 b - - 0 1')
+    assert len(analyse(board, color, lines=5, max_depth=2)) == len(board.legal_moves(color))
+    mated, color = position('R6k/8/6K1/8/8/8/8/8 b - - 0 1')
+    assert analyse(mated, color) == []
+
+
+def test_mate_is_reported_in_moves():
+    board, color = position('7k/8/6K1/8/8/8/8/R7 w - - 0 1')
+    results = analyse(board, color, lines=2, max_depth=3)
+    assert results[0].best_move == uci_to_move('a1a8')
+    assert format_score(results[0].score) == '#1'
+    assert format_score(-MATE_SCORE + 4) == '#-2'
+    assert format_score(35) == '+0.35'
+    assert format_lines(results)[0].startswith('1) a1a8 #1')
+
+
+def test_on_depth_sees_every_iteration_and_the_board_is_untouched():
+    board, color = position()
+    before = board.squares_bytes()
+    depths = []
+    analyse(board, color, lines=2, max_depth=3, on_depth=lambda results: depths.append(results[0].depth))
+    assert depths == [1, 2, 3]
+    assert board.squares_bytes() == before
+
+
+def test_stop_from_another_thread_returns_the_last_depth():
+    board, color = position()
+    searcher = Searcher()
+    seen = threading.Event()
+
+    def on_depth(results):
+        if results[0].depth == 2:
+            seen.set()
+
+    timer = threading.Thread(target=lambda: seen.wait(10) and searcher.stop())
+    timer.start()
+    results = analyse(board, color, lines=3, searcher=searcher, on_depth=on_depth)
+    timer.join()
+    assert len(results) == 3 and results[0].depth >= 2
+
+
+def test_stream_yields_each_depth_and_stops_on_break():
+    async def scenario():
+        board, color = position()
+        searcher = Searcher()
+        depths = []
+        async for results in analyse_stream(board, color, lines=2, searcher=searcher):
+            depths.append(results[0].depth)
+            if len(depths) == 3:
+                break
+        # The generator has been closed by the loop; the searcher is free again.
+        again = analyse(board, color, lines=1, max_depth=1, searcher=searcher)
+        return depths, again
+
+    depths, again = asyncio.run(scenario())
+    assert depths == [1, 2, 3]
+    assert again[0].depth == 1
+
+
+def test_cancelling_the_consumer_stops_the_search():
+    async def scenario():
+        board, color = position()
+        searcher = Searcher()
+        first = asyncio.Event()
+
+        async def consume():
+            async for _ in analyse_stream(board, color, searcher=searcher):
+                first.set()
+
+        task = asyncio.create_task(consume())
+        await asyncio.wait_for(first.wait(), 10)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The worker thread has already finished: no more nodes are searched.
+        nodes = searcher.nodes
+        await asyncio.sleep(0.05)
+        return nodes, searcher.nodes
+
+    nodes, later = asyncio.run(scenario())
+    assert nodes == later
+
+
+def test_stream_ends_by_itself_at_max_depth():
+    async def scenario():
+        board, color = position()
+        return [results async for results in analyse_stream(board, color, lines=1, max_depth=2)]
+
+    assert [results[0].depth for results in asyncio.run(scenario())] == [1, 2]
+
+
+def test_batch_keeps_input_order():
+    boards = [position(moves=moves)[0] for moves in ([], ['e2e4'], ['d2d4', 'd7d5'])]
+    finished = []
+    results = analyse_batch(boards, lines=2, budget=None, max_depth=2, workers=2,
+                            on_result=lambda index, lines: finished.append(index))
+    assert sorted(finished) == [0, 1, 2]
+    for board, lines in zip(boards, results):
+        assert len(lines) == 2
+        assert lines[0].best_move in board.legal_moves(board.turn)
+    with pytest.raises(ValueError):
+        analyse_batch(boards, budget=[1.0])
+
+
+def test_cli_prints_the_lines(capsys):
+    main(['--lines', '2', '--depth', '2', 'e2e4 e7e5'])
+    out = capsys.readouterr().out
+    assert 'Глубина 2' in out
+    assert '  2) ' in out
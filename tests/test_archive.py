@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from engine.archive import (FILE_HEADER, FRAME_HEADER, GameArchiveReader, GameArchiveWriter,
+                            game_id, split_game_id)
+from engine.move import CAPTURE, pack
+
+GAMES = [
+    ('chess', '1-0', [pack((6, 4), (4, 4)), pack((1, 3), (3, 3)), pack((4, 4), (3, 3), CAPTURE)],
+     {'white': 'A', 'black': 'Б'}),
+    ('checkers', '0-1', [pack((5, 0), (4, 1))], None),
+    ('modified', '1/2-1/2', [], None),
+    ('chess', '*', [pack((6, 0), (5, 0))] * 300, {'event': 'long'}),
+]
+
+
+def write(path, compress=False, block_size=512):
+    with GameArchiveWriter(path, compress=compress, block_size=block_size) as writer:
+        for variant, result, moves, metadata in GAMES:
+            writer.append(variant, result, moves, metadata)
+
+
+def summary(games):
+    return [(game.variant, game.result, list(game.moves), game.metadata or None) for game in games]
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_round_trip(tmp_path, compress):
+    path = str(tmp_path / 'games.cca')
+    write(path, compress, block_size=3)
+    assert summary(GameArchiveReader(path)) == [tuple(game) for game in GAMES]
+
+
+def test_game_ids_address_single_games(tmp_path):
+    path = str(tmp_path / 'games.cca')
+    write(path, compress=True, block_size=3)
+    reader = GameArchiveReader(path)
+    games = list(reader)
+    assert len({split_game_id(game.game_id)[0] for game in games}) == 2
+    for game in games:
+        assert list(reader.get(game.game_id).moves) == list(game.moves)
+    assert split_game_id(game_id(1234, 7)) == (1234, 7)
+    with pytest.raises(KeyError):
+        reader.get(game_id(FILE_HEADER.size + 1, 0))
+
+
+def test_reader_continues_after_new_appends(tmp_path):
+    path = str(tmp_path / 'games.cca')
+    write(path)
+    reader = GameArchiveReader(path)
+    assert len(list(reader.games())) == 4
+    assert list(reader.games()) == []
+    with GameArchiveWriter(path) as writer:
+        writer.append('chess', '1-0', [1, 2])
+    [game] = reader.games()
+    assert list(game.moves) == [1, 2]
+
+
+def test_truncated_frame_ends_the_readable_data(tmp_path):
+    path = str(tmp_path / 'games.cca')
+    write(path)
+    reader = GameArchiveReader(path)
+    list(reader.games())
+    complete = reader.next_offset
+    with GameArchiveWriter(path) as writer:
+        writer.append('chess', '1-0', [pack((6, 4), (4, 4))] * 10)
+    os.truncate(path, os.path.getsize(path) - 5)
+    reader = GameArchiveReader(path)
+    assert len(list(reader)) == 4
+    assert reader.next_offset == complete
+    os.truncate(path, complete + FRAME_HEADER.size - 1)
+    assert len(list(GameArchiveReader(path))) == 4
+
+
+def test_checksum_mismatch_ends_the_readable_data(tmp_path):
+    path = str(tmp_path / 'games.cca')
+    write(path)
+    offsets = [offset for offset, _ in GameArchiveReader(path).frames()]
+    with open(path, 'r+b') as f:
+        f.seek(offsets[2] + FRAME_HEADER.size)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 0xFF]))
+    assert summary(GameArchiveReader(path)) == [tuple(game) for game in GAMES[:2]]
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not an archive')
+    with pytest.raises(ValueError):
+        GameArchiveReader(str(path))
+    with pytest.raises(ValueError):
+        GameArchiveWriter(str(path))
+    empty = tmp_path / 'empty.bin'
+    empty.write_bytes(b'')
+    with pytest.raises(ValueError):
+        GameArchiveReader(str(empty))
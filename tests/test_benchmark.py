@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from engine.benchmark import (METRICS, VERSION, compare, load_baseline, main, replay_archive,
+                              run_suite, sample_positions, save_baseline, write_archive)
+
+
+SMALL = dict(positions=3, games=2, plies=10, rounds=1)
+
+
+def test_samples_pair_a_legal_and_an_illegal_move():
+    for board, legal, illegal in sample_positions('checkers', 5, seed=1):
+        assert legal in board.legal_moves()
+        assert illegal not in board.legal_moves()
+        assert board.board[illegal[0][0]][illegal[0][1]].color == board.turn
+
+
+def test_replay_counts_the_games_of_the_variant(tmp_path):
+    path = str(tmp_path / 'games.cca')
+    write_archive(path, 'chess', 3, 12, seed=2)
+    stats = replay_archive(path, 'chess')
+    assert stats['games'] == 3
+    assert stats['replay_game_ms'] > 0 and stats['memory_per_game_kb'] > 0
+    with pytest.raises(ValueError):
+        replay_archive(path, 'checkers')
+
+
+def test_suite_reports_every_metric_per_variant():
+    results = run_suite(['checkers', 'chess'], **SMALL)
+    assert set(results) == {f'{variant}.{metric}' for variant in ('checkers', 'chess')
+                            for metric in METRICS}
+    assert all(value >= 0 for value in results.values())
+
+
+def test_compare_flags_only_increases_beyond_the_threshold():
+    baseline = {'chess.a': 10.0, 'chess.b': 10.0, 'chess.c': 10.0}
+    results = {'chess.a': 12.5, 'chess.b': 12.6, 'chess.c': 2.0, 'chess.new': 99.0}
+    assert compare(results, baseline) == [('chess.b', 10.0, 12.6)]
+    assert compare(results, baseline, threshold=0.3) == []
+
+
+def test_baseline_round_trips_and_checks_its_version(tmp_path):
+    path = str(tmp_path / 'bench.json')
+    save_baseline(path, {'chess.display_us': 1.5})
+    assert load_baseline(path) == {'chess.display_us': 1.5}
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    data['version'] = VERSION + 1
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    with pytest.raises(ValueError):
+        load_baseline(path)
+
+
+def cli(*extra):
+    return ['--variant', 'checkers', '--positions', '3', '--games', '2', '--plies', '10',
+            '--rounds', '1', *extra]
+
+
+def test_cli_saves_and_compares_a_baseline(tmp_path, capsys):
+    path = str(tmp_path / 'bench.json')
+    main(cli('--save', path))
+    assert set(load_baseline(path)) == {f'checkers.{metric}' for metric in METRICS}
+    # A generous threshold absorbs timing noise between the two runs.
+    main(cli('--baseline', path, '--threshold', '1000'))
+    assert 'регрессия!' not in capsys.readouterr().out
+
+
+def test_cli_exits_with_1_on_a_regression(tmp_path, capsys):
+    path = str(tmp_path / 'bench.json')
+    save_baseline(path, {f'checkers.{metric}': 1e-9 for metric in METRICS})
+    with pytest.raises(SystemExit) as exit_info:
+        main(cli('--baseline', path))
+    assert exit_info.value.code == 1
+    out = capsys.readouterr().out
+    assert 'регрессия!' in out and 'Ухудшение больше 25%' in out
+
+
+def test_cli_rejects_a_bad_baseline(tmp_path):
+    path = tmp_path / 'bench.json'
+    path.write_text('[]', encoding='utf-8')
+    for baseline in (str(path), str(tmp_path / 'missing.json')):
+        with pytest.raises(SystemExit) as exit_info:
+            main(cli('--baseline', baseline))
+        assert exit_info.value.code == 2
@@ -0,0 +1,103 @@
+import concurrent.futures
+from multiprocessing import shared_memory
+
+import pytest
+
+from checkers.board import CheckersBoard
+from chess.board import ChessBoard, ModifiedChessBoard
+from engine.board_pool import BoardPool, StaleHandleError, split_handle
+from engine.notation import uci_to_move
+
+
+@pytest.fixture
+def pool():
+    with BoardPool(capacity=4) as pool:
+        yield pool
+
+
+def worker_moves(name, handle, move):
+    pool = BoardPool.attach(name)
+    try:
+        board, color, variant = pool.load(handle)
+        board.make_move(*uci_to_move(move))
+        pool.store(handle, board, 'black' if color == 'white' else 'white', variant)
+        return variant
+    finally:
+        pool.close()
+
+
+@pytest.mark.parametrize('board_class', [ChessBoard, ModifiedChessBoard, CheckersBoard])
+def test_positions_round_trip(pool, board_class):
+    board = board_class()
+    handle = pool.put(board, 'black')
+    loaded, color, variant = pool.load(handle)
+    assert type(loaded) is board_class
+    assert color == 'black'
+    assert loaded.squares_bytes() == board.squares_bytes()
+    assert loaded.legal_moves('white') == board.legal_moves('white')
+
+
+def test_halfmove_clock_is_kept(pool):
+    board = ChessBoard()
+    board.set_fen('7k/8/8/8/8/8/8/KN6 w - - 42 60')
+    loaded, _, _ = pool.load(pool.put(board, 'white'))
+    assert loaded.halfmove_clock == 42
+
+
+def test_freed_and_reused_slots_make_handles_stale(pool):
+    handle = pool.put(ChessBoard(), 'white')
+    pool.free(handle)
+    with pytest.raises(StaleHandleError):
+        pool.load(handle)
+    with pytest.raises(StaleHandleError):
+        pool.free(handle)
+    handles = [pool.allocate() for _ in range(4)]
+    reused = next(h for h in handles if split_handle(h)[0] == split_handle(handle)[0])
+    assert reused != handle
+    with pytest.raises(StaleHandleError):
+        pool.store(handle, ChessBoard(), 'white')
+    with pytest.raises(StaleHandleError):
+        pool.squares(handle)
+    with pytest.raises(StaleHandleError):
+        pool.load(split_handle(handle)[0] + 100)
+
+
+def test_full_pool_raises_memory_error(pool):
+    for _ in range(4):
+        pool.allocate()
+    assert pool.in_use() == 4
+    with pytest.raises(MemoryError):
+        pool.allocate()
+
+
+def test_squares_view_edits_the_slot_in_place(pool):
+    handle = pool.put(ChessBoard(), 'white')
+    view = pool.squares(handle)
+    view[0] = ord('.')
+    view.release()
+    board, _, _ = pool.load(handle)
+    assert board.board[0][0] is None
+
+
+def test_only_8x8_boards_fit(pool):
+    with pytest.raises(ValueError):
+        pool.put(ChessBoard(10), 'white')
+
+
+def test_worker_process_updates_a_slot(pool):
+    handle = pool.put(ChessBoard(), 'white')
+    with concurrent.futures.ProcessPoolExecutor(1) as executor:
+        assert executor.submit(worker_moves, pool.name, handle, 'e2e4').result() == 'chess'
+    board, color, _ = pool.load(handle)
+    assert color == 'black'
+    assert board.board[4][4] is not None
+
+
+def test_attach_rejects_other_blocks():
+    block = shared_memory.SharedMemory(create=True, size=64)
+    try:
+        with pytest.raises(ValueError):
+            BoardPool.attach(block.name)
+    finally:
+        block.close()
+        block.unlink()
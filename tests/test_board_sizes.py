@@ -0,0 +1,23 @@
+import pytest
+
+from checkers.board import CheckersBoard
+from chess.board import ChessBoard
+from chess.game import ChessGame
+
+
+@pytest.mark.parametrize('size', (0, 2, 3, 5, 9))
+def test_checkers_board_rejects_bad_sizes(size):
+    with pytest.raises(ValueError):
+        CheckersBoard(size)
+
+
+def test_smallest_checkers_board():
+    assert CheckersBoard(4).size == 4
+
+
+@pytest.mark.parametrize('size', (8, 10, 12))
+def test_format_square_counts_ranks_on_the_game_board(size):
+    game = ChessGame()
+    game.board = ChessBoard(size)
+    assert game.format_square((0, 0)) == f"A{size}"
+    assert game.format_square((size - 1, 4)) == "E1"
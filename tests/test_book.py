@@ -0,0 +1,107 @@
+import json
+import random
+
+import pytest
+
+from chess.board import ChessBoard, ModifiedChessBoard
+from engine.book import BookBuilder, OpeningBook, main, read_games
+from engine.notation import uci_to_move
+
+GAMES = [
+    (['e2e4', 'e7e5', 'g1f3'], '1-0'),
+    (['e2e4', 'c7c5'], '0-1'),
+    (['d2d4', 'd7d5'], '1/2-1/2'),
+]
+
+
+@pytest.fixture
+def book_path(tmp_path):
+    builder = BookBuilder('chess')
+    for moves, result in GAMES:
+        assert builder.add_game(moves, result)
+    path = str(tmp_path / 'book.bin')
+    assert builder.write(path) == 6
+    return path
+
+
+def test_moves_are_weighted_by_points():
+    builder = BookBuilder('chess')
+    for moves, result in GAMES:
+        builder.add_game(moves, result)
+    stats = {move: entry for (_, move), entry in builder.stats.items()}
+    assert len(stats) == 6
+    with_e4 = [entry for (key, _), entry in builder.stats.items()
+               if key == ChessBoard().position_hash('white')]
+    # e2e4: one win and one loss for white; d2d4: one draw.
+    assert sorted(with_e4) == [[1, 0, 1], [2, 0, 2]]
+
+
+def test_lookup_returns_legal_moves_best_first(book_path):
+    with OpeningBook(book_path) as book:
+        assert book.variant == 'chess'
+        assert book.size == 6
+        entries = book.moves(ChessBoard(), 'white')
+        assert [move for move, _, _ in entries] == [uci_to_move('e2e4'), uci_to_move('d2d4')]
+        board = ChessBoard()
+        board.make_move(*uci_to_move('e2e4'))
+        assert {move for move, _, _ in book.moves(board, 'black')} == {
+            uci_to_move('e7e5'), uci_to_move('c7c5')}
+        board.make_move(*uci_to_move('h7h6'))
+        assert book.moves(board, 'white') == []
+
+
+def test_choose_follows_weights(book_path):
+    rng = random.Random(1)
+    with OpeningBook(book_path) as book:
+        picks = [book.choose(ChessBoard(), 'white', rng) for _ in range(300)]
+    e4 = picks.count(uci_to_move('e2e4'))
+    assert picks.count(uci_to_move('d2d4')) + e4 == 300
+    assert 150 < e4 < 250
+
+
+def test_other_variants_and_sizes_are_out_of_book(book_path):
+    with OpeningBook(book_path) as book:
+        assert book.moves(ModifiedChessBoard(), 'white') == []
+        assert book.choose(ModifiedChessBoard(), 'white') is None
+        assert book.moves(ChessBoard(10), 'white') == []
+
+
+def test_min_games_leaves_rare_moves_out(tmp_path):
+    builder = BookBuilder('chess')
+    for moves, result in GAMES:
+        builder.add_game(moves, result)
+    assert builder.write(str(tmp_path / 'b.bin'), min_games=2) == 1
+
+
+def test_bad_games_are_skipped():
+    builder = BookBuilder('chess')
+    assert not builder.add_game(['e2e4'], '*')
+    assert not builder.add_game(['e2e5'], '1-0')
+    assert not builder.add_game(['??'], '1-0')
+
+
+def test_not_a_book_is_rejected(tmp_path):
+    path = tmp_path / 'x.bin'
+    path.write_bytes(b'\0' * 32)
+    with pytest.raises(ValueError):
+        OpeningBook(str(path))
+
+
+def test_read_games_accepts_json_lines_and_text(tmp_path):
+    path = tmp_path / 'games.txt'
+    path.write_text('# comment\n'
+                    + json.dumps({'moves': ['e2e4'], 'result': '1-0'}) + '\n'
+                    + 'd2d4 d7d5 1/2-1/2\n\n', encoding='utf-8')
+    assert list(read_games(str(path))) == [(['e2e4'], '1-0'), (['d2d4', 'd7d5'], '1/2-1/2')]
+
+
+def test_cli_builds_and_probes(tmp_path, capsys):
+    games = tmp_path / 'games.txt'
+    games.write_text(''.join(' '.join(moves) + f' {result}\n' for moves, result in GAMES),
+                     encoding='utf-8')
+    book = str(tmp_path / 'book.bin')
+    main(['build', str(games), '-o', book])
+    main(['probe', book, '--moves', 'e2e4'])
+    out = capsys.readouterr().out
+    assert 'записей в книге: 6' in out
+    assert 'e7e5' in out and 'c7c5' in out
@@ -0,0 +1,120 @@
+import asyncio
+import random
+
+import pytest
+
+from engine.broadcast import DELTA, KEYFRAME, GameBroadcaster, decode_frame, main
+from engine.variants import VARIANTS
+
+
+def play(board, broadcaster, plies, seed=0):
+    rng = random.Random(seed)
+    for _ in range(plies):
+        start, end = rng.choice(board.legal_moves())
+        flags = board.move_flags(start, end)
+        board.make_move(start, end)
+        broadcaster.publish_move(board, start, end, flags, clocks={'white': 60, 'black': 59.5})
+
+
+async def collect(subscription):
+    return [decode_frame(frame) async for frame in subscription]
+
+
+def replay(updates):
+    squares = None
+    for update in updates:
+        if update.kind == KEYFRAME:
+            squares = bytearray(update.board.squares_bytes())
+        else:
+            update.apply(squares)
+    return bytes(squares)
+
+
+@pytest.mark.parametrize('variant', ['chess', 'checkers'])
+def test_deltas_reconstruct_the_position(variant):
+    async def scenario():
+        board = VARIANTS[variant]()
+        broadcaster = GameBroadcaster(variant)
+        broadcaster.publish_position(board)
+        task = asyncio.create_task(collect(broadcaster.subscribe()))
+        await asyncio.sleep(0)
+        play(board, broadcaster, 12)
+        broadcaster.close()
+        return board, await task
+
+    board, updates = asyncio.run(scenario())
+    assert [update.kind for update in updates] == [KEYFRAME] + [DELTA] * 12
+    assert [update.seq for update in updates] == list(range(13))
+    assert updates[0].variant == variant
+    assert updates[-1].clocks == {'white': 60, 'black': 59.5}
+    assert updates[-1].halfmove_clock == board.halfmove_clock
+    assert replay(updates) == board.squares_bytes()
+
+
+def test_late_joiner_starts_from_the_interval_keyframe():
+    async def scenario():
+        board = VARIANTS['chess']()
+        broadcaster = GameBroadcaster('chess', keyframe_interval=4)
+        broadcaster.publish_position(board)
+        play(board, broadcaster, 10)
+        subscription = broadcaster.subscribe()
+        broadcaster.close()
+        return board, await collect(subscription)
+
+    board, updates = asyncio.run(scenario())
+    # The keyframe after the 8th move, then the two moves since.
+    assert [(update.kind, update.seq) for update in updates] == [(KEYFRAME, 8), (DELTA, 9), (DELTA, 10)]
+    assert replay(updates) == board.squares_bytes()
+
+
+def test_subscriber_before_the_first_position_waits_for_it():
+    async def scenario():
+        broadcaster = GameBroadcaster('checkers')
+        task = asyncio.create_task(collect(broadcaster.subscribe()))
+        await asyncio.sleep(0)
+        board = VARIANTS['checkers']()
+        broadcaster.publish_move(board, (5, 0), (4, 1))
+        broadcaster.close()
+        return await task
+
+    [update] = asyncio.run(scenario())
+    assert update.kind == KEYFRAME
+
+
+def test_lagging_subscriber_is_dropped():
+    async def scenario():
+        board = VARIANTS['chess']()
+        broadcaster = GameBroadcaster('chess', keyframe_interval=4, max_lag=4)
+        broadcaster.publish_position(board)
+        slow = broadcaster.subscribe()
+        fast = asyncio.create_task(collect(broadcaster.subscribe()))
+        await asyncio.sleep(0)
+        await slow.__anext__()
+        for seed in range(20):
+            play(board, broadcaster, 1, seed)
+            # Only the fast spectator reads between moves.
+            await asyncio.sleep(0)
+        broadcaster.close()
+        rest = [frame async for frame in slow]
+        return board, broadcaster, slow, rest, await fast
+
+    board, broadcaster, slow, rest, updates = asyncio.run(scenario())
+    assert slow.dropped and slow.closed and rest == []
+    assert len(updates) == 21 and replay(updates) == board.squares_bytes()
+    assert broadcaster.stats() == {'subscribers': 0, 'dropped': 1, 'frames': 21,
+                                   'bytes': broadcaster.bytes_published}
+
+
+def test_malformed_frames_are_rejected():
+    board = VARIANTS['chess']()
+    broadcaster = GameBroadcaster('chess')
+    broadcaster.publish_position(board)
+    frame = broadcaster.frame(0)
+    for data in (b'', b'\x07', frame[:5]):
+        with pytest.raises(ValueError):
+            decode_frame(data)
+
+
+def test_cli_runs_a_small_benchmark(capsys):
+    main(['--subscribers', '5', '--moves', '10', '--slow', '1'])
+    assert 'Ходов: 10' in capsys.readouterr().out
@@ -0,0 +1,110 @@
+from checkers.board import CheckersBoard
+from chess.board import ChessBoard
+from engine.history import PositionHistory
+from engine.notation import uci_to_move
+
+KNIGHT_SHUFFLE = ['g1f3', 'g8f6', 'f3g1', 'f6g8']
+
+
+def play(board, *moves, piece_api=False):
+    for text in moves:
+        start, end = uci_to_move(text)
+        if piece_api:
+            assert board.move_piece(start, end)
+        else:
+            board.make_move(start, end)
+
+
+def test_history_counts_only_same_side_positions_since_the_clock_reset():
+    history = PositionHistory(1)
+    for position_hash in (2, 1, 2, 1):
+        history.push(position_hash, False)
+    assert history.repetitions() == 3
+    history.push(2, True)
+    history.push(1, False)
+    assert history.repetitions() == 1
+    assert history.halfmove_clock == 1
+    history.pop()
+    history.pop()
+    assert (history.repetitions(), history.halfmove_clock) == (3, 4)
+    copy = history.copy()
+    copy.pop()
+    assert len(history.hashes) == 5
+
+
+def test_threefold_repetition_after_two_knight_shuffles():
+    board = ChessBoard()
+    play(board, *KNIGHT_SHUFFLE)
+    assert board.is_repetition(2) and not board.is_repetition(3)
+    play(board, *KNIGHT_SHUFFLE)
+    assert board.is_repetition(3)
+    assert board.is_draw()
+    board.unmake_move()
+    assert not board.is_draw()
+
+
+def test_repetition_is_found_through_move_piece_and_undo_move():
+    board = ChessBoard()
+    play(board, *KNIGHT_SHUFFLE * 2, piece_api=True)
+    assert board.is_draw()
+    board.undo_move()
+    assert not board.is_repetition(3)
+
+
+def test_a_pawn_move_breaks_the_repetition():
+    board = ChessBoard()
+    play(board, *KNIGHT_SHUFFLE, 'e2e4', 'e7e5', *KNIGHT_SHUFFLE)
+    assert board.halfmove_clock == 4
+    assert not board.is_repetition(3)
+
+
+def test_same_placement_with_the_other_side_to_move_is_not_a_repetition():
+    board = ChessBoard()
+    board.set_fen('4k3/8/8/8/8/8/8/R3K3 w - - 0 1')
+    play(board, 'a1a2', 'e8d8', 'a2a3', 'd8e8', 'a3a1')
+    assert not board.is_repetition(2)
+    play(board, 'e8d8', 'a1a2', 'd8e8', 'a2a1')
+    assert board.is_repetition(2)
+
+
+def test_fifty_move_rule_from_the_fen_clock():
+    board = ChessBoard()
+    board.set_fen('7k/8/8/8/8/8/8/KN6 w - - 99 80')
+    assert not board.is_move_limit_draw()
+    play(board, 'b1c3')
+    assert board.is_fifty_move_draw() and board.is_draw()
+    board.unmake_move()
+    assert board.halfmove_clock == 99
+    board.set_fen('7k/8/8/8/8/8/1p6/KN6 w - - 99 80')
+    play(board, 'b1d2')
+    assert board.halfmove_clock == 100
+    board.set_fen('7k/8/8/8/8/8/1p6/KN6 w - - 99 80')
+    play(board, 'a1b2')
+    assert board.halfmove_clock == 0
+
+
+def kings_only():
+    board = CheckersBoard()
+    squares = bytearray(b'.' * 64)
+    squares[56] = ord('W')
+    squares[7] = ord('B')
+    board.set_squares(bytes(squares))
+    return board
+
+
+def test_checkers_king_shuffle_repeats():
+    board = kings_only()
+    play(board, 'a1b2', 'h8g7', 'b2a1', 'g7h8', 'a1b2', 'h8g7', 'b2a1', 'g7h8')
+    assert board.is_repetition(3) and board.is_draw()
+
+
+def test_checkers_move_limit_counts_king_moves():
+    board = kings_only()
+    moves = ['a1b2', 'h8g7', 'b2c3', 'g7f6', 'c3b2', 'f6g7', 'b2a1', 'g7h8']
+    for ply in range(board.move_limit):
+        play(board, moves[ply % len(moves)])
+    assert board.halfmove_clock == board.move_limit
+    assert board.is_move_limit_draw()
+    man = CheckersBoard()
+    play(man, 'c3d4')
+    assert man.halfmove_clock == 0
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from chess.board import ChessBoard, ModifiedChessBoard
+from engine.features import (CHESS_SYMBOLS, FEATURE_NAMES, encode_positions, extract_features,
+                             iter_batches, main, placement_codes)
+
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+
+def features(fen):
+    return dict(zip(FEATURE_NAMES, extract_features(encode_positions([fen]))[0]))
+
+
+def test_boards_and_fens_give_the_same_planes():
+    board = ChessBoard()
+    planes = encode_positions([board, START_FEN])
+    assert planes.shape == (2, len(CHESS_SYMBOLS), 8, 8)
+    assert np.array_equal(planes[0], planes[1])
+    assert planes[0, CHESS_SYMBOLS.index('K'), 7, 4] == 1
+    assert planes[0, CHESS_SYMBOLS.index('p')].sum() == 8
+    assert planes[0].sum() == 32
+
+
+def test_fairy_pieces_get_their_own_planes():
+    planes = encode_positions([ModifiedChessBoard()])[0]
+    occupied = {CHESS_SYMBOLS[i] for i in range(len(CHESS_SYMBOLS)) if planes[i].any()}
+    assert occupied & set('WDJwdj')
+
+
+def test_start_position_features_are_symmetric():
+    values = features(START_FEN)
+    for name in ('material', 'mobility', 'attacked_squares', 'attacks_on_enemy',
+                 'king_zone_attacks', 'in_check'):
+        assert values[f'white_{name}'] == values[f'black_{name}']
+    # Knight moves and single pawn pushes.
+    assert values['white_mobility'] == 4 + 8
+    assert values['white_attacked_squares'] == 22
+    assert values['white_in_check'] == 0
+
+
+def test_check_and_attacks_are_counted():
+    values = features('4k3/8/8/8/8/8/8/4R1K1 b - - 0 1')
+    assert values['black_in_check'] == 1
+    assert values['white_in_check'] == 0
+    assert values['white_attacks_on_enemy'] == 1
+    # Rook up to the king, along the first rank to the own king, and the king's steps.
+    assert values['white_mobility'] == 7 + 4 + 1 + 5
+
+
+def test_sliders_stop_at_the_first_piece():
+    blocked = features('4k3/8/8/8/8/8/4P3/4R1K1 w - - 0 1')
+    assert blocked['black_in_check'] == 0
+    assert blocked['white_attacks_on_enemy'] == 0
+
+
+def test_batches_match_a_single_pass():
+    fens = [START_FEN, '4k3/8/8/8/8/8/8/4R1K1 b - - 0 1'] * 5
+    whole = extract_features(encode_positions(fens))
+    parts = [batch for _, batch in iter_batches(fens, chunk_size=3)]
+    assert [len(part) for part in parts] == [3, 3, 3, 1]
+    assert np.array_equal(np.concatenate(parts), whole)
+    assert all(batch is None for _, batch in iter_batches(fens, 4, features=False))
+
+
+def test_non_8x8_positions_are_rejected():
+    with pytest.raises(ValueError):
+        placement_codes([ChessBoard(10)])
+    with pytest.raises(ValueError):
+        placement_codes(['8/8/8/8 w - - 0 1'])
+
+
+def test_cli_writes_memory_mapped_arrays(tmp_path, capsys):
+    source = tmp_path / 'positions.fen'
+    source.write_text(f'{START_FEN}\n\n4k3/8/8/8/8/8/8/4R1K1 b - - 0 1\n', encoding='utf-8')
+    out, planes = tmp_path / 'features.npy', tmp_path / 'planes.npy'
+    main([str(source), '-o', str(out), '--planes', str(planes), '--chunk-size', '1'])
+    assert np.load(out).shape == (2, len(FEATURE_NAMES))
+    assert np.load(planes).sum() == 32 + 3
+    assert 'Позиций: 2' in capsys.readouterr().out
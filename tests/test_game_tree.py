@@ -0,0 +1,113 @@
+import random
+
+from checkers.board import CheckersBoard
+from chess.board import ChessBoard
+from chess.game import ChessGame
+from engine.notation import uci_to_move
+from engine.tree import GameTree
+
+
+def play(tree, board, *moves):
+    for text in moves:
+        start, end = uci_to_move(text)
+        flags = board.move_flags(start, end)
+        board.make_move(start, end)
+        tree.play(start, end, flags, board)
+
+
+def squares(board):
+    return board.squares_bytes()
+
+
+def test_undo_redo_and_goto_walk_the_line():
+    board = ChessBoard()
+    tree = GameTree(board)
+    play(tree, board, 'e2e4', 'e7e5', 'g1f3', 'b8c6')
+    assert tree.undo(3).ply == 1
+    assert tree.redo().ply == 2
+    assert tree.goto(4) is tree.current
+    assert tree.current.ply == 4
+    assert tree.goto(0) is tree.root
+    assert tree.redo(10).ply == 4
+    assert tree.undo(10) is tree.root
+    assert tree.goto(-5) is tree.root
+    assert squares(tree.board_at()) == squares(ChessBoard())
+
+
+def test_a_new_move_after_undo_starts_a_variation():
+    board = ChessBoard()
+    tree = GameTree(board)
+    play(tree, board, 'e2e4', 'e7e5', 'g1f3')
+    main_line = tree.current
+    tree.undo(2)
+    board = tree.board_at()
+    play(tree, board, 'c7c5')
+    assert len(tree) == 5
+    assert len(tree.root.children[0].children) == 2
+    variation = tree.current
+    assert tree.redo() is variation
+    tree.undo(2)
+    # redo follows the line visited last; the main line stays reachable.
+    assert tree.redo(2) is variation
+    tree.goto(1)
+    play(tree, tree.board_at(), 'e7e5')
+    assert tree.redo() is main_line
+
+
+def test_replaying_a_known_move_reuses_the_node():
+    board = ChessBoard()
+    tree = GameTree(board)
+    play(tree, board, 'e2e4', 'e7e5')
+    tree.undo(2)
+    play(tree, ChessBoard(), 'e2e4')
+    assert len(tree) == 3
+    assert tree.redo() is tree.root.children[0].children[0]
+
+
+def test_board_at_matches_a_replay_with_bounded_keyframes():
+    board = CheckersBoard()
+    tree = GameTree(board, keyframe_interval=2, max_keyframes=3)
+    rng = random.Random(5)
+    history = [squares(board)]
+    for _ in range(40):
+        legal = board.legal_moves()
+        if not legal:
+            break
+        start, end = rng.choice(legal)
+        flags = board.move_flags(start, end)
+        board.make_move(start, end)
+        tree.play(start, end, flags, board)
+        history.append(squares(board))
+    assert len(tree._keyframes) <= 3
+    for ply in (len(history) - 1, 0, 7, 8, 31, 3):
+        tree.goto(ply)
+        assert squares(tree.board_at()) == history[ply]
+    assert tree.board_at().undo_stack == []
+
+
+def test_color_at_alternates_from_the_root_color():
+    board = ChessBoard()
+    tree = GameTree(board, 'black')
+    assert tree.color_at(tree.root) == 'black'
+    tree.extend([1, 2, 3])
+    assert tree.color_at(tree.current) == 'white'
+    assert list(tree.line()) == [1, 2, 3]
+
+
+def test_game_navigation_commands(capsys):
+    game = ChessGame()
+    for text in ('e2e4', 'e7e5', 'g1f3'):
+        start, end = uci_to_move(text)
+        flags = game.board.move_flags(start, end)
+        game.board.move_piece(start, end)
+        game.record_move(start, end, flags)
+        game.switch_turn()
+    assert game.navigate('undo')
+    assert (game.move_count, game.turn) == (2, 'white')
+    assert game.navigate('goto 0')
+    assert squares(game.board) == squares(ChessBoard())
+    assert game.navigate('redo 3')
+    assert (game.move_count, game.turn) == (3, 'black')
+    assert game.navigate('undo x')
+    assert 'Ожидается число' in capsys.readouterr().out
+    assert not game.navigate('e2')
@@ -0,0 +1,101 @@
+import pytest
+
+from chess.board import ChessBoard
+from engine.notation import move_to_uci, uci_to_move
+
+
+def position(fen):
+    board = ChessBoard()
+    color = board.set_fen(fen)
+    return board, color
+
+
+def moves_of(board, color, square):
+    start = uci_to_move(square + square)[0]
+    return sorted(move_to_uci(move)[2:] for move in board.legal_moves(color) if move[0] == start)
+
+
+def reference_moves(board, color):
+    # Plays every pseudo-legal move and keeps those that leave no check.
+    squares = [(i, j) for i in range(board.size) for j in range(board.size)]
+    moves = []
+    for start in squares:
+        piece = board.board[start[0]][start[1]]
+        if piece is None or piece.color != color:
+            continue
+        for end in squares:
+            if start != end and piece.is_valid_move(board.board, start, end):
+                board.make_move(start, end)
+                if not board.is_in_check(color):
+                    moves.append((start, end))
+                board.unmake_move()
+    return sorted(moves)
+
+
+@pytest.mark.parametrize('fen', [
+    '4r1k1/8/8/8/8/8/4N3/4K3 w - - 0 1',
+    '4r1k1/8/8/8/8/8/4R3/4K3 w - - 0 1',
+    '6k1/8/8/1b6/8/8/4P3/5K2 w - - 0 1',
+    '4r1k1/8/8/8/8/5n2/R7/4K3 w - - 0 1',
+    '5r1k/8/8/8/8/8/8/4K3 w - - 0 1',
+    '4r2k/8/8/8/4K3/8/8/8 w - - 0 1',
+    '4r2k/8/8/8/8/8/3B4/4K3 w - - 0 1',
+    '3r2k1/8/8/8/8/8/3r4/4K3 w - - 0 1',
+    'r1bqkbnr/pppp1ppp/2n5/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR b KQkq - 0 1',
+])
+def test_legal_moves_match_make_unmake(fen):
+    board, color = position(fen)
+    assert sorted(board.legal_moves(color)) == reference_moves(board, color)
+
+
+def test_pinned_knight_cannot_move():
+    board, color = position('4r1k1/8/8/8/8/8/4N3/4K3 w - - 0 1')
+    assert moves_of(board, color, 'e2') == []
+    assert not board.is_legal_move(*uci_to_move('e2c3'), color)
+
+
+def test_pinned_rook_moves_along_the_pin():
+    board, color = position('4r1k1/8/8/8/8/8/4R3/4K3 w - - 0 1')
+    assert moves_of(board, color, 'e2') == ['e3', 'e4', 'e5', 'e6', 'e7', 'e8']
+    assert board.is_legal_move(*uci_to_move('e2e8'), color)
+    assert not board.is_legal_move(*uci_to_move('e2d2'), color)
+
+
+def test_diagonally_pinned_pawn_cannot_push():
+    board, color = position('6k1/8/8/1b6/8/8/4P3/5K2 w - - 0 1')
+    assert moves_of(board, color, 'e2') == []
+
+
+def test_double_check_allows_only_king_moves():
+    board, color = position('4r1k1/8/8/8/8/5n2/R7/4K3 w - - 0 1')
+    legality = board.legality(color)
+    assert len(legality.checkers) == 2
+    assert {move_to_uci(move)[:2] for move in board.legal_moves(color)} == {'e1'}
+    # Ra2-e2 would block the rook but not the knight.
+    assert not board.is_legal_move(*uci_to_move('a2e2'), color)
+
+
+def test_single_check_is_blocked_or_the_king_moves():
+    board, color = position('4r2k/8/8/8/8/8/3B4/4K3 w - - 0 1')
+    assert moves_of(board, color, 'd2') == ['e3']
+
+
+def test_king_cannot_step_onto_an_attacked_square():
+    board, color = position('5r1k/8/8/8/8/8/8/4K3 w - - 0 1')
+    assert moves_of(board, color, 'e1') == ['d1', 'd2', 'e2']
+    assert not board.is_legal_move(*uci_to_move('e1f1'), color)
+    assert not board.is_legal_move(*uci_to_move('e1f2'), color)
+    assert not board.move_piece(*uci_to_move('e1f1'))
+    assert board.board[7][4] is not None
+
+
+def test_king_cannot_retreat_along_the_checking_line():
+    board, color = position('4r2k/8/8/8/4K3/8/8/8 w - - 0 1')
+    assert not board.is_legal_move(*uci_to_move('e4e3'), color)
+    assert board.is_legal_move(*uci_to_move('e4d3'), color)
+
+
+def test_king_cannot_take_a_defended_piece():
+    board, color = position('3r2k1/8/8/8/8/8/3r4/4K3 w - - 0 1')
+    assert not board.is_legal_move(*uci_to_move('e1d2'), color)
+    assert not board.is_legal_move(*uci_to_move('e1d1'), color)
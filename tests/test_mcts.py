@@ -0,0 +1,90 @@
+import pytest
+
+from checkers.board import CheckersBoard
+from chess.board import ChessBoard, ModifiedChessBoard
+from engine.mcts import PUCT, MCTSPlayer, MonteCarloSearcher
+
+
+def test_search_returns_a_legal_move_and_restores_the_board():
+    board = CheckersBoard()
+    before = (board.squares_bytes(), board.hash, len(board.undo_stack))
+    result = MonteCarloSearcher(seed=1).search(board, 'white', playouts=200)
+    assert result.best_move in board.legal_moves('white')
+    assert result.playouts == 200
+    assert sum(result.visits.values()) == 200
+    assert result.pv[0] == result.best_move
+    assert 0.0 <= result.win_rate <= 1.0
+    assert (board.squares_bytes(), board.hash, len(board.undo_stack)) == before
+
+
+def test_tree_is_reused_after_both_sides_moved():
+    board = CheckersBoard()
+    searcher = MonteCarloSearcher(seed=2)
+    first = searcher.search(board, 'white', playouts=400)
+    assert first.reused == 0
+    board.make_move(*first.pv[0])
+    board.make_move(*first.pv[1])
+    second = searcher.search(board, 'white', playouts=100)
+    assert second.reused > 0
+    assert searcher.root.parent is None
+    assert searcher.root.visits == second.reused + 100
+
+
+def test_a_child_position_is_reused_too():
+    board = ModifiedChessBoard()
+    searcher = MonteCarloSearcher(seed=3, max_playout_plies=10)
+    first = searcher.search(board, 'white', playouts=150)
+    board.make_move(*first.best_move)
+    assert searcher.search(board, 'black', playouts=10).reused == first.visits[first.best_move]
+
+
+def test_unknown_positions_start_a_new_tree():
+    searcher = MonteCarloSearcher(seed=4)
+    searcher.search(CheckersBoard(), 'white', playouts=50)
+    result = searcher.search(ChessBoard(), 'white', playouts=20)
+    assert result.reused == 0
+    assert searcher.search(CheckersBoard(10), 'white', playouts=20).reused == 0
+    assert searcher.size == 10
+
+
+def test_forced_and_terminal_positions():
+    searcher = MonteCarloSearcher(seed=5)
+    board = ChessBoard()
+    board.set_fen('6r1/8/8/8/8/8/8/k6K w - - 0 1')
+    result = searcher.search(board, 'white', playouts=100)
+    assert result.best_move == ((7, 7), (6, 7))
+    assert result.playouts == 0
+    board.set_fen('6r1/8/8/8/8/8/r7/k6K w - - 0 1')
+    result = MonteCarloSearcher().search(board, 'white', playouts=100)
+    assert result.best_move is None
+    assert result.win_rate == 0.5
+
+
+def test_seeded_searches_are_reproducible():
+    visits = [MonteCarloSearcher(mode=PUCT, seed=6).search(CheckersBoard(), 'white', 150).visits
+              for _ in range(2)]
+    assert visits[0] == visits[1]
+    with pytest.raises(ValueError):
+        MonteCarloSearcher(mode='minimax')
+
+
+def test_root_parallel_search_merges_the_workers():
+    searcher = MonteCarloSearcher(workers=2, seed=7)
+    try:
+        board = CheckersBoard()
+        result = searcher.search(board, 'white', playouts=100)
+        assert result.best_move in board.legal_moves('white')
+        assert result.playouts == 100
+        assert sum(result.visits.values()) == 100
+    finally:
+        searcher.close()
+
+
+def test_player_keeps_its_tree_between_moves():
+    player = MCTSPlayer(playouts=200, seed=8)
+    board = CheckersBoard()
+    move = player.choose_move(board, 'white')
+    board.make_move(*move)
+    board.make_move(*player.last_result.pv[1])
+    player.choose_move(board, 'white')
+    assert player.last_result.reused > 0
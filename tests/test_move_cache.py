@@ -0,0 +1,73 @@
+from checkers.board import CheckersBoard
+from chess.board import ChessBoard
+from engine.move_cache import MoveCache
+from engine.notation import uci_to_move
+
+
+def after(*moves):
+    board = ChessBoard()
+    for text in moves:
+        board.make_move(*uci_to_move(text))
+    return board
+
+
+def entry_cost(cache, board, color):
+    return cache.ENTRY_BYTES + cache.MOVE_BYTES * len(board.legal_moves(color))
+
+
+def test_positions_are_answered_once_on_any_board_object():
+    cache = MoveCache()
+    moves = cache.legal_moves(ChessBoard(), 'white')
+    assert isinstance(moves, tuple) and len(moves) == 20
+    assert cache.legal_moves(after('g1f3', 'g8f6', 'f3g1', 'f6g8'), 'white') is moves
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.legal_moves(ChessBoard(), 'black')
+    cache.legal_moves(CheckersBoard(), 'white')
+    assert (len(cache), cache.misses) == (3, 3)
+
+
+def test_threats_and_check_share_the_entry():
+    cache = MoveCache()
+    board = after('e2e4', 'f7f6', 'd1h5')
+    assert cache.is_in_check(board, 'black') is True
+    assert cache.is_in_check(board, 'black') is True
+    threats = cache.threatened_pieces(board, 'black')
+    assert isinstance(threats, frozenset)
+    assert (0, 4) in threats
+    assert len(cache) == 1
+    assert cache.stats()['hit_rate'] == 1 / 3
+
+
+def test_least_recently_used_positions_are_evicted_first():
+    boards = [ChessBoard(), after('e2e4'), after('d2d4'), after('c2c4')]
+    colors = ['white', 'black', 'black', 'black']
+    costs = [entry_cost(MoveCache(), board, color) for board, color in zip(boards, colors)]
+    cache = MoveCache(max_bytes=sum(costs[:3]))
+    for board, color in zip(boards[:3], colors):
+        cache.legal_moves(board, color)
+    assert cache.evictions == 0
+    cache.legal_moves(boards[0], 'white')
+    cache.legal_moves(boards[3], 'black')
+    assert cache.evictions >= 1
+    assert cache.bytes <= cache.max_bytes
+    hits = cache.hits
+    cache.legal_moves(boards[0], 'white')
+    assert cache.hits == hits + 1
+    cache.legal_moves(boards[1], 'black')
+    assert cache.hits == hits + 1
+
+
+def test_an_oversized_result_is_still_returned():
+    cache = MoveCache(max_bytes=10)
+    cache.legal_moves(ChessBoard(), 'white')
+    assert len(cache.legal_moves(after('e2e4'), 'black')) == 20
+    assert len(cache) == 1
+    assert cache.evictions == 1
+
+
+def test_clear_keeps_the_counters():
+    cache = MoveCache.from_megabytes(1)
+    assert cache.max_bytes == 1024 * 1024
+    cache.legal_moves(ChessBoard(), 'white')
+    cache.clear()
+    assert (len(cache), cache.bytes, cache.misses) == (0, 0, 1)
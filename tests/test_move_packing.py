@@ -0,0 +1,166 @@
+import random
+import zlib
+
+import pytest
+
+from checkers.board import CheckersBoard
+from checkers.game import CheckersGame
+from chess.board import ChessBoard
+from engine.archive import (FILE_HEADER, FRAME_HEADER, FRAME_MAGIC, MAGIC, RAW,
+                            GameArchiveReader, GameArchiveWriter, encode_game)
+from engine.move import CAPTURE, CONTINUATION, PROMOTION, Move, MoveList, pack, unpack
+from engine.notation import decode_move, encode_move, move_to_uci, square_to_uci, uci_to_move
+from engine.search import Searcher
+from engine.snapshot import read_snapshot, restore_game
+from engine.tree import GameTree
+
+
+SIZES = (8, 10, 12)
+
+
+def random_line(board, plies, seed=0):
+    rng = random.Random(seed)
+    moves = []
+    for _ in range(plies):
+        legal = board.legal_moves()
+        if not legal:
+            break
+        start, end = rng.choice(legal)
+        moves.append((start, end, board.move_flags(start, end)))
+        board.make_move(start, end)
+    return moves
+
+
+def _replayed(board, moves):
+    for start, end, _ in moves:
+        board.make_move(start, end)
+    return board
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_pack_round_trips_every_square(size):
+    squares = [(i, j) for i in range(size) for j in range(size)]
+    for start in squares:
+        for end, flags in ((squares[-1], PROMOTION | CAPTURE | 3), ((0, 0), CONTINUATION),
+                           ((size // 2, size - 1), CAPTURE)):
+            assert unpack(pack(start, end, flags, size), size) == (start, end, flags)
+            assert decode_move(encode_move((start, end), size), size) == (start, end)
+
+
+def test_reported_wrap_on_10x10():
+    assert unpack(pack((9, 9), (8, 8), size=10), 10) == ((9, 9), (8, 8), 0)
+
+
+def test_8x8_layout_is_unchanged():
+    assert pack((6, 4), (4, 4)) == encode_move(((6, 4), (4, 4))) == (52 << 6 | 36)
+    assert MoveList().codes.typecode == 'H'
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_uci_round_trips(size):
+    for start in [(0, 0), (size - 1, size - 1), (1, size - 2)]:
+        for end in [(size - 1, 0), (0, size - 1)]:
+            assert uci_to_move(move_to_uci((start, end), size), size) == (start, end)
+    assert square_to_uci((0, 0), size) == f"a{size}"
+
+
+def test_uci_rejects_squares_off_the_board():
+    with pytest.raises(ValueError):
+        uci_to_move('a9a8')
+    with pytest.raises(ValueError):
+        uci_to_move('k1a1', 10)
+    assert uci_to_move('a10j1', 10) == ((0, 0), (9, 9))
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_checkers_generate_moves_matches_legal_moves(size):
+    board = CheckersBoard(size)
+    random_line(board, 30, seed=size)
+    for _ in range(20):
+        assert board.generate_moves().pairs() == board.legal_moves()
+        assert len(board.generate_moves()) == len(board.legal_moves())
+        legal = board.legal_moves()
+        if not legal:
+            break
+        board.make_move(*legal[-1])
+
+
+@pytest.mark.parametrize('size', (10, 12))
+def test_chess_generate_moves_matches_legal_moves(size):
+    board = ChessBoard(size)
+    random_line(board, 10, seed=size)
+    assert sorted(board.generate_moves().pairs()) == sorted(board.legal_moves())
+
+
+def test_multi_jump_codes_round_trip_on_12x12():
+    path = [(11, 0), (9, 2), (7, 4), (5, 6)]
+    move = Move(path[0], path[-1], CAPTURE, path)
+    moves = MoveList(size=12)
+    moves.add(move)
+    assert list(moves) == [move]
+    assert len(moves) == 1
+    assert move.uci(12) == 'a1c3e5g7'
+
+
+@pytest.mark.parametrize('size', (10, 12))
+def test_game_tree_line_replays_on_large_boards(size):
+    board = CheckersBoard(size)
+    tree = GameTree(board)
+    played = random_line(board.copy(), 40, seed=size)
+    for start, end, flags in played:
+        tree.play(start, end, flags)
+    assert [unpack(code, size) for code in tree.line()] == played
+    rebuilt = tree.board_at()
+    assert rebuilt.squares_bytes() == _replayed(CheckersBoard(size), played).squares_bytes()
+
+
+def test_search_keeps_the_pv_on_10x10():
+    board = ChessBoard(10)
+    result = Searcher().search(board, 'white', max_depth=3)
+    assert result.depth == 3
+    assert len(result.pv) == 3
+    assert result.best_move in board.legal_moves('white')
+
+
+@pytest.mark.parametrize('size', (8, 10, 12))
+def test_archive_round_trips_board_size(tmp_path, size):
+    board = CheckersBoard(size)
+    played = random_line(board, 30, seed=size)
+    codes = [pack(start, end, flags, size) for start, end, flags in played]
+    path = str(tmp_path / 'games.cca')
+    with GameArchiveWriter(path) as writer:
+        writer.append('checkers', '*', codes, size=size)
+    [game] = GameArchiveReader(path)
+    assert game.size == size
+    assert list(game.moves) == codes
+
+
+def test_version_1_archive_is_read_and_appended(tmp_path):
+    path = str(tmp_path / 'old.cca')
+    codes = [pack((5, 0), (4, 1)), pack((2, 1), (3, 0))]
+    record = encode_game('checkers', '*', codes, version=1)
+    with open(path, 'wb') as f:
+        f.write(FILE_HEADER.pack(MAGIC, 1))
+        f.write(FRAME_HEADER.pack(FRAME_MAGIC, RAW, len(record), zlib.crc32(record)) + record)
+    with GameArchiveWriter(path) as writer:
+        assert writer.version == 1
+        writer.append('checkers', '1-0', codes)
+        with pytest.raises(ValueError):
+            writer.append('checkers', '*', codes, size=10)
+    games = list(GameArchiveReader(path))
+    assert [list(game.moves) for game in games] == [codes, codes]
+    assert [game.size for game in games] == [8, 8]
+
+
+def test_snapshot_round_trips_a_10x10_line():
+    game = CheckersGame()
+    game.board = CheckersBoard(10)
+    game.tree = GameTree(game.board)
+    for start, end, flags in random_line(game.board, 25, seed=3):
+        game.tree.play(start, end, flags)
+    game.turn_index = game.players.index(game.board.turn)
+    snapshot = read_snapshot(game.snapshot())
+    assert snapshot.board.size == 10
+    assert list(snapshot.line) == list(game.tree.line())
+    resumed = restore_game(game.snapshot())
+    assert resumed.tree.board_at().squares_bytes() == game.board.squares_bytes()
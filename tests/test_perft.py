@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from engine.notation import uci_to_move
+from engine.perft import PerftCache, divide, main, perft
+from engine.variants import VARIANTS
+
+
+def board_after(variant, *moves, fen=None):
+    board = VARIANTS[variant]()
+    if fen:
+        board.set_fen(fen)
+    for text in moves:
+        board.make_move(*uci_to_move(text))
+    return board
+
+
+@pytest.mark.parametrize('variant, counts', [
+    ('chess', [1, 20, 400, 8902]),
+    # Captures are optional under this board's rules, hence more than
+    # the 302 of English draughts at depth 3.
+    ('checkers', [1, 7, 49, 379]),
+    ('modified', [1, 24, 576]),
+])
+def test_start_position_counts(variant, counts):
+    board = VARIANTS[variant]()
+    before = board.squares_bytes()
+    assert [perft(board, depth) for depth in range(len(counts))] == counts
+    assert board.squares_bytes() == before
+
+
+def test_cache_does_not_change_the_counts():
+    board = VARIANTS['checkers']()
+    cache = PerftCache(max_entries=64)
+    # Subtrees of depth 2 and more are cached; transpositions need 5 plies.
+    assert perft(board, 5, cache) == perft(board, 5) == 23582
+    assert cache.hits > 0
+    assert len(cache) == 64
+
+
+def test_cache_evicts_the_oldest_entry():
+    cache = PerftCache(max_entries=2)
+    for key in range(3):
+        cache.store((key, 2), key)
+    assert cache.get((0, 2)) is None and cache.get((2, 2)) == 2
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert PerftCache.from_megabytes(1).max_entries == 1024 * 1024 // PerftCache.ENTRY_BYTES
+
+
+@pytest.mark.parametrize('variant, fen', [('chess', '4k3/8/8/3n4/8/8/3P4/4K3 w - - 0 1'),
+                                          ('checkers', None)])
+def test_parallel_divide_matches_serial(variant, fen):
+    board = board_after(variant, fen=fen)
+    serial = divide(board, 4)
+    assert sum(count for _, count in serial) == perft(board, 4)
+    finished = []
+    # A tiny split budget makes every task hand subtrees back to the pool.
+    parallel = divide(board, 4, workers=2, hash_mb=1, split_nodes=2,
+                      on_task=lambda move, count: finished.append(count))
+    assert parallel == serial
+    assert len(finished) > len(serial)
+    assert sum(finished) == sum(count for _, count in serial)
+
+
+def test_divide_at_depth_1_counts_each_move_once():
+    board = VARIANTS['chess']()
+    lines = divide(board, 1, workers=2)
+    assert lines == sorted((move, 1) for move in board.legal_moves())
+
+
+def test_cli_saves_and_checks_expected_counts(tmp_path, capsys):
+    path = str(tmp_path / 'perft.json')
+    main(['--depth', '2', '--moves', 'e2e4', '--save', path])
+    assert 'Всего: 600' in capsys.readouterr().out
+    main(['--depth', '2', '--moves', 'e2e4', '--workers', '2', '--expect', path])
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    data['divide']['e7e5'] += 1
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    with pytest.raises(SystemExit) as exit_info:
+        main(['--depth', '2', '--moves', 'e2e4', '--expect', path])
+    assert exit_info.value.code == 1
+    assert 'Расхождение e7e5' in capsys.readouterr().out
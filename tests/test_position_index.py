@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from chess.board import ChessBoard
+from engine.archive import GameArchiveWriter
+from engine.move import pack
+from engine.notation import uci_to_move
+from engine.position_index import MAX_SEGMENTS, PositionIndex
+from engine.tournament import packed_moves
+
+GAMES = [
+    (['e2e4', 'e7e5', 'g1f3'], '1-0'),
+    (['e2e4', 'c7c5'], '0-1'),
+    (['d2d4', 'd7d5'], '1/2-1/2'),
+]
+
+
+def append(path, games, variant='chess'):
+    with GameArchiveWriter(path) as writer:
+        for moves, result in games:
+            codes, size = packed_moves(variant, moves)
+            writer.append(variant, result, codes, size=size)
+
+
+def after(*moves):
+    board = ChessBoard()
+    for text in moves:
+        board.make_move(*uci_to_move(text))
+    return board
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = str(tmp_path / 'games.cca')
+    append(path, GAMES)
+    return path
+
+
+def test_query_counts_games_results_and_next_moves(tmp_path, archive):
+    index = PositionIndex(str(tmp_path / 'index'), archive)
+    assert index.update(workers=1) == 4 + 3 + 3
+    start = index.query(ChessBoard(), 'white', 'chess')
+    assert (start.games, start.white_wins, start.draws, start.black_wins) == (3, 1, 1, 1)
+    assert start.next_moves == {uci_to_move('e2e4'): 2, uci_to_move('d2d4'): 1}
+    e4 = index.query(after('e2e4'), 'black', 'chess')
+    assert e4.games == 2
+    assert sorted(ply for _, ply in e4.occurrences) == [1, 1]
+    assert index.query(after('e2e4'), 'black', 'modified').games == 0
+
+
+def test_update_only_indexes_new_games(tmp_path, archive):
+    directory = str(tmp_path / 'index')
+    index = PositionIndex(directory, archive)
+    index.update(workers=1)
+    assert index.update(workers=1) == 0
+    append(archive, [(['e2e4', 'e7e6'], '1-0')])
+    reopened = PositionIndex(directory)
+    assert reopened.update(workers=1) == 3
+    assert len(reopened.segments) == 2
+    assert reopened.query(after('e2e4'), 'black', 'chess').games == 3
+
+
+def test_compact_merges_segments_and_keeps_answers(tmp_path, archive):
+    directory = str(tmp_path / 'index')
+    index = PositionIndex(directory, archive)
+    index.update(workers=1)
+    append(archive, [(['e2e4', 'e7e6'], '1-0')])
+    index.update(workers=1)
+    before = index.query(after('e2e4'), 'black', 'chess')
+    old = list(index.segments)
+    index.compact()
+    assert len(index.segments) == 1
+    assert not any(os.path.exists(os.path.join(directory, name)) for name in old)
+    merged = PositionIndex(directory).query(after('e2e4'), 'black', 'chess')
+    assert sorted(merged.occurrences) == sorted(before.occurrences)
+    assert merged.next_moves == before.next_moves
+
+
+def test_too_many_segments_are_compacted(tmp_path, archive):
+    index = PositionIndex(str(tmp_path / 'index'), archive)
+    for _ in range(MAX_SEGMENTS + 1):
+        index.update(workers=1)
+        append(archive, GAMES[:1])
+    assert len(index.segments) == 1
+    assert index.query(ChessBoard(), 'white', 'chess').games == MAX_SEGMENTS + 3
+
+
+def test_games_of_another_board_size_are_skipped(tmp_path, archive):
+    with GameArchiveWriter(archive) as writer:
+        writer.append('checkers', '1-0', [pack((6, 1), (5, 2), size=10)], size=10)
+    index = PositionIndex(str(tmp_path / 'index'), archive)
+    assert index.update(workers=1) == 10
+
+
+def test_missing_index_needs_an_archive(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        PositionIndex(str(tmp_path / 'nothing'))
@@ -0,0 +1,50 @@
+import io
+import threading
+
+from chess.board import ChessBoard
+from engine.search import Searcher
+from engine.timecontrol import Deadline
+from engine.uci import UCIAdapter
+
+
+def run_in_thread(function, *args):
+    thread = threading.Thread(target=function, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_stop_before_the_thread_starts_is_kept():
+    searcher = Searcher()
+    searcher.prepare()
+    searcher.stop()
+    results = []
+    thread = run_in_thread(lambda: results.append(searcher.search(ChessBoard(), 'white')))
+    thread.join(10)
+    assert not thread.is_alive()
+    assert results[0].best_move is not None
+
+
+def test_deadline_set_before_the_thread_starts_is_kept():
+    searcher = Searcher()
+    searcher.prepare(Deadline.infinite())
+    searcher.deadline = Deadline.after(0.05, 0.1)
+    thread = run_in_thread(searcher.search, ChessBoard(), 'white')
+    thread.join(10)
+    assert not thread.is_alive()
+
+
+def test_search_without_prepare_clears_an_old_stop():
+    searcher = Searcher()
+    searcher.stop()
+    result = searcher.search(ChessBoard(), 'white', max_depth=2)
+    assert result.depth == 2
+
+
+def test_uci_go_infinite_then_stop_returns_a_move():
+    output = io.StringIO()
+    adapter = UCIAdapter(io.StringIO(), output)
+    adapter.handle('position startpos')
+    adapter.handle('go infinite')
+    adapter.handle('stop')
+    assert adapter._search_thread is None
+    assert 'bestmove ' in output.getvalue()
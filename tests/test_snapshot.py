@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+from chess.game import ChessGame
+from engine.notation import uci_to_move
+from engine.snapshot import (RECORD_HEADER, STORE_HEADER, SnapshotStore, read_snapshot,
+                             restore_game)
+
+
+def chess_game(*moves, **options):
+    game = ChessGame(**options)
+    for text in moves:
+        start, end = uci_to_move(text)
+        flags = game.board.move_flags(start, end)
+        game.board.make_move(start, end)
+        game.record_move(start, end, flags)
+        game.switch_turn()
+        game.move_count += 1
+    return game
+
+
+def test_snapshot_keeps_the_position_and_its_state():
+    game = chess_game('e2e4', 'g8f6', 'e4e5', 'd7d5')
+    game.result = '1-0'
+    snapshot = read_snapshot(game.snapshot())
+    assert snapshot.variant == 'chess'
+    assert (snapshot.move_count, snapshot.engine_color, snapshot.result) == (4, None, '1-0')
+    assert list(snapshot.line) == list(game.tree.line())
+    board = snapshot.board
+    assert board.squares_bytes() == game.board.squares_bytes()
+    assert board.en_passant_target == game.board.en_passant_target
+    assert board.board[7][4].has_moved is False
+    assert board.board[3][4].has_moved is True
+    assert board.history.hashes == game.board.history.hashes[-len(board.history.hashes):]
+
+
+def test_restored_game_continues_where_it_stopped():
+    game = chess_game('g1f3', 'g8f6', 'f3g1', 'f6g8', 'g1f3', 'g8f6', 'f3g1')
+    resumed = restore_game(game.snapshot())
+    assert type(resumed) is ChessGame
+    assert (resumed.turn, resumed.move_count) == ('black', 7)
+    assert resumed.moves == game.moves
+    start, end = uci_to_move('f6g8')
+    resumed.board.make_move(start, end)
+    # The third occurrence of the start position is still recognised.
+    assert resumed.board.is_repetition(3)
+
+
+def test_read_snapshot_rejects_other_data():
+    for data in (b'', b'CCSN', b'XXXX' + bytes(40), chess_game().snapshot()[:4] + b'\x09' + bytes(40)):
+        with pytest.raises(ValueError):
+            read_snapshot(data)
+
+
+def test_store_parks_discards_and_reopens(tmp_path):
+    path = str(tmp_path / 'sessions.ccs')
+    first, second = chess_game('e2e4'), chess_game('d2d4', 'd7d5')
+    with SnapshotStore(path) as store:
+        store.park_many([('a', first), ('b', second)])
+        store.park('a', second)
+        store.discard('b', 'missing')
+        assert list(store) == ['a'] and 'b' not in store
+        assert store.live_bytes == len(second.snapshot())
+    with SnapshotStore(path) as store:
+        assert len(store) == 1
+        assert store.restore('a').moves == second.moves
+        with pytest.raises(KeyError):
+            store.load('b')
+
+
+def test_compact_keeps_only_live_sessions(tmp_path):
+    path = str(tmp_path / 'sessions.ccs')
+    games = {f'session-{k}': chess_game(*['e2e4', 'e7e5', 'g1f3'][:k]) for k in range(4)}
+    with SnapshotStore(path) as store:
+        store.park_many(games.items())
+        store.park_many(games.items())
+        store.discard('session-0', 'session-1')
+        before = os.path.getsize(path)
+        store.compact()
+        after = os.path.getsize(path)
+        assert after < before
+        assert sorted(store) == ['session-2', 'session-3']
+        assert store.restore('session-3').moves == games['session-3'].moves
+        store.park('session-1', games['session-1'])
+    with SnapshotStore(path) as store:
+        assert sorted(store) == ['session-1', 'session-2', 'session-3']
+        expected = sum(len(games[key].snapshot()) for key in store)
+        assert store.live_bytes == expected
+        assert os.path.getsize(path) == (STORE_HEADER.size + expected + RECORD_HEADER.size * 3
+                                         + sum(len(key) for key in store))
+
+
+def test_torn_record_ends_the_readable_data(tmp_path):
+    path = str(tmp_path / 'sessions.ccs')
+    with SnapshotStore(path) as store:
+        store.park('a', chess_game('e2e4'))
+        store.park('b', chess_game('d2d4'))
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 3)
+    with SnapshotStore(path) as store:
+        assert list(store) == ['a']
+        store.park('c', chess_game())
+    with SnapshotStore(path) as store:
+        assert sorted(store) == ['a', 'c']
+
+
+def test_other_files_are_not_opened_as_stores(tmp_path):
+    path = tmp_path / 'notes.txt'
+    path.write_bytes(b'not a store at all')
+    with pytest.raises(ValueError):
+        SnapshotStore(str(path))
+
+
+def test_a_store_is_owned_by_one_opener(tmp_path):
+    path = str(tmp_path / 'sessions.ccs')
+    with SnapshotStore(path):
+        with pytest.raises(BlockingIOError):
+            SnapshotStore(path)
+    with SnapshotStore(path) as store:
+        assert len(store) == 0
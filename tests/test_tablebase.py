@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from chess.board import ChessBoard
+from engine.tablebase import (ILLEGAL, Tablebases, dependencies, generate_all, get_layout,
+                              parse_signature, sub_signatures)
+
+
+@pytest.fixture(scope='module')
+def tablebases(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp('tablebases'))
+    generate_all(['KQvK'], directory, workers=1)
+    return Tablebases(directory)
+
+
+def position(fen):
+    board = ChessBoard()
+    color = board.set_fen(fen)
+    return board, color
+
+
+def test_signatures_are_canonical():
+    assert parse_signature('QKvk') == ('KQ', 'K')
+    assert sub_signatures('KQvKR') == ['KQvK', 'KvKR']
+    assert dependencies(['KQvKR']) == [['KvK'], ['KQvK', 'KvKR'], ['KQvKR']]
+    for bad in ('KKvK', 'QvK', 'KXvK'):
+        with pytest.raises(ValueError):
+            parse_signature(bad)
+
+
+def test_layout_round_trips_indices():
+    layout = get_layout('KQvK')
+    index = np.arange(0, layout.size, 997, dtype=np.int64)
+    white_to_move, squares = layout.decode(index)
+    assert np.array_equal(layout.encode(white_to_move, squares), index)
+
+
+def test_tables_cover_the_dependencies(tablebases):
+    assert tablebases.max_pieces == 3
+    kvk = np.load(f"{tablebases.directory}/KvK.npy")
+    assert set(np.unique(kvk)) == {ILLEGAL, 0}
+
+
+def test_probe_reads_mate_distances(tablebases):
+    assert tablebases.probe(*position('7k/5K2/6Q1/8/8/8/8/8 w - - 0 1')) == 1
+    assert tablebases.probe(*position('6Qk/5K2/8/8/8/8/8/8 b - - 0 1')) == -1
+    assert tablebases.probe(*position('7k/8/5K2/8/8/8/8/8 b - - 0 1')) == 0
+
+
+def test_probe_outside_the_tables(tablebases):
+    assert tablebases.probe(*position('7k/8/5K2/8/8/8/8/1N6 w - - 0 1')) is None
+    assert tablebases.probe(ChessBoard(), 'white') is None
+    assert tablebases.probe(ChessBoard(10), 'white') is None
+
+
+@pytest.mark.parametrize('fen', ['7k/8/5K2/8/8/8/8/1Q6 b - - 0 1',
+                                 '8/8/8/3k4/8/8/1Q6/K7 w - - 0 1'])
+def test_values_agree_with_the_successors(tablebases, fen):
+    board, color = position(fen)
+    value = tablebases.probe(board, color)
+    other = 'black' if color == 'white' else 'white'
+    successors = []
+    for move in board.legal_moves(color):
+        board.make_move(*move)
+        successors.append(tablebases.probe(board, other))
+        board.unmake_move()
+    if value > 0:
+        # The winner has a move to a position lost one ply sooner.
+        assert min(-s for s in successors if s is not None and s < 0) == value
+    else:
+        # Every reply of the loser is won for the other side, at best mated in -value - 2 plies.
+        assert all(s is not None and s > 0 for s in successors)
+        assert max(successors) == -value - 2
@@ -0,0 +1,93 @@
+import math
+
+import pytest
+
+from engine.sprt import SPRT, elo_estimate, elo_from_score, score_fraction, score_from_elo
+from engine.timecontrol import TimeControl
+from engine.tournament import (Adjudication, EngineConfig, Tournament, legal_openings, main,
+                               play_game, replay_opening)
+
+
+def test_elo_and_score_are_inverse():
+    for elo in (-400, -35.5, 0, 12, 200):
+        assert elo_from_score(score_from_elo(elo)) == pytest.approx(elo)
+    assert score_from_elo(0) == 0.5
+    assert score_fraction(3, 2, 1) == pytest.approx(4 / 6)
+
+
+def test_elo_estimate_is_antisymmetric_and_narrows():
+    elo, margin = elo_estimate(60, 20, 40)
+    assert elo > 0
+    assert elo_estimate(40, 20, 60)[0] == pytest.approx(-elo)
+    assert elo_estimate(600, 200, 400)[1] < margin
+    assert elo_estimate(1, 0, 0)[1] == math.inf
+
+
+def test_sprt_accepts_and_rejects():
+    sprt = SPRT(0, 10)
+    assert sprt.status(0, 0, 0) == 'continue'
+    assert sprt.llr(0, 50, 0) == 0.0
+    assert sprt.status(700, 200, 500) == 'H1'
+    assert sprt.status(500, 200, 700) == 'H0'
+    assert sprt.status(10, 5, 10) == 'continue'
+    assert sprt.llr(60, 20, 40) > 0 > sprt.llr(40, 20, 60)
+
+
+def test_engine_config_parse():
+    config = EngineConfig.parse('new,depth=4,nodes=500,hash=8')
+    assert (config.name, config.max_depth, config.max_nodes, config.hash_mb) == ('new', 4, 500, 8)
+    assert EngineConfig.parse('mcts,playouts=100').playouts == 100
+    with pytest.raises(ValueError):
+        EngineConfig.parse('x,speed=3')
+
+
+def test_replay_opening_checks_every_move():
+    board, color = replay_opening('chess', ['e2e4', 'e7e5'])
+    assert color == 'white'
+    assert board.board[4][4] is not None
+    with pytest.raises(ValueError):
+        replay_opening('chess', ['e2e5'])
+    with pytest.raises(ValueError):
+        replay_opening('checkers', ['e2e4'])
+    with pytest.raises(ValueError):
+        replay_opening('chess', ['zz'])
+
+
+def test_chess_openings_are_rejected_for_checkers():
+    suite = [['e2e4', 'e7e5'], ['c3d4']]
+    legal, rejected = legal_openings('checkers', suite)
+    assert legal == [['c3d4']]
+    assert [moves for moves, _ in rejected] == [['e2e4', 'e7e5']]
+
+
+def test_tasks_alternate_colors_and_drop_illegal_openings():
+    a, b = EngineConfig('A', 1), EngineConfig('B', 1)
+    tournament = Tournament(['chess', 'checkers'], a, b,
+                            {'chess': [['e2e4']], 'checkers': [['e2e4']]},
+                            TimeControl(1), max_games=6, workers=1)
+    assert tournament.rejected_openings['checkers'][0][0] == ['e2e4']
+    tasks = list(tournament.tasks())
+    assert len(tasks) == 6
+    assert [(task['white'].name, task['black'].name) for task in tasks[:2]] == [('A', 'B'), ('B', 'A')]
+    assert {tuple(task['opening']) for task in tasks if task['variant'] == 'checkers'} == {()}
+
+
+def test_play_game_starts_after_the_opening():
+    task = {'index': 0, 'variant': 'chess', 'opening': ['e2e4', 'e7e5'],
+            'white': EngineConfig('A', 1), 'black': EngineConfig('B', 1),
+            'base': 10, 'increment': 0, 'adjudication': Adjudication(max_plies=4)}
+    record = play_game(task)
+    assert record['moves'][:2] == ['e2e4', 'e7e5']
+    assert record['plies'] == 4
+    assert (record['result'], record['reason']) == ('1/2-1/2', 'move limit')
+
+
+def test_cli_reports_openings_of_another_variant(tmp_path, capsys):
+    suite = tmp_path / 'suite.txt'
+    suite.write_text('# chess\ne2e4 e7e5\n', encoding='utf-8')
+    main(['--variant', 'chess', '--variant', 'checkers', '--openings', str(suite),
+          '--games', '4', '--workers', '1', '--engine-a', 'A,depth=1', '--engine-b', 'B,depth=1',
+          '--max-plies', '4'])
+    out = capsys.readouterr().out
+    assert 'e2e4 e7e5' in out and 'checkers' in out
+    assert 'Партий: 4' in out
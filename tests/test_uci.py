@@ -0,0 +1,121 @@
+import io
+import time
+
+from chess.board import ChessBoard
+from engine.notation import uci_to_move
+from engine.uci import UCIAdapter
+
+
+def run_script(*lines):
+    output = io.StringIO()
+    UCIAdapter(io.StringIO(''.join(line + '\n' for line in lines)), output).run()
+    return output.getvalue().splitlines()
+
+
+def bestmoves(lines):
+    return [line for line in lines if line.startswith('bestmove')]
+
+
+def wait_for(predicate, timeout=10):
+    end = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < end:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_handshake_lists_options_and_variants():
+    lines = run_script('uci', 'isready')
+    assert lines[-2:] == ['uciok', 'readyok']
+    variant = next(line for line in lines if 'UCI_Variant' in line)
+    assert 'var standard' in variant and 'var modified' in variant
+
+
+def test_position_with_moves_sets_the_side_to_move():
+    adapter = UCIAdapter(io.StringIO(), io.StringIO())
+    adapter.handle('position startpos moves e2e4 e7e5 g1f3')
+    assert adapter.color == 'black'
+    assert adapter.board.board[5][5] is not None
+
+
+def test_illegal_position_move_is_reported_and_ignored():
+    output = io.StringIO()
+    adapter = UCIAdapter(io.StringIO(), output)
+    adapter.handle('position startpos moves e2e5')
+    assert 'info string illegal move e2e5' in output.getvalue()
+    assert adapter.color == 'white'
+
+
+def test_go_depth_returns_a_legal_move():
+    [line] = bestmoves(run_script('position startpos', 'go depth 2'))
+    move = uci_to_move(line.split()[1])
+    assert move in ChessBoard().legal_moves('white')
+
+
+def test_unknown_go_tokens_are_skipped():
+    lines = run_script('position startpos', 'go searchmoves e2e4 d2d4 depth 1')
+    assert len(bestmoves(lines)) == 1
+
+
+def test_non_integer_go_values_are_reported():
+    lines = run_script('position startpos', 'go depth abc wtime 1000')
+    assert 'info string bad value abc for depth' in lines
+    assert len(bestmoves(lines)) == 1
+
+
+def test_bad_option_values_keep_the_adapter_running():
+    lines = run_script('setoption name Hash value abc',
+                       'setoption name Threads value many',
+                       'setoption name BookFile value /missing/book.bin',
+                       'isready')
+    assert sum(line.startswith('info string bad value') for line in lines) == 3
+    assert lines[-1] == 'readyok'
+
+
+def test_variant_option_switches_the_board():
+    adapter = UCIAdapter(io.StringIO(), io.StringIO())
+    adapter.handle('setoption name UCI_Variant value modified')
+    adapter.handle('position startpos')
+    assert adapter.variant == 'modified'
+    assert type(adapter.board).__name__ == 'ModifiedChessBoard'
+
+
+def test_standard_is_the_registry_chess_variant():
+    output = io.StringIO()
+    adapter = UCIAdapter(io.StringIO(), output)
+    adapter.handle('setoption name UCI_Variant value modified')
+    adapter.handle('setoption name UCI_Variant value standard')
+    assert adapter.variant == 'chess'
+    adapter.handle('setoption name UCI_Variant value checkers')
+    assert 'info string unknown variant checkers' in output.getvalue()
+    assert adapter.variant == 'chess'
+
+
+def test_go_infinite_holds_bestmove_until_stop():
+    output = io.StringIO()
+    adapter = UCIAdapter(io.StringIO(), output)
+    adapter.handle('position startpos')
+    adapter.handle('go infinite depth 1')
+    assert wait_for(lambda: 'info depth 1' in output.getvalue())
+    time.sleep(0.1)
+    adapter.handle('ponderhit')
+    assert 'bestmove' not in output.getvalue()
+    adapter.handle('stop')
+    assert len(bestmoves(output.getvalue().splitlines())) == 1
+
+
+def test_go_ponder_holds_bestmove_until_ponderhit():
+    output = io.StringIO()
+    adapter = UCIAdapter(io.StringIO(), output)
+    adapter.handle('position startpos moves e2e4')
+    adapter.handle('go ponder depth 1 movetime 50')
+    assert wait_for(lambda: 'info depth 1' in output.getvalue())
+    time.sleep(0.1)
+    assert 'bestmove' not in output.getvalue()
+    adapter.handle('ponderhit')
+    adapter.wait_search()
+    assert len(bestmoves(output.getvalue().splitlines())) == 1
+
+
+def test_end_of_input_stops_an_infinite_search():
+    lines = run_script('position startpos', 'go infinite')
+    assert len(bestmoves(lines)) == 1
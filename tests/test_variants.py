@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import main as launcher
+from checkers.board import CheckersBoard
+from checkers.game import CheckersGame
+from chess.board import ChessBoard, ModifiedChessBoard
+from chess.game import ChessGame, ModifiedChessGame
+from engine.variants import VARIANTS, variant_name
+
+
+BOARD_MODULES = ('checkers.board', 'chess.board', 'chess.pieces', 'checkers.game', 'chess.game')
+
+
+def imported_after(code):
+    script = f"import sys\n{code}\nprint(' '.join(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.abspath(launcher.__file__)))
+    return set(result.stdout.split())
+
+
+def test_listing_variants_imports_no_board():
+    modules = imported_after("import main\nfrom engine.variants import VARIANTS\n"
+                             "list(VARIANTS); 'chess' in VARIANTS; len(VARIANTS)\n"
+                             "[v.title for v in VARIANTS.variants()]")
+    assert not modules & set(BOARD_MODULES)
+
+
+def test_building_one_variant_imports_only_its_board():
+    modules = imported_after("from engine.variants import VARIANTS\nVARIANTS['checkers']()")
+    assert 'checkers.board' in modules
+    assert 'chess.board' not in modules
+
+
+def test_registry_maps_names_to_classes():
+    assert list(VARIANTS) == ['checkers', 'chess', 'modified']
+    assert VARIANTS['chess'] is ChessBoard
+    assert VARIANTS.variant('modified').game_class() is ModifiedChessGame
+    assert VARIANTS.variant('chess').piece_classes()[0].__name__ == 'King'
+    with pytest.raises(KeyError):
+        VARIANTS['go']
+
+
+def test_variant_name_of_boards():
+    assert variant_name(CheckersBoard()) == 'checkers'
+    assert variant_name(ChessBoard(10)) == 'chess'
+    assert variant_name(ModifiedChessBoard()) == 'modified'
+    with pytest.raises(KeyError):
+        variant_name(object())
+
+
+def test_menu_accepts_numbers_and_names(monkeypatch, capsys):
+    answers = iter(['0', 'go', '3'])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(answers))
+    assert launcher.choose_variant().name == 'modified'
+    assert capsys.readouterr().out.count("Неверный выбор") == 2
+    monkeypatch.setattr('builtins.input', lambda prompt: 'chess')
+    assert launcher.choose_variant().name == 'chess'
+
+
+@pytest.fixture
+def started(monkeypatch):
+    games = []
+    for cls in (ChessGame, CheckersGame):
+        monkeypatch.setattr(cls, 'play', lambda self: games.append(self))
+    return games
+
+
+def test_variant_flag_skips_the_menu(started, monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda prompt: pytest.fail("menu shown"))
+    launcher.main(['--variant', 'modified', '--engine', 'black', '--tc', '60+1'])
+    [game] = started
+    assert type(game) is ModifiedChessGame
+    assert game.engine_color == 'black'
+    launcher.main(['--variant', 'checkers'])
+    assert type(started[-1]) is CheckersGame
+
+
+@pytest.mark.parametrize('argv', [['--variant', 'go'],
+                                  ['--variant', 'checkers', '--engine', 'white'],
+                                  ['--variant', 'chess', '--book', 'x.bin'],
+                                  ['--variant', 'chess', '--engine', 'white', '--tc', 'soon'],
+                                  ['--variant', 'chess', '--engine', 'white', '--book', '/missing.bin']])
+def test_bad_launcher_options_are_usage_errors(started, argv, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        launcher.main(argv)
+    assert exit_info.value.code == 2
+    assert started == []
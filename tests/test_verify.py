@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from engine.move import CAPTURE, QUIET, pack, unpack
+from engine.tournament import packed_moves
+from engine.verify import (BAD_NOTATION, INVALID_MOVE, LEAVES_KING_IN_CHECK, NO_PIECE, OK,
+                           UNKNOWN_VARIANT, WRONG_COLOR, main, verify_game, verify_games)
+
+
+def test_flagged_codes_are_accepted():
+    moves = [pack((6, 4), (4, 4)), pack((1, 3), (3, 3)), pack((4, 4), (3, 3), CAPTURE)]
+    assert moves == [3364, 731, 18715]
+    assert verify_game('chess', moves).reason == OK
+
+
+def test_unknown_flags_are_bad_notation():
+    result = verify_game('chess', [pack((6, 4), (4, 4), 6)])
+    assert result.reason == BAD_NOTATION
+    assert verify_game('chess', [0x10000]).reason == BAD_NOTATION
+
+
+def test_tournament_games_are_packed_with_their_flags():
+    codes, size = packed_moves('chess', ['e2e4', 'd7d5', 'e4d5'])
+    assert size == 8
+    assert [unpack(code)[2] for code in codes] == [QUIET, QUIET, CAPTURE]
+    assert verify_game('chess', codes).reason == OK
+
+
+@pytest.mark.parametrize('variant, moves, reason, ply', [
+    ('chess', ['e2e4', 'e7e5', 'g1f3'], OK, None),
+    ('chess', ['e3e4'], NO_PIECE, 0),
+    ('chess', ['e7e5'], WRONG_COLOR, 0),
+    ('chess', ['e2e4', 'e7e5', 'e4e6'], INVALID_MOVE, 2),
+    ('chess', ['e2e4', 'f7f5', 'd1h5', 'a7a6'], LEAVES_KING_IN_CHECK, 3),
+    ('chess', ['e2e4', 'f7f5', 'd1h5', 'g7g6'], OK, None),
+    ('chess', ['d2d4', 'e7e5', 'd4e5', 'f8b4', 'c2c3'], OK, None),
+    ('chess', ['d2d4', 'e7e6', 'e2e4', 'f8b4', 'c1d2', 'a7a6', 'd2e3'], LEAVES_KING_IN_CHECK, 6),
+    ('checkers', ['c3d4', 'f6e5', 'd4f6'], OK, None),
+    ('checkers', ['c3c4'], INVALID_MOVE, 0),
+    ('xiangqi', ['e2e4'], UNKNOWN_VARIANT, None),
+    ('chess', ['e2'], BAD_NOTATION, 0),
+])
+def test_first_illegal_ply_is_reported(variant, moves, reason, ply):
+    result = verify_game(variant, moves)
+    assert result.reason == reason
+    if ply is not None:
+        assert result.ply == ply
+        assert result.move == moves[ply]
+
+
+def test_pairs_are_accepted():
+    assert verify_game('chess', [((6, 4), (4, 4))]).ok
+    assert verify_game('chess', [((6, 4), (8, 4))]).reason == BAD_NOTATION
+
+
+def test_bulk_results_keep_the_input_order():
+    games = [('chess', ['e2e4', 'e7e5']), ('chess', ['e2e5']), ('checkers', ['c3d4'])] * 7
+    expected = [verify_game(variant, moves, index).to_dict()
+                for index, (variant, moves) in enumerate(games)]
+    results = list(verify_games(iter(games), workers=2, chunk_size=3))
+    assert [result.to_dict() for result in results] == expected
+
+
+def test_cli_prints_illegal_games(tmp_path, capsys):
+    path = tmp_path / 'games.jsonl'
+    path.write_text('e2e4 e7e5 1-0\n' + json.dumps({'moves': ['e2e5'], 'result': '*'}) + '\n',
+                    encoding='utf-8')
+    main([str(path), '--workers', '1'])
+    lines = capsys.readouterr().out.splitlines()
+    assert json.loads(lines[0]) == {'index': 1, 'reason': INVALID_MOVE, 'plies': 0, 'ply': 0,
+                                    'move': 'e2e5'}
+    assert lines[1].startswith('Партий: 2')